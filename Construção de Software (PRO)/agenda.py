@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Núcleo de agendamento de consultas.
+Médicos, horários de 30 minutos e reservas, com detecção atômica de conflitos.
+
+A ocupação de cada médico em cada dia é um inteiro usado como bitset (um bit
+por horário). Por especialidade, uma árvore de segmentos sobre os dias da
+agenda guarda quantos horários livres restam, para achar o primeiro dia com
+vaga em O(log dias); dentro do dia, bitsets por horário (bit = médico) e um
+bitset de horários lotados levam direto ao horário e ao médico, sem
+percorrer os médicos da especialidade.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+DURACAO_SLOT = timedelta(minutes=30)
+SLOTS_POR_DIA = 48
+
+# Horários de atendimento da clínica (mesmos de agendamento.html): 07:00-11:30 e 14:00-17:30
+HORARIOS_EXPEDIENTE = tuple(
+    f"{minutos // 60:02d}:{minutos % 60:02d}"
+    for inicio, fim in ((7 * 60, 12 * 60), (14 * 60, 18 * 60))
+    for minutos in range(inicio, fim, 30)
+)
+MASCARA_EXPEDIENTE = sum(1 << (int(h[:2]) * 2 + int(h[3:]) // 30) for h in HORARIOS_EXPEDIENTE)
+SLOTS_EXPEDIENTE = bin(MASCARA_EXPEDIENTE).count('1')
+
+
+class ConflitoAgendamento(ValueError):
+    """O horário pedido já está reservado."""
+
+
+@dataclass
+class Medico:
+    """Médico que atende na clínica."""
+    id: str
+    nome: str
+    especialidade: str
+
+
+@dataclass
+class Agendamento:
+    """Consulta reservada em um horário."""
+    medico_id: str
+    paciente: str
+    inicio: datetime
+    protocolo: Optional[str] = None
+    expira_em: Optional[float] = None  # preenchido em bloqueios temporários (ver reservas.py)
+
+    @property
+    def fim(self) -> datetime:
+        return self.inicio + DURACAO_SLOT
+
+
+class _ArvoreDias:
+    """Árvore de segmentos (soma) sobre os dias, com busca do primeiro dia positivo."""
+
+    def __init__(self, valores: List[int]):
+        self._tamanho = 1
+        while self._tamanho < len(valores):
+            self._tamanho *= 2
+        self._somas = [0] * (2 * self._tamanho)
+        self._somas[self._tamanho:self._tamanho + len(valores)] = valores
+        for no in range(self._tamanho - 1, 0, -1):
+            self._somas[no] = self._somas[2 * no] + self._somas[2 * no + 1]
+
+    def alterar(self, dia: int, delta: int) -> None:
+        no = dia + self._tamanho
+        while no:
+            self._somas[no] += delta
+            no //= 2
+
+    def primeiro_positivo(self, a_partir: int) -> Optional[int]:
+        """Menor dia >= a_partir com valor positivo, ou None."""
+        if a_partir >= self._tamanho:
+            return None
+        no = a_partir + self._tamanho
+        if self._somas[no] > 0:
+            return a_partir
+        # Sobe até achar um irmão à direita com soma positiva...
+        while True:
+            if no == 1:
+                return None
+            if no % 2 == 0 and self._somas[no + 1] > 0:
+                no += 1
+                break
+            no //= 2
+        # ...e desce pelo filho positivo mais à esquerda
+        while no < self._tamanho:
+            no = 2 * no if self._somas[2 * no] > 0 else 2 * no + 1
+        return no - self._tamanho
+
+
+class _Especialidade:
+    """
+    Médicos de uma especialidade, com um lock, a árvore de vagas por dia e o
+    índice de ocupação por dia e horário.
+
+    O médico i é o bit i (ordem de cadastro). Só dias com reservas têm
+    entradas: `ocupados[dia][slot]` diz quem está ocupado no horário e
+    `lotados[dia]` quais horários não têm nenhum médico livre.
+    """
+
+    def __init__(self, dias: List[date]):
+        self.medicos: List[str] = []
+        self.bits: Dict[str, int] = {}  # medico_id -> bit do médico
+        self.todos = 0
+        self.ocupados: Dict[int, Dict[int, int]] = {}
+        self.lotados: Dict[int, int] = {}
+        self.lock = threading.Lock()
+        self.vagas = _ArvoreDias([0] * len(dias))
+
+    def adicionar(self, medico_id: str) -> None:
+        self.bits[medico_id] = 1 << len(self.medicos)
+        self.todos |= self.bits[medico_id]
+        self.medicos.append(medico_id)
+        self.lotados.clear()  # o médico novo está livre em todos os horários
+
+    def ocupar(self, indice: int, slot: int, medico_id: str) -> None:
+        horarios = self.ocupados.setdefault(indice, {})
+        ocupados = horarios[slot] = horarios.get(slot, 0) | self.bits[medico_id]
+        if ocupados == self.todos:
+            self.lotados[indice] = self.lotados.get(indice, 0) | 1 << slot
+
+    def liberar(self, indice: int, slot: int, medico_id: str) -> None:
+        horarios = self.ocupados[indice]
+        horarios[slot] &= ~self.bits[medico_id]
+        if not horarios[slot]:
+            del horarios[slot]
+            if not horarios:
+                del self.ocupados[indice]
+        if indice in self.lotados:
+            self.lotados[indice] &= ~(1 << slot)
+
+    def primeiro_livre(self, indice: int, mascara: int) -> Optional[Tuple[str, int]]:
+        """(médico, slot) do primeiro horário da máscara com algum médico livre no dia."""
+        livres = mascara & ~self.lotados.get(indice, 0)
+        if not livres or not self.todos:
+            return None
+        slot = (livres & -livres).bit_length() - 1
+        medicos = self.todos & ~self.ocupados.get(indice, {}).get(slot, 0)
+        return self.medicos[(medicos & -medicos).bit_length() - 1], slot
+
+
+class Agenda:
+    """
+    Agenda dos médicos em um horizonte fixo de dias.
+
+    Reservas e cancelamentos de uma especialidade são serializados por um
+    lock próprio, então verificar o horário e ocupá-lo é uma operação
+    atômica: dois pedidos para o mesmo horário nunca são ambos aceitos.
+    """
+
+    def __init__(self, inicio: date, dias: int = 365):
+        """
+        Args:
+            inicio: Primeiro dia da agenda
+            dias: Quantidade de dias da agenda
+
+        Raises:
+            ValueError: Se a quantidade de dias não for positiva
+        """
+        if dias < 1:
+            raise ValueError("A agenda deve ter pelo menos um dia")
+        self.inicio = inicio
+        self.dias = [inicio + timedelta(days=i) for i in range(dias)]
+        self.medicos: Dict[str, Medico] = {}
+        self._especialidades: Dict[str, _Especialidade] = {}
+        self._ocupacao: Dict[str, List[int]] = {}  # medico_id -> bitset por dia
+        self._agendamentos: Dict[Tuple[str, datetime], Agendamento] = {}
+        self._lock_cadastro = threading.Lock()
+
+    def adicionar_medico(self, medico: Medico) -> None:
+        """
+        Cadastra médico com a agenda toda livre.
+
+        Raises:
+            ValueError: Se o id já estiver cadastrado
+        """
+        with self._lock_cadastro:
+            if medico.id in self.medicos:
+                raise ValueError(f"Médico já cadastrado: {medico.id}")
+            especialidade = self._especialidades.get(medico.especialidade)
+            if especialidade is None:
+                especialidade = self._especialidades[medico.especialidade] = _Especialidade(self.dias)
+            with especialidade.lock:
+                self.medicos[medico.id] = medico
+                self._ocupacao[medico.id] = [0] * len(self.dias)
+                especialidade.adicionar(medico.id)
+                for indice, dia in enumerate(self.dias):
+                    if dia.weekday() < 5:
+                        especialidade.vagas.alterar(indice, SLOTS_EXPEDIENTE)
+
+    def horarios_livres(self, medico_id: str, dia: date) -> List[datetime]:
+        """Horários livres do médico no dia (vazio em fins de semana ou fora da agenda)."""
+        ocupacao = self._ocupacao_medico(medico_id)
+        indice = (dia - self.inicio).days
+        if not 0 <= indice < len(self.dias) or dia.weekday() >= 5:
+            return []
+        livres = MASCARA_EXPEDIENTE & ~ocupacao[indice]
+        return [_horario(dia, slot) for slot in _bits(livres)]
+
+    def esta_livre(self, medico_id: str, inicio: datetime) -> bool:
+        """Indica se o horário do médico está livre (e é um horário de atendimento)."""
+        indice, slot = self._localizar(inicio)
+        return not self._ocupacao_medico(medico_id)[indice] >> slot & 1
+
+    def primeiro_horario_livre(self, especialidade: str,
+                               a_partir: datetime) -> Optional[Tuple[Medico, datetime]]:
+        """
+        Primeiro horário livre, a partir de `a_partir`, entre os médicos da especialidade.
+
+        Returns:
+            (médico, horário) ou None se não houver vaga no horizonte da agenda
+        """
+        grupo = self._especialidades.get(especialidade)
+        if grupo is None:
+            return None
+        indice = (a_partir.date() - self.inicio).days
+        if indice >= len(self.dias):
+            return None
+        minimo = 0
+        if indice < 0:
+            indice = 0
+        else:
+            # No primeiro dia só valem horários que começam a partir do instante pedido
+            segundos = a_partir.hour * 3600 + a_partir.minute * 60 + a_partir.second
+            minimo = -(-segundos // 1800)
+        with grupo.lock:
+            while indice is not None:
+                melhor = None
+                if self.dias[indice].weekday() < 5:
+                    melhor = grupo.primeiro_livre(indice, MASCARA_EXPEDIENTE & ~((1 << minimo) - 1))
+                if melhor is not None:
+                    return self.medicos[melhor[0]], _horario(self.dias[indice], melhor[1])
+                # Dias seguintes: a árvore pula direto para o próximo com vaga
+                indice = grupo.vagas.primeiro_positivo(indice + 1)
+                minimo = 0
+        return None
+
+    def reservar(self, medico_id: str, inicio: datetime, paciente: str,
+                 protocolo: Optional[str] = None) -> Agendamento:
+        """
+        Reserva o horário de forma atômica.
+
+        Raises:
+            ValueError: Se o horário não for um horário de atendimento da agenda
+            ConflitoAgendamento: Se o horário já estiver reservado
+        """
+        agendamento = Agendamento(medico_id, paciente, inicio, protocolo)
+        if not self.comparar_e_trocar(medico_id, inicio, None, agendamento):
+            raise ConflitoAgendamento(f"Horário já reservado: {medico_id} {inicio:%Y-%m-%d %H:%M}")
+        return agendamento
+
+    def cancelar(self, medico_id: str, inicio: datetime) -> Agendamento:
+        """
+        Libera um horário reservado.
+
+        Raises:
+            KeyError: Se não houver reserva no horário
+        """
+        while True:
+            agendamento = self._agendamentos[(medico_id, inicio)]
+            if self.comparar_e_trocar(medico_id, inicio, agendamento, None):
+                return agendamento
+
+    def comparar_e_trocar(self, medico_id: str, inicio: datetime,
+                          esperado: Optional[Agendamento], novo: Optional[Agendamento]) -> bool:
+        """
+        Troca a reserva do horário por `novo` se a atual ainda for `esperado`.
+
+        None representa o horário livre: (None, novo) reserva, (atual, None)
+        libera e (atual, novo) substitui. A comparação é por identidade.
+
+        Returns:
+            True se a troca foi feita, False se o horário mudou nesse meio-tempo
+
+        Raises:
+            ValueError: Se o horário não for um horário de atendimento da agenda
+        """
+        indice, slot = self._localizar(inicio)
+        ocupacao = self._ocupacao_medico(medico_id)
+        grupo = self._especialidades[self.medicos[medico_id].especialidade]
+        chave = (medico_id, inicio)
+        with grupo.lock:
+            if self._agendamentos.get(chave) is not esperado:
+                return False
+            if novo is None:
+                if esperado is not None:
+                    del self._agendamentos[chave]
+                    ocupacao[indice] &= ~(1 << slot)
+                    grupo.liberar(indice, slot, medico_id)
+                    grupo.vagas.alterar(indice, 1)
+                return True
+            if esperado is None:
+                ocupacao[indice] |= 1 << slot
+                grupo.ocupar(indice, slot, medico_id)
+                grupo.vagas.alterar(indice, -1)
+            self._agendamentos[chave] = novo
+        return True
+
+    def agendamento(self, medico_id: str, inicio: datetime) -> Optional[Agendamento]:
+        """Reserva do médico no horário, se houver."""
+        return self._agendamentos.get((medico_id, inicio))
+
+    def _ocupacao_medico(self, medico_id: str) -> List[int]:
+        try:
+            return self._ocupacao[medico_id]
+        except KeyError:
+            raise ValueError(f"Médico não cadastrado: {medico_id}") from None
+
+    def _localizar(self, inicio: datetime) -> Tuple[int, int]:
+        """(índice do dia, slot do dia) de um horário de atendimento."""
+        indice = (inicio.date() - self.inicio).days
+        if not 0 <= indice < len(self.dias):
+            raise ValueError("Data fora do horizonte da agenda")
+        if inicio.weekday() >= 5:
+            raise ValueError("A clínica não funciona aos finais de semana")
+        if inicio.minute % 30 or inicio.second or inicio.microsecond:
+            raise ValueError("Horário deve começar em múltiplos de 30 minutos")
+        slot = inicio.hour * 2 + inicio.minute // 30
+        if not MASCARA_EXPEDIENTE >> slot & 1:
+            raise ValueError("Horário fora do expediente")
+        return indice, slot
+
+
+def _horario(dia: date, slot: int) -> datetime:
+    return datetime.combine(dia, time(slot // 2, 30 * (slot % 2)))
+
+
+def _bits(valor: int) -> List[int]:
+    """Posições dos bits ligados, em ordem crescente."""
+    posicoes = []
+    while valor:
+        menor = valor & -valor
+        posicoes.append(menor.bit_length() - 1)
+        valor ^= menor
+    return posicoes
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Backend de fila persistente em SQLite (modo WAL) para o GerenciadorTriagem.
+Guarda pacientes, a fila de espera e o histórico de atendimentos; a fila é
+reaberta intacta após reinícios.
+
+Uso:
+    gerenciador = GerenciadorTriagem(backend=FilaSQLite("triagem.db"))
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pacientes_colunares import datetime_para_ns, ns_para_datetime
+from filas import FilaPrioridade
+from relogio import Relogio, obter_relogio
+from triagem import Paciente
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS pacientes (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    idade INTEGER NOT NULL,
+    urgencia INTEGER NOT NULL,
+    chegada_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fila (
+    paciente_id INTEGER PRIMARY KEY REFERENCES pacientes(id),
+    urgencia INTEGER NOT NULL,
+    chegada_ns INTEGER NOT NULL
+);
+-- Cobre a escolha do próximo: o paciente_id (rowid) já faz parte do índice
+CREATE INDEX IF NOT EXISTS idx_fila_prioridade ON fila (urgencia DESC, chegada_ns, paciente_id);
+CREATE TABLE IF NOT EXISTS atendimentos (
+    paciente_id INTEGER PRIMARY KEY REFERENCES pacientes(id),
+    atendido_ns INTEGER NOT NULL,
+    espera_segundos REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_atendimentos_data ON atendimentos (atendido_ns);
+"""
+
+_SELECIONAR_FILA = """
+SELECT p.id, p.nome, p.idade, p.urgencia, p.chegada_ns
+FROM fila f JOIN pacientes p ON p.id = f.paciente_id
+"""
+_ORDEM_ATENDIMENTO = " ORDER BY f.urgencia DESC, f.chegada_ns, f.paciente_id"
+
+
+def _abrir_conexao(caminho: str) -> sqlite3.Connection:
+    # Transações explícitas (isolation_level=None) para agrupar gravações
+    conexao = sqlite3.connect(caminho, isolation_level=None, check_same_thread=False)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute("PRAGMA synchronous=NORMAL")
+    return conexao
+
+
+def _paciente_da_linha(linha: Tuple[int, str, int, int, int]) -> Paciente:
+    _, nome, idade, urgencia, chegada_ns = linha
+    return Paciente._ja_validado(nome, idade, urgencia, ns_para_datetime(chegada_ns))
+
+
+class PoolConexoes:
+    """
+    Pool pequeno de conexões somente leitura.
+
+    Em modo WAL, leitores não bloqueiam o gravador nem uns aos outros;
+    as conexões são criadas sob demanda até `tamanho` e reaproveitadas.
+    """
+
+    def __init__(self, caminho: str, tamanho: int = 4):
+        if tamanho < 1:
+            raise ValueError("Tamanho do pool deve ser positivo")
+        self.caminho = caminho
+        self.tamanho = tamanho
+        self._livres: queue.LifoQueue = queue.LifoQueue()
+        self._criadas = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def conexao(self) -> Iterator[sqlite3.Connection]:
+        """Empresta uma conexão; aguarda se todas estiverem em uso."""
+        conexao = self._obter()
+        try:
+            yield conexao
+        finally:
+            self._livres.put(conexao)
+
+    def fechar(self) -> None:
+        """Fecha as conexões livres."""
+        while True:
+            try:
+                self._livres.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _obter(self) -> sqlite3.Connection:
+        try:
+            return self._livres.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            criar = self._criadas < self.tamanho
+            if criar:
+                self._criadas += 1
+        if not criar:
+            return self._livres.get()
+        conexao = _abrir_conexao(self.caminho)
+        conexao.execute("PRAGMA query_only=ON")
+        return conexao
+
+
+class FilaSQLite(FilaPrioridade):
+    """
+    Backend de fila persistido em SQLite.
+
+    O próximo paciente é uma busca no índice (urgencia DESC, chegada_ns), sem
+    varrer a tabela. Atendimentos saem da tabela `fila` e vão para
+    `atendimentos`, com o tempo de espera.
+
+    As gravações acontecem numa transação que só é confirmada a cada
+    `lote_gravacao` operações (ou em `sincronizar()`); a própria fila enxerga
+    as operações pendentes, mas consultas pelo pool só veem as confirmadas.
+
+    Quem está na fila é devolvido sempre como o mesmo objeto (o inserido, ou
+    o lido do banco na primeira vez após reabrir), como nos backends em
+    memória: observadores como o FluxoFila comparam pacientes por identidade.
+    """
+
+    def __init__(self, caminho: str, lote_gravacao: int = 1, tamanho_pool: int = 4) -> None:
+        """
+        Args:
+            caminho: Arquivo do banco (criado se não existir)
+            lote_gravacao: Operações por transação (1 = confirma cada operação)
+            tamanho_pool: Conexões de leitura para as consultas de histórico
+
+        Raises:
+            ValueError: Se lote_gravacao não for positivo
+        """
+        if lote_gravacao < 1:
+            raise ValueError("Lote de gravação deve ser positivo")
+        self.caminho = caminho
+        self.lote_gravacao = lote_gravacao
+        self._conexao = _abrir_conexao(caminho)
+        self._conexao.executescript(ESQUEMA)
+        self._lock = threading.Lock()
+        self._pendentes = 0
+        self._tamanho = self._conexao.execute("SELECT COUNT(*) FROM fila").fetchone()[0]
+        self._cache: Optional[List[Paciente]] = None
+        self._vivos: Dict[int, Any] = {}  # paciente_id -> objeto na fila
+        self._relogio = obter_relogio()
+        self.pool = PoolConexoes(caminho, tamanho_pool)
+
+    def usar_relogio(self, relogio: Relogio) -> None:
+        self._relogio = relogio
+
+    def adicionar(self, paciente: Any) -> None:
+        self.adicionar_varios([paciente])
+
+    def adicionar_varios(self, pacientes: List[Any]) -> None:
+        linhas = [(p.nome, p.idade, p.urgencia, datetime_para_ns(p.timestamp)) for p in pacientes]
+        with self._lock:
+            self._iniciar_transacao()
+            ultimo_id = self._conexao.execute("SELECT COALESCE(MAX(id), 0) FROM pacientes").fetchone()[0]
+            self._conexao.executemany(
+                "INSERT INTO pacientes (nome, idade, urgencia, chegada_ns) VALUES (?, ?, ?, ?)", linhas
+            )
+            self._conexao.execute(
+                "INSERT INTO fila (paciente_id, urgencia, chegada_ns) "
+                "SELECT id, urgencia, chegada_ns FROM pacientes WHERE id > ?", (ultimo_id,)
+            )
+            self._vivos.update(zip(range(ultimo_id + 1, ultimo_id + 1 + len(linhas)), pacientes))
+            self._tamanho += len(linhas)
+            self._cache = None
+            self._concluir_operacao()
+
+    def remover_proximo(self) -> Any:
+        with self._lock:
+            linha = self._primeira_linha()
+            paciente = self._paciente(linha)
+            agora = self._relogio.agora()
+            self._iniciar_transacao()
+            self._conexao.execute("DELETE FROM fila WHERE paciente_id = ?", (linha[0],))
+            self._conexao.execute(
+                "INSERT INTO atendimentos (paciente_id, atendido_ns, espera_segundos) VALUES (?, ?, ?)",
+                (linha[0], datetime_para_ns(agora), (agora - paciente.timestamp).total_seconds())
+            )
+            del self._vivos[linha[0]]
+            self._tamanho -= 1
+            self._cache = None
+            self._concluir_operacao()
+        return paciente
+
+    def espiar(self) -> Any:
+        with self._lock:
+            return self._paciente(self._primeira_linha())
+
+    def ordenada(self) -> List[Any]:
+        with self._lock:
+            if self._cache is None:
+                linhas = self._conexao.execute(_SELECIONAR_FILA + _ORDEM_ATENDIMENTO).fetchall()
+                self._cache = [self._paciente(linha) for linha in linhas]
+            return self._cache
+
+    def pacientes(self) -> List[Any]:
+        with self._lock:
+            linhas = self._conexao.execute(_SELECIONAR_FILA + " ORDER BY f.paciente_id").fetchall()
+            return [self._paciente(linha) for linha in linhas]
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def sincronizar(self) -> None:
+        """Confirma as gravações pendentes."""
+        with self._lock:
+            if self._conexao.in_transaction:
+                self._conexao.execute("COMMIT")
+            self._pendentes = 0
+
+    def historico_atendimentos(self, desde: Optional[int] = None, ate: Optional[int] = None,
+                               limite: int = 100) -> List[Tuple[Paciente, int, float]]:
+        """
+        Consulta atendimentos confirmados, do mais recente para o mais antigo.
+
+        Args:
+            desde: Início do intervalo em ns desde a época (inclusivo)
+            ate: Fim do intervalo em ns desde a época (exclusivo)
+            limite: Máximo de registros
+
+        Returns:
+            Lista de (paciente, atendido_ns, espera_segundos)
+        """
+        with self.pool.conexao() as conexao:
+            linhas = conexao.execute(
+                "SELECT p.id, p.nome, p.idade, p.urgencia, p.chegada_ns, a.atendido_ns, a.espera_segundos "
+                "FROM atendimentos a JOIN pacientes p ON p.id = a.paciente_id "
+                "WHERE a.atendido_ns >= ? AND a.atendido_ns < ? "
+                "ORDER BY a.atendido_ns DESC LIMIT ?",
+                (desde if desde is not None else 0,
+                 ate if ate is not None else 2 ** 63 - 1, limite)
+            ).fetchall()
+        return [(_paciente_da_linha(linha[:5]), linha[5], linha[6]) for linha in linhas]
+
+    def fechar(self) -> None:
+        """Confirma as gravações pendentes e fecha as conexões."""
+        self.sincronizar()
+        self.pool.fechar()
+        self._conexao.close()
+
+    def _paciente(self, linha: Tuple[int, str, int, int, int]) -> Any:
+        paciente = self._vivos.get(linha[0])
+        if paciente is None:
+            paciente = self._vivos[linha[0]] = _paciente_da_linha(linha)
+        return paciente
+
+    def _primeira_linha(self) -> Tuple[int, str, int, int, int]:
+        linha = self._conexao.execute(_SELECIONAR_FILA + _ORDEM_ATENDIMENTO + " LIMIT 1").fetchone()
+        if linha is None:
+            raise IndexError("Fila vazia")
+        return linha
+
+    def _iniciar_transacao(self) -> None:
+        if not self._conexao.in_transaction:
+            self._conexao.execute("BEGIN")
+
+    def _concluir_operacao(self) -> None:
+        self._pendentes += 1
+        if self._pendentes >= self.lote_gravacao:
+            self._conexao.execute("COMMIT")
+            self._pendentes = 0
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark da agenda de consultas.
+Cadastra N médicos em 4 especialidades com um ano de agenda, reserva uma
+fração dos horários (lotando os primeiros meses) e mede reservas, conflitos,
+horários livres de um médico e o primeiro horário livre por especialidade,
+comparando este último com a varredura dia a dia das agendas.
+
+Uso:
+    python benchmark_agenda.py
+    python benchmark_agenda.py --medicos 400 --ocupacao 0.9
+"""
+
+import argparse
+import gc
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional, Tuple
+
+from agenda import Agenda, ConflitoAgendamento, Medico
+
+ESPECIALIDADES = ["Clínico Geral", "Cardiologia", "Pediatria", "Ortopedia"]
+
+
+def medir_us(consulta: Callable[[], object], repeticoes: int) -> float:
+    """Tempo médio da consulta em microssegundos."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        consulta()
+    return (time.perf_counter() - inicio) / repeticoes * 1e6
+
+
+def varrer_primeiro_livre(agenda: Agenda, especialidade: str,
+                          a_partir: datetime) -> Optional[Tuple[Medico, datetime]]:
+    """Referência: percorre os dias e os médicos até achar um horário livre."""
+    medicos = [m for m in agenda.medicos.values() if m.especialidade == especialidade]
+    dia = a_partir.date()
+    while dia < agenda.inicio + timedelta(days=len(agenda.dias)):
+        melhor = None
+        for medico in medicos:
+            for horario in agenda.horarios_livres(medico.id, dia):
+                if horario >= a_partir and (melhor is None or horario < melhor[1]):
+                    melhor = (medico, horario)
+                    break
+        if melhor:
+            return melhor
+        dia += timedelta(days=1)
+    return None
+
+
+def executar_benchmark(medicos: int, dias: int, ocupacao: float, meses_lotados: int) -> None:
+    """Executa e imprime os tempos da agenda."""
+    inicio = date(2025, 1, 6)
+    agenda = Agenda(inicio, dias)
+    for i in range(medicos):
+        agenda.adicionar_medico(Medico(str(i), f"Dr(a). {i}", ESPECIALIDADES[i % len(ESPECIALIDADES)]))
+
+    gerador = random.Random(42)
+    dias_lotados = meses_lotados * 30
+    pedidos = []
+    for medico_id in agenda.medicos:
+        for indice, dia in enumerate(agenda.dias):
+            if dia.weekday() >= 5:
+                continue
+            for horario in agenda.horarios_livres(medico_id, dia):
+                if indice < dias_lotados or gerador.random() < ocupacao:
+                    pedidos.append((medico_id, horario))
+    gerador.shuffle(pedidos)
+
+    gc.disable()
+    try:
+        inicio_medicao = time.perf_counter()
+        for medico_id, horario in pedidos:
+            agenda.reservar(medico_id, horario, "Paciente")
+        tempo_reservas = time.perf_counter() - inicio_medicao
+
+        # Pedidos repetidos: todos devem ser recusados como conflito
+        repetidos = pedidos[:100_000]
+        inicio_medicao = time.perf_counter()
+        conflitos = 0
+        for medico_id, horario in repetidos:
+            try:
+                agenda.reservar(medico_id, horario, "Outro paciente")
+            except ConflitoAgendamento:
+                conflitos += 1
+        tempo_conflitos = time.perf_counter() - inicio_medicao
+    finally:
+        gc.enable()
+    assert conflitos == len(repetidos)
+
+    a_partir = datetime.combine(inicio, datetime.min.time()) + timedelta(hours=9)
+    dia_consulta = inicio + timedelta(days=dias_lotados + 3)
+
+    print("📈 BENCHMARK DA AGENDA DE CONSULTAS")
+    print("=" * 64)
+    print(f"Médicos: {medicos} | dias: {dias} | ocupação: {ocupacao:.0%} "
+          f"(primeiros {dias_lotados} dias lotados)")
+    print(f"Reservas: {len(pedidos)} em {tempo_reservas:.2f} s ({len(pedidos) / tempo_reservas:10.0f} reservas/s)")
+    print(f"Conflitos detectados: {conflitos} ({len(repetidos) / tempo_conflitos:10.0f} tentativas/s)")
+    print("-" * 64)
+    print(f"{'horários livres (médico, dia)':>40}: {medir_us(lambda: agenda.horarios_livres('7', dia_consulta), 2000):10.1f} µs")
+    for especialidade in ESPECIALIDADES[:2]:
+        resultado = agenda.primeiro_horario_livre(especialidade, a_partir)
+        assert resultado == varrer_primeiro_livre(agenda, especialidade, a_partir)
+        tempo = medir_us(lambda: agenda.primeiro_horario_livre(especialidade, a_partir), 500)
+        varredura = medir_us(lambda: varrer_primeiro_livre(agenda, especialidade, a_partir), 3)
+        print(f"{'primeiro livre ' + especialidade:>40}: {tempo:10.1f} µs | varredura {varredura:10.1f} µs "
+              f"-> {resultado[1]:%d/%m %H:%M}")
+    print("=" * 64)
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmark da agenda de consultas")
+    parser.add_argument('--medicos', type=int, default=200)
+    parser.add_argument('--dias', type=int, default=365)
+    parser.add_argument('--ocupacao', type=float, default=0.7)
+    parser.add_argument('--meses-lotados', type=int, default=3)
+    args = parser.parse_args()
+
+    executar_benchmark(args.medicos, args.dias, args.ocupacao, args.meses_lotados)
+
+
+if __name__ == "__main__":
+    main()
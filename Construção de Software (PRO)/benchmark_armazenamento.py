@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark do backend SQLite comparado à fila em memória.
+Mede adições individuais, adição em lote e atendimentos, em operações por segundo.
+
+Uso:
+    python benchmark_armazenamento.py
+    python benchmark_armazenamento.py --pacientes 50000 --lotes 1 64 1024
+"""
+
+import argparse
+import gc
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from armazenamento_sqlite import FilaSQLite
+from filas import FilaHeap, FilaPrioridade
+from triagem import Paciente
+
+
+def gerar_pacientes(quantidade: int, semente: int = 42) -> List[Paciente]:
+    """Gera pacientes já validados, em ordem de chegada, com urgências aleatórias."""
+    gerador = random.Random(semente)
+    base_time = datetime.now()
+    return [
+        Paciente._ja_validado(f"Paciente {i}", 40, gerador.randint(1, 5), base_time + timedelta(microseconds=i))
+        for i in range(quantidade)
+    ]
+
+
+def medir_backend(criar: Callable[[str], FilaPrioridade], pacientes: List[Paciente]) -> Dict[str, float]:
+    """
+    Mede as etapas em um banco novo por etapa.
+
+    Returns:
+        Operações por segundo de cada etapa
+    """
+    resultados = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        fila = criar(os.path.join(diretorio, 'individual.db'))
+        resultados['adicionar'] = _vazao(lambda: [fila.adicionar(p) for p in pacientes], len(pacientes))
+        resultados['atender'] = _vazao(lambda: [fila.remover_proximo() for _ in pacientes], len(pacientes))
+        _fechar(fila)
+
+        fila = criar(os.path.join(diretorio, 'lote.db'))
+        resultados['adicionar_varios'] = _vazao(lambda: fila.adicionar_varios(pacientes), len(pacientes))
+        _fechar(fila)
+    return resultados
+
+
+def _vazao(etapa: Callable[[], object], operacoes: int) -> float:
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        etapa()
+        return operacoes / (time.perf_counter() - inicio)
+    finally:
+        gc.enable()
+
+
+def _fechar(fila: FilaPrioridade) -> None:
+    if isinstance(fila, FilaSQLite):
+        fila.fechar()
+
+
+def executar_benchmark(quantidade: int, lotes: List[int]) -> None:
+    """Executa e imprime a vazão de cada configuração."""
+    pacientes = gerar_pacientes(quantidade)
+    configuracoes = [("memória (heap)", lambda caminho: FilaHeap())]
+    for lote in lotes:
+        configuracoes.append((f"sqlite lote={lote}",
+                              lambda caminho, lote=lote: FilaSQLite(caminho, lote_gravacao=lote)))
+
+    print("📈 BENCHMARK DO ARMAZENAMENTO SQLITE")
+    print("=" * 72)
+    print(f"Pacientes: {quantidade}")
+    print(f"{'configuração':>18} {'adicionar':>14} {'atender':>14} {'adicionar_varios':>18}")
+    print("-" * 72)
+    for nome, criar in configuracoes:
+        resultado = medir_backend(criar, pacientes)
+        print(f"{nome:>18} {resultado['adicionar']:>10.0f} op/s {resultado['atender']:>10.0f} op/s "
+              f"{resultado['adicionar_varios']:>14.0f} op/s")
+    print("=" * 72)
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmark do backend SQLite")
+    parser.add_argument('--pacientes', type=int, default=20000)
+    parser.add_argument('--lotes', type=int, nargs='+', default=[1, 256],
+                        help="operações por transação no SQLite")
+    args = parser.parse_args()
+
+    executar_benchmark(args.pacientes, args.lotes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark do índice de busca de pacientes por nome.
+Indexa N nomes brasileiros sintéticos e compara buscas por prefixo e
+aproximadas com uma varredura linear dos nomes já normalizados.
+
+Uso:
+    python benchmark_busca.py
+    python benchmark_busca.py --pacientes 100000 --k 20
+"""
+
+import argparse
+import gc
+import random
+import time
+from datetime import datetime
+from typing import Callable, List
+
+from busca_pacientes import IndiceNomes, distancia_edicao, normalizar_nome
+from triagem import Paciente
+
+PRENOMES = ["João", "José", "Maria", "Ana", "Antônio", "Francisco", "Luís", "Lúcia", "Mônica",
+            "Márcio", "Paulo", "Sérgio", "Cláudia", "Fábio", "Inês", "Vitória", "Caio", "Júlia",
+            "Letícia", "André", "Beatriz", "Fernanda", "Gabriel", "Heloísa", "Otávio", "Rafael"]
+SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Conceição", "Gonçalves", "Araújo", "Simões",
+              "Pereira", "Lima", "Carvalho", "Ferreira", "Rodrigues", "Almeida", "Nascimento",
+              "Guimarães", "Brandão", "Magalhães", "Assunção", "Romão", "Falcão", "Sá", "Teixeira"]
+
+
+def gerar_pacientes(quantidade: int, semente: int = 42) -> List[Paciente]:
+    """Nomes com prenome, dois sobrenomes e um sufixo numérico para variar os termos."""
+    gerador = random.Random(semente)
+    agora = datetime.now()
+    return [
+        Paciente._ja_validado(
+            f"{gerador.choice(PRENOMES)} {gerador.choice(SOBRENOMES)} "
+            f"{gerador.choice(SOBRENOMES)}{i % 5000 or ''}", 40, 3, agora)
+        for i in range(quantidade)
+    ]
+
+
+def medir_us(consulta: Callable[[], object], repeticoes: int) -> float:
+    """Tempo médio da consulta em microssegundos."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        consulta()
+    return (time.perf_counter() - inicio) / repeticoes * 1e6
+
+
+def executar_benchmark(quantidade: int, k: int) -> None:
+    """Executa e imprime os tempos de indexação e de busca."""
+    pacientes = gerar_pacientes(quantidade)
+    indice = IndiceNomes()
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        indice.adicionar_varios(pacientes)
+        indexacao = time.perf_counter() - inicio
+    finally:
+        gc.enable()
+
+    # Referência: nomes já normalizados, percorridos a cada consulta
+    normalizados = [normalizar_nome(p.nome).split() for p in pacientes]
+
+    def varrer_prefixo(prefixos):
+        resultado = []
+        for posicao, termos in enumerate(normalizados):
+            if all(any(t.startswith(p) for t in termos) for p in prefixos):
+                resultado.append(pacientes[posicao])
+                if len(resultado) == k:
+                    break
+        return resultado
+
+    def varrer_aproximado(termo):
+        return [pacientes[posicao] for posicao, termos in enumerate(normalizados)
+                if any(distancia_edicao(termo, t, 1) <= 1 for t in termos)][:k]
+
+    print("📈 BENCHMARK DA BUSCA DE PACIENTES")
+    print("=" * 64)
+    print(f"Pacientes: {quantidade} | indexação: {quantidade / indexacao:10.0f} nomes/s | k = {k}")
+    print("-" * 64)
+    consultas = [
+        ("prefixo 'joa'", lambda: indice.buscar_prefixo("joa", k), lambda: varrer_prefixo(["joa"])),
+        ("prefixo 'joão sil'", lambda: indice.buscar_prefixo("joão sil", k),
+         lambda: varrer_prefixo(["joao", "sil"])),
+        ("prefixo curto 's'", lambda: indice.buscar_prefixo("s", k), lambda: varrer_prefixo(["s"])),
+        ("prefixo curto 'maria s'", lambda: indice.buscar_prefixo("maria s", k),
+         lambda: varrer_prefixo(["maria", "s"])),
+        ("prefixo raro 'gonçalves4999'", lambda: indice.buscar_prefixo("gonçalves4999", k),
+         lambda: varrer_prefixo(["goncalves4999"])),
+        ("aproximada 'guimares'", lambda: indice.buscar_aproximado("guimares", k),
+         lambda: varrer_aproximado("guimares")),
+        ("aproximada 'mraia olievira'", lambda: indice.buscar_aproximado("mraia olievira", k), None),
+    ]
+    for nome, com_indice, varredura in consultas:
+        tempo = medir_us(com_indice, 200)
+        linha = f"{nome:>30}: {tempo:10.1f} µs"
+        if varredura is not None:
+            linha += f" | varredura {medir_us(varredura, 1):12.1f} µs"
+        print(linha)
+    print("=" * 64)
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmark da busca de pacientes por nome")
+    parser.add_argument('--pacientes', type=int, default=500_000)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    executar_benchmark(args.pacientes, args.k)
+
+
+if __name__ == "__main__":
+    main()
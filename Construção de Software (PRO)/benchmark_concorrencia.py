@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Teste de carga multi-thread do GerenciadorTriagemConcorrente.
+Recepções e enfermeiros em threads separadas; mede a vazão conforme o
+número de threads cresce e confere que nenhum paciente é atendido duas vezes.
+
+Uso:
+    python benchmark_concorrencia.py
+    python benchmark_concorrencia.py --pacientes 50000 --threads 1 2 4 8 16
+"""
+
+import argparse
+import contextlib
+import os
+import threading
+import time
+from datetime import datetime
+from typing import List
+
+from monitor_sistema import NIVEIS_INSTRUMENTACAO, monitor
+from triagem import Paciente
+from triagem_concorrente import GerenciadorTriagemConcorrente
+
+
+def medir_vazao(quantidade: int, threads: int) -> float:
+    """
+    Executa `threads` recepções e `threads` enfermeiros sobre a mesma fila.
+
+    Returns:
+        Operações (adições + atendimentos) por segundo
+    """
+    gerenciador = GerenciadorTriagemConcorrente()
+    por_thread = quantidade // threads
+    chegada = datetime.now()
+    lotes = [
+        [Paciente._ja_validado(f"R{r}-P{i}", 40, i % 5 + 1, chegada) for i in range(por_thread)]
+        for r in range(threads)
+    ]
+    atendidos: List[List[Paciente]] = [[] for _ in range(threads)]
+
+    def recepcao(pacientes: List[Paciente]) -> None:
+        for paciente in pacientes:
+            gerenciador.adicionar_paciente(paciente)
+
+    def enfermeiro(destino: List[Paciente]) -> None:
+        for _ in range(por_thread):
+            destino.append(gerenciador.atender_proximo(bloquear=True, timeout=30))
+
+    trabalhadores = [threading.Thread(target=recepcao, args=(lote,)) for lote in lotes]
+    trabalhadores += [threading.Thread(target=enfermeiro, args=(destino,)) for destino in atendidos]
+
+    # Os alertas de tamanho_fila vão para o stdout; silenciá-los evita medir o terminal
+    with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+        inicio = time.perf_counter()
+        for trabalhador in trabalhadores:
+            trabalhador.start()
+        for trabalhador in trabalhadores:
+            trabalhador.join()
+        duracao = time.perf_counter() - inicio
+
+    total = sum(len(destino) for destino in atendidos)
+    unicos = len({id(p) for destino in atendidos for p in destino})
+    if total != por_thread * threads or unicos != total or len(gerenciador):
+        raise AssertionError(f"Inconsistência: {total} atendidos, {unicos} únicos")
+
+    return 2 * total / duracao
+
+
+def executar_benchmark(quantidade: int, contagens_threads: List[int], nivel: str) -> None:
+    """Executa e imprime a vazão para cada número de threads."""
+    nivel_original = monitor.nivel_instrumentacao
+    monitor.configurar_instrumentacao(nivel)
+
+    print("📈 CARGA MULTI-THREAD DA FILA DE TRIAGEM")
+    print("=" * 60)
+    print(f"Pacientes por rodada: {quantidade} | instrumentação: {nivel}")
+    print("-" * 60)
+    try:
+        for threads in contagens_threads:
+            vazao = medir_vazao(quantidade, threads)
+            monitor.descarregar()
+            print(f"{threads:>3} recepções + {threads:>3} enfermeiros: {vazao:12.0f} ops/s")
+    finally:
+        monitor.configurar_instrumentacao(nivel_original)
+    print("=" * 60)
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Teste de carga multi-thread da triagem")
+    parser.add_argument('--pacientes', type=int, default=20000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--nivel', choices=NIVEIS_INSTRUMENTACAO, default='contadores',
+                        help="nível de instrumentação do decorator durante a carga")
+    args = parser.parse_args()
+
+    executar_benchmark(args.pacientes, args.threads, args.nivel)
+
+
+if __name__ == "__main__":
+    main()
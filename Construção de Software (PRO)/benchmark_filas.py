@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos backends de fila de triagem.
+Compara o caminho original (lista + sort) com o heap e as cinco faixas.
+
+Uso:
+    python benchmark_filas.py
+    python benchmark_filas.py --tamanhos 1000 10000 --atendimentos 200
+"""
+
+import argparse
+import gc
+import random
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from filas import FilaFaixas, FilaHeap, FilaLista
+
+
+# Registro leve: os backends só dependem de urgencia e timestamp, e usar
+# Paciente mediria também validação e logging de cada criação.
+RegistroBenchmark = namedtuple('RegistroBenchmark', 'nome urgencia timestamp')
+
+BACKENDS = {
+    'lista': FilaLista,
+    'heap': FilaHeap,
+    'faixas': FilaFaixas,
+}
+
+
+def gerar_registros(quantidade: int, semente: int = 42) -> List[RegistroBenchmark]:
+    """Gera chegadas em ordem de timestamp com urgências aleatórias."""
+    gerador = random.Random(semente)
+    base_time = datetime.now()
+    return [
+        RegistroBenchmark(f"P{i}", gerador.randint(1, 5), base_time + timedelta(microseconds=i))
+        for i in range(quantidade)
+    ]
+
+
+def medir_backend(nome: str, registros: List[RegistroBenchmark], atendimentos: int) -> Dict[str, float]:
+    """
+    Mede inserção, atendimentos e listagem ordenada em um backend.
+
+    Returns:
+        Microssegundos por operação para cada etapa
+    """
+    fila = BACKENDS[nome]()
+    # Coleta cíclica distorce medições com milhões de tuplas vivas
+    gc.disable()
+    try:
+        return _medir_etapas(fila, registros, atendimentos)
+    finally:
+        gc.enable()
+
+
+def _medir_etapas(fila, registros: List[RegistroBenchmark], atendimentos: int) -> Dict[str, float]:
+    """Executa as etapas medidas sobre uma fila vazia."""
+    inicio = time.perf_counter()
+    for registro in registros:
+        fila.adicionar(registro)
+    tempo_insercao = time.perf_counter() - inicio
+
+    quantidade_atendimentos = min(atendimentos, len(registros))
+    inicio = time.perf_counter()
+    for _ in range(quantidade_atendimentos):
+        fila.remover_proximo()
+    tempo_atendimento = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    fila.ordenada()
+    tempo_listagem = time.perf_counter() - inicio
+
+    return {
+        'insercao_us': tempo_insercao / len(registros) * 1e6,
+        'listagem_ms': tempo_listagem * 1e3,
+        'atendimento_us': tempo_atendimento / max(quantidade_atendimentos, 1) * 1e6,
+    }
+
+
+def executar_benchmark(tamanhos: List[int], atendimentos: int, max_lista: int) -> None:
+    """Executa e imprime a comparação entre backends."""
+    print("📈 BENCHMARK DOS BACKENDS DE FILA")
+    print("=" * 72)
+    print(f"{'pacientes':>10} {'backend':>8} {'inserção (µs/op)':>18} "
+          f"{'listagem (ms)':>14} {'atendimento (µs/op)':>20}")
+    print("-" * 72)
+
+    for tamanho in tamanhos:
+        registros = gerar_registros(tamanho)
+        for nome in BACKENDS:
+            if nome == 'lista' and tamanho > max_lista:
+                print(f"{tamanho:>10} {nome:>8} {'(omitido: acima de --max-lista)':>54}")
+                continue
+            resultado = medir_backend(nome, registros, atendimentos)
+            print(f"{tamanho:>10} {nome:>8} {resultado['insercao_us']:>18.3f} "
+                  f"{resultado['listagem_ms']:>14.3f} {resultado['atendimento_us']:>20.3f}")
+        print("-" * 72)
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmark dos backends de fila")
+    parser.add_argument('--tamanhos', type=int, nargs='+',
+                        default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6])
+    parser.add_argument('--atendimentos', type=int, default=100,
+                        help="atendimentos medidos por tamanho")
+    parser.add_argument('--max-lista', type=int, default=10 ** 5,
+                        help="maior fila medida no backend lista (O(n log n) por atendimento)")
+    args = parser.parse_args()
+
+    executar_benchmark(args.tamanhos, args.atendimentos, args.max_lista)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark do fluxo de mudanças contra a consulta periódica da fila.
+N telas acompanham uma fila de tamanho estável enquanto uma thread gera
+mudanças (adições e atendimentos) a uma taxa fixa. Compara o uso de CPU do
+processo com as telas consultando a fila inteira (ordenar + serializar) a
+cada 1/taxa segundos e com as telas assinando o FluxoFila; a coluna sem
+telas é o custo das próprias mudanças (logs e métricas do gerenciador).
+
+Uso:
+    python benchmark_fluxo.py
+    python benchmark_fluxo.py --telas 100 --consultas-por-segundo 2 --duracao 5
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Callable, List
+
+from fluxo_fila import FluxoFila
+from triagem import Paciente
+from triagem_concorrente import GerenciadorTriagemConcorrente
+
+
+def preparar(fluxo: FluxoFila = None, tamanho: int = 500) -> GerenciadorTriagemConcorrente:
+    gerenciador = GerenciadorTriagemConcorrente(fluxo=fluxo)
+    agora = datetime.now()
+    gerenciador.adicionar_lote([Paciente._ja_validado(f"Paciente {i}", 40, i % 5 + 1, agora)
+                                for i in range(tamanho)])
+    return gerenciador
+
+
+def gerar_mudancas(gerenciador: GerenciadorTriagemConcorrente, taxa: float, parar: threading.Event) -> int:
+    """Alterna adição e atendimento a `taxa` mudanças por segundo; retorna quantas fez."""
+    intervalo = 1.0 / taxa
+    proxima = time.perf_counter()
+    mudancas = 0
+    while not parar.is_set():
+        if mudancas % 2:
+            gerenciador.atender_proximo()
+        else:
+            gerenciador.adicionar_lote([(f"Chegada {mudancas}", 40, mudancas % 5 + 1)])
+        mudancas += 1
+        proxima += intervalo
+        espera = proxima - time.perf_counter()
+        if espera > 0:
+            parar.wait(espera)
+    return mudancas
+
+
+def medir_cpu(telas: List[Callable[[threading.Event], None]], gerenciador: GerenciadorTriagemConcorrente,
+              taxa: float, duracao: float) -> float:
+    """Percentual de CPU do processo durante `duracao` segundos de carga."""
+    parar = threading.Event()
+    threads = [threading.Thread(target=tela, args=(parar,)) for tela in telas]
+    produtor = threading.Thread(target=gerar_mudancas, args=(gerenciador, taxa, parar))
+    cpu_inicio, relogio_inicio = time.process_time(), time.perf_counter()
+    for thread in threads + [produtor]:
+        thread.start()
+    time.sleep(duracao)
+    parar.set()
+    for thread in threads + [produtor]:
+        thread.join()
+    return (time.process_time() - cpu_inicio) / (time.perf_counter() - relogio_inicio) * 100
+
+
+def cenario_consulta(telas: int, taxa_consulta: float, taxa_mudancas: float, duracao: float) -> float:
+    gerenciador = preparar()
+
+    def tela(parar: threading.Event) -> None:
+        while not parar.wait(1.0 / taxa_consulta):
+            fila = gerenciador.obter_fila_ordenada()
+            json.dumps([{'nome': p.nome, 'idade': p.idade, 'urgencia': p.urgencia,
+                         'chegada': p.timestamp.isoformat()} for p in fila]).encode('utf-8')
+
+    return medir_cpu([tela] * telas, gerenciador, taxa_mudancas, duracao)
+
+
+def cenario_fluxo(telas: int, taxa_mudancas: float, duracao: float) -> float:
+    fluxo = FluxoFila()
+    gerenciador = preparar(fluxo)
+
+    def tela(parar: threading.Event) -> None:
+        recebido = 0
+        for quadro in fluxo.assinar(intervalo_ping=0.2):
+            recebido += len(quadro)  # o servidor só escreve estes bytes no socket
+            if parar.is_set():
+                break
+
+    try:
+        return medir_cpu([tela] * telas, gerenciador, taxa_mudancas, duracao)
+    finally:
+        fluxo.fechar()
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Fluxo de mudanças vs. consulta periódica da fila")
+    parser.add_argument('--telas', type=int, default=50)
+    parser.add_argument('--consultas-por-segundo', type=float, default=1.0)
+    parser.add_argument('--taxas', type=float, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--duracao', type=float, default=3.0)
+    args = parser.parse_args()
+
+    print("📈 BENCHMARK DO FLUXO DE MUDANÇAS DA FILA")
+    print("=" * 64)
+    print(f"Telas: {args.telas} | fila: ~500 pacientes | consulta: {args.consultas_por_segundo}/s por tela")
+    print(f"{'Mudanças/s':>12} | {'CPU sem telas':>14} | {'CPU consulta':>14} | {'CPU fluxo':>12}")
+    print("-" * 64)
+    with open(os.devnull, 'w') as nulo:
+        for taxa in args.taxas:
+            with redirect_stdout(nulo):
+                sem_telas = medir_cpu([], preparar(), taxa, args.duracao)
+                consulta = cenario_consulta(args.telas, args.consultas_por_segundo, taxa, args.duracao)
+                fluxo = cenario_fluxo(args.telas, taxa, args.duracao)
+            print(f"{taxa:>12.0f} | {sem_telas:13.1f}% | {consulta:13.1f}% | {fluxo:11.1f}%")
+    print("=" * 64)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark do histórico de atendimentos.
+Preenche o histórico com N atendimentos distribuídos em 90 dias e mede
+consultas por intervalo, paginação, busca por paciente e agregados,
+comparando com uma varredura linear da lista de atendimentos.
+
+Uso:
+    python benchmark_historico.py
+    python benchmark_historico.py --registros 2000000
+"""
+
+import argparse
+import gc
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from historico_pacientes import HistoricoAtendimentos
+from pacientes_colunares import datetime_para_ns
+from triagem import Paciente
+
+DIAS = 90
+
+
+def preencher(historico: HistoricoAtendimentos, quantidade: int, inicio: datetime) -> float:
+    """Registra `quantidade` atendimentos; retorna registros por segundo."""
+    gerador = random.Random(42)
+    passo = timedelta(days=DIAS) / quantidade
+    inicio_medicao = time.perf_counter()
+    for i in range(quantidade):
+        atendido_em = inicio + passo * i
+        paciente = Paciente._ja_validado(f"Paciente {i % 50000}", 40, gerador.randint(1, 5),
+                                         atendido_em - timedelta(minutes=30))
+        historico.registrar(paciente, atendido_em, gerador.uniform(60, 7200))
+    return quantidade / (time.perf_counter() - inicio_medicao)
+
+
+def medir_us(consulta: Callable[[], object], repeticoes: int) -> float:
+    """Tempo médio da consulta em microssegundos."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        consulta()
+    return (time.perf_counter() - inicio) / repeticoes * 1e6
+
+
+def executar_benchmark(quantidade: int) -> None:
+    """Executa e imprime os tempos de cada consulta."""
+    historico = HistoricoAtendimentos()
+    inicio = datetime(2024, 1, 1)
+    gc.disable()
+    try:
+        vazao = preencher(historico, quantidade, inicio)
+    finally:
+        gc.enable()
+    fim = inicio + timedelta(days=DIAS)
+    semana_passada = fim - timedelta(days=7)
+
+    def percorrer_paginas():
+        pagina = historico.consultar(inicio=semana_passada, urgencia=5, limite=500)
+        while pagina.cursor is not None:
+            pagina = historico.consultar(inicio=semana_passada, urgencia=5, apos=pagina.cursor, limite=500)
+
+    print("📈 BENCHMARK DO HISTÓRICO DE ATENDIMENTOS")
+    print("=" * 60)
+    print(f"Registros: {len(historico)} em {DIAS} dias | registro: {vazao:10.0f} atendimentos/s")
+    print("-" * 60)
+    consultas = [
+        ("urgência 5, última semana (1ª página)",
+         lambda: historico.consultar(inicio=semana_passada, urgencia=5), 1000),
+        ("página no meio (cursor)",
+         lambda: historico.consultar(urgencia=5, apos=quantidade // 2), 1000),
+        ("por paciente",
+         lambda: historico.por_paciente("paciente 123", limite=10), 1000),
+        ("agregados urgência 5", lambda: historico.agregados(5), 1000),
+        ("todas as páginas da semana (500/página)", percorrer_paginas, 3),
+    ]
+    for nome, consulta, repeticoes in consultas:
+        print(f"{nome:>42}: {medir_us(consulta, repeticoes):12.1f} µs")
+
+    # Referência: filtrar a lista inteira, como faria uma varredura sem índice
+    registros = [(historico._atendidos_ns[i], historico._pacientes.urgencias[i]) for i in range(len(historico))]
+    limite_ns = datetime_para_ns(semana_passada)
+    varredura = medir_us(lambda: [r for r in registros if r[1] == 5 and r[0] >= limite_ns][:50], 3)
+    print(f"{'varredura linear (mesma 1ª página)':>42}: {varredura:12.1f} µs")
+    print("=" * 60)
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmark do histórico de atendimentos")
+    parser.add_argument('--registros', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    executar_benchmark(args.registros)
+
+
+if __name__ == "__main__":
+    main()
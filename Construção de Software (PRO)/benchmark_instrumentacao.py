@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark do custo do decorator monitorar_performance.
+Mede o overhead por chamada em cada nível de instrumentação.
+
+Uso:
+    python benchmark_instrumentacao.py
+    python benchmark_instrumentacao.py --chamadas 50000 --amostragem 1000
+"""
+
+import argparse
+import time
+
+from monitor_sistema import NIVEIS_INSTRUMENTACAO, monitor, monitorar_performance
+
+
+def operacao_vazia(valor: int) -> int:
+    """Função trivial: o tempo medido é praticamente só o do decorator."""
+    return valor
+
+
+operacao_monitorada = monitorar_performance("benchmark")(operacao_vazia)
+
+
+def medir_ns_por_chamada(funcao, chamadas: int) -> float:
+    """Retorna o tempo médio por chamada em nanossegundos."""
+    inicio = time.perf_counter_ns()
+    for i in range(chamadas):
+        funcao(i)
+    return (time.perf_counter_ns() - inicio) / chamadas
+
+
+def executar_benchmark(chamadas: int, amostragem: int) -> None:
+    """Executa e imprime o overhead de cada nível."""
+    nivel_original = monitor.nivel_instrumentacao
+    amostragem_original = monitor.amostragem
+
+    print("📈 BENCHMARK DO DECORATOR monitorar_performance")
+    print("=" * 60)
+    base = medir_ns_por_chamada(operacao_vazia, chamadas)
+    print(f"{'sem decorator':>14}: {base:10.1f} ns/chamada")
+
+    try:
+        for nivel in NIVEIS_INSTRUMENTACAO:
+            monitor.configurar_instrumentacao(nivel, amostragem)
+            # O nível completo grava logs; menos chamadas bastam para a média
+            quantidade = chamadas if nivel != 'completo' else max(chamadas // 20, 1)
+            tempo = medir_ns_por_chamada(operacao_monitorada, quantidade)
+            monitor.descarregar()
+            print(f"{nivel:>14}: {tempo:10.1f} ns/chamada "
+                  f"(overhead {tempo - base:10.1f} ns)")
+    finally:
+        monitor.configurar_instrumentacao(nivel_original, amostragem_original)
+
+    print("=" * 60)
+    print(f"Amostragem no nível 'amostrado': 1 a cada {amostragem} chamadas")
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmark do decorator de monitoramento")
+    parser.add_argument('--chamadas', type=int, default=200000)
+    parser.add_argument('--amostragem', type=int, default=100)
+    args = parser.parse_args()
+
+    executar_benchmark(args.chamadas, args.amostragem)
+
+
+if __name__ == "__main__":
+    main()
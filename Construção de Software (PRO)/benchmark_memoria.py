@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória por paciente.
+Compara o dataclass original (com __dict__), o Paciente com __slots__
+e o armazenamento colunar PacienteArray.
+
+Uso:
+    python benchmark_memoria.py
+    python benchmark_memoria.py --pacientes 500000
+"""
+
+import argparse
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable
+
+from triagem import Paciente
+from pacientes_colunares import PacienteArray, datetime_para_ns
+
+
+@dataclass
+class PacienteOriginal:
+    """Réplica do Paciente antes do __slots__ (apenas para comparação)."""
+    nome: str
+    idade: int
+    urgencia: int
+    timestamp: datetime = field(default_factory=datetime.now)
+
+
+def medir_bytes(construir: Callable[[int], object], quantidade: int) -> int:
+    """Retorna os bytes alocados (e ainda vivos) para construir a coleção."""
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    colecao = construir(quantidade)
+    total = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del colecao
+    return total
+
+
+def _chegada(base: datetime, indice: int) -> datetime:
+    return base + timedelta(microseconds=indice)
+
+
+def construir_original(quantidade: int) -> list:
+    base = datetime.now()
+    return [PacienteOriginal(f"Paciente {i:07d}", i % 100, i % 5 + 1, _chegada(base, i))
+            for i in range(quantidade)]
+
+
+def construir_slots(quantidade: int) -> list:
+    base = datetime.now()
+    return [Paciente._ja_validado(f"Paciente {i:07d}", i % 100, i % 5 + 1, _chegada(base, i))
+            for i in range(quantidade)]
+
+
+def construir_colunar(quantidade: int) -> PacienteArray:
+    base_ns = datetime_para_ns(datetime.now())
+    armazenamento = PacienteArray()
+    for i in range(quantidade):
+        armazenamento.anexar(f"Paciente {i:07d}", i % 100, i % 5 + 1, base_ns + i * 1000)
+    return armazenamento
+
+
+def executar_benchmark(quantidade: int) -> None:
+    """Executa e imprime os bytes por paciente de cada representação."""
+    print("📈 BENCHMARK DE MEMÓRIA POR PACIENTE")
+    print("=" * 60)
+    print(f"Pacientes: {quantidade}")
+    print("-" * 60)
+
+    referencia = None
+    for nome, construir in (("dataclass original", construir_original),
+                            ("dataclass com slots", construir_slots),
+                            ("PacienteArray", construir_colunar)):
+        por_paciente = medir_bytes(construir, quantidade) / quantidade
+        referencia = referencia or por_paciente
+        print(f"{nome:>20}: {por_paciente:8.1f} bytes/paciente "
+              f"({por_paciente / referencia:6.1%} do original)")
+    print("=" * 60)
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmark de memória por paciente")
+    parser.add_argument('--pacientes', type=int, default=100000)
+    args = parser.parse_args()
+
+    executar_benchmark(args.pacientes)
+
+
+if __name__ == "__main__":
+    main()
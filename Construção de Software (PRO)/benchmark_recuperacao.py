@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark do diário da fila de triagem.
+Grava N eventos (adições e atendimentos) e mede o tempo de recuperação
+reproduzindo o diário inteiro e reproduzindo só o final após um snapshot.
+
+Uso:
+    python benchmark_recuperacao.py
+    python benchmark_recuperacao.py --eventos 200000 --lote 1
+"""
+
+import argparse
+import gc
+import os
+import random
+import shutil
+import tempfile
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict
+
+from diario_triagem import DiarioTriagem, GerenciadorTriagemDuravel
+from triagem import Paciente
+
+
+def gravar_eventos(diretorio: str, eventos: int, lote: int, fracao_snapshot: float) -> float:
+    """
+    Grava `eventos` eventos (~60% adições); com fracao_snapshot > 0, grava um
+    snapshot depois dessa fração dos eventos.
+
+    Returns:
+        Eventos gravados por segundo
+    """
+    aleatorio = random.Random(42)
+    base = datetime.now()
+    diario = DiarioTriagem(diretorio, lote_sincronizacao=lote)
+    aguardando: Dict[int, Paciente] = {}
+    ordem_chegada: deque = deque()
+    proximo_seq = 1
+    momento_snapshot = int(eventos * fracao_snapshot) if fracao_snapshot > 0 else -1
+
+    inicio = time.perf_counter()
+    for indice in range(eventos):
+        if indice == momento_snapshot:
+            diario.gravar_snapshot(aguardando.items(), proximo_seq)
+        if aguardando and aleatorio.random() < 0.4:
+            # Atende o mais antigo; para o diário só o seq importa
+            seq = ordem_chegada.popleft()
+            del aguardando[seq]
+            diario.registrar_remocao(seq)
+        else:
+            paciente = Paciente._ja_validado(f"Paciente {proximo_seq:07d}", 40,
+                                             aleatorio.randint(1, 5),
+                                             base + timedelta(microseconds=proximo_seq))
+            aguardando[proximo_seq] = paciente
+            ordem_chegada.append(proximo_seq)
+            diario.registrar_adicao(proximo_seq, paciente)
+            proximo_seq += 1
+    diario.fechar()
+    return eventos / (time.perf_counter() - inicio)
+
+
+def medir_recuperacao(diretorio: str):
+    """Retorna (segundos lendo o diário, segundos até o gerenciador pronto, eventos, pacientes)."""
+    gc.collect()
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        diario = DiarioTriagem(diretorio)
+        leitura = time.perf_counter() - inicio
+        eventos = diario.estado.eventos_reproduzidos
+        diario.fechar()
+
+        inicio = time.perf_counter()
+        gerenciador = GerenciadorTriagemDuravel(diretorio, intervalo_snapshot=0)
+        total = time.perf_counter() - inicio
+        pacientes = len(gerenciador)
+        gerenciador.fechar()
+    finally:
+        gc.enable()
+    return leitura, total, eventos, pacientes
+
+
+def tamanho_diretorio(diretorio: str) -> int:
+    return sum(os.path.getsize(os.path.join(diretorio, nome)) for nome in os.listdir(diretorio))
+
+
+def executar_benchmark(eventos: int, lote: int, fracao_snapshot: float) -> None:
+    """Executa e imprime gravação e recuperação com e sem snapshot."""
+    print("📈 BENCHMARK DO DIÁRIO DE TRIAGEM")
+    print("=" * 60)
+    print(f"Eventos: {eventos} | fsync a cada {lote} eventos")
+    print("-" * 60)
+
+    for nome, fracao in (("sem snapshot", 0.0), (f"snapshot em {fracao_snapshot:.0%}", fracao_snapshot)):
+        diretorio = tempfile.mkdtemp(prefix='diario_triagem_')
+        try:
+            vazao = gravar_eventos(diretorio, eventos, lote, fracao)
+            leitura, total, reproduzidos, pacientes = medir_recuperacao(diretorio)
+            print(f"{nome}:")
+            print(f"   gravação:    {vazao:12.0f} eventos/s, {tamanho_diretorio(diretorio) / 1e6:8.1f} MB em disco")
+            print(f"   recuperação: {leitura * 1000:10.1f} ms lendo {reproduzidos} eventos, "
+                  f"{total * 1000:10.1f} ms até a fila pronta ({pacientes} pacientes)")
+        finally:
+            shutil.rmtree(diretorio)
+    print("=" * 60)
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmark do diário de triagem")
+    parser.add_argument('--eventos', type=int, default=1_000_000)
+    parser.add_argument('--lote', type=int, default=1024,
+                        help="eventos por fsync (group commit)")
+    parser.add_argument('--snapshot', type=float, default=0.9,
+                        help="fração dos eventos após a qual gravar o snapshot")
+    args = parser.parse_args()
+
+    executar_benchmark(args.eventos, args.lote, args.snapshot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Teste de carga do serviço de reservas.
+Várias threads bloqueiam e confirmam horários disputados de uma agenda com
+N médicos; ao final confere que nenhum horário foi reservado duas vezes e
+que nenhum protocolo se repetiu. Mostra também quantas colisões o
+gerarProtocolo original (Math.random entre 9999 números) teria.
+
+Uso:
+    python benchmark_reservas.py
+    python benchmark_reservas.py --medicos 50 --pedidos 20000 --bloco 100
+"""
+
+import argparse
+import random
+import threading
+import time
+from datetime import date
+from typing import List
+
+from agenda import Agenda, ConflitoAgendamento, Medico
+from reservas import GeradorProtocolos, ServicoReservas
+
+
+def colisoes_protocolo_aleatorio(quantidade: int, semente: int = 42) -> int:
+    """Protocolos repetidos entre `quantidade` sorteados como em agendamento.js."""
+    gerador = random.Random(semente)
+    sorteados = [gerador.randint(1, 9999) for _ in range(quantidade)]
+    return quantidade - len(set(sorteados))
+
+
+def executar_rodada(medicos: int, threads: int, pedidos: int, bloco: int) -> None:
+    """Uma rodada de carga com `threads` clientes e `pedidos` pedidos por thread."""
+    agenda = Agenda(date(2025, 1, 6), 30)
+    for i in range(medicos):
+        agenda.adicionar_medico(Medico(str(i), f"Dr(a). {i}", "Clínico Geral"))
+    servico = ServicoReservas(agenda, gerador=GeradorProtocolos(tamanho_bloco=bloco))
+    horarios = [(medico_id, horario) for medico_id in agenda.medicos
+                for dia in agenda.dias[:5] for horario in agenda.horarios_livres(medico_id, dia)]
+
+    confirmados: List[List] = [[] for _ in range(threads)]
+    conflitos = [0] * threads
+    barreira = threading.Barrier(threads + 1)
+
+    def cliente(posicao: int) -> None:
+        gerador = random.Random(posicao)
+        barreira.wait()
+        for _ in range(pedidos):
+            medico_id, horario = gerador.choice(horarios)
+            try:
+                bloqueio = servico.bloquear(medico_id, horario, "Paciente")
+                confirmados[posicao].append(servico.confirmar(bloqueio))
+            except ConflitoAgendamento:
+                conflitos[posicao] += 1
+
+    trabalhadores = [threading.Thread(target=cliente, args=(i,)) for i in range(threads)]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    barreira.wait()
+    inicio = time.perf_counter()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    tempo = time.perf_counter() - inicio
+
+    todos = [a for lista in confirmados for a in lista]
+    assert len({(a.medico_id, a.inicio) for a in todos}) == len(todos), "Reserva dupla!"
+    assert len({a.protocolo for a in todos}) == len(todos), "Protocolo repetido!"
+    total = threads * pedidos
+    print(f"{threads:>8} | {total / tempo:12.0f} | {len(todos):>11} | {sum(conflitos):>9} | "
+          f"{len(horarios):>8}")
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço de reservas")
+    parser.add_argument('--medicos', type=int, default=20)
+    parser.add_argument('--pedidos', type=int, default=5000, help="Pedidos por thread")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--bloco', type=int, default=1000)
+    args = parser.parse_args()
+
+    print("📈 TESTE DE CARGA DO SERVIÇO DE RESERVAS")
+    print("=" * 60)
+    print(f"{'Threads':>8} | {'pedidos/s':>12} | {'confirmados':>11} | {'conflitos':>9} | {'horários':>8}")
+    print("-" * 60)
+    for threads in args.threads:
+        executar_rodada(args.medicos, threads, args.pedidos, args.bloco)
+    print("-" * 60)
+    for quantidade in (100, 1000, 10000):
+        print(f"Protocolo aleatório (agendamento.js), {quantidade:>5} reservas: "
+              f"{colisoes_protocolo_aleatorio(quantidade):>5} colisões")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Teste de carga do servidor HTTP da triagem.
+Sobe o ServidorAPI em localhost (ou usa --url de um servidor já rodando)
+e dispara requisições de várias threads clientes, cada uma com sua conexão
+persistente, reportando requisições por segundo, p50 e p99 por cenário.
+
+Uso:
+    python benchmark_servidor.py
+    python benchmark_servidor.py --clientes 16 --requisicoes 2000
+    python benchmark_servidor.py --url http://127.0.0.1:8080
+"""
+
+import argparse
+import http.client
+import json
+import os
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from agenda import HORARIOS_EXPEDIENTE
+from servidor_api import ServidorAPI
+
+Requisicao = Tuple[str, str, Optional[bytes], dict]
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil p (0-100) por posição na lista ordenada."""
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+def executar_cenario(host: str, porta: int, nome: str, gerar: Callable[[int, int], Requisicao],
+                     clientes: int, requisicoes: int, keep_alive: bool = True,
+                     itens_por_requisicao: int = 1) -> str:
+    """Roda `requisicoes` por cliente; retorna a linha com vazão e latências."""
+    latencias: List[List[float]] = [[] for _ in range(clientes)]
+    erros = [0] * clientes
+    barreira = threading.Barrier(clientes + 1)
+
+    def cliente(posicao: int) -> None:
+        conexao = http.client.HTTPConnection(host, porta, timeout=30)
+        barreira.wait()
+        for i in range(requisicoes):
+            metodo, caminho, corpo, cabecalhos = gerar(posicao, i)
+            inicio = time.perf_counter()
+            if not keep_alive:
+                cabecalhos = dict(cabecalhos, Connection='close')
+            conexao.request(metodo, caminho, body=corpo, headers=cabecalhos)
+            resposta = conexao.getresponse()
+            resposta.read()
+            latencias[posicao].append(time.perf_counter() - inicio)
+            if resposta.status >= 400:
+                erros[posicao] += 1
+            if not keep_alive:
+                conexao.close()
+        conexao.close()
+
+    threads = [threading.Thread(target=cliente, args=(i,)) for i in range(clientes)]
+    for thread in threads:
+        thread.start()
+    barreira.wait()
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    tempo = time.perf_counter() - inicio
+
+    todas = [latencia for lista in latencias for latencia in lista]
+    vazao = len(todas) / tempo
+    linha = (f"{nome:>34} | {vazao:9.0f} req/s | p50 {percentil(todas, 50) * 1e3:6.2f} ms | "
+             f"p99 {percentil(todas, 99) * 1e3:6.2f} ms")
+    if itens_por_requisicao > 1:
+        linha += f" | {vazao * itens_por_requisicao:9.0f} itens/s"
+    if sum(erros):
+        linha += f" | {sum(erros)} erros"
+    return linha
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Teste de carga do servidor HTTP da triagem")
+    parser.add_argument('--url', help="Servidor já rodando (padrão: sobe um em localhost)")
+    parser.add_argument('--clientes', type=int, default=8)
+    parser.add_argument('--requisicoes', type=int, default=1000, help="Requisições por cliente")
+    parser.add_argument('--fila', type=int, default=200, help="Pacientes na fila durante as leituras")
+    parser.add_argument('--lote', type=int, default=50)
+    args = parser.parse_args()
+
+    servidor = None
+    if args.url:
+        partes = urlsplit(args.url)
+        host, porta = partes.hostname, partes.port or 80
+    else:
+        servidor = ServidorAPI(porta=0)
+        servidor.iniciar()
+        host, porta = servidor.endereco
+
+    json_cabecalhos = {'Content-Type': 'application/json'}
+
+    def paciente(posicao: int, i: int) -> Requisicao:
+        corpo = json.dumps({'nome': f"Paciente {posicao}-{i}", 'idade': 40, 'urgencia': i % 5 + 1})
+        return 'POST', '/triage/patients', corpo.encode(), json_cabecalhos
+
+    def lote(posicao: int, i: int) -> Requisicao:
+        linhas = [[f"Paciente {posicao}-{i}-{j}", 40, j % 5 + 1] for j in range(args.lote)]
+        return 'POST', '/triage/patients', json.dumps(linhas).encode(), json_cabecalhos
+
+    def atender(posicao: int, i: int) -> Requisicao:
+        return 'POST', '/triage/next', None, {}
+
+    def listar(posicao: int, i: int) -> Requisicao:
+        return 'GET', '/triage/queue', None, {}
+
+    etag = {}
+
+    def listar_com_etag(posicao: int, i: int) -> Requisicao:
+        return 'GET', '/triage/queue', None, {'If-None-Match': etag.get('atual', '')}
+
+    # Cada cliente reserva horários distintos dos demais (médicos 1-4 da agenda padrão)
+    dias_uteis = [dia for dia in (date.today() + timedelta(days=k) for k in range(1, 90)) if dia.weekday() < 5]
+    clientes_por_medico = -(-args.clientes // 4)
+
+    def agendar(posicao: int, i: int) -> Requisicao:
+        posicao_horario = i * clientes_por_medico + posicao // 4
+        dia = dias_uteis[posicao_horario // len(HORARIOS_EXPEDIENTE) % len(dias_uteis)]
+        horario = HORARIOS_EXPEDIENTE[posicao_horario % len(HORARIOS_EXPEDIENTE)]
+        corpo = {'doctorId': str(posicao % 4 + 1), 'dateTime': f"{dia.isoformat()}T{horario}:00",
+                 'patientName': 'Maria'}
+        return 'POST', '/appointments', json.dumps(corpo).encode(), json_cabecalhos
+
+    print("📈 TESTE DE CARGA DO SERVIDOR HTTP")
+    print("=" * 100)
+    print(f"Servidor: http://{host}:{porta} | clientes: {args.clientes} | "
+          f"requisições por cliente: {args.requisicoes}")
+    print("-" * 100)
+
+    # Os alertas de tamanho de fila do monitor vão para o stdout: descartados durante a carga
+    def rodar(nome: str, gerar: Callable[[int, int], Requisicao], requisicoes: int, **opcoes) -> None:
+        with open(os.devnull, 'w') as nulo, redirect_stdout(nulo):
+            linha = executar_cenario(host, porta, nome, gerar, args.clientes, requisicoes, **opcoes)
+        print(linha)
+
+    rodar("POST /triage/patients (1)", paciente, args.requisicoes)
+    rodar(f"POST /triage/patients (lote {args.lote})", lote, max(args.requisicoes // 10, 1),
+          itens_por_requisicao=args.lote)
+    rodar("POST /triage/next", atender, args.requisicoes)
+
+    # Leituras: fila com tamanho fixo, como os painéis da sala de espera
+    conexao = http.client.HTTPConnection(host, porta)
+    conexao.request('POST', '/triage/next', json.dumps({'quantidade': 10 ** 9}).encode(), json_cabecalhos)
+    conexao.getresponse().read()
+    linhas = [[f"Paciente {i}", 40, i % 5 + 1] for i in range(args.fila)]
+    conexao.request('POST', '/triage/patients', json.dumps(linhas).encode(), json_cabecalhos)
+    conexao.getresponse().read()
+    conexao.request('GET', '/triage/queue')
+    resposta = conexao.getresponse()
+    resposta.read()
+    etag['atual'] = resposta.getheader('ETag') or ''
+    conexao.close()
+
+    rodar(f"GET /triage/queue ({args.fila} pac.)", listar, args.requisicoes)
+    rodar("GET /triage/queue (ETag -> 304)", listar_com_etag, args.requisicoes)
+    rodar("GET /triage/queue (sem keep-alive)", listar, args.requisicoes, keep_alive=False)
+    rodar("POST /appointments", agendar, args.requisicoes // 2)
+    print("=" * 100)
+
+    if servidor is not None:
+        servidor.parar()
+
+
+if __name__ == "__main__":
+    main()
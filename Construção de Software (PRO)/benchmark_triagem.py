@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Benchmarks do núcleo da triagem com baselines para detectar regressões.
+Mede adicionar_paciente, atender_proximo, obter_fila_ordenada,
+ordenar_por_prioridade, a criação de Paciente e monitor.registrar_metrica
+em vários tamanhos de fila, com e sem monitoramento, e grava os resultados
+em JSON. No modo de comparação, cada caso é confrontado com uma baseline e
+o script termina com código 1 se algum ficar mais lento que o limite.
+
+Uso:
+    python benchmark_triagem.py
+    python benchmark_triagem.py --salvar baseline.json
+    python benchmark_triagem.py --comparar baseline.json --limite 0.15
+    python benchmark_triagem.py --tamanhos 100 10000 --casos adicionar_paciente atender_proximo
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import monitor_sistema
+from monitor_sistema import monitor
+from triagem import GerenciadorTriagem, Paciente, ordenar_por_prioridade
+
+TAMANHOS_PADRAO = (100, 1000, 10000)
+MODOS = ('sem_monitoramento', 'com_monitoramento')  # o modo silencioso roda antes dos logs
+LIMITE_REGRESSAO = 0.10  # 10% mais lento que a baseline
+OPERACOES_PADRAO = 1000
+REPETICOES_PADRAO = 5
+
+_base = datetime(2024, 1, 1, 8, 0)
+
+
+def _pacientes(quantidade: int, inicio: int = 0) -> List[Paciente]:
+    """Pacientes já validados, com urgências e chegadas variadas."""
+    return [Paciente._ja_validado(f"Paciente {i}", 40, i % 5 + 1, _base + timedelta(seconds=i))
+            for i in range(inicio, inicio + quantidade)]
+
+
+def _gerenciador(tamanho: int) -> GerenciadorTriagem:
+    gerenciador = GerenciadorTriagem()
+    gerenciador.adicionar_lote(_pacientes(tamanho))
+    return gerenciador
+
+
+# Cada caso recebe (tamanho da fila, operações), prepara os dados e retorna a
+# função medida, que executa as operações e retorna o tempo total em ns.
+
+def _cronometrar(operacao: Callable[[], Any]) -> Callable[[], int]:
+    def medida() -> int:
+        inicio = time.perf_counter_ns()
+        operacao()
+        return time.perf_counter_ns() - inicio
+    return medida
+
+
+def caso_criar_paciente(tamanho: Optional[int], operacoes: int) -> Callable[[], int]:
+    """Construção de Paciente com validação e log (independe da fila)."""
+    def operacao() -> None:
+        for i in range(operacoes):
+            Paciente(f"Paciente {i}", 40, i % 5 + 1, _base)
+    return _cronometrar(operacao)
+
+
+def caso_adicionar_paciente(tamanho: int, operacoes: int) -> Callable[[], int]:
+    """Inserções individuais em uma fila com `tamanho` pacientes."""
+    gerenciador = _gerenciador(tamanho)
+    novos = _pacientes(operacoes, tamanho)
+
+    def operacao() -> None:
+        for paciente in novos:
+            gerenciador.adicionar_paciente(paciente)
+    return _cronometrar(operacao)
+
+
+def caso_atender_proximo(tamanho: int, operacoes: int) -> Callable[[], int]:
+    """Atendimentos até restarem `tamanho` pacientes na fila."""
+    gerenciador = _gerenciador(tamanho + operacoes)
+
+    def operacao() -> None:
+        for _ in range(operacoes):
+            gerenciador.atender_proximo()
+    return _cronometrar(operacao)
+
+
+def caso_obter_fila_ordenada(tamanho: int, operacoes: int) -> Callable[[], int]:
+    """Fila ordenada logo após uma mudança (sem o snapshot reaproveitado); a mudança não é medida."""
+    gerenciador = _gerenciador(tamanho)
+    gerenciador.obter_fila_ordenada()
+    novos = _pacientes(operacoes, tamanho)
+
+    def medida() -> int:
+        total = 0
+        for paciente in novos:
+            gerenciador.adicionar_paciente(paciente)
+            gerenciador.atender_proximo()
+            inicio = time.perf_counter_ns()
+            gerenciador.obter_fila_ordenada()
+            total += time.perf_counter_ns() - inicio
+        return total
+    return medida
+
+
+def caso_ordenar_por_prioridade(tamanho: int, operacoes: int) -> Callable[[], int]:
+    """Ordenação completa de uma lista embaralhada com `tamanho` pacientes."""
+    pacientes = _pacientes(tamanho)
+    random.Random(tamanho).shuffle(pacientes)
+
+    def operacao() -> None:
+        for _ in range(operacoes):
+            ordenar_por_prioridade(pacientes)
+    return _cronometrar(operacao)
+
+
+def caso_registrar_metrica(tamanho: Optional[int], operacoes: int) -> Callable[[], int]:
+    """Uma métrica de tempo (série, histograma e log; independe da fila)."""
+    registrar = monitor.registrar_metrica
+
+    def operacao() -> None:
+        for i in range(operacoes):
+            registrar("tempo_espera", i * 0.5, "atendimento", {'urgencia': i % 5 + 1})
+    return _cronometrar(operacao)
+
+
+# nome: (função, depende do tamanho da fila, custo por operação proporcional ao tamanho)
+CASOS: Dict[str, Tuple[Callable[[Optional[int], int], Callable[[], int]], bool, bool]] = {
+    'criar_paciente': (caso_criar_paciente, False, False),
+    'adicionar_paciente': (caso_adicionar_paciente, True, False),
+    'atender_proximo': (caso_atender_proximo, True, False),
+    'obter_fila_ordenada': (caso_obter_fila_ordenada, True, True),
+    'ordenar_por_prioridade': (caso_ordenar_por_prioridade, True, True),
+    'registrar_metrica': (caso_registrar_metrica, False, False),
+}
+
+
+@contextmanager
+def modo_monitoramento(modo: str) -> Iterator[None]:
+    """
+    Ativa um modo de medição e restaura o monitor ao sair.
+
+    'com_monitoramento' usa a instrumentação completa; 'sem_monitoramento'
+    desliga o decorator e descarta os logs antes de formatá-los. Contadores
+    e séries de métricas continuam sendo atualizados nos dois modos, pois
+    fazem parte das próprias operações.
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo inválido: {modo}")
+    nivel, amostragem = monitor.nivel_instrumentacao, monitor.amostragem
+    desativacao = logging.root.manager.disable
+    try:
+        if modo == 'com_monitoramento':
+            monitor.configurar_instrumentacao('completo')
+        else:
+            monitor.configurar_instrumentacao('desligado')
+            logging.disable(logging.CRITICAL)
+        yield
+    finally:
+        logging.disable(desativacao)
+        monitor.configurar_instrumentacao(nivel, amostragem)
+
+
+def chave_resultado(caso: str, modo: str, tamanho: Optional[int]) -> str:
+    """Identificador de um resultado, ex.: 'adicionar_paciente/n=1000/sem_monitoramento'."""
+    if tamanho is None:
+        return f"{caso}/{modo}"
+    return f"{caso}/n={tamanho}/{modo}"
+
+
+def medir(caso: Callable[[Optional[int], int], Callable[[], int]], tamanho: Optional[int],
+          operacoes: int, repeticoes: int) -> Tuple[float, float]:
+    """
+    (melhor, mediana) dos ns por operação em `repeticoes` execuções.
+
+    Como no timeit, a comparação usa a melhor execução: interferências
+    externas (outros processos, a thread de logs) só deixam o tempo maior,
+    e o mínimo varia bem menos entre execuções do que a média ou a mediana.
+
+    A preparação de cada execução fica fora da medição, assim como os logs
+    que ela gerou (gravados antes de começar); a coleta de lixo fica
+    desligada durante a medição.
+    """
+    amostras = []
+    for _ in range(repeticoes):
+        medida = caso(tamanho, operacoes)
+        monitor.descarregar()
+        gc.collect()
+        gc.disable()
+        try:
+            total = medida()
+        finally:
+            gc.enable()
+        monitor.descarregar()
+        amostras.append(total / operacoes)
+    return min(amostras), statistics.median(amostras)
+
+
+def executar(tamanhos: Sequence[int] = TAMANHOS_PADRAO, casos: Optional[Sequence[str]] = None,
+             modos: Sequence[str] = MODOS, operacoes: int = OPERACOES_PADRAO,
+             repeticoes: int = REPETICOES_PADRAO,
+             progresso: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Executa os casos e retorna o documento de resultados (o mesmo formato da baseline).
+
+    Args:
+        tamanhos: Tamanhos de fila dos casos que dependem da fila
+        casos: Nomes em CASOS (padrão: todos)
+        modos: Subconjunto de MODOS
+        operacoes: Operações por repetição; nos casos de custo O(n) são
+            reduzidas proporcionalmente acima de 100 pacientes
+        repeticoes: Execuções de cada caso; vale a melhor
+        progresso: Chamado com (chave, resultado) após cada caso
+
+    Returns:
+        {'metadados': {...}, 'resultados': {chave: {'ns_por_op', 'mediana_ns_por_op', 'operacoes'}}}
+    """
+    casos = list(CASOS) if casos is None else list(casos)
+    desconhecidos = [caso for caso in casos if caso not in CASOS]
+    if desconhecidos:
+        raise ValueError(f"Casos desconhecidos: {', '.join(desconhecidos)}")
+
+    resultados: Dict[str, Dict[str, Any]] = {}
+    # Alertas de tamanho de fila do monitor vão para o stdout: descartados durante a medição
+    with open(os.devnull, 'w') as nulo:
+        for modo in modos:
+            with modo_monitoramento(modo):
+                for caso in casos:
+                    funcao, usa_tamanho, custo_linear = CASOS[caso]
+                    for tamanho in (tamanhos if usa_tamanho else [None]):
+                        quantidade = operacoes
+                        if custo_linear and tamanho > 100:
+                            quantidade = max(50, operacoes * 100 // tamanho)
+                        with redirect_stdout(nulo):
+                            melhor, mediana = medir(funcao, tamanho, quantidade, repeticoes)
+                        chave = chave_resultado(caso, modo, tamanho)
+                        resultados[chave] = {'ns_por_op': round(melhor, 1), 'mediana_ns_por_op': round(mediana, 1),
+                                             'operacoes': quantidade}
+                        if progresso is not None:
+                            progresso(chave, resultados[chave])
+
+    return {
+        'metadados': {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'implementacao': platform.python_implementation(),
+            'plataforma': platform.platform(),
+            'repeticoes': repeticoes,
+            'operacoes': operacoes,
+            'tamanhos': list(tamanhos),
+        },
+        'resultados': resultados,
+    }
+
+
+def salvar(documento: Dict[str, Any], caminho: str) -> None:
+    """Grava os resultados como baseline JSON."""
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(documento, arquivo, ensure_ascii=False, indent=2)
+        arquivo.write('\n')
+
+
+def carregar(caminho: str) -> Dict[str, Any]:
+    """Lê uma baseline gravada por salvar()."""
+    with open(caminho, encoding='utf-8') as arquivo:
+        documento = json.load(arquivo)
+    if 'resultados' not in documento:
+        raise ValueError(f"Arquivo de baseline inválido: {caminho}")
+    return documento
+
+
+def comparar(baseline: Dict[str, Any], atual: Dict[str, Any],
+             limite: float = LIMITE_REGRESSAO) -> List[Dict[str, Any]]:
+    """
+    Compara os resultados atuais com a baseline, caso a caso.
+
+    Args:
+        baseline: Documento de resultados de referência
+        atual: Documento de resultados da execução atual
+        limite: Variação relativa tolerada (0.10 = até 10% mais lento)
+
+    Returns:
+        Uma linha por caso executado agora, com 'chave', 'baseline', 'atual',
+        'variacao' (relativa, None sem baseline) e 'situacao': 'regressão',
+        'melhora', 'estável' ou 'novo'
+    """
+    if limite < 0:
+        raise ValueError("Limite deve ser não negativo")
+    anteriores = baseline['resultados']
+    linhas = []
+    for chave, resultado in atual['resultados'].items():
+        valor = resultado['ns_por_op']
+        anterior = anteriores.get(chave)
+        if anterior is None:
+            linhas.append({'chave': chave, 'baseline': None, 'atual': valor,
+                           'variacao': None, 'situacao': 'novo'})
+            continue
+        referencia = anterior['ns_por_op']
+        variacao = valor / referencia - 1 if referencia else 0.0
+        if variacao > limite:
+            situacao = 'regressão'
+        elif variacao < -limite:
+            situacao = 'melhora'
+        else:
+            situacao = 'estável'
+        linhas.append({'chave': chave, 'baseline': referencia, 'atual': valor,
+                       'variacao': variacao, 'situacao': situacao})
+    return linhas
+
+
+def _formatar_ns(valor: float) -> str:
+    if valor >= 1e6:
+        return f"{valor / 1e6:8.2f} ms"
+    if valor >= 1e3:
+        return f"{valor / 1e3:8.2f} µs"
+    return f"{valor:8.1f} ns"
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Benchmarks do núcleo da triagem com baselines")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=list(TAMANHOS_PADRAO))
+    parser.add_argument('--casos', nargs='+', choices=list(CASOS))
+    parser.add_argument('--modos', nargs='+', choices=MODOS, default=list(MODOS))
+    parser.add_argument('--operacoes', type=int, default=OPERACOES_PADRAO)
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_PADRAO)
+    parser.add_argument('--salvar', metavar='ARQUIVO', help="Grava os resultados como baseline JSON")
+    parser.add_argument('--comparar', metavar='ARQUIVO', help="Compara com uma baseline gravada")
+    parser.add_argument('--limite', type=float, default=LIMITE_REGRESSAO,
+                        help="Variação tolerada antes de acusar regressão (padrão: 0.10)")
+    parser.add_argument('--diretorio-logs', help="Onde o monitor grava os logs (padrão: diretório temporário)")
+    args = parser.parse_args()
+
+    baseline = carregar(args.comparar) if args.comparar else None
+
+    print("📈 BENCHMARKS DO NÚCLEO DA TRIAGEM")
+    print("=" * 72)
+    print(f"Tamanhos: {', '.join(map(str, args.tamanhos))} | repetições: {args.repeticoes} "
+          f"(vale a melhor) | Python {platform.python_version()}")
+    print("-" * 72)
+
+    def progresso(chave: str, resultado: Dict[str, Any]) -> None:
+        print(f"{chave:>52} | {_formatar_ns(resultado['ns_por_op'])}/op "
+              f"(mediana {_formatar_ns(resultado['mediana_ns_por_op']).strip()})")
+
+    with tempfile.TemporaryDirectory() as temporario:
+        monitor_sistema.configurar(diretorio_logs=args.diretorio_logs or temporario)
+        try:
+            documento = executar(args.tamanhos, args.casos, args.modos, args.operacoes,
+                                 args.repeticoes, progresso)
+        finally:
+            monitor_sistema.encerrar()
+    print("=" * 72)
+
+    if args.salvar:
+        salvar(documento, args.salvar)
+        print(f"💾 Baseline gravada em {args.salvar}")
+
+    if baseline is None:
+        return
+
+    print(f"\n📊 COMPARAÇÃO COM {args.comparar} (limite {args.limite:.0%})")
+    print("=" * 72)
+    if baseline.get('metadados', {}).get('python') != documento['metadados']['python']:
+        print(f"⚠️  Baseline gravada com Python {baseline.get('metadados', {}).get('python')}")
+    linhas = comparar(baseline, documento, args.limite)
+    for linha in linhas:
+        if linha['variacao'] is None:
+            print(f"{linha['chave']:>52} | {'sem baseline':>12}")
+            continue
+        marca = {'regressão': '❌', 'melhora': '✅'}.get(linha['situacao'], '  ')
+        print(f"{linha['chave']:>52} | {linha['variacao']:+11.1%} {marca} {linha['situacao']}")
+    regressoes = [linha for linha in linhas if linha['situacao'] == 'regressão']
+    print("=" * 72)
+    if regressoes:
+        print(f"❌ {len(regressoes)} regressão(ões) acima de {args.limite:.0%}")
+        sys.exit(1)
+    print("✅ Nenhuma regressão acima do limite")
+
+
+if __name__ == "__main__":
+    main()
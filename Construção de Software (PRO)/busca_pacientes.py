@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Índice de busca de pacientes por nome.
+Busca por prefixo sem diferenciar acentos e maiúsculas ("joao sil" encontra
+"João Silva") e busca tolerante a erros de digitação ("jaoa" encontra "João").
+
+Uso:
+    indice = IndiceNomes()
+    gerenciador = GerenciadorTriagem(indice_nomes=indice)
+    indice.buscar("joão si", k=10)
+"""
+
+import bisect
+import heapq
+import threading
+import unicodedata
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple
+
+K_PADRAO = 10
+# Termos somados, no máximo, para escolher o termo mais seletivo de uma consulta
+PASSOS_CONTAGEM = 64
+
+
+def normalizar_nome(texto: str) -> str:
+    """Remove acentos, ignora maiúsculas e espaços repetidos: ' João  DA Silva' -> 'joao da silva'."""
+    decomposto = unicodedata.normalize('NFKD', texto)
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.casefold().split())
+
+
+def distancia_edicao(a: str, b: str, limite: int) -> int:
+    """
+    Distância de edição com transposição de vizinhos (OSA), interrompida cedo.
+
+    Returns:
+        A distância, ou `limite + 1` se ela ultrapassar `limite`
+    """
+    if abs(len(a) - len(b)) > limite:
+        return limite + 1
+    anterior2: List[int] = []
+    anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        atual = [i] + [0] * len(b)
+        menor = i
+        for j in range(1, len(b) + 1):
+            custo = 0 if a[i - 1] == b[j - 1] else 1
+            valor = min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + custo)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                valor = min(valor, anterior2[j - 2] + 1)
+            atual[j] = valor
+            menor = min(menor, valor)
+        if menor > limite:
+            return limite + 1
+        anterior2, anterior = anterior, atual
+    return min(anterior[-1], limite + 1)
+
+
+def _variantes_remocao(palavra: str, distancia: int) -> Set[str]:
+    """A palavra e todas as formas com até `distancia` letras removidas."""
+    variantes = {palavra}
+    fronteira = {palavra}
+    for _ in range(distancia):
+        fronteira = {p[:i] + p[i + 1:] for p in fronteira for i in range(len(p))}
+        variantes |= fronteira
+    return variantes
+
+
+class IndiceNomes:
+    """
+    Índice incremental de nomes de pacientes.
+
+    Prefixo: os termos distintos ficam numa lista ordenada; um prefixo é um
+    intervalo contíguo dela (busca binária) e cada termo aponta para os ids
+    dos pacientes, em ordem de cadastro. O top-k para após k resultados;
+    se outro termo da consulta tem menos pacientes, a busca parte dele.
+
+    Erros de digitação: cada termo distinto é indexado por todas as formas
+    obtidas removendo até `distancia_maxima` letras (symmetric delete). Uma
+    consulta gera as próprias remoções e só compara, por distância de
+    edição, os poucos termos que compartilham alguma forma.
+
+    É um cadastro: pacientes atendidos continuam pesquisáveis.
+    """
+
+    def __init__(self, distancia_maxima: int = 1):
+        """
+        Args:
+            distancia_maxima: Erros de digitação tolerados por termo
+
+        Raises:
+            ValueError: Se a distância for negativa
+        """
+        if distancia_maxima < 0:
+            raise ValueError("Distância máxima não pode ser negativa")
+        self.distancia_maxima = distancia_maxima
+        self._pacientes: List[Any] = []
+        self._termos_por_id: List[Tuple[str, ...]] = []
+        self._ids_por_termo: Dict[str, array] = {}
+        self._termos_ordenados: List[str] = []
+        self._termos_por_variante: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pacientes)
+
+    def adicionar(self, paciente: Any) -> int:
+        """
+        Indexa um paciente pelo nome.
+
+        Returns:
+            Id do paciente no índice
+        """
+        with self._lock:
+            return self._indexar([paciente])
+
+    def adicionar_varios(self, pacientes: Iterable[Any]) -> None:
+        """Indexa vários pacientes; os termos novos entram na lista ordenada de uma vez."""
+        pacientes = list(pacientes)
+        if pacientes:
+            with self._lock:
+                self._indexar(pacientes)
+
+    def buscar_prefixo(self, consulta: str, k: int = K_PADRAO) -> List[Any]:
+        """
+        Pacientes cujo nome tem, para cada termo da consulta, um termo que começa com ele.
+
+        Resultados em ordem alfabética do termo mais longo da consulta e,
+        dentro dele, em ordem de cadastro.
+        """
+        termos = normalizar_nome(consulta).split()
+        if not termos or k < 1:
+            return []
+        principal = max(termos, key=len)
+        outros = list(termos)
+        outros.remove(principal)
+        filtros = [lambda termos_paciente, prefixo=prefixo: any(t.startswith(prefixo) for t in termos_paciente)
+                   for prefixo in outros]
+        with self._lock:
+            # Termo único: a varredura para nos k primeiros, sem contar nada
+            seletivo = self._prefixo_mais_seletivo(termos, principal) if outros else principal
+            if seletivo == principal:
+                return self._filtrar(self._ids_prefixo(principal), filtros, k)
+            # Um termo secundário tem menos pacientes: parte só deles (sem varrer o
+            # intervalo do principal) e ordena como a varredura do principal faria
+            candidatos = []
+            for id_paciente in set(self._ids_prefixo(seletivo)):
+                termos_paciente = self._termos_por_id[id_paciente]
+                primeiro = min((t for t in termos_paciente if t.startswith(principal)), default=None)
+                if primeiro is not None and all(filtro(termos_paciente) for filtro in filtros):
+                    candidatos.append((primeiro, id_paciente))
+            return [self._pacientes[id_paciente] for _, id_paciente in heapq.nsmallest(k, candidatos)]
+
+    def buscar_aproximado(self, consulta: str, k: int = K_PADRAO) -> List[Any]:
+        """
+        Pacientes cujo nome contém cada termo da consulta com até `distancia_maxima` erros.
+
+        Resultados ordenados pela distância no termo mais seletivo da consulta.
+        """
+        termos = normalizar_nome(consulta).split()
+        if not termos or k < 1:
+            return []
+        with self._lock:
+            semelhantes = [self._termos_semelhantes(termo) for termo in termos]
+            # Percorre o termo com menos pacientes; os demais viram testes de pertinência
+            principal = min(semelhantes, key=lambda lista: sum(len(self._ids_por_termo[t]) for _, t in lista))
+            conjuntos = [{termo for _, termo in lista} for lista in semelhantes if lista is not principal]
+            filtros = [lambda termos_paciente, conjunto=conjunto: any(t in conjunto for t in termos_paciente)
+                       for conjunto in conjuntos]
+            ids = (id_paciente for _, termo in principal for id_paciente in self._ids_por_termo[termo])
+            return self._filtrar(ids, filtros, k)
+
+    def buscar(self, consulta: str, k: int = K_PADRAO) -> List[Any]:
+        """Busca por prefixo, completada pela busca aproximada se vierem menos de k resultados."""
+        resultado = self.buscar_prefixo(consulta, k)
+        if len(resultado) < k:
+            encontrados = {id(paciente) for paciente in resultado}
+            for paciente in self.buscar_aproximado(consulta, k):
+                if id(paciente) not in encontrados and len(resultado) < k:
+                    resultado.append(paciente)
+        return resultado
+
+    def _indexar(self, pacientes: List[Any]) -> int:
+        """Indexa os pacientes (chamar com o lock); retorna o id do último."""
+        novos = []
+        for paciente in pacientes:
+            termos = tuple(dict.fromkeys(normalizar_nome(paciente.nome).split()))
+            id_paciente = len(self._pacientes)
+            self._pacientes.append(paciente)
+            self._termos_por_id.append(termos)
+            for termo in termos:
+                ids = self._ids_por_termo.get(termo)
+                if ids is None:
+                    ids = self._ids_por_termo[termo] = array('q')
+                    novos.append(termo)
+                    for variante in _variantes_remocao(termo, self.distancia_maxima):
+                        self._termos_por_variante.setdefault(variante, []).append(termo)
+                ids.append(id_paciente)
+        if len(novos) == 1:
+            bisect.insort(self._termos_ordenados, novos[0])
+        elif novos:
+            # Duas sequências ordenadas: o sort só as intercala, O(n + m) após ordenar as novas
+            novos.sort()
+            self._termos_ordenados.extend(novos)
+            self._termos_ordenados.sort()
+        return id_paciente
+
+    def _faixa_prefixo(self, prefixo: str) -> range:
+        """Posições em _termos_ordenados dos termos que começam com o prefixo."""
+        inicio = bisect.bisect_left(self._termos_ordenados, prefixo)
+        return range(inicio, bisect.bisect_left(self._termos_ordenados, prefixo + '\U0010ffff', inicio))
+
+    def _prefixo_mais_seletivo(self, prefixos: List[str], preferido: str) -> str:
+        """
+        Prefixo com menos ids, somando o mínimo das faixas.
+
+        Avança sempre a faixa de menor total parcial; a primeira a terminar tem
+        o menor total. Se nenhuma terminar em PASSOS_CONTAGEM termos (todas
+        comuns, como "s"), fica o `preferido`, cuja varredura para nos k primeiros.
+        """
+        faixas = [(0, prefixo != preferido, prefixo, iter(self._faixa_prefixo(prefixo)))
+                  for prefixo in dict.fromkeys(prefixos)]
+        heapq.heapify(faixas)
+        for _ in range(PASSOS_CONTAGEM):
+            total, outro, prefixo, posicoes = faixas[0]
+            posicao = next(posicoes, None)
+            if posicao is None:
+                return prefixo
+            termo = self._termos_ordenados[posicao]
+            heapq.heapreplace(faixas, (total + len(self._ids_por_termo[termo]), outro, prefixo, posicoes))
+        return preferido
+
+    def _ids_prefixo(self, prefixo: str) -> Iterator[int]:
+        posicao = bisect.bisect_left(self._termos_ordenados, prefixo)
+        while posicao < len(self._termos_ordenados) and self._termos_ordenados[posicao].startswith(prefixo):
+            yield from self._ids_por_termo[self._termos_ordenados[posicao]]
+            posicao += 1
+
+    def _termos_semelhantes(self, termo: str) -> List[Tuple[int, str]]:
+        """Termos indexados a até `distancia_maxima` edições, como (distância, termo)."""
+        candidatos: Set[str] = set()
+        for variante in _variantes_remocao(termo, self.distancia_maxima):
+            candidatos.update(self._termos_por_variante.get(variante, ()))
+        semelhantes = []
+        for candidato in candidatos:
+            distancia = distancia_edicao(termo, candidato, self.distancia_maxima)
+            if distancia <= self.distancia_maxima:
+                semelhantes.append((distancia, candidato))
+        semelhantes.sort()
+        return semelhantes
+
+    def _filtrar(self, ids: Iterable[int], filtros: List[Callable[[Tuple[str, ...]], bool]],
+                 k: int) -> List[Any]:
+        """Primeiros k pacientes (sem repetição) cujos termos passam em todos os filtros."""
+        resultado = []
+        vistos: Set[int] = set()
+        for id_paciente in ids:
+            if id_paciente in vistos:
+                continue
+            vistos.add(id_paciente)
+            termos = self._termos_por_id[id_paciente]
+            if all(filtro(termos) for filtro in filtros):
+                resultado.append(self._pacientes[id_paciente])
+                if len(resultado) == k:
+                    break
+        return resultado
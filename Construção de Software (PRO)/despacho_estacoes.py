@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Despacho de pacientes entre várias estações de atendimento.
+O GerenciadorTriagem modela uma fila com um único atendente implícito; aqui
+há várias estações (salas de triagem, consultórios), cada uma com as
+especialidades que atende (como o filtro de especialidade da agenda) e a
+sua própria fila:
+
+- Na chegada, o paciente vai para a primeira estação livre compatível ou,
+  se todas estiverem ocupadas, para a fila da compatível menos carregada
+- Ao terminar um atendimento, a estação chama o próximo da sua fila ou
+  rouba da fila de outra estação compatível (work stealing) quando a sua
+  está vazia ou quando há alguém mais urgente esperando em outra fila
+- A partir de URGENCIA_GLOBAL (5), a ordem é global: um paciente crítico
+  nunca fica preso atrás de uma estação ocupada
+
+Cada decisão custa O(log n) nos pacientes aguardando. Métricas de vazão,
+ocupação, espera e duração de atendimento por estação.
+
+Uso:
+    despachante = DespachanteEstacoes([Estacao("sala1", {"clinica"}), Estacao("sala2", {"pediatria"})])
+    despachante.admitir(paciente, "clinica")   # -> "sala1" se estava livre
+    proximo = despachante.finalizar("sala1")   # próximo paciente da sala1, ou None
+    python despacho_estacoes.py --cenario surto
+"""
+
+import argparse
+import heapq
+import itertools
+import logging
+import random
+import threading
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from monitor_sistema import NIVEIS_INSTRUMENTACAO, PERCENTIS_RELATORIO, HistogramaLatencia, monitor
+from relogio import Relogio, RelogioVirtual, obter_relogio
+from triagem import Paciente
+
+ESPECIALIDADE_PADRAO = 'triagem'
+
+# A partir deste nível de urgência, a estação que vagar primeiro atende o mais antigo de todas as filas
+URGENCIA_GLOBAL = 5
+
+# (-urgencia, timestamp, seq): mesma ordem do FilaHeap
+Chave = Tuple[int, datetime, int]
+
+
+@dataclass
+class Estacao:
+    """Posto de atendimento e as especialidades que ele atende."""
+    id: str
+    especialidades: FrozenSet[str] = frozenset({ESPECIALIDADE_PADRAO})
+    nome: str = ''
+
+    def __post_init__(self) -> None:
+        self.especialidades = frozenset(self.especialidades)
+        if not self.especialidades:
+            raise ValueError("Estação deve atender pelo menos uma especialidade")
+
+
+@dataclass
+class MetricasEstacao:
+    """Indicadores acumulados de uma estação (tempos em segundos)."""
+    atendidos: int = 0
+    roubados: int = 0  # atendidos que estavam na fila de outra estação
+    finalizados: int = 0
+    ocupado: float = 0.0  # tempo total de atendimentos finalizados
+    espera: HistogramaLatencia = field(default_factory=HistogramaLatencia)
+    atendimento: HistogramaLatencia = field(default_factory=HistogramaLatencia)
+
+
+class _EstadoEstacao:
+    """Fila, atendimento em curso e métricas de uma estação."""
+
+    __slots__ = ('estacao', 'ordem', 'heap', 'aguardando', 'atual', 'inicio_ns', 'livre_em', 'metricas')
+
+    def __init__(self, estacao: Estacao, ordem: int) -> None:
+        self.estacao = estacao
+        self.ordem = ordem
+        self.heap: List[Tuple[Chave, Paciente]] = []
+        self.aguardando = 0
+        self.atual: Optional[Paciente] = None
+        self.inicio_ns = 0
+        self.livre_em: Set[str] = set()  # especialidades em cujo heap de livres a estação já está
+        self.metricas = MetricasEstacao()
+
+    @property
+    def carga(self) -> int:
+        return self.aguardando + (self.atual is not None)
+
+
+class DespachanteEstacoes:
+    """
+    Distribui pacientes entre estações com filas próprias e roubo de trabalho.
+
+    Cada paciente aguardando tem uma entrada no heap da estação onde está e
+    outra no heap da sua especialidade; ao sair por um dos caminhos, a
+    entrada do outro fica obsoleta e é descartada quando chega ao topo
+    (remoção preguiçosa, compactada quando passa do dobro das vigentes).
+    Estações livres ficam em um heap por especialidade, na ordem de cadastro.
+
+    Invariante: uma estação só fica livre se nenhum paciente compatível
+    está aguardando. Por isso a chegada só precisa olhar as estações
+    livres, e a saída só precisa olhar a própria fila e o topo das
+    especialidades da estação.
+    """
+
+    def __init__(self, estacoes: Iterable[Estacao] = (), relogio: Optional[Relogio] = None,
+                 urgencia_global: int = URGENCIA_GLOBAL) -> None:
+        """
+        Args:
+            estacoes: Estações iniciais (a ordem define qual é a "primeira" livre)
+            relogio: Fonte de tempo de esperas e atendimentos (padrão: relogio.obter_relogio())
+            urgencia_global: Urgência a partir da qual a ordem ignora a fila de origem
+        """
+        self.relogio = relogio if relogio is not None else obter_relogio()
+        self.urgencia_global = urgencia_global
+        self._estados: Dict[str, _EstadoEstacao] = {}
+        self._compativeis: Dict[str, List[_EstadoEstacao]] = {}
+        self._por_especialidade: Dict[str, List[Tuple[Chave, Paciente]]] = {}
+        self._aguardando_especialidade: Dict[str, int] = {}
+        self._livres: Dict[str, List[Tuple[int, _EstadoEstacao]]] = {}
+        self._aguardando: Dict[int, Tuple[_EstadoEstacao, str]] = {}  # seq -> (estação, especialidade)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._inicio_ns = self.relogio.agora_ns()
+        for estacao in estacoes:
+            self.adicionar_estacao(estacao)
+
+    def adicionar_estacao(self, estacao: Estacao) -> None:
+        """
+        Cadastra uma estação, livre; se houver paciente compatível aguardando, ela já o chama.
+
+        Raises:
+            ValueError: Se já existir estação com o mesmo id
+        """
+        with self._lock:
+            if estacao.id in self._estados:
+                raise ValueError(f"Estação '{estacao.id}' já cadastrada")
+            estado = _EstadoEstacao(estacao, len(self._estados))
+            self._estados[estacao.id] = estado
+            for especialidade in estacao.especialidades:
+                self._compativeis.setdefault(especialidade, []).append(estado)
+                self._por_especialidade.setdefault(especialidade, [])
+                self._aguardando_especialidade.setdefault(especialidade, 0)
+                self._livres.setdefault(especialidade, [])
+            self._chamar_proximo(estado, self.relogio.agora_ns())
+
+    def admitir(self, paciente: Paciente, especialidade: str = ESPECIALIDADE_PADRAO,
+                estacao: Optional[str] = None) -> Optional[str]:
+        """
+        Recebe um paciente: atende já em uma estação livre ou coloca na fila de uma estação.
+
+        Args:
+            paciente: Paciente a atender
+            especialidade: Especialidade exigida
+            estacao: Fila preferida (afinidade); outra estação livre compatível ainda o atende já
+
+        Returns:
+            Id da estação que começou a atendê-lo, ou None se ficou aguardando
+
+        Raises:
+            ValueError: Se nenhuma estação atende a especialidade ou a preferida não é compatível
+        """
+        with self._lock:
+            compativeis = self._compativeis.get(especialidade)
+            if not compativeis:
+                raise ValueError(f"Nenhuma estação atende a especialidade '{especialidade}'")
+            preferida = None
+            if estacao is not None:
+                preferida = self._estado(estacao)
+                if especialidade not in preferida.estacao.especialidades:
+                    raise ValueError(f"Estação '{estacao}' não atende a especialidade '{especialidade}'")
+            instante_ns = self.relogio.agora_ns()
+            monitor.incrementar('pacientes_adicionados')
+
+            if preferida is not None and preferida.atual is None:
+                livre = preferida
+            else:
+                livre = self._primeira_livre(especialidade)
+            if livre is not None:
+                self._iniciar(livre, paciente, instante_ns, roubado=False)
+                return livre.estacao.id
+
+            destino = preferida or min(compativeis, key=lambda estado: (estado.carga, estado.ordem))
+            seq = next(self._seq)
+            entrada = ((-paciente.urgencia, paciente.timestamp, seq), paciente)
+            heapq.heappush(destino.heap, entrada)
+            heapq.heappush(self._por_especialidade[especialidade], entrada)
+            self._aguardando[seq] = (destino, especialidade)
+            destino.aguardando += 1
+            self._aguardando_especialidade[especialidade] += 1
+            return None
+
+    def finalizar(self, estacao: str) -> Optional[Paciente]:
+        """
+        Encerra o atendimento em curso na estação e chama o próximo.
+
+        Returns:
+            Próximo paciente da estação (da própria fila ou roubado), ou None se ela ficou livre
+
+        Raises:
+            ValueError: Se a estação não existir ou não estiver atendendo
+        """
+        with self._lock:
+            estado = self._estado(estacao)
+            if estado.atual is None:
+                raise ValueError(f"Estação '{estacao}' não está atendendo")
+            instante_ns = self.relogio.agora_ns()
+            duracao = (instante_ns - estado.inicio_ns) / 1e9
+            estado.metricas.finalizados += 1
+            estado.metricas.ocupado += duracao
+            estado.metricas.atendimento.registrar(duracao)
+            monitor.registrar_metrica(
+                nome="tempo_atendimento",
+                valor=duracao,
+                categoria="atendimento",
+                detalhes={'estacao': estacao, 'paciente': estado.atual.nome},
+                instante_ns=instante_ns
+            )
+            estado.atual = None
+            return self._chamar_proximo(estado, instante_ns)
+
+    def em_atendimento(self, estacao: str) -> Optional[Paciente]:
+        """Paciente sendo atendido na estação, ou None se ela está livre."""
+        return self._estado(estacao).atual
+
+    def aguardando(self, estacao: Optional[str] = None) -> int:
+        """Pacientes aguardando na fila da estação (ou em todas as filas)."""
+        if estacao is None:
+            return len(self._aguardando)
+        return self._estado(estacao).aguardando
+
+    def __len__(self) -> int:
+        return len(self._aguardando)
+
+    def relatorio(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Indicadores por estação desde a criação do despachante.
+
+        Returns:
+            Por id da estação: atendidos, roubados, aguardando, ocupação (0-1),
+            vazão por hora e percentis de espera e de duração de atendimento (s)
+        """
+        with self._lock:
+            agora_ns = self.relogio.agora_ns()
+            decorrido = max((agora_ns - self._inicio_ns) / 1e9, 1e-9)
+            relatorio = {}
+            for estacao_id, estado in self._estados.items():
+                metricas = estado.metricas
+                ocupado = metricas.ocupado
+                if estado.atual is not None:
+                    ocupado += (agora_ns - estado.inicio_ns) / 1e9
+                relatorio[estacao_id] = {
+                    'especialidades': sorted(estado.estacao.especialidades),
+                    'atendidos': metricas.atendidos,
+                    'roubados': metricas.roubados,
+                    'aguardando': estado.aguardando,
+                    'ocupacao': ocupado / decorrido,
+                    'vazao_por_hora': metricas.finalizados / decorrido * 3600,
+                    'espera': metricas.espera.percentis(PERCENTIS_RELATORIO),
+                    'atendimento': metricas.atendimento.percentis(PERCENTIS_RELATORIO),
+                }
+            return relatorio
+
+    def _estado(self, estacao: str) -> _EstadoEstacao:
+        try:
+            return self._estados[estacao]
+        except KeyError:
+            raise ValueError(f"Estação '{estacao}' não cadastrada") from None
+
+    def _primeira_livre(self, especialidade: str) -> Optional[_EstadoEstacao]:
+        """Estação livre compatível de menor ordem de cadastro, ou None."""
+        livres = self._livres[especialidade]
+        while livres:
+            estado = livres[0][1]
+            if estado.atual is None:
+                return estado
+            heapq.heappop(livres)
+            estado.livre_em.discard(especialidade)
+        return None
+
+    def _chamar_proximo(self, estado: _EstadoEstacao, instante_ns: int) -> Optional[Paciente]:
+        """Escolhe o próximo da estação recém-liberada ou a marca como livre."""
+        proprio = self._topo(estado.heap)
+        melhor = None
+        for especialidade in estado.estacao.especialidades:
+            topo = self._topo(self._por_especialidade[especialidade])
+            if topo is not None and (melhor is None or topo[0] < melhor[0]):
+                melhor = topo
+
+        escolhido = proprio
+        if proprio is None:
+            escolhido = melhor
+        elif melhor is not None and melhor[0] < proprio[0]:
+            # Rouba só quem é mais urgente que o topo da própria fila, ou crítico mais antigo
+            urgencia = -melhor[0][0]
+            if urgencia > -proprio[0][0] or urgencia >= self.urgencia_global:
+                escolhido = melhor
+
+        if escolhido is None:
+            for especialidade in estado.estacao.especialidades - estado.livre_em:
+                heapq.heappush(self._livres[especialidade], (estado.ordem, estado))
+            estado.livre_em.update(estado.estacao.especialidades)
+            return None
+
+        chave, paciente = escolhido
+        dono, especialidade = self._aguardando.pop(chave[2])
+        dono.aguardando -= 1
+        self._aguardando_especialidade[especialidade] -= 1
+        self._compactar(dono.heap, dono.aguardando)
+        self._compactar(self._por_especialidade[especialidade], self._aguardando_especialidade[especialidade])
+        self._iniciar(estado, paciente, instante_ns, roubado=dono is not estado)
+        return paciente
+
+    def _iniciar(self, estado: _EstadoEstacao, paciente: Paciente, instante_ns: int, roubado: bool) -> None:
+        """Começa o atendimento e registra a espera."""
+        estado.atual = paciente
+        estado.inicio_ns = instante_ns
+        espera = (self.relogio.para_datetime(instante_ns) - paciente.timestamp).total_seconds()
+        metricas = estado.metricas
+        metricas.atendidos += 1
+        metricas.roubados += roubado
+        metricas.espera.registrar(espera)
+        monitor.incrementar('pacientes_atendidos')
+        monitor.registrar_metrica(
+            nome="tempo_espera",
+            valor=espera,
+            categoria="atendimento",
+            detalhes={'paciente': paciente.nome, 'urgencia': paciente.urgencia, 'estacao': estado.estacao.id},
+            instante_ns=instante_ns
+        )
+        monitor.log_operacao(
+            operacao="despachar_paciente",
+            detalhes={
+                'paciente': paciente.nome,
+                'urgencia': paciente.urgencia,
+                'estacao': estado.estacao.id,
+                'roubado': roubado,
+                'tempo_espera_segundos': espera
+            },
+            instante_ns=instante_ns
+        )
+
+    def _topo(self, heap: List[Tuple[Chave, Paciente]]) -> Optional[Tuple[Chave, Paciente]]:
+        """Topo vigente do heap, descartando entradas de quem já saiu por outro caminho."""
+        while heap:
+            if heap[0][0][2] in self._aguardando:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def _compactar(self, heap: List[Tuple[Chave, Paciente]], vigentes: int) -> None:
+        """Reconstrói o heap só com entradas vigentes quando as obsoletas dominam."""
+        if len(heap) > 2 * vigentes + 32:
+            heap[:] = [entrada for entrada in heap if entrada[0][2] in self._aguardando]
+            heapq.heapify(heap)
+
+
+# Plantão de demonstração: consultórios com especialidades sobrepostas
+ESTACOES_PADRAO = (
+    Estacao('consultorio1', {'clinica'}, "Consultório 1"),
+    Estacao('consultorio2', {'clinica'}, "Consultório 2"),
+    Estacao('consultorio3', {'clinica', 'pediatria'}, "Consultório 3"),
+    Estacao('consultorio4', {'pediatria'}, "Consultório 4"),
+    Estacao('consultorio5', {'ortopedia', 'clinica'}, "Consultório 5"),
+)
+MIX_ESPECIALIDADES = {'clinica': 0.60, 'pediatria': 0.25, 'ortopedia': 0.15}
+
+
+def simular_plantao(cenario: Any, estacoes: Iterable[Estacao] = ESTACOES_PADRAO,
+                    mix_especialidades: Optional[Dict[str, float]] = None,
+                    semente: Optional[int] = None) -> DespachanteEstacoes:
+    """
+    Conduz um DespachanteEstacoes com as chegadas de um cenário do simulador, em relógio virtual.
+
+    Args:
+        cenario: simulador_triagem.Cenario (chegadas e tempos de atendimento por urgência)
+        estacoes: Estações do plantão
+        mix_especialidades: Proporção de chegadas por especialidade
+        semente: Semente do gerador aleatório
+
+    Returns:
+        O despachante ao fim do plantão (ver relatorio())
+    """
+    from simulador_triagem import gerar_chegadas
+
+    gerador = random.Random(semente)
+    gerador_atendimento = random.Random(gerador.getrandbits(64))
+    mix = mix_especialidades or MIX_ESPECIALIDADES
+    especialidades, pesos = list(mix), list(mix.values())
+    relogio = RelogioVirtual()
+    despachante = DespachanteEstacoes(estacoes, relogio=relogio)
+    duracao_de: Dict[int, float] = {}  # id(paciente) -> duração do atendimento
+    eventos: List[Tuple[float, int, Any]] = []  # chegadas (Chegada) e fins de atendimento (id da estação)
+    ordem = itertools.count()
+    numeros = itertools.count(1)
+
+    def iniciar(paciente: Optional[Paciente], estacao: Optional[str], agora: float) -> None:
+        if paciente is not None and estacao is not None:
+            heapq.heappush(eventos, (agora + duracao_de.pop(id(paciente)), next(ordem), estacao))
+
+    for chegada in gerar_chegadas(cenario, gerador):
+        heapq.heappush(eventos, (chegada.tempo, next(ordem), chegada))
+    while eventos:
+        agora, _, dados = heapq.heappop(eventos)
+        if agora >= cenario.duracao:
+            break
+        relogio.definir(agora)
+        if isinstance(dados, str):
+            iniciar(despachante.finalizar(dados), dados, agora)
+            continue
+        paciente = Paciente._ja_validado(f"Paciente {next(numeros)}", dados.idade, dados.urgencia, relogio.chegada())
+        duracao_de[id(paciente)] = cenario.atendimento[dados.urgencia](gerador_atendimento)
+        estacao = despachante.admitir(paciente, gerador.choices(especialidades, pesos)[0])
+        iniciar(paciente, estacao, agora)
+    relogio.definir(cenario.duracao)
+    return despachante
+
+
+def imprimir_relatorio(relatorio: Dict[str, Dict[str, Any]]) -> None:
+    """Exibe os indicadores por estação."""
+    percentis = [f"p{q * 100:g}" for q in PERCENTIS_RELATORIO]
+    print(f"{'Estação':<14} | {'especialidades':<19} | {'atendidos':>9} | {'roubados':>8} | "
+          f"{'ocupação':>8} | {'vazão/h':>7} | " + " | ".join(f"{'espera ' + p:>10}" for p in percentis)
+          + f" | {'atend. p50':>10}")
+    for estacao_id, linha in relatorio.items():
+        print(f"{estacao_id:<14} | {','.join(linha['especialidades']):<19} | {linha['atendidos']:>9} | "
+              f"{linha['roubados']:>8} | {linha['ocupacao']:>8.0%} | {linha['vazao_por_hora']:>7.1f} | "
+              + " | ".join(f"{linha['espera'][p] / 60:>10.1f}" for p in percentis)
+              + f" | {linha['atendimento']['p50'] / 60:>10.1f}")
+    print("(tempos em minutos)")
+
+
+def main() -> None:
+    """Função principal."""
+    from simulador_triagem import CENARIOS, DIA
+
+    parser = argparse.ArgumentParser(description="Plantão simulado com despacho entre estações")
+    parser.add_argument('--cenario', choices=list(CENARIOS), default='normal')
+    parser.add_argument('--dias', type=float, default=1.0)
+    parser.add_argument('--chegadas-por-hora', type=float, help="Média de chegadas por hora (padrão do cenário)")
+    parser.add_argument('--nivel', choices=NIVEIS_INSTRUMENTACAO, default='contadores',
+                        help="nível de instrumentação do decorator durante a simulação")
+    parser.add_argument('--sem-logs', action='store_true', help="Descarta os logs do monitor durante a simulação")
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+
+    cenario = replace(CENARIOS[args.cenario], duracao=args.dias * DIA)
+    if args.chegadas_por_hora is not None:
+        cenario = replace(cenario, chegadas_por_hora=args.chegadas_por_hora)
+
+    print("🏥 DESPACHO ENTRE ESTAÇÕES")
+    print("=" * 80)
+    nivel_original = monitor.nivel_instrumentacao
+    monitor.configurar_instrumentacao(args.nivel)
+    if args.sem_logs:
+        logging.disable(logging.CRITICAL)
+    try:
+        despachante = simular_plantao(cenario, semente=args.semente)
+    finally:
+        logging.disable(logging.NOTSET)
+        monitor.configurar_instrumentacao(nivel_original)
+    print(f"Cenário '{cenario.nome}' | {len(ESTACOES_PADRAO)} estações | "
+          f"aguardando no fim: {despachante.aguardando()}")
+    imprimir_relatorio(despachante.relatorio())
+
+
+if __name__ == "__main__":
+    main()
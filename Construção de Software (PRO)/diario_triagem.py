@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Diário (write-ahead log) binário da fila de triagem.
+Cada adição e cada atendimento é gravado antes de alterar a fila; após uma
+queda, a fila é reconstruída a partir do último snapshot mais o final do diário.
+
+Arquivos no diretório do diário:
+    diario.00000001.bin  segmentos do diário, só acrescentados
+    snapshot.bin         pacientes aguardando no início do segmento indicado
+
+Registro: cabeçalho <HI (tamanho do conteúdo, crc32) + conteúdo
+    adição:  <BQqBH (tipo, seq, chegada_ns, urgencia, idade) + nome UTF-8
+    remoção: <BQ (tipo, seq)
+"""
+
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from monitor_sistema import monitor
+from pacientes_colunares import datetime_para_ns, ns_para_datetime
+from filas import FilaPrioridade
+from relogio import Relogio
+from triagem import GerenciadorTriagem, Paciente
+
+TIPO_ADICAO = 1
+TIPO_REMOCAO = 2
+
+_CABECALHO = struct.Struct('<HI')
+_ADICAO = struct.Struct('<BQqBH')
+_REMOCAO = struct.Struct('<BQ')
+_SNAPSHOT = struct.Struct('<4sQQI')
+_PACIENTE_SNAPSHOT = struct.Struct('<QqBHH')
+_MAGICO_SNAPSHOT = b'TRS1'
+
+# Dados de um paciente no diário: (nome, idade, urgencia, chegada_ns)
+DadosPaciente = Tuple[str, int, int, int]
+
+
+@dataclass
+class EstadoRecuperado:
+    """Resultado da leitura do diário na abertura."""
+    pacientes: Dict[int, DadosPaciente] = field(default_factory=dict)  # seq -> dados, em ordem de seq
+    proximo_seq: int = 1
+    eventos_reproduzidos: int = 0
+    bytes_descartados: int = 0  # final truncado por uma gravação interrompida
+
+
+class DiarioTriagem:
+    """
+    Diário de eventos com sincronização em grupo (group commit).
+
+    Os registros são acumulados em memória e gravados com um único fsync
+    quando `lote_sincronizacao` eventos estão pendentes ou, em segundo plano,
+    a cada `intervalo_sincronizacao` segundos. Uma queda perde no máximo os
+    eventos desse intervalo; `sincronizar()` força a gravação imediata.
+    """
+
+    def __init__(self, diretorio: str, lote_sincronizacao: int = 64,
+                 intervalo_sincronizacao: float = 0.05):
+        """
+        Abre (ou cria) o diário e lê o estado salvo.
+
+        Args:
+            diretorio: Diretório dos segmentos e do snapshot
+            lote_sincronizacao: Eventos pendentes que disparam um fsync (1 = a cada evento)
+            intervalo_sincronizacao: Atraso máximo, em segundos, até o fsync em segundo plano
+
+        Raises:
+            ValueError: Se os parâmetros forem inválidos ou um segmento antigo estiver corrompido
+        """
+        if lote_sincronizacao < 1:
+            raise ValueError("Lote de sincronização deve ser positivo")
+        if intervalo_sincronizacao <= 0:
+            raise ValueError("Intervalo de sincronização deve ser positivo")
+        self.diretorio = diretorio
+        self.lote_sincronizacao = lote_sincronizacao
+        self.intervalo_sincronizacao = intervalo_sincronizacao
+        self.sincronizacoes = 0
+        self._buffer = bytearray()
+        self._pendentes = 0
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        os.makedirs(diretorio, exist_ok=True)
+
+        self.estado = self._recuperar()
+        segmentos = self._segmentos()
+        self._segmento = max(segmentos[-1] if segmentos else 1, self._segmento_snapshot)
+        self._fd = self._abrir_segmento(self._segmento)
+
+        self._thread = threading.Thread(
+            target=self._sincronizar_periodicamente, name='diario-triagem', daemon=True
+        )
+        self._thread.start()
+
+    def registrar_adicao(self, seq: int, paciente: Paciente) -> None:
+        """Acrescenta o evento de adição de um paciente."""
+        nome = paciente.nome.encode('utf-8')
+        conteudo = _ADICAO.pack(TIPO_ADICAO, seq, datetime_para_ns(paciente.timestamp),
+                                paciente.urgencia, paciente.idade) + nome
+        self._acrescentar(conteudo)
+
+    def registrar_remocao(self, seq: int) -> None:
+        """Acrescenta o evento de atendimento (remoção) de um paciente."""
+        self._acrescentar(_REMOCAO.pack(TIPO_REMOCAO, seq))
+
+    def sincronizar(self) -> None:
+        """Grava e faz fsync dos eventos pendentes."""
+        with self._lock:
+            self._sincronizar()
+
+    def gravar_snapshot(self, pacientes: Iterable[Tuple[int, Paciente]], proximo_seq: int) -> None:
+        """
+        Grava o estado atual e descarta os segmentos que ele torna desnecessários.
+
+        Abre um novo segmento, grava o snapshot de forma atômica (arquivo
+        temporário + rename) apontando para ele e só então apaga os anteriores.
+
+        Args:
+            pacientes: Pares (seq, paciente) aguardando atendimento
+            proximo_seq: Próximo número de sequência a ser usado
+        """
+        with self._lock:
+            self._sincronizar()
+            os.close(self._fd)
+            anterior = self._segmento
+            self._segmento += 1
+            self._fd = self._abrir_segmento(self._segmento)
+
+            partes = []
+            for seq, paciente in pacientes:
+                nome = paciente.nome.encode('utf-8')
+                partes.append(_PACIENTE_SNAPSHOT.pack(seq, datetime_para_ns(paciente.timestamp),
+                                                      paciente.urgencia, paciente.idade, len(nome)))
+                partes.append(nome)
+            corpo = b''.join(partes)
+            cabecalho = _SNAPSHOT.pack(_MAGICO_SNAPSHOT, self._segmento, proximo_seq, len(partes) // 2)
+            conteudo = cabecalho + corpo
+            self._gravar_atomico('snapshot.bin', conteudo + struct.pack('<I', zlib.crc32(conteudo)))
+
+            for segmento in self._segmentos():
+                if segmento <= anterior:
+                    os.remove(self._caminho_segmento(segmento))
+            self._sincronizar_diretorio()
+
+    def fechar(self) -> None:
+        """Sincroniza os eventos pendentes e fecha o diário."""
+        if self._parar.is_set():
+            return
+        self._parar.set()
+        self._thread.join()
+        with self._lock:
+            self._sincronizar()
+            os.close(self._fd)
+
+    def _acrescentar(self, conteudo: bytes) -> None:
+        with self._lock:
+            self._buffer += _CABECALHO.pack(len(conteudo), zlib.crc32(conteudo))
+            self._buffer += conteudo
+            self._pendentes += 1
+            if self._pendentes >= self.lote_sincronizacao:
+                self._sincronizar()
+
+    def _sincronizar(self) -> None:
+        """Grava o buffer e faz fsync; chamar com o lock adquirido."""
+        if not self._pendentes:
+            return
+        dados = memoryview(self._buffer)
+        while dados:
+            dados = dados[os.write(self._fd, dados):]
+        dados.release()
+        os.fsync(self._fd)
+        self._buffer.clear()
+        self._pendentes = 0
+        self.sincronizacoes += 1
+
+    def _sincronizar_periodicamente(self) -> None:
+        while not self._parar.wait(self.intervalo_sincronizacao):
+            if self._pendentes:
+                self.sincronizar()
+
+    def _recuperar(self) -> EstadoRecuperado:
+        """Carrega o snapshot e reproduz apenas os segmentos posteriores a ele."""
+        estado = EstadoRecuperado()
+        self._segmento_snapshot = self._ler_snapshot(estado)
+        segmentos = [s for s in self._segmentos() if s >= self._segmento_snapshot]
+        for posicao, segmento in enumerate(segmentos):
+            ultimo = posicao == len(segmentos) - 1
+            self._reproduzir_segmento(segmento, estado, ultimo)
+
+        # Só os pacientes que continuam na fila têm o registro decodificado
+        pacientes = estado.pacientes
+        for seq, dados in pacientes.items():
+            if isinstance(dados, bytes):
+                _, _, chegada_ns, urgencia, idade = _ADICAO.unpack_from(dados)
+                pacientes[seq] = (dados[_ADICAO.size:].decode('utf-8'), idade, urgencia, chegada_ns)
+        return estado
+
+    def _ler_snapshot(self, estado: EstadoRecuperado) -> int:
+        caminho = os.path.join(self.diretorio, 'snapshot.bin')
+        if not os.path.exists(caminho):
+            return 0
+        with open(caminho, 'rb') as arquivo:
+            dados = arquivo.read()
+        if len(dados) < _SNAPSHOT.size + 4 or \
+                zlib.crc32(dados[:-4]) != struct.unpack_from('<I', dados, len(dados) - 4)[0]:
+            raise ValueError("Snapshot do diário corrompido")
+        magico, segmento, proximo_seq, quantidade = _SNAPSHOT.unpack_from(dados, 0)
+        if magico != _MAGICO_SNAPSHOT:
+            raise ValueError("Snapshot do diário em formato desconhecido")
+
+        posicao = _SNAPSHOT.size
+        pacientes = estado.pacientes
+        for _ in range(quantidade):
+            seq, chegada_ns, urgencia, idade, tamanho_nome = _PACIENTE_SNAPSHOT.unpack_from(dados, posicao)
+            posicao += _PACIENTE_SNAPSHOT.size
+            nome = dados[posicao:posicao + tamanho_nome].decode('utf-8')
+            posicao += tamanho_nome
+            pacientes[seq] = (nome, idade, urgencia, chegada_ns)
+        estado.proximo_seq = proximo_seq
+        return segmento
+
+    def _reproduzir_segmento(self, segmento: int, estado: EstadoRecuperado, ultimo: bool) -> None:
+        caminho = self._caminho_segmento(segmento)
+        with open(caminho, 'rb') as arquivo:
+            dados = arquivo.read()
+
+        # Adições guardam o registro bruto; a maioria será removida mais adiante
+        pacientes = estado.pacientes
+        remover = pacientes.pop
+        proximo_seq = estado.proximo_seq
+        eventos = 0
+        posicao, fim = 0, len(dados)
+        tamanho_cabecalho = _CABECALHO.size
+        ler_cabecalho = _CABECALHO.unpack_from
+        ler_tipo_seq = _REMOCAO.unpack_from  # tipo e seq iniciam os dois tipos de registro
+        crc32 = zlib.crc32
+        while posicao + tamanho_cabecalho <= fim:
+            tamanho, crc = ler_cabecalho(dados, posicao)
+            inicio_conteudo = posicao + tamanho_cabecalho
+            conteudo = dados[inicio_conteudo:inicio_conteudo + tamanho]
+            if len(conteudo) < max(tamanho, _REMOCAO.size) or crc32(conteudo) != crc:
+                break
+            tipo, seq = ler_tipo_seq(conteudo)
+            if tipo == TIPO_ADICAO:
+                pacientes[seq] = conteudo
+                if seq >= proximo_seq:
+                    proximo_seq = seq + 1
+            elif tipo == TIPO_REMOCAO:
+                remover(seq, None)
+            else:
+                break
+            eventos += 1
+            posicao = inicio_conteudo + tamanho
+
+        estado.proximo_seq = proximo_seq
+        estado.eventos_reproduzidos += eventos
+        if posicao < fim:
+            if not ultimo:
+                raise ValueError(f"Segmento {segmento} do diário corrompido")
+            # Gravação interrompida no meio de um registro: descarta o final
+            estado.bytes_descartados += fim - posicao
+            with open(caminho, 'r+b') as arquivo:
+                arquivo.truncate(posicao)
+                os.fsync(arquivo.fileno())
+
+    def _segmentos(self) -> List[int]:
+        segmentos = []
+        for nome in os.listdir(self.diretorio):
+            if nome.startswith('diario.') and nome.endswith('.bin'):
+                segmentos.append(int(nome[len('diario.'):-len('.bin')]))
+        return sorted(segmentos)
+
+    def _caminho_segmento(self, segmento: int) -> str:
+        return os.path.join(self.diretorio, f"diario.{segmento:08d}.bin")
+
+    def _abrir_segmento(self, segmento: int) -> int:
+        fd = os.open(self._caminho_segmento(segmento), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._sincronizar_diretorio()
+        return fd
+
+    def _gravar_atomico(self, nome: str, conteudo: bytes) -> None:
+        destino = os.path.join(self.diretorio, nome)
+        temporario = destino + '.tmp'
+        with open(temporario, 'wb') as arquivo:
+            arquivo.write(conteudo)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, destino)
+
+    def _sincronizar_diretorio(self) -> None:
+        """Torna durável a criação/remoção de arquivos (onde o SO permite)."""
+        if hasattr(os, 'O_DIRECTORY'):
+            fd = os.open(self.diretorio, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+
+class GerenciadorTriagemDuravel(GerenciadorTriagem):
+    """
+    GerenciadorTriagem cuja fila sobrevive a reinícios do processo.
+
+    Cada adição e cada atendimento é registrado no diário antes de alterar a
+    fila. Na abertura, a fila é reconstruída a partir do diário; a cada
+    `intervalo_snapshot` eventos um snapshot limita o trecho a reproduzir.
+    """
+
+    def __init__(self, diretorio: str, backend: Optional[FilaPrioridade] = None,
+                 intervalo_snapshot: int = 10000, historico: Optional[Any] = None,
+                 indice_nomes: Optional[Any] = None, fluxo: Optional[Any] = None,
+                 relogio: Optional[Relogio] = None, **opcoes_diario: Any) -> None:
+        """
+        Args:
+            diretorio: Diretório do diário
+            backend: Estrutura de fila a utilizar (padrão: FilaHeap)
+            intervalo_snapshot: Eventos entre snapshots automáticos (0 = só manuais)
+            historico: Recebe cada atendimento (ver historico_pacientes.HistoricoAtendimentos)
+            indice_nomes: Recebe cada admissão (ver busca_pacientes.IndiceNomes)
+            fluxo: Recebe cada mudança da fila (ver fluxo_fila.FluxoFila)
+            relogio: Fonte de tempo de chegadas, esperas e registros (padrão: relogio.obter_relogio())
+            **opcoes_diario: lote_sincronizacao / intervalo_sincronizacao do DiarioTriagem
+        """
+        super().__init__(backend, historico, indice_nomes, fluxo, relogio)
+        self.intervalo_snapshot = intervalo_snapshot
+        inicio = time.perf_counter()
+        self.diario = DiarioTriagem(diretorio, **opcoes_diario)
+        estado = self.diario.estado
+
+        # seq de cada paciente na fila, por id(); um mesmo objeto adicionado
+        # mais de uma vez guarda a lista de seqs em ordem de chegada
+        self._seqs: Dict[int, Any] = {}
+        pacientes = []
+        for seq, (nome, idade, urgencia, chegada_ns) in estado.pacientes.items():
+            paciente = Paciente._ja_validado(nome, idade, urgencia, ns_para_datetime(chegada_ns))
+            self._seqs[id(paciente)] = seq
+            pacientes.append(paciente)
+        if pacientes:
+            self._fila.adicionar_varios(pacientes)
+            if self.indice_nomes is not None:
+                self.indice_nomes.adicionar_varios(pacientes)
+            if self.fluxo is not None:
+                self.fluxo.carregar(pacientes)
+        # A fila agora é a dona dos dados; não manter uma segunda cópia
+        estado.pacientes.clear()
+        self._proximo_seq = estado.proximo_seq
+        self._eventos_desde_snapshot = estado.eventos_reproduzidos
+
+        monitor.log_operacao("recuperar_fila", {
+            'pacientes_recuperados': len(pacientes),
+            'eventos_reproduzidos': estado.eventos_reproduzidos,
+            'bytes_descartados': estado.bytes_descartados,
+            'tempo_ms': round((time.perf_counter() - inicio) * 1000, 3)
+        })
+
+    def gravar_snapshot(self) -> None:
+        """Grava um snapshot da fila atual (os segmentos anteriores são descartados)."""
+        self.diario.gravar_snapshot(self._pacientes_com_seq(), self._proximo_seq)
+        self._eventos_desde_snapshot = 0
+
+    def fechar(self) -> None:
+        """Sincroniza os eventos pendentes e fecha o diário."""
+        self.diario.fechar()
+
+    def _inserir(self, pacientes: List[Paciente]) -> int:
+        for paciente in pacientes:
+            seq = self._proximo_seq
+            self._proximo_seq += 1
+            self.diario.registrar_adicao(seq, paciente)
+            anterior = self._seqs.get(id(paciente))
+            if anterior is None:
+                self._seqs[id(paciente)] = seq
+            elif isinstance(anterior, list):
+                anterior.append(seq)
+            else:
+                self._seqs[id(paciente)] = [anterior, seq]
+        tamanho = super()._inserir(pacientes)
+        self._contar_eventos(len(pacientes))
+        return tamanho
+
+    def _retirar(self) -> Tuple[Paciente, int]:
+        proximo = self._fila.espiar()
+        seqs = self._seqs[id(proximo)]
+        if isinstance(seqs, list):
+            seq = seqs.pop(0)
+            if len(seqs) == 1:
+                self._seqs[id(proximo)] = seqs[0]
+        else:
+            seq = self._seqs.pop(id(proximo))
+        self.diario.registrar_remocao(seq)
+        resultado = super()._retirar()
+        self._contar_eventos(1)
+        return resultado
+
+    def _contar_eventos(self, quantidade: int) -> None:
+        self._eventos_desde_snapshot += quantidade
+        if self.intervalo_snapshot and self._eventos_desde_snapshot >= self.intervalo_snapshot:
+            self.gravar_snapshot()
+
+    def _pacientes_com_seq(self) -> List[Tuple[int, Paciente]]:
+        pares = []
+        repetidos: Dict[int, int] = {}
+        for paciente in self._fila.pacientes():
+            seqs = self._seqs[id(paciente)]
+            if isinstance(seqs, list):
+                indice = repetidos.get(id(paciente), 0)
+                repetidos[id(paciente)] = indice + 1
+                pares.append((seqs[indice], paciente))
+            else:
+                pares.append((seqs, paciente))
+        # Em ordem de seq, para a recuperação reinserir na ordem de chegada
+        pares.sort(key=lambda par: par[0])
+        return pares
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Backends de fila de prioridade para o Sistema de Triagem.
+Cada backend mantém a ordem por urgência (maior primeiro) e ordem de chegada.
+"""
+
+import bisect
+import heapq
+import itertools
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+
+# Domínio fechado de urgência validado em validar_entrada_paciente
+NIVEIS_URGENCIA = (5, 4, 3, 2, 1)
+
+
+class FilaPrioridade:
+    """
+    Interface comum dos backends de fila usados pelo GerenciadorTriagem.
+
+    A ordem de atendimento é sempre: urgência decrescente, depois timestamp
+    crescente e, em caso de timestamps idênticos, ordem de inserção.
+    """
+
+    def adicionar(self, paciente: Any) -> None:
+        """Insere paciente na fila."""
+        raise NotImplementedError
+
+    def adicionar_varios(self, pacientes: List[Any]) -> None:
+        """Insere vários pacientes, na ordem da lista, em uma única operação."""
+        for paciente in pacientes:
+            self.adicionar(paciente)
+
+    def remover_proximo(self) -> Any:
+        """
+        Remove e retorna o paciente de maior prioridade.
+
+        Raises:
+            IndexError: Se a fila estiver vazia
+        """
+        raise NotImplementedError
+
+    def espiar(self) -> Any:
+        """
+        Retorna o paciente de maior prioridade sem removê-lo.
+
+        Raises:
+            IndexError: Se a fila estiver vazia
+        """
+        raise NotImplementedError
+
+    def ordenada(self) -> List[Any]:
+        """
+        Retorna os pacientes na ordem de atendimento.
+
+        A lista retornada pode ser um snapshot compartilhado entre chamadas
+        e não deve ser modificada por quem a recebe.
+        """
+        raise NotImplementedError
+
+    def pacientes(self) -> List[Any]:
+        """Retorna os pacientes aguardando, na ordem interna do backend."""
+        raise NotImplementedError
+
+    def chave_ordem(self, paciente: Any) -> Any:
+        """Chave comparável da posição de um paciente aguardando (menor é atendido antes; empates por chegada à fila)."""
+        return (-paciente.urgencia, paciente.timestamp)
+
+    def usar_relogio(self, relogio: Any) -> None:
+        """Recebe o relógio do gerenciador; só backends cuja ordem depende do tempo o usam."""
+
+    @property
+    def reordenacoes(self) -> int:
+        """Mudanças de ordem sem inserção nem remoção (ordem que depende do tempo)."""
+        return 0
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.pacientes())
+
+
+class FilaLista(FilaPrioridade):
+    """
+    Backend original: lista simples reordenada após cada mudança.
+
+    Inserção O(1), mas cada atendimento custa O(n log n) para ordenar
+    e O(n) para remover. Mantido como referência e para comparação.
+    """
+
+    def __init__(self) -> None:
+        self._itens: List[Any] = []
+        self._cache: Optional[List[Any]] = None
+
+    def adicionar(self, paciente: Any) -> None:
+        self._itens.append(paciente)
+        self._cache = None
+
+    def adicionar_varios(self, pacientes: List[Any]) -> None:
+        self._itens.extend(pacientes)
+        self._cache = None
+
+    def remover_proximo(self) -> Any:
+        proximo = self.espiar()
+        self._itens.remove(proximo)
+        self._cache = None
+        return proximo
+
+    def espiar(self) -> Any:
+        if not self._itens:
+            raise IndexError("Fila vazia")
+        return self.ordenada()[0]
+
+    def ordenada(self) -> List[Any]:
+        if self._cache is None:
+            # sorted() é estável: timestamps idênticos mantêm a ordem de inserção
+            self._cache = sorted(self._itens, key=lambda p: (-p.urgencia, p.timestamp))
+        return self._cache
+
+    def pacientes(self) -> List[Any]:
+        return list(self._itens)
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+
+class VisaoOrdenada:
+    """
+    Visão ordenada mantida incrementalmente em baldes por urgência.
+
+    Cada balde guarda entradas (timestamp, seq, paciente) ordenadas via
+    bisect, então inserções e remoções custam O(log n) comparações. A
+    remoção do início de um balde (o caso do atendimento) apenas avança
+    um deslocamento, compactado quando metade do balde já foi consumida.
+
+    O snapshot completo é a concatenação dos baldes (5 → 1), reconstruído
+    apenas quando houve mudança desde a última leitura; leituras sem
+    mudança intermediária retornam a mesma lista em O(1).
+    """
+
+    def __init__(self) -> None:
+        self._baldes: Dict[int, List[Tuple[Any, int, Any]]] = {}
+        self._inicio: Dict[int, int] = {}
+        self._snapshot: Optional[List[Any]] = None
+
+    def inserir(self, urgencia: int, timestamp: Any, seq: int, paciente: Any) -> None:
+        """Insere entrada no balde da urgência correspondente."""
+        balde = self._baldes.get(urgencia)
+        if balde is None:
+            balde = self._baldes[urgencia] = []
+            self._inicio[urgencia] = 0
+        entrada = (timestamp, seq, paciente)
+        if len(balde) == self._inicio[urgencia] or balde[-1] < entrada:
+            balde.append(entrada)  # caso comum: chegada em ordem
+        else:
+            bisect.insort(balde, entrada, lo=self._inicio[urgencia])
+        self._snapshot = None
+
+    def remover(self, urgencia: int, timestamp: Any, seq: int) -> None:
+        """Remove a entrada identificada por (urgencia, timestamp, seq)."""
+        balde = self._baldes[urgencia]
+        inicio = self._inicio[urgencia]
+        # (timestamp, seq) é prefixo da entrada e seq é único
+        posicao = bisect.bisect_left(balde, (timestamp, seq), lo=inicio)
+        if posicao == inicio:
+            inicio += 1
+            if inicio * 2 >= len(balde):
+                del balde[:inicio]
+                inicio = 0
+            self._inicio[urgencia] = inicio
+        else:
+            del balde[posicao]
+        if len(balde) == inicio:
+            del self._baldes[urgencia]
+            del self._inicio[urgencia]
+        self._snapshot = None
+
+    def snapshot(self) -> List[Any]:
+        """Retorna a fila completa na ordem de atendimento."""
+        if self._snapshot is None:
+            snapshot = []
+            for urgencia in sorted(self._baldes, reverse=True):
+                balde = self._baldes[urgencia]
+                snapshot.extend(
+                    balde[i][-1] for i in range(self._inicio[urgencia], len(balde))
+                )
+            self._snapshot = snapshot
+        return self._snapshot
+
+
+class FilaHeap(FilaPrioridade):
+    """
+    Backend padrão: heap binário com chave (-urgencia, timestamp, seq).
+
+    O contador `seq` é atribuído na inserção e garante o mesmo desempate
+    estável de `sorted()` para pacientes com timestamps idênticos.
+
+    Complexidade: inserção e remoção O(log n), espiar O(1).
+
+    A visão ordenada (`ordenada()`) só é criada na primeira consulta e a
+    partir daí é mantida incrementalmente junto com o heap.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[int, Any, int, Any]] = []
+        self._seq = itertools.count()
+        self._visao: Optional[VisaoOrdenada] = None
+
+    def adicionar(self, paciente: Any) -> None:
+        entrada = (-paciente.urgencia, paciente.timestamp, next(self._seq), paciente)
+        heapq.heappush(self._heap, entrada)
+        if self._visao is not None:
+            self._visao.inserir(paciente.urgencia, entrada[1], entrada[2], paciente)
+
+    def adicionar_varios(self, pacientes: List[Any]) -> None:
+        # Lote grande em relação ao heap: heapify O(n + k) vence k inserções
+        if len(pacientes) <= len(self._heap):
+            for paciente in pacientes:
+                self.adicionar(paciente)
+            return
+        entradas = [
+            (-paciente.urgencia, paciente.timestamp, next(self._seq), paciente)
+            for paciente in pacientes
+        ]
+        self._heap.extend(entradas)
+        heapq.heapify(self._heap)
+        if self._visao is not None:
+            for prioridade, timestamp, seq, paciente in entradas:
+                self._visao.inserir(-prioridade, timestamp, seq, paciente)
+
+    def remover_proximo(self) -> Any:
+        if not self._heap:
+            raise IndexError("Fila vazia")
+        prioridade, timestamp, seq, paciente = heapq.heappop(self._heap)
+        if self._visao is not None:
+            self._visao.remover(-prioridade, timestamp, seq)
+        return paciente
+
+    def espiar(self) -> Any:
+        if not self._heap:
+            raise IndexError("Fila vazia")
+        return self._heap[0][-1]
+
+    def ordenada(self) -> List[Any]:
+        if self._visao is None:
+            self._visao = VisaoOrdenada()
+            for prioridade, timestamp, seq, paciente in sorted(self._heap):
+                self._visao.inserir(-prioridade, timestamp, seq, paciente)
+        return self._visao.snapshot()
+
+    def pacientes(self) -> List[Any]:
+        return [entrada[-1] for entrada in self._heap]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class FilaFaixas(FilaPrioridade):
+    """
+    Backend de cinco faixas: uma deque FIFO por nível de urgência (1-5).
+
+    Como a urgência é um domínio fechado, não há comparação entre níveis:
+    inserção e remoção são O(1) e a listagem ordenada é a concatenação
+    das faixas. Pacientes chegam normalmente em ordem de timestamp; quando
+    um timestamp anterior ao último da faixa aparece, a inserção recua
+    a partir do fim da faixa para preservar a ordem exata.
+    """
+
+    def __init__(self) -> None:
+        self._faixas: Dict[int, Deque[Tuple[Any, Any]]] = {
+            nivel: deque() for nivel in NIVEIS_URGENCIA
+        }
+        self._tamanho = 0
+        self._snapshot: Optional[List[Any]] = None
+
+    def adicionar(self, paciente: Any) -> None:
+        try:
+            faixa = self._faixas[paciente.urgencia]
+        except KeyError:
+            raise ValueError("Urgência deve estar entre 1 e 5") from None
+
+        entrada = (paciente.timestamp, paciente)
+        if not faixa or faixa[-1][0] <= entrada[0]:
+            faixa.append(entrada)
+        else:
+            posicao = len(faixa)
+            while posicao > 0 and faixa[posicao - 1][0] > entrada[0]:
+                posicao -= 1
+            faixa.insert(posicao, entrada)
+        self._tamanho += 1
+        self._snapshot = None
+
+    def remover_proximo(self) -> Any:
+        for nivel in NIVEIS_URGENCIA:
+            faixa = self._faixas[nivel]
+            if faixa:
+                self._tamanho -= 1
+                self._snapshot = None
+                return faixa.popleft()[1]
+        raise IndexError("Fila vazia")
+
+    def espiar(self) -> Any:
+        for nivel in NIVEIS_URGENCIA:
+            faixa = self._faixas[nivel]
+            if faixa:
+                return faixa[0][1]
+        raise IndexError("Fila vazia")
+
+    def ordenada(self) -> List[Any]:
+        if self._snapshot is None:
+            snapshot = []
+            for nivel in NIVEIS_URGENCIA:
+                snapshot.extend(entrada[1] for entrada in self._faixas[nivel])
+            self._snapshot = snapshot
+        return self._snapshot
+
+    def pacientes(self) -> List[Any]:
+        return list(self.ordenada())
+
+    def __len__(self) -> int:
+        return self._tamanho
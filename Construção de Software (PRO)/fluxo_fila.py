@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Fluxo de mudanças da fila de triagem para os painéis da sala de espera.
+Em vez de cada tela consultar a fila inteira periodicamente, o gerenciador
+publica diferenças compactas (paciente adicionado na posição p, paciente
+chamado da posição p, paciente movido de p para q) e cada tela mantém sua
+própria cópia.
+
+Uso:
+    fluxo = FluxoFila()
+    gerenciador = GerenciadorTriagem(fluxo=fluxo)
+    for quadro in fluxo.assinar():     # bytes no formato Server-Sent Events
+        resposta.write(quadro)
+
+Eventos (campo data de cada quadro SSE):
+    event: snapshot   {"pacientes": [{"id", "nome", "idade", "urgencia", "chegada"}, ...]}
+    event: mudancas   [{"tipo": "adicionado", "id", "posicao", "nome", "idade", "urgencia", "chegada"},
+                       {"tipo": "chamado", "id", "posicao"},
+                       {"tipo": "movido", "id", "de", "para"}, ...]
+Uma inserção ou remoção na posição p desloca implicitamente os pacientes
+seguintes; as telas aplicam os eventos em ordem (ver ReplicaFila).
+Movimentos vêm de backends cuja ordem muda com o tempo (ver
+politicas_prioridade): o gerenciador repassa a nova ordem em reordenar().
+"""
+
+import bisect
+import itertools
+import json
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+INTERVALO_COALESCENCIA = 0.05  # segundos
+LIMITE_DIFERENCAS = 256
+LOTES_GUARDADOS = 1024
+INTERVALO_PING = 15.0
+
+
+class FluxoFila:
+    """
+    Espelho ordenado da fila que gera e distribui eventos de mudança.
+
+    O gerenciador chama adicionados()/chamado() a cada alteração da fila
+    (O(log n) para achar a posição, pela chave de ordem do backend; ver
+    usar_ordem) e reordenar() quando a ordem muda sozinha. Uma thread publicadora junta as
+    mudanças de cada janela de `intervalo_coalescencia` segundos em um
+    único quadro SSE, codificado uma vez e entregue com os mesmos bytes a
+    todas as telas; rajadas com mais de `limite_diferencas` mudanças viram
+    um snapshot. O custo cresce com o número de mudanças, não com o número
+    de telas vezes a frequência de consulta.
+    """
+
+    def __init__(self, intervalo_coalescencia: float = INTERVALO_COALESCENCIA,
+                 limite_diferencas: int = LIMITE_DIFERENCAS,
+                 lotes_guardados: int = LOTES_GUARDADOS) -> None:
+        """
+        Args:
+            intervalo_coalescencia: Janela em segundos em que as mudanças são agrupadas
+            limite_diferencas: Acima disso, a janela é publicada como snapshot
+            lotes_guardados: Quadros mantidos para telas que reconectam (Last-Event-ID)
+        """
+        self.intervalo_coalescencia = intervalo_coalescencia
+        self.limite_diferencas = limite_diferencas
+        self._lock = threading.Lock()
+        # Mesmo lock, filas de espera separadas: uma mudança acorda só o
+        # publicador; as telas só acordam quando sai um quadro novo
+        self._ha_pendentes = threading.Condition(self._lock)
+        self._novo_quadro = threading.Condition(self._lock)
+        self._chave_ordem: Callable[[Any], Any] = _chave_urgencia
+        self._chaves: List[Tuple[Any, int]] = []     # (chave de ordem, ordem de entrada), ordenadas
+        self._entradas: List[Tuple[int, Any]] = []   # (id, paciente), na mesma ordem
+        self._chave_de: Dict[int, Tuple[Any, int]] = {}  # id(paciente) -> chave no espelho
+        self._ordem = itertools.count()
+        self._ids = itertools.count(1)
+        self._pendentes: List[Dict[str, Any]] = []
+        self._snapshot_pendente = False  # reordenação grande demais para virar eventos
+        self._quadros: Deque[Tuple[int, bytes]] = deque(maxlen=lotes_guardados)
+        self._seq = 0
+        self._snapshot: Optional[Tuple[int, bytes]] = None
+        self._fechado = False
+        self._encerrado = threading.Event()  # interrompe a espera da janela em fechar()
+        self.assinantes = 0
+        self._publicador = threading.Thread(target=self._publicar_continuamente, daemon=True)
+        self._publicador.start()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    @property
+    def seq(self) -> int:
+        """Número do último quadro publicado."""
+        return self._seq
+
+    # ----- lado do gerenciador -----
+
+    def usar_ordem(self, chave_ordem: Callable[[Any], Any]) -> None:
+        """
+        Define a chave de ordenação do espelho (a do backend da fila).
+
+        Args:
+            chave_ordem: Chave comparável de um paciente aguardando; menor é atendido antes
+        """
+        with self._lock:
+            self._chave_ordem = chave_ordem
+
+    def carregar(self, pacientes: Iterable[Any]) -> None:
+        """Substitui o espelho pelos pacientes dados, sem gerar eventos (fila já existente)."""
+        with self._lock:
+            pares = sorted(((self._chave(p), (next(self._ids), p)) for p in pacientes), key=lambda par: par[0])
+            self._chaves = [chave for chave, _ in pares]
+            self._entradas = [entrada for _, entrada in pares]
+            self._chave_de = {id(paciente): chave for chave, (_, paciente) in pares}
+            self._snapshot = None
+
+    def adicionados(self, pacientes: Iterable[Any]) -> None:
+        """Registra pacientes que entraram na fila."""
+        with self._lock:
+            for paciente in pacientes:
+                chave = self._chave(paciente)
+                posicao = bisect.bisect_right(self._chaves, chave)
+                identificador = next(self._ids)
+                self._chaves.insert(posicao, chave)
+                self._entradas.insert(posicao, (identificador, paciente))
+                self._chave_de[id(paciente)] = chave
+                self._pendentes.append({
+                    'tipo': 'adicionado', 'id': identificador, 'posicao': posicao,
+                    **_dados_paciente(paciente),
+                })
+            self._ha_pendentes.notify()
+
+    def chamado(self, paciente: Any) -> None:
+        """Registra o paciente que saiu da fila para atendimento."""
+        with self._lock:
+            posicao = self._posicao(paciente)
+            if posicao is None:
+                return
+            identificador = self._entradas[posicao][0]
+            del self._chaves[posicao]
+            del self._entradas[posicao]
+            self._chave_de.pop(id(paciente), None)
+            self._pendentes.append({'tipo': 'chamado', 'id': identificador, 'posicao': posicao})
+            self._ha_pendentes.notify()
+
+    def reordenar(self, pacientes: List[Any]) -> None:
+        """
+        Acompanha uma mudança de ordem feita pelo backend (envelhecimento, prazo vencido).
+
+        As chaves do espelho são sempre recalculadas, mesmo sem ninguém mudar
+        de lugar (as próximas inserções dependem delas). Cada paciente que
+        passou à frente vira um evento `movido`; com mais de
+        `limite_diferencas` movimentos, ou se o espelho divergir do backend,
+        o espelho é refeito a partir de `pacientes` e sai um snapshot.
+
+        Args:
+            pacientes: Os mesmos pacientes do espelho, na nova ordem de atendimento
+        """
+        with self._lock:
+            entradas = list(self._entradas)
+            movimentos: List[Dict[str, Any]] = []
+            refazer = len(pacientes) != len(entradas)
+            for destino, paciente in enumerate(pacientes if not refazer else ()):
+                if entradas[destino][1] is paciente:
+                    continue
+                origem = next((i for i in range(destino + 1, len(entradas)) if entradas[i][1] is paciente), None)
+                if origem is None or len(movimentos) == self.limite_diferencas:
+                    refazer = True  # espelho divergente ou reordenação grande
+                    break
+                entradas.insert(destino, entradas.pop(origem))
+                movimentos.append({'tipo': 'movido', 'id': entradas[destino][0], 'de': origem, 'para': destino})
+            if refazer:
+                ids = {id(outro): identificador for identificador, outro in self._entradas}
+                entradas = [(ids[id(outro)] if id(outro) in ids else next(self._ids), outro) for outro in pacientes]
+            # Chaves novas na nova ordem; a ordem de entrada continua desempatando
+            self._chaves = [self._chave(paciente) for _, paciente in entradas]
+            self._entradas = entradas
+            self._chave_de = {id(paciente): chave for chave, (_, paciente) in zip(self._chaves, entradas)}
+            if refazer:
+                self._snapshot_pendente = True
+            elif movimentos:
+                self._pendentes.extend(movimentos)
+            else:
+                return
+            self._ha_pendentes.notify()
+
+    # ----- lado das telas -----
+
+    def assinar(self, desde: Optional[int] = None, intervalo_ping: float = INTERVALO_PING) -> Iterator[bytes]:
+        """
+        Quadros SSE da fila: um snapshot (ou os quadros perdidos desde `desde`) e depois as mudanças.
+
+        Args:
+            desde: Último quadro recebido antes de uma reconexão (cabeçalho Last-Event-ID)
+            intervalo_ping: Segundos sem mudanças até enviar um comentário de keep-alive
+
+        Returns:
+            Iterador que bloqueia aguardando mudanças e termina quando o fluxo é fechado
+        """
+        with self._lock:
+            self.assinantes += 1
+        try:
+            ultimo = desde
+            while True:
+                with self._lock:
+                    if ultimo is not None and not self._tem_quadros_desde(ultimo):
+                        ultimo = None
+                    if ultimo is not None and ultimo >= self._seq and not self._fechado:
+                        self._novo_quadro.wait_for(lambda: self._seq > ultimo or self._fechado, intervalo_ping)
+                    if self._fechado:
+                        return
+                    if ultimo is None or not self._tem_quadros_desde(ultimo):
+                        ultimo, saida = self._snapshot_atual()
+                    elif ultimo >= self._seq:
+                        saida = b': ping\n\n'
+                    else:
+                        primeiro = self._quadros[0][0]
+                        saida = b''.join(quadro for _, quadro in
+                                         itertools.islice(self._quadros, ultimo + 1 - primeiro, None))
+                        ultimo = self._seq
+                yield saida
+        finally:
+            with self._lock:
+                self.assinantes -= 1
+
+    def fechar(self) -> None:
+        """Encerra a publicação e os iteradores de assinatura."""
+        with self._lock:
+            self._fechado = True
+            self._encerrado.set()
+            self._ha_pendentes.notify_all()
+            self._novo_quadro.notify_all()
+        self._publicador.join()
+
+    # ----- publicação -----
+
+    def publicar(self) -> int:
+        """Publica imediatamente as mudanças pendentes; retorna o número do último quadro."""
+        with self._lock:
+            self._publicar_pendentes()
+            return self._seq
+
+    def _publicar_continuamente(self) -> None:
+        while True:
+            with self._lock:
+                self._ha_pendentes.wait_for(lambda: self._pendentes or self._snapshot_pendente or self._fechado)
+                if self._fechado:
+                    return
+            # Junta a rajada: as mudanças da janela saem em um único quadro
+            self._encerrado.wait(self.intervalo_coalescencia)
+            with self._lock:
+                self._publicar_pendentes()
+
+    def _publicar_pendentes(self) -> None:
+        """Transforma as mudanças pendentes em um quadro (chamar com o lock)."""
+        if not self._pendentes and not self._snapshot_pendente:
+            return
+        pendentes, self._pendentes = self._pendentes, []
+        self._seq += 1
+        if len(pendentes) > self.limite_diferencas or self._snapshot_pendente:
+            self._snapshot_pendente = False
+            quadro = self._quadro_snapshot()
+        else:
+            dados = json.dumps(pendentes, ensure_ascii=False, separators=(',', ':'))
+            quadro = f"id: {self._seq}\nevent: mudancas\ndata: {dados}\n\n".encode('utf-8')
+        self._quadros.append((self._seq, quadro))
+        self._novo_quadro.notify_all()
+
+    def _snapshot_atual(self) -> Tuple[int, bytes]:
+        """(quadro atual, snapshot da fila inteira) (chamar com o lock)."""
+        self._publicar_pendentes()
+        if self._snapshot is None or self._snapshot[0] != self._seq:
+            self._quadro_snapshot()
+        return self._snapshot
+
+    def _quadro_snapshot(self) -> bytes:
+        pacientes = [dict(id=identificador, **_dados_paciente(paciente))
+                     for identificador, paciente in self._entradas]
+        dados = json.dumps({'pacientes': pacientes}, ensure_ascii=False, separators=(',', ':'))
+        quadro = f"id: {self._seq}\nevent: snapshot\ndata: {dados}\n\n".encode('utf-8')
+        self._snapshot = (self._seq, quadro)
+        return quadro
+
+    def _tem_quadros_desde(self, ultimo: int) -> bool:
+        if ultimo > self._seq:
+            return False  # quadro de outra execução do servidor
+        return ultimo == self._seq or (bool(self._quadros) and self._quadros[0][0] <= ultimo + 1)
+
+    def _chave(self, paciente: Any) -> Tuple[Any, int]:
+        return (self._chave_ordem(paciente), next(self._ordem))
+
+    def _posicao(self, paciente: Any) -> Optional[int]:
+        """Posição do paciente no espelho (normalmente a primeira: é o próximo da fila)."""
+        if self._entradas and self._entradas[0][1] is paciente:
+            return 0
+        chave = self._chave_de.get(id(paciente))
+        if chave is not None:
+            posicao = bisect.bisect_left(self._chaves, chave)
+            if posicao < len(self._entradas) and self._entradas[posicao][1] is paciente:
+                return posicao
+        # Mesmo objeto adicionado mais de uma vez: a chave guardada é a da última entrada
+        return next((posicao for posicao, (_, outro) in enumerate(self._entradas) if outro is paciente), None)
+
+
+class ReplicaFila:
+    """Cópia da fila mantida por uma tela a partir dos quadros SSE do FluxoFila."""
+
+    def __init__(self) -> None:
+        self.pacientes: List[Dict[str, Any]] = []
+        self.ultimo_quadro: Optional[int] = None
+
+    def aplicar(self, quadros: bytes) -> None:
+        """Aplica um ou mais quadros SSE recebidos."""
+        for bloco in quadros.decode('utf-8').split('\n\n'):
+            campos = dict(linha.split(': ', 1) for linha in bloco.split('\n') if ': ' in linha and linha[0] != ':')
+            if 'data' not in campos:
+                continue
+            dados = json.loads(campos['data'])
+            if campos.get('event') == 'snapshot':
+                self.pacientes = dados['pacientes']
+            else:
+                for evento in dados:
+                    if evento['tipo'] == 'adicionado':
+                        paciente = {chave: valor for chave, valor in evento.items() if chave not in ('tipo', 'posicao')}
+                        self.pacientes.insert(evento['posicao'], paciente)
+                    elif evento['tipo'] == 'movido':
+                        self.pacientes.insert(evento['para'], self.pacientes.pop(evento['de']))
+                    else:
+                        del self.pacientes[evento['posicao']]
+            self.ultimo_quadro = int(campos['id'])
+
+
+def _chave_urgencia(paciente: Any) -> Tuple[int, Any]:
+    return (-paciente.urgencia, paciente.timestamp)
+
+
+def _dados_paciente(paciente: Any) -> Dict[str, Any]:
+    return {
+        'nome': paciente.nome,
+        'idade': paciente.idade,
+        'urgencia': paciente.urgencia,
+        'chegada': paciente.timestamp.isoformat(),
+    }
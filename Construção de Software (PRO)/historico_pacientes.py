@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Histórico de atendimentos da triagem.
+Guarda cada paciente atendido com o instante do atendimento e o tempo de espera,
+com índices por paciente, por tempo e por urgência e agregados incrementais.
+
+Uso:
+    historico = HistoricoAtendimentos()
+    gerenciador = GerenciadorTriagem(historico=historico)
+    pagina = historico.consultar(inicio=uma_semana_atras, urgencia=5)
+"""
+
+import bisect
+import threading
+from array import array
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from monitor_sistema import PERCENTIS_RELATORIO, HistogramaLatencia
+from pacientes_colunares import PacienteArray, datetime_para_ns, ns_para_datetime
+from filas import NIVEIS_URGENCIA
+
+LIMITE_PADRAO_PAGINA = 50
+
+
+@dataclass(slots=True)
+class RegistroAtendimento:
+    """Um atendimento do histórico."""
+    id: int
+    paciente: Any  # Paciente
+    atendido_em: datetime
+    espera_segundos: float
+
+
+@dataclass
+class PaginaHistorico:
+    """
+    Página de uma consulta com paginação por cursor (keyset).
+
+    `cursor` é o id do último registro da página; passe-o como `apos` para
+    obter a página seguinte. É None quando não há mais registros.
+    """
+    registros: List[RegistroAtendimento] = field(default_factory=list)
+    cursor: Optional[int] = None
+
+
+class _AgregadoUrgencia:
+    """Contagem, soma e máximo da espera, mais histograma para percentis."""
+
+    __slots__ = ('contagem', 'soma_espera', 'espera_maxima', 'histograma')
+
+    def __init__(self):
+        self.contagem = 0
+        self.soma_espera = 0.0
+        self.espera_maxima = 0.0
+        self.histograma = HistogramaLatencia()
+
+    def registrar(self, espera: float):
+        self.contagem += 1
+        self.soma_espera += espera
+        if espera > self.espera_maxima:
+            self.espera_maxima = espera
+        self.histograma.registrar(espera)
+
+
+class HistoricoAtendimentos:
+    """
+    Histórico de atendimentos em colunas, apenas acrescentado.
+
+    Os ids são sequenciais e seguem a ordem dos atendimentos, então cada
+    índice (geral, por urgência, por paciente) é um array de ids já ordenado
+    no tempo: intervalos e páginas saem por busca binária, sem varredura.
+    Contagens, médias e percentis de espera são atualizados a cada registro.
+    """
+
+    def __init__(self):
+        self._pacientes = PacienteArray()
+        self._atendidos_ns = array('q')
+        self._esperas = array('d')
+        self._ids_por_urgencia: Dict[int, array] = {u: array('q') for u in NIVEIS_URGENCIA}
+        self._tempos_por_urgencia: Dict[int, array] = {u: array('q') for u in NIVEIS_URGENCIA}
+        self._ids_por_nome: Dict[str, array] = {}
+        self._agregados: Dict[int, _AgregadoUrgencia] = {u: _AgregadoUrgencia() for u in NIVEIS_URGENCIA}
+        self._por_dia: Dict[date, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, paciente: Any, atendido_em: datetime, espera_segundos: float) -> int:
+        """
+        Acrescenta um atendimento ao histórico.
+
+        Args:
+            paciente: Paciente atendido
+            atendido_em: Instante do atendimento
+            espera_segundos: Tempo entre a chegada e o atendimento
+
+        Returns:
+            Id do registro
+        """
+        atendido_ns = datetime_para_ns(atendido_em)
+        urgencia = paciente.urgencia
+        with self._lock:
+            # O índice temporal exige ordem; um relógio que volta atrás é
+            # registrado no último instante conhecido
+            if self._atendidos_ns and atendido_ns < self._atendidos_ns[-1]:
+                atendido_ns = self._atendidos_ns[-1]
+            id_registro = self._pacientes.anexar_paciente(paciente)
+            self._atendidos_ns.append(atendido_ns)
+            self._esperas.append(espera_segundos)
+            self._ids_por_urgencia[urgencia].append(id_registro)
+            self._tempos_por_urgencia[urgencia].append(atendido_ns)
+            chave = _chave_nome(paciente.nome)
+            ids_paciente = self._ids_por_nome.get(chave)
+            if ids_paciente is None:
+                ids_paciente = self._ids_por_nome[chave] = array('q')
+            ids_paciente.append(id_registro)
+            self._agregados[urgencia].registrar(espera_segundos)
+            dia = atendido_em.date()
+            contagens = self._por_dia.get(dia)
+            if contagens is None:
+                contagens = self._por_dia[dia] = [0] * (len(NIVEIS_URGENCIA) + 1)
+            contagens[urgencia] += 1
+        return id_registro
+
+    def __len__(self) -> int:
+        return len(self._atendidos_ns)
+
+    def __getitem__(self, id_registro: int) -> RegistroAtendimento:
+        if not 0 <= id_registro < len(self):
+            raise IndexError("Registro de atendimento inexistente")
+        return RegistroAtendimento(
+            id=id_registro,
+            paciente=self._pacientes[id_registro],
+            atendido_em=ns_para_datetime(self._atendidos_ns[id_registro]),
+            espera_segundos=self._esperas[id_registro]
+        )
+
+    def consultar(self, inicio: Optional[datetime] = None, fim: Optional[datetime] = None,
+                  urgencia: Optional[int] = None, apos: Optional[int] = None,
+                  limite: int = LIMITE_PADRAO_PAGINA) -> PaginaHistorico:
+        """
+        Atendimentos no intervalo [inicio, fim), em ordem cronológica.
+
+        Args:
+            inicio: Início do intervalo (None = desde o primeiro)
+            fim: Fim do intervalo, exclusivo (None = até o último)
+            urgencia: Filtra por nível de urgência
+            apos: Cursor da página anterior
+            limite: Máximo de registros na página
+
+        Returns:
+            Página de registros e cursor para a próxima
+
+        Raises:
+            ValueError: Se a urgência ou o limite forem inválidos
+        """
+        if urgencia is None:
+            ids, tempos = None, self._atendidos_ns
+        elif urgencia in self._ids_por_urgencia:
+            ids, tempos = self._ids_por_urgencia[urgencia], self._tempos_por_urgencia[urgencia]
+        else:
+            raise ValueError("Urgência deve estar entre 1 e 5")
+
+        with self._lock:
+            baixo = 0 if inicio is None else bisect.bisect_left(tempos, datetime_para_ns(inicio))
+            alto = len(tempos) if fim is None else bisect.bisect_left(tempos, datetime_para_ns(fim))
+            if apos is not None:
+                baixo = max(baixo, apos + 1 if ids is None else bisect.bisect_right(ids, apos))
+            return self._paginar(ids, baixo, alto, limite)
+
+    def por_paciente(self, nome: str, apos: Optional[int] = None,
+                     limite: int = LIMITE_PADRAO_PAGINA) -> PaginaHistorico:
+        """
+        Atendimentos de um paciente (nome sem diferenciar maiúsculas), em ordem cronológica.
+
+        Args:
+            nome: Nome do paciente
+            apos: Cursor da página anterior
+            limite: Máximo de registros na página
+
+        Returns:
+            Página de registros e cursor para a próxima
+        """
+        with self._lock:
+            ids = self._ids_por_nome.get(_chave_nome(nome), array('q'))
+            baixo = 0 if apos is None else bisect.bisect_right(ids, apos)
+            return self._paginar(ids, baixo, len(ids), limite)
+
+    def agregados(self, urgencia: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Estatísticas de espera mantidas incrementalmente (sem varrer registros).
+
+        Args:
+            urgencia: Nível de urgência (None = todos os níveis)
+
+        Returns:
+            Dicionário com contagem, espera média, máxima e percentis
+        """
+        with self._lock:
+            if urgencia is not None:
+                if urgencia not in self._agregados:
+                    raise ValueError("Urgência deve estar entre 1 e 5")
+                partes = [self._agregados[urgencia]]
+            else:
+                partes = list(self._agregados.values())
+            contagem = sum(parte.contagem for parte in partes)
+            histograma = HistogramaLatencia()
+            for parte in partes:
+                histograma.mesclar(parte.histograma)
+            resultado = {
+                'contagem': contagem,
+                'espera_media': sum(parte.soma_espera for parte in partes) / contagem if contagem else 0.0,
+                'espera_maxima': max(parte.espera_maxima for parte in partes),
+            }
+        resultado.update(histograma.percentis(PERCENTIS_RELATORIO))
+        return resultado
+
+    def atendimentos_por_dia(self, dia: date) -> Dict[int, int]:
+        """Número de atendimentos do dia por nível de urgência."""
+        with self._lock:
+            contagens = self._por_dia.get(dia)
+            return {u: contagens[u] if contagens else 0 for u in NIVEIS_URGENCIA}
+
+    def _paginar(self, ids: Optional[array], baixo: int, alto: int, limite: int) -> PaginaHistorico:
+        """Materializa ids[baixo:alto] até `limite` registros; chamar com o lock."""
+        if limite < 1:
+            raise ValueError("Limite da página deve ser positivo")
+        fim = min(alto, baixo + limite)
+        selecionados = range(baixo, fim) if ids is None else ids[baixo:fim]
+        registros = [self[id_registro] for id_registro in selecionados]
+        cursor = registros[-1].id if registros and fim < alto else None
+        return PaginaHistorico(registros, cursor)
+
+
+def _chave_nome(nome: str) -> str:
+    return " ".join(nome.split()).casefold()
@@ -4,14 +4,41 @@ Sistema de Logging e Métricas para Monitoramento Proativo
 Detecta falhas de entrada de dados e monitora performance das operações.
 """
 
+import atexit
 import logging
+import logging.handlers
+import itertools
 import json
+import math
+import os
+import queue
+import threading
 import time
+from array import array
 from datetime import datetime
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Set
+from dataclasses import dataclass, asdict, is_dataclass
 from functools import wraps
 
+from relogio import Instante, Relogio, obter_relogio
+
+
+# Políticas quando a fila de logs assíncrona está cheia
+POLITICAS_DESCARTE = ('bloquear', 'descartar_novos', 'descartar_antigos')
+
+# Amostras mantidas por métrica (memória constante por série)
+CAPACIDADE_PADRAO_METRICAS = 1024
+
+# Percentis publicados no relatório para métricas de tempo
+PERCENTIS_RELATORIO = (0.5, 0.9, 0.99)
+
+# Níveis de instrumentação do decorator monitorar_performance:
+# - desligado: chama a função diretamente
+# - contadores: apenas contadores pré-alocados (chamadas, erros, tempo em ns)
+# - amostrado: contadores + instrumentação completa em 1 de cada N chamadas
+# - completo: métrica e log em toda chamada (comportamento original)
+NIVEIS_INSTRUMENTACAO = ('desligado', 'contadores', 'amostrado', 'completo')
+
 
 @dataclass
 class Metrica:
@@ -23,19 +50,438 @@ class Metrica:
     detalhes: Optional[Dict[str, Any]] = None
 
 
+class SerieMetrica:
+    """
+    Armazenamento de capacidade fixa para uma série de métricas.
+    
+    Valores e timestamps (epoch em segundos) ficam em arrays circulares de
+    doubles; `detalhes` só ocupa espaço nas amostras que os possuem. Os
+    agregados (contagem, soma, mínimo, máximo) cobrem toda a vida da série,
+    inclusive amostras já sobrescritas.
+    """
+    
+    __slots__ = ('nome', 'categoria', 'capacidade', 'valores', 'timestamps',
+                 'detalhes', '_proximo', 'contagem', 'soma', 'minimo', 'maximo')
+    
+    def __init__(self, nome: str, categoria: str, capacidade: int = CAPACIDADE_PADRAO_METRICAS):
+        if capacidade < 1:
+            raise ValueError("Capacidade da série deve ser positiva")
+        self.nome = nome
+        self.categoria = categoria
+        self.capacidade = capacidade
+        self.valores = array('d', bytes(8 * capacidade))
+        self.timestamps = array('d', bytes(8 * capacidade))
+        self.detalhes: Dict[int, Dict[str, Any]] = {}
+        self._proximo = 0
+        self.contagem = 0
+        self.soma = 0.0
+        self.minimo = float('inf')
+        self.maximo = float('-inf')
+    
+    def adicionar(self, valor: float, timestamp: float, detalhes: Optional[Dict[str, Any]] = None):
+        """Grava amostra sobrescrevendo a mais antiga quando cheia."""
+        posicao = self._proximo
+        self.valores[posicao] = valor
+        self.timestamps[posicao] = timestamp
+        if detalhes is not None:
+            self.detalhes[posicao] = detalhes
+        elif self.detalhes:
+            self.detalhes.pop(posicao, None)
+        self._proximo = (posicao + 1) % self.capacidade
+        
+        self.contagem += 1
+        self.soma += valor
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+    
+    def __len__(self) -> int:
+        return min(self.contagem, self.capacidade)
+    
+    def recentes(self, quantidade: int) -> List[Metrica]:
+        """Retorna as últimas `quantidade` amostras, da mais antiga para a mais nova."""
+        quantidade = min(quantidade, len(self))
+        resultado = []
+        for deslocamento in range(quantidade, 0, -1):
+            posicao = (self._proximo - deslocamento) % self.capacidade
+            resultado.append(Metrica(
+                nome=self.nome,
+                valor=self.valores[posicao],
+                timestamp=datetime.fromtimestamp(self.timestamps[posicao]),
+                categoria=self.categoria,
+                detalhes=self.detalhes.get(posicao)
+            ))
+        return resultado
+    
+    def agregados(self) -> Dict[str, float]:
+        """Retorna agregados de toda a vida da série."""
+        return {
+            'contagem': self.contagem,
+            'soma': self.soma,
+            'media': self.soma / self.contagem if self.contagem else 0.0,
+            'minimo': self.minimo if self.contagem else 0.0,
+            'maximo': self.maximo if self.contagem else 0.0
+        }
+
+
+class EstatisticasFuncao:
+    """
+    Contadores pré-alocados de uma função decorada com monitorar_performance.
+    
+    As atualizações são leitura-modificação-escrita; um lock próprio (sem
+    disputa com as demais funções) evita perder contagens entre threads.
+    """
+    
+    __slots__ = ('nome', 'chamadas', 'erros', 'tempo_total_ns', 'tempo_max_ns', '_lock')
+    
+    def __init__(self, nome: str):
+        self.nome = nome
+        self._lock = threading.Lock()
+        self.zerar()
+    
+    def zerar(self):
+        """Volta os contadores a zero."""
+        with self._lock:
+            self.chamadas = 0
+            self.erros = 0
+            self.tempo_total_ns = 0
+            self.tempo_max_ns = 0
+    
+    def registrar(self, duracao_ns: int):
+        """Contabiliza uma chamada concluída."""
+        with self._lock:
+            self.chamadas += 1
+            self.tempo_total_ns += duracao_ns
+            if duracao_ns > self.tempo_max_ns:
+                self.tempo_max_ns = duracao_ns
+    
+    def registrar_erro(self):
+        """Contabiliza uma chamada que lançou exceção."""
+        with self._lock:
+            self.erros += 1
+    
+    def resumo(self) -> Dict[str, float]:
+        """Retorna contadores com tempos em segundos."""
+        with self._lock:
+            chamadas, erros = self.chamadas, self.erros
+            tempo_total_ns, tempo_max_ns = self.tempo_total_ns, self.tempo_max_ns
+        return {
+            'chamadas': chamadas,
+            'erros': erros,
+            'tempo_medio': tempo_total_ns / chamadas / 1e9 if chamadas else 0.0,
+            'tempo_max': tempo_max_ns / 1e9
+        }
+
+
+# Estatísticas de cada função decorada, criadas na decoração
+_estatisticas_funcoes: Dict[str, EstatisticasFuncao] = {}
+
+
+class HistogramaLatencia:
+    """
+    Histograma logarítmico de latências com erro relativo limitado.
+    
+    Cada valor cai no balde ceil(log_γ(v)), com γ = (1 + α) / (1 - α); o
+    representante de cada balde fica a no máximo α (padrão 1%) do valor
+    real. A faixa [valor_minimo, valor_maximo] é fixa, então o número de
+    baldes — e a memória — é limitado independentemente do volume de
+    amostras. Histogramas com a mesma precisão podem ser mesclados.
+    """
+    
+    __slots__ = ('precisao', 'valor_minimo', 'valor_maximo', '_log_gama',
+                 '_indice_minimo', '_indice_maximo', 'baldes', 'zeros', 'contagem')
+    
+    def __init__(self, precisao: float = 0.01, valor_minimo: float = 1e-9,
+                 valor_maximo: float = 1e7):
+        if not 0 < precisao < 1:
+            raise ValueError("Precisão do histograma deve estar entre 0 e 1")
+        self.precisao = precisao
+        self.valor_minimo = valor_minimo
+        self.valor_maximo = valor_maximo
+        self._log_gama = math.log((1 + precisao) / (1 - precisao))
+        self._indice_minimo = math.ceil(math.log(valor_minimo) / self._log_gama)
+        self._indice_maximo = math.ceil(math.log(valor_maximo) / self._log_gama)
+        self.baldes: Dict[int, int] = {}
+        self.zeros = 0
+        self.contagem = 0
+    
+    def registrar(self, valor: float):
+        """Conta uma amostra; valores abaixo de `valor_minimo` contam como zero."""
+        self.contagem += 1
+        if valor < self.valor_minimo:
+            self.zeros += 1
+            return
+        indice = min(math.ceil(math.log(valor) / self._log_gama), self._indice_maximo)
+        self.baldes[indice] = self.baldes.get(indice, 0) + 1
+    
+    def mesclar(self, outro: 'HistogramaLatencia'):
+        """Soma as contagens de outro histograma com a mesma configuração."""
+        if (outro.precisao, outro.valor_minimo, outro.valor_maximo) != \
+                (self.precisao, self.valor_minimo, self.valor_maximo):
+            raise ValueError("Histogramas com configurações diferentes")
+        for indice, quantidade in outro.baldes.items():
+            self.baldes[indice] = self.baldes.get(indice, 0) + quantidade
+        self.zeros += outro.zeros
+        self.contagem += outro.contagem
+    
+    def _representante(self, indice: int) -> float:
+        """Valor central do balde, com erro relativo de no máximo `precisao`."""
+        gama = math.exp(self._log_gama)
+        return 2 * gama ** indice / (gama + 1)
+    
+    def quantil(self, q: float) -> float:
+        """Retorna o quantil `q` (0-1) aproximado; 0.0 se não houver amostras."""
+        if not self.contagem:
+            return 0.0
+        posicao = q * (self.contagem - 1)
+        acumulado = self.zeros
+        if posicao < acumulado:
+            return 0.0
+        for indice in sorted(self.baldes):
+            acumulado += self.baldes[indice]
+            if posicao < acumulado:
+                return self._representante(indice)
+        return self._representante(max(self.baldes))
+    
+    def percentis(self, quantis=PERCENTIS_RELATORIO) -> Dict[str, float]:
+        """Retorna p50/p90/p99 (ou os quantis pedidos) e a contagem."""
+        resultado: Dict[str, float] = {'contagem': self.contagem}
+        for q in quantis:
+            resultado[f"p{q * 100:g}"] = self.quantil(q)
+        return resultado
+    
+    def faixas(self) -> List[tuple]:
+        """Retorna (limite_superior, contagem) de cada balde não vazio, em ordem."""
+        gama = math.exp(self._log_gama)
+        resultado = [(self.valor_minimo, self.zeros)] if self.zeros else []
+        resultado.extend(
+            (gama ** indice, self.baldes[indice]) for indice in sorted(self.baldes)
+        )
+        return resultado
+
+
+class _MensagemJSON:
+    """Mensagem de log serializada em JSON apenas quando o registro é gravado."""
+    
+    __slots__ = ('dados',)
+    
+    def __init__(self, dados: Any):
+        self.dados = dados
+    
+    def __str__(self) -> str:
+        dados = asdict(self.dados) if is_dataclass(self.dados) else self.dados
+        return json.dumps(dados, default=str)
+
+
+class _ArquivoEmLote(logging.FileHandler):
+    """FileHandler que não descarrega a cada registro; o escritor descarrega por lote."""
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _HandlerFilaLog(logging.handlers.QueueHandler):
+    """Encaminha registros ao escritor assíncrono sem formatá-los na thread chamadora."""
+    
+    def __init__(self, escritor: 'EscritorLogAssincrono'):
+        super().__init__(escritor._fila)
+        self.escritor = escritor
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A serialização fica para a thread do escritor
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        self.escritor.enfileirar(record)
+
+
+class EscritorLogAssincrono:
+    """
+    Grava logs em segundo plano, em lotes, a partir de uma fila limitada.
+    
+    Os loggers recebem um QueueHandler; uma thread dedicada drena a fila em
+    lotes de até `tamanho_lote` registros, formata, grava e descarrega cada
+    arquivo uma vez por lote. Quando a fila enche, a política define se o
+    produtor espera ('bloquear') ou se registros são descartados
+    ('descartar_novos' / 'descartar_antigos').
+    """
+    
+    _SENTINELA = object()
+    
+    def __init__(self, capacidade: int = 10000, tamanho_lote: int = 256,
+                 politica: str = 'bloquear'):
+        if politica not in POLITICAS_DESCARTE:
+            raise ValueError(f"Política de descarte inválida: {politica}")
+        self.politica = politica
+        self.tamanho_lote = tamanho_lote
+        self.descartados = 0
+        self.lotes_gravados = 0
+        self._fila: queue.Queue = queue.Queue(maxsize=capacidade)
+        self._destinos: Dict[str, List[logging.Handler]] = {}
+        self._handlers_fila: Dict[str, logging.Handler] = {}
+        self._lock = threading.Lock()
+        self._lock_descartes = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._encerrado = False
+    
+    def registrar_destino(self, logger: logging.Logger, handler: logging.Handler) -> logging.Handler:
+        """
+        Passa a gravar os registros de `logger` em `handler` via fila.
+        
+        Returns:
+            QueueHandler anexado ao logger
+        """
+        if logger.name not in self._destinos:
+            self._destinos[logger.name] = []
+            self._handlers_fila[logger.name] = _HandlerFilaLog(self)
+            logger.addHandler(self._handlers_fila[logger.name])
+        self._destinos[logger.name].append(handler)
+        return self._handlers_fila[logger.name]
+    
+    def iniciar(self):
+        """Inicia a thread de gravação."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._executar, name='escritor-log-triagem', daemon=True
+            )
+            self._thread.start()
+    
+    def enfileirar(self, registro: logging.LogRecord):
+        """Enfileira registro aplicando a política de descarte."""
+        if self._encerrado:
+            # Após o encerramento, grava de forma síncrona para não perder nada
+            with self._lock:
+                self._gravar([registro])
+            return
+        
+        if self.politica == 'bloquear':
+            self._fila.put(registro)
+            return
+        
+        while True:
+            try:
+                self._fila.put_nowait(registro)
+                return
+            except queue.Full:
+                with self._lock_descartes:
+                    self.descartados += 1
+                if self.politica == 'descartar_novos':
+                    return
+                try:
+                    self._fila.get_nowait()
+                    self._fila.task_done()
+                except queue.Empty:
+                    pass
+    
+    def descarregar(self):
+        """Aguarda até que todos os registros enfileirados tenham sido gravados."""
+        if self._thread is not None and not self._encerrado:
+            self._fila.join()
+    
+    def encerrar(self):
+        """Grava os registros pendentes, encerra a thread e fecha os arquivos."""
+        if self._encerrado:
+            return
+        if self._thread is not None:
+            self._fila.put(self._SENTINELA)
+            self._thread.join()
+        self._encerrado = True
+        for handlers in self._destinos.values():
+            for handler in handlers:
+                handler.flush()
+    
+    def _executar(self):
+        """Laço da thread: drena a fila em lotes até receber a sentinela."""
+        while True:
+            lote = [self._fila.get()]
+            while len(lote) < self.tamanho_lote:
+                try:
+                    lote.append(self._fila.get_nowait())
+                except queue.Empty:
+                    break
+            
+            parar = any(registro is self._SENTINELA for registro in lote)
+            with self._lock:
+                self._gravar([r for r in lote if r is not self._SENTINELA])
+            for _ in lote:
+                self._fila.task_done()
+            if parar:
+                return
+    
+    def _gravar(self, lote: List[logging.LogRecord]):
+        """Grava um lote e descarrega cada handler usado uma única vez."""
+        usados = set()
+        for registro in lote:
+            for handler in self._destinos.get(registro.name, ()):
+                if registro.levelno >= handler.level:
+                    handler.handle(registro)
+                    usados.add(handler)
+        for handler in usados:
+            handler.flush()
+        if lote:
+            self.lotes_gravados += 1
+
+
 class MonitorTriagem:
     """Sistema de monitoramento para triagem de pacientes."""
     
-    def __init__(self):
-        self.metricas: Dict[str, list] = {}
+    def __init__(self, assincrono: bool = True, capacidade_fila_log: int = 10000,
+                 politica_descarte: str = 'bloquear', tamanho_lote_log: int = 256,
+                 capacidade_metricas: int = CAPACIDADE_PADRAO_METRICAS,
+                 nivel_instrumentacao: str = 'completo', amostragem: int = 100,
+                 diretorio_logs: str = '.', relogio: Optional[Relogio] = None):
+        """
+        Args:
+            assincrono: Grava logs em thread separada, em lotes
+            capacidade_fila_log: Máximo de registros aguardando gravação
+            politica_descarte: Comportamento com a fila cheia (ver POLITICAS_DESCARTE)
+            tamanho_lote_log: Máximo de registros gravados por lote
+            capacidade_metricas: Amostras recentes mantidas por métrica
+            nivel_instrumentacao: Nível do decorator (ver NIVEIS_INSTRUMENTACAO)
+            amostragem: No nível 'amostrado', instrumenta 1 de cada N chamadas
+            diretorio_logs: Diretório dos arquivos de log (abertos só na primeira gravação)
+            relogio: Fonte dos instantes de métricas e logs (padrão: relogio.obter_relogio())
+        """
+        self.diretorio_logs = diretorio_logs
+        self._relogio = relogio
+        self._handlers_anexados: List[tuple] = []
+        self._encerrado = False
+        self.configurar_instrumentacao(nivel_instrumentacao, amostragem)
+        self.capacidade_metricas = capacidade_metricas
+        self.metricas: Dict[str, SerieMetrica] = {}
+        # Histogramas de todas as métricas tempo_* e da espera por urgência
+        self.histogramas: Dict[str, HistogramaLatencia] = {}
+        self.espera_por_urgencia: Dict[int, HistogramaLatencia] = {}
         self.contadores = {
             'pacientes_adicionados': 0,
             'pacientes_atendidos': 0,
             'erros_validacao': 0,
             'operacoes_ordenacao': 0,
-            'tempo_total_ordenacao': 0.0
+            'tempo_total_ordenacao': 0.0,
+            'alertas_threshold': 0
         }
+        # Métricas acima do threshold: o alerta só vai para o stdout ao cruzá-lo
+        self._acima_threshold: Set[str] = set()
+        # Contadores e métricas podem ser atualizados por várias threads
+        self._lock_contadores = threading.Lock()
+        self._lock_metricas = threading.Lock()
+        self.escritor: Optional[EscritorLogAssincrono] = None
+        if assincrono:
+            self.escritor = EscritorLogAssincrono(
+                capacidade=capacidade_fila_log,
+                tamanho_lote=tamanho_lote_log,
+                politica=politica_descarte
+            )
         self._configurar_logging()
+        if self.escritor is not None:
+            self.escritor.iniciar()
+        atexit.register(self.encerrar)
     
     def _configurar_logging(self):
         """Configura sistema de logging estruturado."""
@@ -51,185 +497,470 @@ class MonitorTriagem:
         self.error_logger = logging.getLogger('triagem_erros')
         self.error_logger.setLevel(logging.ERROR)
         
+        # Configuração idempotente: handlers de um monitor anterior são liberados
+        for logger in (self.logger, self.metrics_logger, self.error_logger):
+            _liberar_handlers_monitor(logger)
+        
         # Formatter estruturado
         formatter = logging.Formatter(
             '%(asctime)s | %(name)s | %(levelname)s | %(message)s'
         )
         
+        # No modo assíncrono os arquivos só são descarregados a cada lote
+        classe_handler = _ArquivoEmLote if self.escritor is not None else logging.FileHandler
+        
         # Handler para arquivo de logs
-        file_handler = logging.FileHandler('triagem_sistema.log')
+        file_handler = classe_handler(self._caminho_log('triagem_sistema.log'), delay=True)
         file_handler.setFormatter(formatter)
         
         # Handler para métricas
-        metrics_handler = logging.FileHandler('triagem_metricas.log')
+        metrics_handler = classe_handler(self._caminho_log('triagem_metricas.log'), delay=True)
         metrics_handler.setFormatter(formatter)
         
         # Handler para erros
-        error_handler = logging.FileHandler('triagem_erros.log')
+        error_handler = classe_handler(self._caminho_log('triagem_erros.log'), delay=True)
         error_handler.setFormatter(formatter)
         
         # Adicionar handlers
-        self.logger.addHandler(file_handler)
-        self.metrics_logger.addHandler(metrics_handler)
-        self.error_logger.addHandler(error_handler)
+        self._handlers_arquivo = [file_handler, metrics_handler, error_handler]
+        for logger, handler in ((self.logger, file_handler),
+                                (self.metrics_logger, metrics_handler),
+                                (self.error_logger, error_handler)):
+            if self.escritor is not None:
+                anexado = self.escritor.registrar_destino(logger, handler)
+            else:
+                logger.addHandler(handler)
+                anexado = handler
+            anexado._monitor_triagem = self
+            self._handlers_anexados.append((logger, anexado))
+    
+    @property
+    def relogio(self) -> Relogio:
+        """Relógio dos registros: o recebido na criação ou o padrão do momento."""
+        return self._relogio if self._relogio is not None else obter_relogio()
+    
+    def _instante(self, instante_ns: Optional[int]) -> Instante:
+        """Instante de um registro: o da operação, se informado, ou o atual."""
+        relogio = self.relogio
+        return Instante(relogio.agora_ns() if instante_ns is None else instante_ns, relogio)
+    
+    def _caminho_log(self, nome_arquivo: str) -> str:
+        """Caminho de um arquivo de log no diretório configurado."""
+        return os.path.join(self.diretorio_logs, nome_arquivo)
     
-    def log_operacao(self, operacao: str, detalhes: Dict[str, Any]):
-        """Registra operação do sistema."""
+    def configurar_instrumentacao(self, nivel: str, amostragem: Optional[int] = None):
+        """
+        Define o nível de instrumentação do decorator monitorar_performance.
+        
+        Args:
+            nivel: Um dos NIVEIS_INSTRUMENTACAO
+            amostragem: Instrumenta 1 de cada N chamadas no nível 'amostrado'
+        """
+        if nivel not in NIVEIS_INSTRUMENTACAO:
+            raise ValueError(f"Nível de instrumentação inválido: {nivel}")
+        if amostragem is not None:
+            if amostragem < 1:
+                raise ValueError("Amostragem deve ser pelo menos 1")
+            self.amostragem = amostragem
+        self.nivel_instrumentacao = nivel
+    
+    def descarregar(self):
+        """Aguarda a gravação de todos os logs pendentes."""
+        if self.escritor is not None:
+            self.escritor.descarregar()
+    
+    def encerrar(self):
+        """Grava logs pendentes, desanexa os handlers e fecha os arquivos."""
+        if self._encerrado:
+            return
+        self._encerrado = True
+        if self.escritor is not None:
+            self.escritor.encerrar()
+        for logger, handler in self._handlers_anexados:
+            logger.removeHandler(handler)
+        for handler in self._handlers_arquivo:
+            handler.close()
+        atexit.unregister(self.encerrar)
+    
+    def log_operacao(self, operacao: str, detalhes: Dict[str, Any], instante_ns: Optional[int] = None):
+        """
+        Registra operação do sistema.
+        
+        Args:
+            operacao: Nome da operação
+            detalhes: Dados do registro (serializados só na gravação)
+            instante_ns: Instante da operação no relógio do monitor (padrão: agora)
+        """
         log_data = {
             'operacao': operacao,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': self._instante(instante_ns),
             'detalhes': detalhes
         }
-        self.logger.info(json.dumps(log_data))
+        self.logger.info(_MensagemJSON(log_data))
+    
+    def incrementar(self, contador: str, valor: float = 1) -> float:
+        """Incrementa um contador de forma atômica e retorna o novo valor."""
+        with self._lock_contadores:
+            self.contadores[contador] += valor
+            return self.contadores[contador]
     
-    def log_erro_validacao(self, erro: str, dados_entrada: Dict[str, Any]):
+    def log_erro_validacao(self, erro: str, dados_entrada: Dict[str, Any], instante_ns: Optional[int] = None):
         """Registra erro de validação de dados."""
-        self.contadores['erros_validacao'] += 1
+        total_erros = self.incrementar('erros_validacao')
+        instante = self._instante(instante_ns)
         
         erro_data = {
             'tipo_erro': 'validacao_entrada',
             'erro': erro,
             'dados_entrada': dados_entrada,
-            'timestamp': datetime.now().isoformat(),
-            'contador_total': self.contadores['erros_validacao']
+            'timestamp': instante,
+            'contador_total': total_erros
         }
         
-        self.error_logger.error(json.dumps(erro_data))
+        self.error_logger.error(_MensagemJSON(erro_data))
         
         # Alerta se muitos erros
-        if self.contadores['erros_validacao'] % 5 == 0:
-            self._alerta_erros_frequentes()
-    
-    def registrar_metrica(self, nome: str, valor: float, categoria: str, detalhes: Dict[str, Any] = None):
-        """Registra métrica de performance."""
-        metrica = Metrica(
-            nome=nome,
-            valor=valor,
-            timestamp=datetime.now(),
-            categoria=categoria,
-            detalhes=detalhes
-        )
+        if total_erros % 5 == 0:
+            self._alerta_erros_frequentes(instante)
+    
+    def log_erros_validacao_lote(self, erros: List[Dict[str, Any]], total_linhas: int,
+                                 instante_ns: Optional[int] = None):
+        """
+        Registra em um único registro os erros de validação de um lote.
         
-        if nome not in self.metricas:
-            self.metricas[nome] = []
+        Args:
+            erros: Um dicionário por linha rejeitada ('linha', 'erro', 'dados_entrada')
+            total_linhas: Quantidade de linhas recebidas no lote
+            instante_ns: Instante da operação no relógio do monitor (padrão: agora)
+        """
+        total_erros = self.incrementar('erros_validacao', len(erros))
+        anterior = total_erros - len(erros)
+        instante = self._instante(instante_ns)
         
-        self.metricas[nome].append(metrica)
+        erro_data = {
+            'tipo_erro': 'validacao_lote',
+            'linhas_recebidas': total_linhas,
+            'linhas_rejeitadas': len(erros),
+            'erros': erros,
+            'timestamp': instante,
+            'contador_total': total_erros
+        }
+        
+        self.error_logger.error(_MensagemJSON(erro_data))
+        
+        # Alerta se o lote cruzou um múltiplo de 5 erros
+        if total_erros // 5 > anterior // 5:
+            self._alerta_erros_frequentes(instante)
+    
+    def registrar_metrica(self, nome: str, valor: float, categoria: str, detalhes: Dict[str, Any] = None,
+                          instante_ns: Optional[int] = None):
+        """
+        Registra métrica de performance.
+        
+        Args:
+            nome: Nome da métrica (tempo_* também alimenta um histograma)
+            valor: Valor medido
+            categoria: Categoria da métrica
+            detalhes: Dados adicionais da amostra
+            instante_ns: Instante da operação no relógio do monitor (padrão: agora);
+                uma operação que gera várias métricas e logs passa o mesmo instante a todos
+        """
+        instante = self._instante(instante_ns)
+        
+        with self._lock_metricas:
+            serie = self.metricas.get(nome)
+            if serie is None:
+                serie = self.metricas[nome] = SerieMetrica(nome, categoria, self.capacidade_metricas)
+            
+            serie.adicionar(valor, instante.ns / 1e9, detalhes)
+            
+            if nome.startswith('tempo_'):
+                self._registrar_histograma(nome, valor, detalhes)
         
-        # Log da métrica
-        self.metrics_logger.info(json.dumps(asdict(metrica), default=str))
+        # Log da métrica (mesmos campos de Metrica; o instante só é formatado na gravação)
+        self.metrics_logger.info(_MensagemJSON({
+            'nome': nome,
+            'valor': valor,
+            'timestamp': instante,
+            'categoria': categoria,
+            'detalhes': detalhes
+        }))
         
         # Verificar thresholds
-        self._verificar_thresholds(nome, valor)
+        self._verificar_thresholds(nome, valor, instante)
+    
+    def _registrar_histograma(self, nome: str, valor: float, detalhes: Optional[Dict[str, Any]]):
+        """Atualiza o histograma da métrica e, para tempo_espera, o da urgência."""
+        histograma = self.histogramas.get(nome)
+        if histograma is None:
+            histograma = self.histogramas[nome] = HistogramaLatencia()
+        histograma.registrar(valor)
+        
+        if nome == 'tempo_espera' and detalhes and 'urgencia' in detalhes:
+            urgencia = detalhes['urgencia']
+            histograma = self.espera_por_urgencia.get(urgencia)
+            if histograma is None:
+                histograma = self.espera_por_urgencia[urgencia] = HistogramaLatencia()
+            histograma.registrar(valor)
     
-    def _verificar_thresholds(self, nome: str, valor: float):
+    def _verificar_thresholds(self, nome: str, valor: float, instante: Instante):
         """Verifica se métricas excedem thresholds críticos."""
         thresholds = {
             'tempo_ordenacao': 1.0,  # 1 segundo
             'tamanho_fila': 50,      # 50 pacientes
-            'tempo_atendimento': 300  # 5 minutos
+            'tempo_espera': 300      # 5 minutos
         }
         
-        if nome in thresholds and valor > thresholds[nome]:
-            self._alerta_threshold(nome, valor, thresholds[nome])
+        if nome not in thresholds:
+            return
+        with self._lock_contadores:
+            if valor <= thresholds[nome]:
+                self._acima_threshold.discard(nome)
+                return
+            cruzou = nome not in self._acima_threshold
+            self._acima_threshold.add(nome)
+            self.contadores['alertas_threshold'] += 1
+        # tempo_espera é uma amostra por paciente atendido: fica só no log de erros
+        self._alerta_threshold(nome, valor, thresholds[nome], instante,
+                               imprimir=cruzou and nome != 'tempo_espera')
     
-    def _alerta_threshold(self, metrica: str, valor: float, threshold: float):
+    def _alerta_threshold(self, metrica: str, valor: float, threshold: float, instante: Instante,
+                          imprimir: bool = True):
         """Gera alerta quando threshold é excedido."""
         alerta = {
             'tipo': 'threshold_excedido',
             'metrica': metrica,
             'valor_atual': valor,
             'threshold': threshold,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': instante
         }
         
-        self.error_logger.warning(json.dumps(alerta))
-        print(f"⚠️  ALERTA: {metrica} = {valor} (threshold: {threshold})")
+        self.error_logger.warning(_MensagemJSON(alerta))
+        if imprimir:
+            print(f"⚠️  ALERTA: {metrica} = {valor} (threshold: {threshold})")
     
-    def _alerta_erros_frequentes(self):
+    def _alerta_erros_frequentes(self, instante: Instante):
         """Alerta para erros de validação frequentes."""
         alerta = {
             'tipo': 'erros_frequentes',
             'total_erros': self.contadores['erros_validacao'],
-            'timestamp': datetime.now().isoformat()
+            'timestamp': instante
         }
         
-        self.error_logger.warning(json.dumps(alerta))
+        self.error_logger.warning(_MensagemJSON(alerta))
         print(f"🚨 ALERTA: {self.contadores['erros_validacao']} erros de validação detectados!")
     
     def obter_relatorio_metricas(self) -> Dict[str, Any]:
         """Gera relatório de métricas."""
+        with self._lock_contadores:
+            contadores = self.contadores.copy()
+        
         relatorio = {
-            'timestamp': datetime.now().isoformat(),
-            'contadores': self.contadores.copy(),
-            'metricas_recentes': {}
+            'timestamp': self.relogio.agora().isoformat(),
+            'contadores': contadores,
+            'metricas_recentes': {},
+            'agregados': {},
+            'percentis': {},
+            'histogramas': {},
+            'tempo_espera_por_urgencia': {},
+            'funcoes': {
+                nome: estatisticas.resumo()
+                for nome, estatisticas in _estatisticas_funcoes.items()
+                if estatisticas.chamadas or estatisticas.erros
+            }
         }
         
-        # Últimas 10 métricas de cada tipo
-        for nome, metricas in self.metricas.items():
-            relatorio['metricas_recentes'][nome] = [
-                asdict(m) for m in metricas[-10:]
-            ]
+        with self._lock_metricas:
+            # Últimas 10 métricas de cada tipo
+            for nome, serie in self.metricas.items():
+                relatorio['metricas_recentes'][nome] = [
+                    asdict(m) for m in serie.recentes(10)
+                ]
+                relatorio['agregados'][nome] = serie.agregados()
+            
+            for nome, histograma in self.histogramas.items():
+                relatorio['percentis'][nome] = histograma.percentis()
+                relatorio['histogramas'][nome] = histograma.faixas()
+            
+            for urgencia in sorted(self.espera_por_urgencia, reverse=True):
+                relatorio['tempo_espera_por_urgencia'][urgencia] = \
+                    self.espera_por_urgencia[urgencia].percentis()
         
         return relatorio
 
 
 def monitorar_performance(categoria: str = "geral"):
-    """Decorator para monitorar performance de funções."""
+    """
+    Decorator para monitorar performance de funções.
+    
+    O custo por chamada depende de `monitor.nivel_instrumentacao`; fora do
+    nível 'completo' apenas contadores pré-alocados são atualizados, com
+    `time.perf_counter_ns`, salvo nas chamadas amostradas.
+    """
     def decorator(func):
+        nome_funcao = func.__name__
+        estatisticas = _estatisticas_funcoes.setdefault(
+            func.__qualname__, EstatisticasFuncao(nome_funcao)
+        )
+        # next() de um itertools.count é atômico: sem lock no caminho amostrado
+        contador_amostragem = itertools.count(1)
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            inicio = time.time()
+            atual = _instancia if _instancia is not None else obter_monitor()
+            nivel = atual.nivel_instrumentacao
+            if nivel == 'desligado':
+                return func(*args, **kwargs)
+            
+            completo = nivel == 'completo'
+            if nivel == 'amostrado':
+                if next(contador_amostragem) % atual.amostragem == 0:
+                    completo = True
             
+            inicio = time.perf_counter_ns()
             try:
                 resultado = func(*args, **kwargs)
-                
-                # Registrar sucesso
-                tempo_execucao = time.time() - inicio
-                monitor.registrar_metrica(
-                    nome=f"tempo_{func.__name__}",
-                    valor=tempo_execucao,
-                    categoria=categoria,
-                    detalhes={'funcao': func.__name__, 'sucesso': True}
-                )
-                
-                monitor.log_operacao(
-                    operacao=func.__name__,
-                    detalhes={'tempo_execucao': tempo_execucao, 'sucesso': True}
-                )
-                
-                return resultado
-                
             except Exception as e:
-                # Registrar erro
-                tempo_execucao = time.time() - inicio
-                monitor.log_erro_validacao(
-                    erro=str(e),
-                    dados_entrada={'funcao': func.__name__, 'args': str(args)[:100]}
-                )
-                
-                monitor.registrar_metrica(
-                    nome=f"erro_{func.__name__}",
-                    valor=1,
-                    categoria="erros",
-                    detalhes={'funcao': func.__name__, 'erro': str(e)}
-                )
-                
+                estatisticas.registrar_erro()
+                if completo:
+                    _registrar_erro_funcao(nome_funcao, e, args, _relogio_da_chamada(args))
                 raise
+            
+            duracao_ns = time.perf_counter_ns() - inicio
+            estatisticas.registrar(duracao_ns)
+            if completo:
+                _registrar_sucesso_funcao(nome_funcao, categoria, duracao_ns / 1e9, _relogio_da_chamada(args))
+            return resultado
         
         return wrapper
     return decorator
 
 
-# Instância global do monitor
-monitor = MonitorTriagem()
+def _relogio_da_chamada(args: tuple) -> Optional[Relogio]:
+    """Relógio da instância do método monitorado (ex.: GerenciadorTriagem.relogio), se houver."""
+    relogio = getattr(args[0], 'relogio', None) if args else None
+    return relogio if isinstance(relogio, Relogio) else None
+
 
+def _registrar_sucesso_funcao(nome_funcao: str, categoria: str, tempo_execucao: float,
+                              relogio: Optional[Relogio] = None):
+    """Instrumentação completa de uma chamada bem-sucedida, no relógio da instância (ou no do monitor)."""
+    monitor = obter_monitor()
+    instante_ns = (relogio if relogio is not None else monitor.relogio).agora_ns()
+    monitor.registrar_metrica(
+        nome=f"tempo_{nome_funcao}",
+        valor=tempo_execucao,
+        categoria=categoria,
+        detalhes={'funcao': nome_funcao, 'sucesso': True},
+        instante_ns=instante_ns
+    )
+    
+    monitor.log_operacao(
+        operacao=nome_funcao,
+        detalhes={'tempo_execucao': tempo_execucao, 'sucesso': True},
+        instante_ns=instante_ns
+    )
+
+
+def _registrar_erro_funcao(nome_funcao: str, erro: Exception, args: tuple,
+                           relogio: Optional[Relogio] = None):
+    """Instrumentação completa de uma chamada que lançou exceção, no relógio da instância (ou no do monitor)."""
+    monitor = obter_monitor()
+    instante_ns = (relogio if relogio is not None else monitor.relogio).agora_ns()
+    monitor.log_erro_validacao(
+        erro=str(erro),
+        dados_entrada={'funcao': nome_funcao, 'args': str(args)[:100]},
+        instante_ns=instante_ns
+    )
+    
+    monitor.registrar_metrica(
+        nome=f"erro_{nome_funcao}",
+        valor=1,
+        categoria="erros",
+        detalhes={'funcao': nome_funcao, 'erro': str(erro)},
+        instante_ns=instante_ns
+    )
 
-def validar_entrada_paciente(nome: str, idade: int, urgencia: int) -> bool:
-    """Valida dados de entrada do paciente com logging."""
+
+def _liberar_handlers_monitor(logger: logging.Logger):
+    """Encerra monitores que ainda tenham handlers anexados ao logger."""
+    for handler in list(logger.handlers):
+        dono = getattr(handler, '_monitor_triagem', None)
+        if dono is not None:
+            dono.encerrar()
+            logger.removeHandler(handler)
+
+
+# Instância global do monitor, criada sob demanda (ver obter_monitor)
+_instancia: Optional[MonitorTriagem] = None
+_configuracao: Dict[str, Any] = {}
+_lock_instancia = threading.Lock()
+
+
+def obter_monitor() -> MonitorTriagem:
+    """Retorna o monitor global, criando-o no primeiro uso."""
+    global _instancia
+    instancia = _instancia
+    if instancia is None:
+        with _lock_instancia:
+            if _instancia is None:
+                _instancia = MonitorTriagem(**_configuracao)
+            instancia = _instancia
+    return instancia
+
+
+def configurar(**opcoes) -> None:
+    """
+    Define as opções do monitor global (mesmos argumentos de MonitorTriagem).
+    
+    Um monitor já criado é encerrado; o próximo uso cria outro com as
+    novas opções, com contadores e métricas zerados (inclusive os das
+    funções decoradas).
+    """
+    global _instancia, _configuracao
+    with _lock_instancia:
+        anterior, _instancia = _instancia, None
+        _configuracao = dict(opcoes)
+        for estatisticas in _estatisticas_funcoes.values():
+            estatisticas.zerar()
+    if anterior is not None:
+        anterior.encerrar()
+
+
+def encerrar() -> None:
+    """Encerra o monitor global, gravando logs pendentes e fechando arquivos."""
+    global _instancia
+    with _lock_instancia:
+        anterior, _instancia = _instancia, None
+    if anterior is not None:
+        anterior.encerrar()
+
+
+class _MonitorPreguicoso:
+    """Acesso ao monitor global que só o cria quando um atributo é usado."""
+    
+    __slots__ = ()
+    
+    def __getattr__(self, nome: str):
+        return getattr(obter_monitor(), nome)
+    
+    def __setattr__(self, nome: str, valor: Any):
+        setattr(obter_monitor(), nome, valor)
+    
+    def __repr__(self) -> str:
+        estado = 'ativo' if _instancia is not None else 'não criado'
+        return f"<monitor de triagem ({estado})>"
+
+
+monitor = _MonitorPreguicoso()
+
+
+def verificar_dados_paciente(nome: str, idade: int, urgencia: int) -> List[str]:
+    """Retorna a lista de erros dos dados do paciente, sem registrar nada."""
     erros = []
     
     # Validar nome
-    if not nome or not nome.strip():
+    if not isinstance(nome, str) or not nome.strip():
         erros.append("Nome não pode ser vazio")
     elif len(nome.strip()) < 2:
         erros.append("Nome deve ter pelo menos 2 caracteres")
@@ -248,11 +979,19 @@ def validar_entrada_paciente(nome: str, idade: int, urgencia: int) -> bool:
     elif not 1 <= urgencia <= 5:
         erros.append("Urgência deve estar entre 1 e 5")
     
+    return erros
+
+
+def validar_entrada_paciente(nome: str, idade: int, urgencia: int, instante_ns: Optional[int] = None) -> bool:
+    """Valida dados de entrada do paciente com logging (no instante da operação, se informado)."""
+    erros = verificar_dados_paciente(nome, idade, urgencia)
+    
     # Registrar erros se houver
     if erros:
         monitor.log_erro_validacao(
             erro="; ".join(erros),
-            dados_entrada={'nome': nome, 'idade': idade, 'urgencia': urgencia}
+            dados_entrada={'nome': nome, 'idade': idade, 'urgencia': urgencia},
+            instante_ns=instante_ns
         )
         return False
     
@@ -277,6 +1016,13 @@ def gerar_relatorio_sistema():
         tempo_medio = relatorio['contadores']['tempo_total_ordenacao'] / relatorio['contadores']['operacoes_ordenacao']
         print(f"⏱️  Tempo médio de ordenação: {tempo_medio:.3f}s")
     
+    if relatorio['tempo_espera_por_urgencia']:
+        print("⌛ Tempo de espera por urgência (p50 / p90 / p99):")
+        for urgencia, percentis in relatorio['tempo_espera_por_urgencia'].items():
+            print(f"   Urgência {urgencia}: {percentis['p50']:.1f}s / "
+                  f"{percentis['p90']:.1f}s / {percentis['p99']:.1f}s "
+                  f"({percentis['contagem']} atendimentos)")
+    
     print("="*60)
     
     return relatorio
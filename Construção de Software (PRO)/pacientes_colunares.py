@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Armazenamento colunar de pacientes para grandes volumes em memória.
+Guarda nomes, idades, urgências e chegadas em arrays tipados.
+"""
+
+from array import array
+from datetime import datetime
+from typing import Iterable, Iterator, List
+
+from triagem import Paciente
+
+
+def datetime_para_ns(momento: datetime) -> int:
+    """Converte datetime (ingênuo = horário local) em nanossegundos desde a época."""
+    return round(momento.timestamp() * 1_000_000) * 1000
+
+
+def ns_para_datetime(nanossegundos: int) -> datetime:
+    """Converte nanossegundos desde a época em datetime local (precisão de µs)."""
+    segundos, resto = divmod(nanossegundos, 1_000_000_000)
+    return datetime.fromtimestamp(segundos).replace(microsecond=resto // 1000)
+
+
+class PacienteArray:
+    """
+    Pacientes armazenados em colunas tipadas.
+    
+    Nomes ficam concatenados em UTF-8 em um único bytearray, com os
+    deslocamentos em array('Q'); idade e urgência usam um byte cada
+    e a chegada é um inteiro de 64 bits em nanossegundos desde a época.
+    Objetos Paciente só são materializados na leitura.
+    """
+    
+    def __init__(self, pacientes: Iterable[Paciente] = ()):
+        self._nomes = bytearray()
+        self._fim_nomes = array('Q')
+        self.idades = array('B')
+        self.urgencias = array('B')
+        self.chegadas_ns = array('q')
+        self.estender(pacientes)
+    
+    def anexar(self, nome: str, idade: int, urgencia: int, chegada_ns: int) -> int:
+        """
+        Anexa um paciente já validado.
+        
+        Returns:
+            Índice do paciente no armazenamento
+        """
+        self._nomes += nome.encode('utf-8')
+        self._fim_nomes.append(len(self._nomes))
+        self.idades.append(idade)
+        self.urgencias.append(urgencia)
+        self.chegadas_ns.append(chegada_ns)
+        return len(self.chegadas_ns) - 1
+    
+    def anexar_paciente(self, paciente: Paciente) -> int:
+        """Anexa um Paciente, convertendo o timestamp para nanossegundos."""
+        return self.anexar(paciente.nome, paciente.idade, paciente.urgencia,
+                           datetime_para_ns(paciente.timestamp))
+    
+    def estender(self, pacientes: Iterable[Paciente]) -> None:
+        """Anexa vários pacientes."""
+        for paciente in pacientes:
+            self.anexar_paciente(paciente)
+    
+    def nome(self, indice: int) -> str:
+        """Nome do paciente no índice, sem materializar o Paciente."""
+        indice = self._normalizar(indice)
+        inicio = self._fim_nomes[indice - 1] if indice else 0
+        return self._nomes[inicio:self._fim_nomes[indice]].decode('utf-8')
+    
+    def __len__(self) -> int:
+        return len(self.chegadas_ns)
+    
+    def __getitem__(self, indice: int) -> Paciente:
+        indice = self._normalizar(indice)
+        return Paciente._ja_validado(
+            self.nome(indice),
+            self.idades[indice],
+            self.urgencias[indice],
+            ns_para_datetime(self.chegadas_ns[indice])
+        )
+    
+    def __iter__(self) -> Iterator[Paciente]:
+        for indice in range(len(self)):
+            yield self[indice]
+    
+    def indices_por_urgencia(self, urgencia: int) -> List[int]:
+        """Índices dos pacientes com a urgência informada."""
+        return [i for i, valor in enumerate(self.urgencias) if valor == urgencia]
+    
+    def bytes_usados(self) -> int:
+        """Bytes ocupados pelos buffers das colunas (sem o excedente alocado)."""
+        return (len(self._nomes)
+                + self._fim_nomes.itemsize * len(self._fim_nomes)
+                + self.idades.itemsize * len(self.idades)
+                + self.urgencias.itemsize * len(self.urgencias)
+                + self.chegadas_ns.itemsize * len(self.chegadas_ns))
+    
+    def _normalizar(self, indice: int) -> int:
+        """Aceita índices negativos e valida os limites."""
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice de paciente fora do intervalo")
+        return indice
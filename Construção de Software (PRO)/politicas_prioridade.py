@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Políticas de prioridade plugáveis para a fila de triagem.
+Com a ordem pura (-urgencia, timestamp), pacientes de urgência baixa podem
+esperar indefinidamente durante um surto. As políticas deste módulo mudam
+a ordem de atendimento sem reordenar a fila inteira a cada instante:
+
+- Envelhecimento: a prioridade efetiva sobe um nível a cada intervalo de espera
+- EsperaMaxima: quem estoura o tempo máximo da sua urgência passa à frente
+- JustaPonderada: as faixas de urgência dividem os atendimentos por peso
+
+Uso:
+    gerenciador = GerenciadorTriagem(backend=FilaPolitica(Envelhecimento(intervalo=1800)))
+"""
+
+import heapq
+import itertools
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from filas import FilaPrioridade
+from relogio import Relogio, obter_relogio
+
+# Tempo máximo de espera por urgência, em segundos (Sistema Manchester de Triagem)
+ESPERA_MAXIMA_PADRAO: Dict[int, float] = {5: 0, 4: 10 * 60, 3: 60 * 60, 2: 120 * 60, 1: 240 * 60}
+
+# Fração dos atendimentos de cada faixa compartilhada na JustaPonderada
+PESOS_PADRAO: Dict[int, float] = {4: 8, 3: 4, 2: 2, 1: 1}
+
+Chave = Tuple[Any, ...]
+
+
+class PoliticaPrioridade:
+    """
+    Interface das políticas usadas pela FilaPolitica.
+
+    A política dá a chave de ordenação de um paciente (menor = atendido
+    antes) e o instante em que essa chave muda. A fila só volta a pedir a
+    chave quando esse instante passa, então o custo de uma política que
+    depende do tempo é proporcional ao número de mudanças, não ao tamanho
+    da fila vezes o número de consultas. Chaves de uma mesma política
+    precisam ser comparáveis entre si.
+
+    Uma política com estado (JustaPonderada) pertence a uma única fila,
+    como um backend pertence a um único gerenciador.
+    """
+
+    nome = ''
+
+    def chave(self, paciente: Any, agora: datetime) -> Tuple[Chave, Optional[datetime]]:
+        """
+        Calcula a chave vigente do paciente.
+
+        Chamada na admissão e de novo a cada mudança anunciada.
+
+        Args:
+            paciente: Paciente aguardando
+            agora: Instante atual no relógio da fila
+
+        Returns:
+            (chave, instante da próxima mudança ou None se a chave é definitiva)
+        """
+        raise NotImplementedError
+
+    def atendido(self, paciente: Any, chave: Chave) -> None:
+        """Avisa que o paciente foi retirado da fila com a chave informada."""
+
+
+class PrioridadeUrgencia(PoliticaPrioridade):
+    """Ordem padrão da triagem: urgência decrescente, depois ordem de chegada."""
+
+    nome = 'urgencia'
+
+    def chave(self, paciente: Any, agora: datetime) -> Tuple[Chave, Optional[datetime]]:
+        return (-paciente.urgencia, paciente.timestamp), None
+
+
+class Envelhecimento(PoliticaPrioridade):
+    """
+    Promoção por tempo de espera: +1 nível de prioridade a cada `intervalo`.
+
+    A prioridade efetiva é min(urgência + espera // intervalo, teto) e, no
+    mesmo nível efetivo, quem chegou antes é atendido antes. Com o teto
+    abaixo de 5, um paciente envelhecido nunca passa à frente de um
+    paciente crítico. Cada paciente muda de chave no máximo `teto - urgência`
+    vezes, em instantes conhecidos na admissão.
+    """
+
+    nome = 'envelhecimento'
+
+    def __init__(self, intervalo: float = 30 * 60, teto: int = 4) -> None:
+        """
+        Args:
+            intervalo: Segundos de espera por nível promovido
+            teto: Nível máximo alcançado por envelhecimento
+        """
+        if intervalo <= 0:
+            raise ValueError("Intervalo de envelhecimento deve ser positivo")
+        self.intervalo = timedelta(seconds=intervalo)
+        self.teto = teto
+
+    def chave(self, paciente: Any, agora: datetime) -> Tuple[Chave, Optional[datetime]]:
+        teto = max(paciente.urgencia, self.teto)
+        espera = max(agora - paciente.timestamp, timedelta(0))
+        nivel = min(paciente.urgencia + espera // self.intervalo, teto)
+        mudanca = None
+        if nivel < teto:
+            mudanca = paciente.timestamp + (nivel - paciente.urgencia + 1) * self.intervalo
+        return (-nivel, paciente.timestamp), mudanca
+
+
+class EsperaMaxima(PoliticaPrioridade):
+    """
+    Tempo máximo de espera (SLA) por urgência.
+
+    Dentro do prazo vale a ordem padrão. Vencido o prazo, o paciente sobe
+    para `nivel_vencido`, à frente de quem está no prazo nesse nível, e os
+    vencidos são atendidos pelo prazo mais antigo primeiro. Urgências acima
+    de `nivel_vencido` nunca são ultrapassadas. Cada paciente muda de chave
+    uma vez.
+    """
+
+    nome = 'espera_maxima'
+
+    def __init__(self, limites: Optional[Mapping[int, float]] = None, nivel_vencido: int = 4) -> None:
+        """
+        Args:
+            limites: Espera máxima em segundos por urgência (padrão: ESPERA_MAXIMA_PADRAO)
+            nivel_vencido: Nível de quem estourou o prazo
+        """
+        limites = ESPERA_MAXIMA_PADRAO if limites is None else limites
+        self.limites = {urgencia: timedelta(seconds=segundos) for urgencia, segundos in limites.items()}
+        self.nivel_vencido = nivel_vencido
+
+    def chave(self, paciente: Any, agora: datetime) -> Tuple[Chave, Optional[datetime]]:
+        limite = self.limites.get(paciente.urgencia)
+        if paciente.urgencia > self.nivel_vencido or limite is None:
+            return (-paciente.urgencia, 1, paciente.timestamp), None
+        prazo = paciente.timestamp + limite
+        if agora >= prazo:
+            return (-self.nivel_vencido, 0, prazo), None
+        return (-paciente.urgencia, 1, paciente.timestamp), prazo
+
+
+class JustaPonderada(PoliticaPrioridade):
+    """
+    Fila justa ponderada entre as faixas de urgência (self-clocked fair queuing).
+
+    Cada chegada recebe um término virtual: max(tempo virtual, término do
+    anterior da faixa) + 1 / peso; atende-se o menor término e o tempo
+    virtual avança até ele. Com faixas cheias, cada uma recebe atendimentos
+    na proporção do seu peso (8:4:2:1 no padrão), então nenhuma faixa fica
+    sem atendimento. As urgências `prioritarias` ficam fora da divisão e
+    são sempre atendidas primeiro. As chaves são definitivas na admissão.
+    """
+
+    nome = 'justa_ponderada'
+
+    def __init__(self, pesos: Optional[Mapping[int, float]] = None, prioritarias: Tuple[int, ...] = (5,)) -> None:
+        """
+        Args:
+            pesos: Peso de cada urgência compartilhada (padrão: PESOS_PADRAO)
+            prioritarias: Urgências atendidas antes de todas as faixas compartilhadas
+        """
+        self.pesos = dict(PESOS_PADRAO if pesos is None else pesos)
+        if any(peso <= 0 for peso in self.pesos.values()):
+            raise ValueError("Pesos devem ser positivos")
+        self.prioritarias = frozenset(prioritarias)
+        self._tempo_virtual = 0.0
+        self._ultimo_termino = dict.fromkeys(self.pesos, 0.0)
+
+    def chave(self, paciente: Any, agora: datetime) -> Tuple[Chave, Optional[datetime]]:
+        if paciente.urgencia in self.prioritarias:
+            return (0, -paciente.urgencia, paciente.timestamp), None
+        try:
+            peso = self.pesos[paciente.urgencia]
+        except KeyError:
+            raise ValueError("Urgência deve estar entre 1 e 5") from None
+        termino = max(self._tempo_virtual, self._ultimo_termino[paciente.urgencia]) + 1 / peso
+        self._ultimo_termino[paciente.urgencia] = termino
+        return (1, termino, paciente.timestamp), None
+
+    def atendido(self, paciente: Any, chave: Chave) -> None:
+        if chave[0] == 1:
+            self._tempo_virtual = chave[1]
+
+
+POLITICAS = {
+    PrioridadeUrgencia.nome: PrioridadeUrgencia,
+    Envelhecimento.nome: Envelhecimento,
+    EsperaMaxima.nome: EsperaMaxima,
+    JustaPonderada.nome: JustaPonderada,
+}
+
+
+class FilaPolitica(FilaPrioridade):
+    """
+    Backend cuja ordem é dada por uma PoliticaPrioridade.
+
+    Heap com chave (chave da política, seq) mais um heap de mudanças
+    agendadas (instante, seq). Antes de cada operação, só as mudanças
+    vencidas são recalculadas: a nova chave entra no heap e a anterior fica
+    obsoleta, descartada quando chega ao topo (remoção preguiçosa). Inserção
+    e remoção custam O(log n) mais O(log n) por mudança vencida; a passagem
+    do tempo sozinha não custa nada. A visão ordenada é refeita só quando a
+    fila ou alguma chave mudou.
+
+    O tempo vem do relógio do gerenciador (ver usar_relogio).
+    """
+
+    def __init__(self, politica: Optional[PoliticaPrioridade] = None,
+                 relogio: Optional[Relogio] = None) -> None:
+        """
+        Args:
+            politica: Política de ordenação (padrão: PrioridadeUrgencia)
+            relogio: Fonte do instante atual (padrão: relogio.obter_relogio())
+        """
+        self.politica = politica if politica is not None else PrioridadeUrgencia()
+        self._relogio = relogio if relogio is not None else obter_relogio()
+        self._heap: List[Tuple[Chave, int, Any]] = []
+        self._mudancas: List[Tuple[datetime, int, Any]] = []
+        self._chaves: Dict[int, Chave] = {}  # seq -> chave vigente dos pacientes aguardando
+        self._seq_de: Dict[int, int] = {}    # id(paciente) -> seq, para chave_ordem
+        self._seq = itertools.count()
+        self._reordenacoes = 0
+        self._snapshot: Optional[List[Any]] = None
+
+    def usar_relogio(self, relogio: Relogio) -> None:
+        self._relogio = relogio
+
+    def chave_ordem(self, paciente: Any) -> Any:
+        return self._chaves[self._seq_de[id(paciente)]]
+
+    @property
+    def reordenacoes(self) -> int:
+        # Uma mudança vencida e ainda não aplicada já conta: a ordem pode ter mudado
+        mudancas = self._mudancas
+        pendente = 1 if mudancas and mudancas[0][0] <= self._relogio.agora() else 0
+        return self._reordenacoes + pendente
+
+    def adicionar(self, paciente: Any) -> None:
+        agora = self._relogio.agora()
+        self._aplicar_mudancas(agora)
+        heapq.heappush(self._heap, self._admitir(paciente, agora))
+        self._snapshot = None
+
+    def adicionar_varios(self, pacientes: List[Any]) -> None:
+        agora = self._relogio.agora()
+        self._aplicar_mudancas(agora)
+        entradas = [self._admitir(paciente, agora) for paciente in pacientes]
+        # Lote grande em relação ao heap: heapify O(n + k) vence k inserções
+        if len(entradas) <= len(self._heap):
+            for entrada in entradas:
+                heapq.heappush(self._heap, entrada)
+        else:
+            self._heap.extend(entradas)
+            heapq.heapify(self._heap)
+        self._snapshot = None
+
+    def remover_proximo(self) -> Any:
+        self._aplicar_mudancas(self._relogio.agora())
+        self._descartar_obsoletas()
+        if not self._heap:
+            raise IndexError("Fila vazia")
+        chave, seq, paciente = heapq.heappop(self._heap)
+        del self._chaves[seq]
+        if self._seq_de.get(id(paciente)) == seq:
+            del self._seq_de[id(paciente)]
+        self.politica.atendido(paciente, chave)
+        self._snapshot = None
+        # Entradas obsoletas (chaves substituídas, mudanças de quem já foi atendido)
+        # passaram de 4x as vigentes (mais uma folga para filas pequenas): compactar
+        if len(self._heap) + len(self._mudancas) > 4 * len(self._chaves) + 64:
+            self._compactar()
+        return paciente
+
+    def espiar(self) -> Any:
+        self._aplicar_mudancas(self._relogio.agora())
+        self._descartar_obsoletas()
+        if not self._heap:
+            raise IndexError("Fila vazia")
+        return self._heap[0][-1]
+
+    def ordenada(self) -> List[Any]:
+        self._aplicar_mudancas(self._relogio.agora())
+        if self._snapshot is None:
+            self._snapshot = [entrada[-1] for entrada in sorted(self._vigentes())]
+        return self._snapshot
+
+    def pacientes(self) -> List[Any]:
+        return [entrada[-1] for entrada in self._vigentes()]
+
+    def __len__(self) -> int:
+        return len(self._chaves)
+
+    def _admitir(self, paciente: Any, agora: datetime) -> Tuple[Chave, int, Any]:
+        """Calcula a chave de um paciente novo e agenda sua próxima mudança."""
+        seq = next(self._seq)
+        chave, mudanca = self.politica.chave(paciente, agora)
+        self._chaves[seq] = chave
+        self._seq_de[id(paciente)] = seq
+        if mudanca is not None:
+            heapq.heappush(self._mudancas, (mudanca, seq, paciente))
+        return chave, seq, paciente
+
+    def _aplicar_mudancas(self, agora: datetime) -> None:
+        """Recalcula as chaves cujas mudanças agendadas já venceram."""
+        mudancas = self._mudancas
+        if not mudancas or mudancas[0][0] > agora:
+            return
+        while mudancas and mudancas[0][0] <= agora:
+            _, seq, paciente = heapq.heappop(mudancas)
+            anterior = self._chaves.get(seq)
+            if anterior is None:
+                continue  # já atendido
+            chave, mudanca = self.politica.chave(paciente, agora)
+            if mudanca is not None:
+                heapq.heappush(mudancas, (mudanca, seq, paciente))
+            if chave != anterior:
+                self._chaves[seq] = chave
+                heapq.heappush(self._heap, (chave, seq, paciente))
+                self._reordenacoes += 1
+                self._snapshot = None
+
+    def _descartar_obsoletas(self) -> None:
+        """Remove do topo do heap entradas substituídas por chaves novas."""
+        heap = self._heap
+        while heap and self._chaves.get(heap[0][1]) is not heap[0][0]:
+            heapq.heappop(heap)
+
+    def _compactar(self) -> None:
+        """Reconstrói os heaps só com entradas de pacientes aguardando."""
+        self._heap = self._vigentes()
+        heapq.heapify(self._heap)
+        self._mudancas = [mudanca for mudanca in self._mudancas if mudanca[1] in self._chaves]
+        heapq.heapify(self._mudancas)
+
+    def _vigentes(self) -> List[Tuple[Chave, int, Any]]:
+        """Entradas do heap com a chave vigente de cada paciente."""
+        chaves = self._chaves
+        return [entrada for entrada in self._heap if chaves.get(entrada[1]) is entrada[0]]
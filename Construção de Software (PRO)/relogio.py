@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Relógio injetável da triagem.
+Fonte única de tempo para chegadas de pacientes, métricas e logs, com um
+relógio do sistema (monotônico) e um relógio virtual para simulações e
+testes determinísticos.
+
+Uso:
+    relogio = RelogioVirtual(datetime(2024, 3, 1, 8, 0))
+    gerenciador = GerenciadorTriagem(relogio=relogio)
+    with usando_relogio(relogio):       # Paciente(...) sem timestamp usa este relógio
+        paciente = Paciente("Maria Silva", 45, 3)
+    relogio.avancar(90)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+_NS_POR_US = 1000
+
+
+class Relogio:
+    """
+    Fonte de tempo: instantes em nanossegundos desde a época (inteiros).
+
+    Os instantes são monotônicos e convertíveis em datetime ingênuo
+    (horário local) com precisão de microssegundos. `carimbo_ns()` dá
+    instantes de chegada estritamente crescentes e alinhados ao
+    microssegundo: dois pacientes nunca recebem o mesmo timestamp, nem
+    depois da conversão para datetime. Todos os relógios usam a mesma
+    escala, de modo que um instante de um relógio pode ser formatado por outro.
+    """
+
+    def __init__(self, base_ns: int, base_datetime: datetime) -> None:
+        # Par de referência para as conversões ns <-> datetime
+        self._base_ns = base_ns
+        self._base_datetime = base_datetime
+        self._ultimo_carimbo = 0
+        self._lock_carimbo = threading.Lock()
+
+    def agora_ns(self) -> int:
+        """Instante atual em nanossegundos desde a época."""
+        raise NotImplementedError
+
+    def carimbo_ns(self) -> int:
+        """Instante de chegada: o atual, ou 1 µs após o carimbo anterior se este for maior."""
+        agora = self.agora_ns() // _NS_POR_US * _NS_POR_US
+        with self._lock_carimbo:
+            if agora <= self._ultimo_carimbo:
+                agora = self._ultimo_carimbo + _NS_POR_US
+            self._ultimo_carimbo = agora
+        return agora
+
+    def para_datetime(self, instante_ns: int) -> datetime:
+        """Converte um instante deste relógio em datetime (truncado no microssegundo)."""
+        return self._base_datetime + timedelta(0, 0, (instante_ns - self._base_ns) // _NS_POR_US)
+
+    def para_ns(self, momento: datetime) -> int:
+        """Converte um datetime no instante correspondente deste relógio."""
+        return self._base_ns + (momento - self._base_datetime) // timedelta(microseconds=1) * _NS_POR_US
+
+    def agora(self) -> datetime:
+        """Instante atual como datetime."""
+        return self.para_datetime(self.agora_ns())
+
+    def chegada(self) -> datetime:
+        """Timestamp de chegada de um paciente (ver carimbo_ns)."""
+        return self.para_datetime(self.carimbo_ns())
+
+    def instante(self, instante_ns: Optional[int] = None) -> 'Instante':
+        """Instante (o atual, se omitido) formatado só quando o log for gravado."""
+        return Instante(self.agora_ns() if instante_ns is None else instante_ns, self)
+
+
+class RelogioSistema(Relogio):
+    """
+    Relógio real: `time.monotonic_ns()` ancorado no horário do sistema na criação.
+
+    Ajustes do relógio do sistema (NTP, horário de verão) depois da criação
+    não fazem o tempo voltar nem pular; o datetime pode se afastar do
+    relógio de parede na mesma medida.
+    """
+
+    def __init__(self) -> None:
+        base_monotonico = time.monotonic_ns()
+        base_ns = time.time_ns() // _NS_POR_US * _NS_POR_US
+        segundos, resto = divmod(base_ns, 1_000_000_000)
+        super().__init__(base_ns, datetime.fromtimestamp(segundos) + timedelta(microseconds=resto // _NS_POR_US))
+        self._deslocamento = base_ns - base_monotonico
+
+    def agora_ns(self) -> int:
+        return time.monotonic_ns() + self._deslocamento
+
+
+class RelogioVirtual(Relogio):
+    """Relógio que só anda quando mandado (simulações e testes)."""
+
+    def __init__(self, inicio: Optional[datetime] = None) -> None:
+        """
+        Args:
+            inicio: Instante inicial (padrão: 2024-01-01 00:00)
+        """
+        inicio = inicio if inicio is not None else datetime(2024, 1, 1)
+        base_ns = round(inicio.timestamp() * 1_000_000) * _NS_POR_US
+        super().__init__(base_ns, inicio)
+        self._agora = base_ns
+
+    def agora_ns(self) -> int:
+        return self._agora
+
+    @property
+    def decorrido(self) -> float:
+        """Segundos desde o início."""
+        return (self._agora - self._base_ns) / 1e9
+
+    def avancar(self, segundos: float) -> None:
+        """Avança o relógio; tempo negativo é rejeitado."""
+        if segundos < 0:
+            raise ValueError("O relógio não pode voltar no tempo")
+        self._agora += round(segundos * 1e9)
+
+    def definir(self, segundos: float) -> None:
+        """Posiciona o relógio `segundos` após o início, sem voltar no tempo."""
+        alvo = self._base_ns + round(segundos * 1e9)
+        if alvo < self._agora:
+            raise ValueError("O relógio não pode voltar no tempo")
+        self._agora = alvo
+
+
+class Instante:
+    """Instante de um registro de log, convertido em ISO 8601 só ao ser gravado."""
+
+    __slots__ = ('ns', 'relogio')
+
+    def __init__(self, instante_ns: int, relogio: Relogio) -> None:
+        self.ns = instante_ns
+        self.relogio = relogio
+
+    def __str__(self) -> str:
+        return self.relogio.para_datetime(self.ns).isoformat()
+
+
+class DatetimeISO:
+    """datetime já existente em um registro de log, formatado só ao ser gravado."""
+
+    __slots__ = ('momento',)
+
+    def __init__(self, momento: datetime) -> None:
+        self.momento = momento
+
+    def __str__(self) -> str:
+        return self.momento.isoformat()
+
+
+_relogio: Relogio = RelogioSistema()
+
+
+def obter_relogio() -> Relogio:
+    """Relógio padrão de quem não recebeu um relógio próprio."""
+    return _relogio
+
+
+def definir_relogio(relogio: Relogio) -> Relogio:
+    """Troca o relógio padrão e retorna o anterior."""
+    global _relogio
+    anterior, _relogio = _relogio, relogio
+    return anterior
+
+
+@contextmanager
+def usando_relogio(relogio: Relogio) -> Iterator[Relogio]:
+    """Usa `relogio` como padrão dentro do bloco."""
+    anterior = definir_relogio(relogio)
+    try:
+        yield relogio
+    finally:
+        definir_relogio(anterior)
+
+
+def momento_chegada() -> datetime:
+    """Timestamp padrão de Paciente: carimbo de chegada do relógio padrão."""
+    return _relogio.chegada()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Serviço de reservas de consultas sobre a Agenda.
+Substitui a simulação de agendamento.js: a disponibilidade é verificada de
+verdade (compare-and-set no horário, em vez de 5% de falhas aleatórias) e os
+protocolos são únicos e crescentes (em vez de Math.random() entre 9999).
+
+Fluxo em duas etapas, como na tela de agendamento:
+    servico = ServicoReservas(agenda)
+    bloqueio = servico.bloquear("2", horario, "Maria Silva")   # horário selecionado
+    agendamento = servico.confirmar(bloqueio)                 # botão confirmar
+    agendamento.protocolo  # '#AG202500000001'
+"""
+
+import heapq
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from agenda import Agenda, Agendamento, ConflitoAgendamento
+
+DURACAO_BLOQUEIO = 300.0  # segundos
+TAMANHO_BLOCO = 1000
+
+
+class GeradorProtocolos:
+    """
+    Protocolos de agendamento únicos, no formato de agendamento.js (#AG<ano><número>).
+
+    Os números vêm de um contador central reservado em blocos de
+    `tamanho_bloco`, compartilhados por todas as threads: cada número sai do
+    bloco atual sem lock, e o lock só é tomado para reservar o próximo bloco
+    quando este acaba. Assim os números são crescentes, nunca se repetem e
+    threads de vida curta (uma por conexão no servidor HTTP) não desperdiçam
+    blocos. Com `arquivo`, o fim do último bloco reservado é gravado antes do
+    bloco ser usado, então um reinício continua dali (os números não usados
+    do bloco são pulados, nunca repetidos).
+    """
+
+    def __init__(self, tamanho_bloco: int = TAMANHO_BLOCO, arquivo: Optional[str] = None):
+        """
+        Args:
+            tamanho_bloco: Números reservados por vez no contador central
+            arquivo: Arquivo onde o contador é persistido (opcional)
+
+        Raises:
+            ValueError: Se o tamanho do bloco não for positivo
+        """
+        if tamanho_bloco < 1:
+            raise ValueError("Tamanho do bloco deve ser positivo")
+        self.tamanho_bloco = tamanho_bloco
+        self.arquivo = arquivo
+        self._lock = threading.Lock()
+        self._bloco: Iterator[int] = iter(())
+        self._proximo_bloco = 1
+        if arquivo and os.path.exists(arquivo):
+            with open(arquivo, encoding='utf-8') as f:
+                self._proximo_bloco = int(f.read().strip() or 1)
+
+    def proximo_numero(self) -> int:
+        """Próximo número de protocolo."""
+        # next() de um range é atômico: threads dividem o bloco sem lock
+        numero = next(self._bloco, None)
+        while numero is None:
+            with self._lock:
+                # Outra thread pode ter reservado um bloco enquanto esta esperava
+                numero = next(self._bloco, None)
+                if numero is None:
+                    self._bloco = self._reservar_bloco()
+        return numero
+
+    def proximo(self) -> str:
+        """Próximo protocolo, ex.: '#AG202500000042'."""
+        return f"#AG{date.today().year}{self.proximo_numero():08d}"
+
+    def _reservar_bloco(self) -> Iterator[int]:
+        """Reserva (e persiste) o próximo bloco; chamar com o lock."""
+        inicio = self._proximo_bloco
+        self._proximo_bloco += self.tamanho_bloco
+        if self.arquivo:
+            temporario = self.arquivo + '.tmp'
+            with open(temporario, 'w', encoding='utf-8') as f:
+                f.write(str(self._proximo_bloco))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporario, self.arquivo)
+        return iter(range(inicio, inicio + self.tamanho_bloco))
+
+
+class BloqueioExpirado(ConflitoAgendamento):
+    """O bloqueio temporário expirou antes da confirmação."""
+
+
+class ServicoReservas:
+    """
+    Reservas com bloqueio temporário e confirmação por compare-and-set.
+
+    Um bloqueio ocupa o horário na agenda (some de horarios_livres) até
+    `duracao_bloqueio` segundos. Bloqueios vencidos são liberados sob
+    demanda: um novo pedido para o mesmo horário toma o lugar do vencido, e
+    expirar_bloqueios() (chamado pelas consultas do serviço) devolve à
+    agenda os que ninguém pediu. Todas as trocas de estado do horário são
+    comparar_e_trocar da agenda, então corridas entre confirmar, liberar e
+    expirar nunca produzem reserva dupla.
+    """
+
+    def __init__(self, agenda: Agenda, duracao_bloqueio: float = DURACAO_BLOQUEIO,
+                 gerador: Optional[GeradorProtocolos] = None,
+                 relogio: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            agenda: Agenda dos médicos
+            duracao_bloqueio: Segundos que um horário fica bloqueado aguardando confirmação
+            gerador: Gerador de protocolos (um novo, em memória, se omitido)
+            relogio: Função que retorna o tempo atual em segundos (monotônico)
+
+        Raises:
+            ValueError: Se a duração do bloqueio não for positiva
+        """
+        if duracao_bloqueio <= 0:
+            raise ValueError("Duração do bloqueio deve ser positiva")
+        self.agenda = agenda
+        self.duracao_bloqueio = duracao_bloqueio
+        self.gerador = gerador or GeradorProtocolos()
+        self.relogio = relogio
+        self._vencimentos: List[Tuple[float, int, Agendamento]] = []
+        self._sequencia = 0
+        self._lock_vencimentos = threading.Lock()
+
+    def bloquear(self, medico_id: str, inicio: datetime, paciente: str) -> Agendamento:
+        """
+        Bloqueia o horário para o paciente enquanto ele confirma.
+
+        Raises:
+            ValueError: Se o horário não for um horário de atendimento da agenda
+            ConflitoAgendamento: Se o horário estiver reservado ou bloqueado por outro
+        """
+        agora = self.relogio()
+        bloqueio = Agendamento(medico_id, paciente, inicio, expira_em=agora + self.duracao_bloqueio)
+        self._ocupar(bloqueio, agora)
+        with self._lock_vencimentos:
+            self._sequencia += 1
+            heapq.heappush(self._vencimentos, (bloqueio.expira_em, self._sequencia, bloqueio))
+        return bloqueio
+
+    def confirmar(self, bloqueio: Agendamento) -> Agendamento:
+        """
+        Transforma o bloqueio em reserva definitiva, com protocolo.
+
+        Raises:
+            BloqueioExpirado: Se o bloqueio venceu antes da confirmação
+            ConflitoAgendamento: Se o bloqueio já foi confirmado ou liberado
+        """
+        if bloqueio.expira_em is None:
+            raise ConflitoAgendamento("Agendamento já confirmado")
+        if self.relogio() >= bloqueio.expira_em:
+            # Libera o horário se ninguém o tomou; falhar aqui é indiferente
+            self.agenda.comparar_e_trocar(bloqueio.medico_id, bloqueio.inicio, bloqueio, None)
+            raise BloqueioExpirado("Bloqueio expirado, selecione o horário novamente")
+        agendamento = Agendamento(bloqueio.medico_id, bloqueio.paciente, bloqueio.inicio,
+                                  self.gerador.proximo())
+        if not self.agenda.comparar_e_trocar(bloqueio.medico_id, bloqueio.inicio, bloqueio, agendamento):
+            raise ConflitoAgendamento("Horário não está mais disponível")
+        return agendamento
+
+    def reservar(self, medico_id: str, inicio: datetime, paciente: str) -> Agendamento:
+        """
+        Reserva direta, sem bloqueio prévio.
+
+        Raises:
+            ValueError: Se o horário não for um horário de atendimento da agenda
+            ConflitoAgendamento: Se o horário estiver reservado ou bloqueado
+        """
+        agendamento = Agendamento(medico_id, paciente, inicio, self.gerador.proximo())
+        self._ocupar(agendamento, self.relogio())
+        return agendamento
+
+    def liberar(self, bloqueio: Agendamento) -> bool:
+        """Desiste do bloqueio. Retorna False se ele não estava mais ativo."""
+        return self.agenda.comparar_e_trocar(bloqueio.medico_id, bloqueio.inicio, bloqueio, None)
+
+    def cancelar(self, agendamento: Agendamento) -> bool:
+        """Cancela uma reserva confirmada. Retorna False se ela não existia mais."""
+        return self.agenda.comparar_e_trocar(agendamento.medico_id, agendamento.inicio, agendamento, None)
+
+    def expirar_bloqueios(self) -> int:
+        """
+        Devolve à agenda os horários de bloqueios vencidos.
+
+        Returns:
+            Quantidade de bloqueios liberados
+        """
+        agora = self.relogio()
+        vencidos = []
+        with self._lock_vencimentos:
+            while self._vencimentos and self._vencimentos[0][0] <= agora:
+                vencidos.append(heapq.heappop(self._vencimentos)[2])
+        # Bloqueios já confirmados ou liberados simplesmente não casam mais
+        return sum(self.agenda.comparar_e_trocar(b.medico_id, b.inicio, b, None) for b in vencidos)
+
+    def horarios_livres(self, medico_id: str, dia: date) -> List[datetime]:
+        """Horários livres do médico no dia, já descontados os bloqueios ativos."""
+        self.expirar_bloqueios()
+        return self.agenda.horarios_livres(medico_id, dia)
+
+    def primeiro_horario_livre(self, especialidade: str, a_partir: datetime):
+        """Primeiro horário livre da especialidade, já descontados os bloqueios ativos."""
+        self.expirar_bloqueios()
+        return self.agenda.primeiro_horario_livre(especialidade, a_partir)
+
+    def _ocupar(self, novo: Agendamento, agora: float) -> None:
+        """Coloca `novo` no horário livre ou no lugar de um bloqueio vencido."""
+        esperado = None
+        while not self.agenda.comparar_e_trocar(novo.medico_id, novo.inicio, esperado, novo):
+            atual = self.agenda.agendamento(novo.medico_id, novo.inicio)
+            if atual is not None and (atual.expira_em is None or atual.expira_em > agora):
+                raise ConflitoAgendamento(
+                    f"Horário não está disponível: {novo.medico_id} {novo.inicio:%Y-%m-%d %H:%M}")
+            esperado = atual
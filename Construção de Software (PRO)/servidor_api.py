@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP/JSON embutido para a triagem e o agendamento.
+Usa apenas a biblioteca padrão (http.server), com conexões persistentes
+(HTTP/1.1 keep-alive), POST em lote, ETag/304 na listagem da fila e
+resposta em streaming (chunked) para listagens grandes.
+
+Rotas (respostas no envelope {"success": ..., "data"/"error": ...} da
+especificacao-interface-api.md):
+    GET    /health
+    GET    /triage/queue                      fila ordenada (ETag / If-None-Match)
+    GET    /triage/events                     mudanças da fila via Server-Sent Events
+    POST   /triage/patients                   um paciente ou lista de pacientes
+    POST   /triage/next                       atende o próximo ({"quantidade": n} opcional)
+    GET    /appointments/availability?doctorId=1&date=2025-02-17
+    GET    /appointments/first-available?specialty=pediatria&from=2025-02-17T09:00
+    POST   /appointments                      uma reserva ou lista de reservas
+    DELETE /appointments/{protocolo}
+
+Uso:
+    python servidor_api.py --porta 8080
+"""
+
+import argparse
+import json
+import threading
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from agenda import DURACAO_SLOT, Agenda, ConflitoAgendamento, Medico
+from fluxo_fila import FluxoFila
+from monitor_sistema import monitor
+from reservas import ServicoReservas
+from triagem import GerenciadorTriagem, Paciente, obter_texto_urgencia
+from triagem_concorrente import GerenciadorTriagemConcorrente
+
+LIMITE_STREAMING = 1000  # pacientes; acima disso a listagem vai em chunks
+TAMANHO_CHUNK = 500
+TAMANHO_MAXIMO_CORPO = 10 * 1024 * 1024
+
+# Médicos da tela de agendamento (agendamento.html)
+MEDICOS_PADRAO = [
+    Medico("1", "Dr. João Silva", "cardiologia"),
+    Medico("2", "Dra. Maria Santos", "dermatologia"),
+    Medico("3", "Dr. Pedro Costa", "pediatria"),
+    Medico("4", "Dra. Ana Oliveira", "ortopedia"),
+]
+
+
+class ErroAPI(Exception):
+    """Erro que vira uma resposta JSON com status HTTP e código."""
+
+    def __init__(self, status: int, codigo: str, mensagem: str, detalhes: Any = None):
+        super().__init__(mensagem)
+        self.status = status
+        self.codigo = codigo
+        self.mensagem = mensagem
+        self.detalhes = detalhes
+
+
+class _CacheFila:
+    """Listagem da fila já serializada para uma versão do gerenciador."""
+
+    def __init__(self, versao: int, corpo: bytes):
+        self.versao = versao
+        self.corpo = corpo
+        self.etag = f'"fila-{versao}"'
+
+
+class ServidorAPI:
+    """
+    API HTTP da triagem e do agendamento.
+
+    A listagem da fila é serializada uma vez por versão do gerenciador
+    (GerenciadorTriagem.versao): requisições seguintes recebem os mesmos
+    bytes, e clientes com o ETag atual recebem 304 sem nenhuma ordenação.
+    """
+
+    def __init__(self, gerenciador: Optional[GerenciadorTriagem] = None,
+                 reservas: Optional[ServicoReservas] = None,
+                 host: str = '127.0.0.1', porta: int = 8080,
+                 limite_streaming: int = LIMITE_STREAMING):
+        """
+        Args:
+            gerenciador: Gerenciador da fila (padrão: GerenciadorTriagemConcorrente com FluxoFila)
+            reservas: Serviço de reservas (padrão: agenda de 90 dias com os médicos da tela)
+            host: Endereço de escuta
+            porta: Porta de escuta (0 = porta livre escolhida pelo sistema)
+            limite_streaming: Tamanho da fila a partir do qual a listagem é enviada em chunks
+        """
+        self._fluxo_proprio = None
+        if gerenciador is None:
+            self._fluxo_proprio = FluxoFila()
+            gerenciador = GerenciadorTriagemConcorrente(fluxo=self._fluxo_proprio)
+        self.gerenciador = gerenciador
+        if reservas is None:
+            agenda = Agenda(date.today(), 90)
+            for medico in MEDICOS_PADRAO:
+                agenda.adicionar_medico(medico)
+            reservas = ServicoReservas(agenda)
+        self.reservas = reservas
+        self.limite_streaming = limite_streaming
+        self._cache_fila: Optional[_CacheFila] = None
+        self._agendamentos: Dict[str, Any] = {}  # protocolo -> Agendamento
+        self._lock_agendamentos = threading.Lock()
+        self._http = ThreadingHTTPServer((host, porta), _ManipuladorHTTP)
+        self._http.daemon_threads = True
+        self._http.api = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endereco(self) -> Tuple[str, int]:
+        """(host, porta) em que o servidor está escutando."""
+        return self._http.server_address[:2]
+
+    def iniciar(self) -> None:
+        """Atende requisições em uma thread de fundo."""
+        self._thread = threading.Thread(target=self._http.serve_forever, daemon=True)
+        self._thread.start()
+
+    def servir(self) -> None:
+        """Atende requisições na thread atual até parar()."""
+        self._http.serve_forever()
+
+    def parar(self) -> None:
+        """Para de aceitar requisições e fecha o socket (e o fluxo criado pelo servidor)."""
+        if self._fluxo_proprio is not None:
+            self._fluxo_proprio.fechar()
+        self._http.shutdown()
+        self._http.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    # ----- triagem -----
+
+    def listagem_fila(self) -> Tuple[Optional[str], Union[bytes, Iterator[bytes]]]:
+        """
+        Listagem da fila atual.
+
+        Returns:
+            (etag, corpo) com o corpo em bytes quando a listagem cabe em
+            memória ou já estava pronta, ou como iterador de chunks quando a
+            fila é grande e mudou (os chunks são guardados para os próximos).
+            O etag é None se a fila mudou durante a leitura.
+        """
+        versao = self.gerenciador.versao
+        cache = self._cache_fila
+        if cache is not None and cache.versao == versao:
+            return cache.etag, cache.corpo
+        fila = self.gerenciador.obter_fila_ordenada()
+        # Mudança entre ler a versão e a fila: envia sem ETag e sem guardar
+        if self.gerenciador.versao != versao:
+            return None, b''.join(_chunks_fila(fila))
+        if len(fila) <= self.limite_streaming:
+            cache = self._cache_fila = _CacheFila(versao, b''.join(_chunks_fila(fila)))
+            return cache.etag, cache.corpo
+        return _CacheFila(versao, b'').etag, self._gerar_e_guardar(fila, versao)
+
+    def _gerar_e_guardar(self, fila: List[Paciente], versao: int) -> Iterator[bytes]:
+        partes = []
+        for chunk in _chunks_fila(fila):
+            partes.append(chunk)
+            yield chunk
+        self._cache_fila = _CacheFila(versao, b''.join(partes))
+
+    def adicionar_pacientes(self, corpo: Any) -> Tuple[int, Any]:
+        unico = isinstance(corpo, dict)
+        linhas = [corpo] if unico else corpo
+        if not isinstance(linhas, list):
+            raise ErroAPI(400, 'VALIDATION_ERROR', "Envie um paciente ou uma lista de pacientes")
+        resultado = self.gerenciador.adicionar_lote([_linha_paciente(linha) for linha in linhas])
+        if unico:
+            if resultado.erros:
+                raise ErroAPI(400, 'VALIDATION_ERROR', resultado.erros[0][1])
+            return 201, _paciente_json(resultado.adicionados[0])
+        return 200, {
+            'adicionados': len(resultado.adicionados),
+            'erros': [{'linha': linha, 'mensagem': mensagem} for linha, mensagem in resultado.erros],
+        }
+
+    def atender(self, corpo: Any) -> Tuple[int, Any]:
+        quantidade = corpo.get('quantidade') if isinstance(corpo, dict) else None
+        if quantidade is None:
+            try:
+                return 200, _paciente_json(self.gerenciador.atender_proximo())
+            except IndexError:
+                raise ErroAPI(404, 'EMPTY_QUEUE', "Fila vazia") from None
+        if not isinstance(quantidade, int) or quantidade < 1:
+            raise ErroAPI(400, 'VALIDATION_ERROR', "Quantidade deve ser um inteiro positivo")
+        atendidos = []
+        for _ in range(quantidade):
+            try:
+                atendidos.append(_paciente_json(self.gerenciador.atender_proximo()))
+            except IndexError:
+                break
+        return 200, atendidos
+
+    # ----- agendamento -----
+
+    def disponibilidade(self, parametros: Dict[str, str]) -> Tuple[int, Any]:
+        medico_id = _parametro(parametros, 'doctorId')
+        dia = _converter(date.fromisoformat, _parametro(parametros, 'date'), 'date')
+        try:
+            livres = self.reservas.horarios_livres(medico_id, dia)
+        except ValueError as erro:
+            raise ErroAPI(404, 'NOT_FOUND', str(erro)) from None
+        return 200, {
+            'doctorId': medico_id,
+            'date': dia.isoformat(),
+            'availableSlots': [{'startTime': f"{h:%H:%M:%S}", 'endTime': f"{h + DURACAO_SLOT:%H:%M:%S}"}
+                               for h in livres],
+        }
+
+    def primeiro_livre(self, parametros: Dict[str, str]) -> Tuple[int, Any]:
+        especialidade = _parametro(parametros, 'specialty')
+        a_partir = _converter(datetime.fromisoformat, parametros.get('from') or datetime.now().isoformat(), 'from')
+        resultado = self.reservas.primeiro_horario_livre(especialidade, a_partir)
+        if resultado is None:
+            raise ErroAPI(404, 'NOT_FOUND', "Nenhum horário livre no período da agenda")
+        medico, horario = resultado
+        return 200, {'doctorId': medico.id, 'doctorName': medico.nome, 'dateTime': horario.isoformat()}
+
+    def criar_agendamentos(self, corpo: Any) -> Tuple[int, Any]:
+        if isinstance(corpo, dict):
+            return 201, self._criar_agendamento(corpo)
+        if not isinstance(corpo, list):
+            raise ErroAPI(400, 'VALIDATION_ERROR', "Envie uma reserva ou uma lista de reservas")
+        resultados = []
+        for pedido in corpo:
+            try:
+                resultados.append({'success': True, 'data': self._criar_agendamento(pedido)})
+            except ErroAPI as erro:
+                resultados.append(_erro_json(erro))
+        return 200, resultados
+
+    def cancelar_agendamento(self, protocolo: str) -> Tuple[int, Any]:
+        with self._lock_agendamentos:
+            agendamento = self._agendamentos.pop(protocolo, None)
+        if agendamento is None or not self.reservas.cancelar(agendamento):
+            raise ErroAPI(404, 'NOT_FOUND', f"Agendamento não encontrado: {protocolo}")
+        return 200, _agendamento_json(agendamento, 'cancelled')
+
+    def _criar_agendamento(self, pedido: Any) -> Dict[str, Any]:
+        if not isinstance(pedido, dict):
+            raise ErroAPI(400, 'VALIDATION_ERROR', "Reserva deve ser um objeto")
+        medico_id = str(pedido.get('doctorId', ''))
+        paciente = pedido.get('patientName') or pedido.get('patientId')
+        if not paciente:
+            raise ErroAPI(400, 'VALIDATION_ERROR', "patientName é obrigatório")
+        horario = _converter(datetime.fromisoformat, str(pedido.get('dateTime', '')), 'dateTime')
+        try:
+            agendamento = self.reservas.reservar(medico_id, horario, str(paciente))
+        except ConflitoAgendamento as erro:
+            livres = self.reservas.horarios_livres(medico_id, horario.date())
+            raise ErroAPI(409, 'TIME_CONFLICT', str(erro),
+                          {'suggestedTimes': [h.isoformat() for h in livres[:3]]}) from None
+        except ValueError as erro:
+            raise ErroAPI(400, 'VALIDATION_ERROR', str(erro)) from None
+        with self._lock_agendamentos:
+            self._agendamentos[agendamento.protocolo] = agendamento
+        return _agendamento_json(agendamento, 'scheduled')
+
+
+class _ManipuladorHTTP(BaseHTTPRequestHandler):
+    """Traduz requisições HTTP em chamadas ao ServidorAPI."""
+
+    protocol_version = 'HTTP/1.1'  # conexões persistentes por padrão
+    # Cabeçalho e corpo saem em escritas separadas: sem TCP_NODELAY, o algoritmo
+    # de Nagle com o ACK atrasado do cliente segura cada resposta ~40 ms
+    disable_nagle_algorithm = True
+    server_version = 'TriagemAPI/1.0'
+
+    def log_message(self, formato: str, *args: Any) -> None:
+        pass  # o acesso não vai para o stderr; erros aparecem na resposta
+
+    def do_GET(self) -> None:
+        self._despachar('GET')
+
+    def do_POST(self) -> None:
+        self._despachar('POST')
+
+    def do_DELETE(self) -> None:
+        self._despachar('DELETE')
+
+    def _despachar(self, metodo: str) -> None:
+        api: ServidorAPI = self.server.api
+        partes = urlsplit(self.path)
+        caminho = partes.path.rstrip('/') or '/'
+        parametros = {chave: valores[-1] for chave, valores in parse_qs(partes.query).items()}
+        self._resposta_iniciada = False
+        try:
+            corpo = self._ler_corpo() if metodo == 'POST' else None
+            if metodo == 'GET' and caminho == '/triage/queue':
+                self._enviar_fila(api)
+                return
+            if metodo == 'GET' and caminho == '/triage/events':
+                self._enviar_eventos(api)
+                return
+            if metodo == 'GET' and caminho == '/health':
+                resposta = 200, {'status': 'healthy', 'fila': len(api.gerenciador)}
+            elif metodo == 'POST' and caminho == '/triage/patients':
+                resposta = api.adicionar_pacientes(corpo)
+            elif metodo == 'POST' and caminho == '/triage/next':
+                resposta = api.atender(corpo)
+            elif metodo == 'GET' and caminho == '/appointments/availability':
+                resposta = api.disponibilidade(parametros)
+            elif metodo == 'GET' and caminho == '/appointments/first-available':
+                resposta = api.primeiro_livre(parametros)
+            elif metodo == 'POST' and caminho == '/appointments':
+                resposta = api.criar_agendamentos(corpo)
+            elif metodo == 'DELETE' and caminho.startswith('/appointments/'):
+                resposta = api.cancelar_agendamento(unquote(caminho[len('/appointments/'):]))
+            else:
+                raise ErroAPI(404, 'NOT_FOUND', f"Rota não encontrada: {metodo} {caminho}")
+        except ErroAPI as erro:
+            self._enviar_json(erro.status, _erro_json(erro))
+            return
+        except Exception as erro:
+            # Falha inesperada: registrar e responder 500 no envelope, sem derrubar a thread
+            monitor.log_operacao("erro_interno_api", {
+                'metodo': metodo, 'caminho': caminho, 'erro': f"{type(erro).__name__}: {erro}"
+            })
+            self.close_connection = True
+            if not self._resposta_iniciada:
+                self._enviar_json(500, _erro_json(ErroAPI(500, 'INTERNAL_ERROR', "Erro interno do servidor")))
+            return
+        status, dados = resposta
+        self._enviar_json(status, {'success': True, 'data': dados})
+
+    def _ler_corpo(self) -> Any:
+        if 'chunked' in self.headers.get('Transfer-Encoding', ''):
+            self.close_connection = True
+            raise ErroAPI(411, 'LENGTH_REQUIRED', "Envie o corpo com Content-Length")
+        try:
+            tamanho = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            tamanho = -1
+        if tamanho < 0:
+            self.close_connection = True  # sem tamanho confiável, o resto da conexão é ilegível
+            raise ErroAPI(400, 'INVALID_CONTENT_LENGTH', "Content-Length deve ser um inteiro não negativo")
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            self.close_connection = True
+            raise ErroAPI(413, 'PAYLOAD_TOO_LARGE', "Corpo da requisição muito grande")
+        dados = self.rfile.read(tamanho) if tamanho else b''
+        if not dados:
+            return None
+        try:
+            return json.loads(dados)
+        except ValueError:
+            raise ErroAPI(400, 'INVALID_JSON', "Corpo não é um JSON válido") from None
+
+    def send_response(self, code: int, message: Optional[str] = None) -> None:
+        self._resposta_iniciada = True
+        super().send_response(code, message)
+
+    def _enviar_json(self, status: int, conteudo: Any) -> None:
+        corpo = json.dumps(conteudo, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _enviar_fila(self, api: ServidorAPI) -> None:
+        etag, corpo = api.listagem_fila()
+        if etag is not None and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if etag is not None:
+            self.send_header('ETag', etag)
+        if isinstance(corpo, bytes):
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+            return
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for chunk in corpo:
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _enviar_eventos(self, api: ServidorAPI) -> None:
+        fluxo = getattr(api.gerenciador, 'fluxo', None)
+        if fluxo is None:
+            raise ErroAPI(404, 'NOT_FOUND', "Fluxo de mudanças não configurado no gerenciador")
+        ultimo = self.headers.get('Last-Event-ID')
+        desde = int(ultimo) if ultimo and ultimo.isdigit() else None
+        # Resposta sem tamanho definido: termina quando a conexão fecha
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        quadros = fluxo.assinar(desde)
+        try:
+            for quadro in quadros:
+                self.wfile.write(quadro)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # tela desconectou
+        finally:
+            quadros.close()
+
+
+def _chunks_fila(fila: List[Paciente]) -> Iterator[bytes]:
+    """Envelope JSON da fila em pedaços de até TAMANHO_CHUNK pacientes."""
+    yield b'{"success":true,"data":{"total":%d,"pacientes":[' % len(fila)
+    for inicio in range(0, len(fila), TAMANHO_CHUNK):
+        itens = [json.dumps(dict(_paciente_json(p), posicao=inicio + i + 1), ensure_ascii=False)
+                 for i, p in enumerate(fila[inicio:inicio + TAMANHO_CHUNK])]
+        yield (',' if inicio else '').encode() + ','.join(itens).encode('utf-8')
+    yield b']}}'
+
+
+def _paciente_json(paciente: Paciente) -> Dict[str, Any]:
+    return {
+        'nome': paciente.nome,
+        'idade': paciente.idade,
+        'urgencia': paciente.urgencia,
+        'urgenciaTexto': obter_texto_urgencia(paciente.urgencia),
+        'timestamp': paciente.timestamp.isoformat(),
+    }
+
+
+def _agendamento_json(agendamento: Any, situacao: str) -> Dict[str, Any]:
+    return {
+        'protocol': agendamento.protocolo,
+        'doctorId': agendamento.medico_id,
+        'patientName': agendamento.paciente,
+        'dateTime': agendamento.inicio.isoformat(),
+        'duration': 30,
+        'status': situacao,
+    }
+
+
+def _erro_json(erro: ErroAPI) -> Dict[str, Any]:
+    conteudo = {'code': erro.codigo, 'message': erro.mensagem}
+    if erro.detalhes is not None:
+        conteudo['details'] = erro.detalhes
+    return {'success': False, 'error': conteudo}
+
+
+def _linha_paciente(linha: Any) -> Any:
+    """Converte o timestamp ISO de uma linha JSON em datetime para adicionar_lote."""
+    if isinstance(linha, dict) and isinstance(linha.get('timestamp'), str):
+        try:
+            return dict(linha, timestamp=datetime.fromisoformat(linha['timestamp']))
+        except ValueError:
+            pass  # adicionar_lote rejeita a linha com a mensagem de timestamp inválido
+    return linha
+
+
+def _parametro(parametros: Dict[str, str], nome: str) -> str:
+    valor = parametros.get(nome)
+    if not valor:
+        raise ErroAPI(400, 'VALIDATION_ERROR', f"Parâmetro obrigatório: {nome}")
+    return valor
+
+
+def _converter(conversor: Any, valor: str, campo: str) -> Any:
+    try:
+        return conversor(valor)
+    except ValueError:
+        raise ErroAPI(400, 'VALIDATION_ERROR', f"Valor inválido para {campo}: {valor}") from None
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Servidor HTTP da triagem e do agendamento")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8080)
+    args = parser.parse_args()
+
+    servidor = ServidorAPI(host=args.host, porta=args.porta)
+    host, porta = servidor.endereco
+    print(f"🌐 Servidor da triagem em http://{host}:{porta} (Ctrl+C para sair)")
+    try:
+        servidor.servir()
+    except KeyboardInterrupt:
+        servidor.parar()
+
+
+if __name__ == "__main__":
+    main()
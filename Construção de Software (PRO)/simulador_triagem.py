@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Simulador de eventos discretos do pronto-socorro.
+Gera chegadas de Poisson (com perfil ao longo do dia e surtos), urgências
+sorteadas de um mix e tempos de atendimento por urgência, e conduz um
+GerenciadorTriagem real com N enfermeiros em um relógio virtual: um dia
+simulado leva segundos. Reporta tamanho da fila, percentis de espera por
+urgência, vazão e ocupação da equipe, para dimensionar plantões e testar
+os backends de fila com volumes muito acima do real.
+
+Uso:
+    python simulador_triagem.py
+    python simulador_triagem.py --cenario surto --enfermeiros 2 3 4 5
+    python simulador_triagem.py --escala 100 --backend faixas --nivel desligado --sem-logs
+    python simulador_triagem.py --cenario surto --politica envelhecimento
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import logging
+import math
+import random
+import time
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from filas import FilaFaixas, FilaHeap, FilaLista
+from monitor_sistema import NIVEIS_INSTRUMENTACAO, monitor
+from politicas_prioridade import POLITICAS, FilaPolitica
+from relogio import RelogioVirtual
+from triagem import GerenciadorTriagem, Paciente
+
+Amostrador = Callable[[random.Random], float]
+
+BACKENDS = {
+    'lista': FilaLista,
+    'heap': FilaHeap,
+    'faixas': FilaFaixas,
+}
+
+HORA = 3600.0
+DIA = 24 * HORA
+
+# Proporção de chegadas por urgência 1..5
+MIX_PADRAO = (0.30, 0.30, 0.25, 0.10, 0.05)
+MIX_SURTO = (0.10, 0.20, 0.30, 0.25, 0.15)
+
+# Multiplicador da taxa por hora do dia (média 1): madrugada calma, picos às 10h e às 19h
+PERFIL_PRONTO_SOCORRO = (
+    0.40, 0.30, 0.25, 0.25, 0.30, 0.40, 0.60, 0.90, 1.20, 1.40, 1.50, 1.40,
+    1.30, 1.30, 1.30, 1.30, 1.40, 1.50, 1.60, 1.70, 1.50, 1.20, 0.80, 0.50,
+)
+
+PERCENTIS = (50, 90, 95, 99)
+
+
+class Chegada(NamedTuple):
+    """Chegada de um paciente, em segundos desde o início da simulação."""
+    tempo: float
+    urgencia: int
+    idade: int
+
+
+def exponencial(media: float) -> Amostrador:
+    """Tempos exponenciais com a média dada (segundos)."""
+    return lambda gerador: gerador.expovariate(1.0 / media)
+
+
+def lognormal(media: float, desvio: float) -> Amostrador:
+    """Tempos log-normais com a média e o desvio padrão dados (segundos)."""
+    sigma2 = math.log(1 + (desvio / media) ** 2)
+    mu = math.log(media) - sigma2 / 2
+    sigma = math.sqrt(sigma2)
+    return lambda gerador: gerador.lognormvariate(mu, sigma)
+
+
+def fixo(valor: float) -> Amostrador:
+    """Tempo constante (útil para cenários verificáveis à mão)."""
+    return lambda gerador: valor
+
+
+def _atendimento_padrao() -> Dict[int, Amostrador]:
+    # Casos mais graves tomam mais tempo da equipe
+    return {
+        1: lognormal(5 * 60, 3 * 60),
+        2: lognormal(8 * 60, 4 * 60),
+        3: lognormal(12 * 60, 6 * 60),
+        4: lognormal(18 * 60, 9 * 60),
+        5: lognormal(25 * 60, 12 * 60),
+    }
+
+
+@dataclass
+class Surto:
+    """Período com taxa de chegadas multiplicada (acidente, epidemia, evento)."""
+    inicio: float  # segundos desde o início da simulação
+    duracao: float
+    multiplicador: float
+    mix_urgencia: Optional[Tuple[float, ...]] = None  # padrão: o mix do cenário
+
+    def ativo(self, tempo: float) -> bool:
+        return self.inicio <= tempo < self.inicio + self.duracao
+
+
+@dataclass
+class Cenario:
+    """Parâmetros de uma simulação."""
+    nome: str
+    duracao: float = DIA
+    chegadas_por_hora: float = 12.0  # média ao longo do dia
+    mix_urgencia: Tuple[float, ...] = MIX_PADRAO
+    enfermeiros: int = 3
+    atendimento: Dict[int, Amostrador] = field(default_factory=_atendimento_padrao)
+    perfil_horario: Optional[Tuple[float, ...]] = PERFIL_PRONTO_SOCORRO  # None: taxa constante
+    surtos: List[Surto] = field(default_factory=list)
+
+    def escalado(self, fator: float) -> 'Cenario':
+        """Mesmo cenário com chegadas e equipe multiplicadas por `fator` (mesma carga por enfermeiro)."""
+        return replace(self, chegadas_por_hora=self.chegadas_por_hora * fator,
+                       enfermeiros=max(1, round(self.enfermeiros * fator)))
+
+    def taxa(self, tempo: float) -> float:
+        """Chegadas por segundo no instante `tempo`."""
+        taxa = self.chegadas_por_hora / HORA
+        if self.perfil_horario is not None:
+            taxa *= self.perfil_horario[int(tempo // HORA) % 24]
+        for surto in self.surtos:
+            if surto.ativo(tempo):
+                taxa *= surto.multiplicador
+        return taxa
+
+    def mix(self, tempo: float) -> Tuple[float, ...]:
+        """Mix de urgências no instante `tempo`."""
+        for surto in reversed(self.surtos):
+            if surto.mix_urgencia is not None and surto.ativo(tempo):
+                return surto.mix_urgencia
+        return self.mix_urgencia
+
+
+CENARIOS = {
+    'normal': Cenario('normal'),
+    # Epidemia de fim de tarde: 3x mais chegadas e mais graves entre 17h e 21h
+    'surto': Cenario('surto', surtos=[Surto(17 * HORA, 4 * HORA, 3.0, MIX_SURTO)]),
+    # Acidente com múltiplas vítimas: 10x por meia hora, quase só urgências altas
+    'acidente': Cenario('acidente', surtos=[Surto(14 * HORA, HORA / 2, 10.0, (0.0, 0.05, 0.25, 0.35, 0.35))]),
+}
+
+
+def gerar_chegadas(cenario: Cenario, gerador: random.Random) -> Iterator[Chegada]:
+    """
+    Chegadas de um processo de Poisson não homogêneo, em ordem de tempo.
+
+    Usa thinning (Lewis-Shedler): candidatos a uma taxa máxima constante
+    são aceitos com probabilidade taxa(t)/taxa_maxima, o que vale para
+    qualquer combinação de perfil horário e surtos. Serve também como
+    gerador de carga independente do simulador.
+    """
+    taxa_maxima = cenario.chegadas_por_hora / HORA
+    if cenario.perfil_horario is not None:
+        taxa_maxima *= max(cenario.perfil_horario)
+    for surto in cenario.surtos:
+        taxa_maxima *= max(1.0, surto.multiplicador)
+    if taxa_maxima <= 0:
+        return
+
+    urgencias = (1, 2, 3, 4, 5)
+    tempo = 0.0
+    while True:
+        tempo += gerador.expovariate(taxa_maxima)
+        if tempo >= cenario.duracao:
+            return
+        if gerador.random() * taxa_maxima < cenario.taxa(tempo):
+            urgencia = gerador.choices(urgencias, cenario.mix(tempo))[0]
+            yield Chegada(tempo, urgencia, gerador.randint(0, 95))
+
+
+@dataclass
+class ResultadoSimulacao:
+    """Indicadores de uma simulação (tempos em segundos simulados)."""
+    cenario: str
+    enfermeiros: int
+    duracao: float
+    chegadas: int = 0
+    atendidos: int = 0
+    aguardando_no_fim: int = 0
+    aguardando_por_urgencia: Dict[int, int] = field(default_factory=dict)  # sem atendimento ao fim; fora das esperas
+    vazao_por_hora: float = 0.0
+    fila_media: float = 0.0
+    fila_maxima: int = 0
+    fila_por_hora: List[int] = field(default_factory=list)  # tamanho da fila a cada hora cheia
+    espera_por_urgencia: Dict[int, Dict[str, float]] = field(default_factory=dict)
+    ocupacao_equipe: float = 0.0
+    eventos: int = 0
+    tempo_real: float = 0.0  # segundos de relógio de parede
+
+    def como_dict(self) -> Dict:
+        return asdict(self)
+
+
+def percentil(valores: Sequence[float], p: float) -> float:
+    """Percentil p (0-100) por posição em uma lista já ordenada."""
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+
+def _resumo_esperas(esperas: List[float]) -> Dict[str, float]:
+    esperas.sort()
+    resumo = {'quantidade': len(esperas), 'media': sum(esperas) / len(esperas)}
+    for p in PERCENTIS:
+        resumo[f'p{p}'] = percentil(esperas, p)
+    resumo['maxima'] = esperas[-1]
+    return resumo
+
+
+# Tipos de evento; no mesmo instante, saídas liberam enfermeiros antes das chegadas
+_FIM_ATENDIMENTO, _CHEGADA, _AMOSTRA = 0, 1, 2
+
+
+def simular(cenario: Cenario, gerenciador: Optional[GerenciadorTriagem] = None,
+            semente: Optional[int] = None, chegadas: Optional[Iterable[Chegada]] = None,
+            inicio: Optional[datetime] = None) -> ResultadoSimulacao:
+    """
+    Executa a simulação de eventos discretos.
+
+    O relógio é virtual (relogio.RelogioVirtual): a simulação salta de
+    evento em evento e o gerenciador passa a usar o mesmo relógio, de modo
+    que timestamps de chegada, a métrica tempo_espera e os registros do
+    monitor ficam no tempo simulado e a fila ordena como ordenaria em
+    tempo real.
+
+    Args:
+        cenario: Parâmetros da simulação
+        gerenciador: Gerenciador conduzido (padrão: GerenciadorTriagem() com FilaHeap);
+            seu relógio é substituído pelo relógio da simulação
+        semente: Semente do gerador aleatório, para resultados reprodutíveis
+        chegadas: Chegadas prontas em ordem de tempo (padrão: gerar_chegadas)
+        inicio: Data e hora do instante zero (padrão: meia-noite de hoje)
+
+    Returns:
+        Indicadores da simulação
+    """
+    if cenario.enfermeiros < 1:
+        raise ValueError("O cenário precisa de pelo menos um enfermeiro")
+    gerador = random.Random(semente)
+    # Durações sorteadas na chegada, em fluxo próprio: com a mesma semente cada paciente
+    # tem a mesma duração de atendimento em qualquer backend ou política de prioridade
+    gerador_atendimento = random.Random(gerador.getrandbits(64))
+    inicio = inicio if inicio is not None else datetime.combine(datetime.now().date(), datetime.min.time())
+    relogio = RelogioVirtual(inicio)
+    if gerenciador is None:
+        gerenciador = GerenciadorTriagem(relogio=relogio)
+    gerenciador.relogio = relogio
+    fonte = iter(chegadas if chegadas is not None else gerar_chegadas(cenario, gerador))
+    atendimento = cenario.atendimento
+
+    relogio_real = time.perf_counter()
+    resultado = ResultadoSimulacao(cenario.nome, cenario.enfermeiros, cenario.duracao)
+    eventos: List[Tuple[float, int, int, object]] = []
+    ordem = itertools.count()
+    chegada_de: Dict[int, Tuple[float, int, float]] = {}  # id(paciente) -> (chegada, urgência, duração)
+    esperas: Dict[int, List[float]] = {urgencia: [] for urgencia in (1, 2, 3, 4, 5)}
+    livres = cenario.enfermeiros
+    fila = 0
+    area_fila = 0.0  # integral do tamanho da fila no tempo
+    ultimo = 0.0
+    ocupado = 0.0
+
+    def agendar_chegada() -> None:
+        proxima = next(fonte, None)
+        if proxima is not None and proxima.tempo < cenario.duracao:
+            heapq.heappush(eventos, (proxima.tempo, _CHEGADA, next(ordem), proxima))
+
+    agendar_chegada()
+    heapq.heappush(eventos, (0.0, _AMOSTRA, next(ordem), None))
+
+    while eventos:
+        agora, tipo, _, dados = heapq.heappop(eventos)
+        if agora >= cenario.duracao:
+            break
+        resultado.eventos += 1
+        relogio.definir(agora)
+        area_fila += fila * (agora - ultimo)
+        ultimo = agora
+
+        if tipo == _CHEGADA:
+            chegada = dados
+            paciente = Paciente._ja_validado(f"Paciente {resultado.chegadas + 1}", chegada.idade,
+                                             chegada.urgencia, relogio.chegada())
+            chegada_de[id(paciente)] = (agora, chegada.urgencia,
+                                        atendimento[chegada.urgencia](gerador_atendimento))
+            gerenciador.adicionar_paciente(paciente)
+            resultado.chegadas += 1
+            fila += 1
+            resultado.fila_maxima = max(resultado.fila_maxima, fila)
+            agendar_chegada()
+        elif tipo == _FIM_ATENDIMENTO:
+            livres += 1
+        else:
+            resultado.fila_por_hora.append(fila)
+            heapq.heappush(eventos, (agora + HORA, _AMOSTRA, next(ordem), None))
+            continue
+
+        while livres and fila:
+            paciente = gerenciador.atender_proximo()
+            fila -= 1
+            livres -= 1
+            chegou, _, duracao = chegada_de.pop(id(paciente))
+            esperas[paciente.urgencia].append(agora - chegou)
+            resultado.atendidos += 1
+            ocupado += min(duracao, cenario.duracao - agora)
+            heapq.heappush(eventos, (agora + duracao, _FIM_ATENDIMENTO, next(ordem), None))
+
+    area_fila += fila * (cenario.duracao - ultimo)
+    resultado.aguardando_no_fim = fila
+    for _, urgencia, _ in chegada_de.values():
+        resultado.aguardando_por_urgencia[urgencia] = resultado.aguardando_por_urgencia.get(urgencia, 0) + 1
+    resultado.fila_media = area_fila / cenario.duracao
+    resultado.vazao_por_hora = resultado.atendidos / (cenario.duracao / HORA)
+    resultado.ocupacao_equipe = ocupado / (cenario.enfermeiros * cenario.duracao)
+    resultado.espera_por_urgencia = {urgencia: _resumo_esperas(lista)
+                                     for urgencia, lista in esperas.items() if lista}
+    resultado.tempo_real = time.perf_counter() - relogio_real
+    return resultado
+
+
+def imprimir_resultado(resultado: ResultadoSimulacao) -> None:
+    """Exibe os indicadores de uma simulação."""
+    print(f"Cenário '{resultado.cenario}' | {resultado.enfermeiros} enfermeiro(s) | "
+          f"{resultado.duracao / HORA:.0f} h simuladas em {resultado.tempo_real:.2f} s "
+          f"({resultado.eventos / max(resultado.tempo_real, 1e-9):,.0f} eventos/s)")
+    print(f"Chegadas: {resultado.chegadas} | atendidos: {resultado.atendidos} "
+          f"({resultado.vazao_por_hora:.1f}/h) | aguardando no fim: {resultado.aguardando_no_fim} | "
+          f"ocupação da equipe: {resultado.ocupacao_equipe:.0%}")
+    print(f"Fila: média {resultado.fila_media:.1f} | máxima {resultado.fila_maxima} | por hora: "
+          + " ".join(str(tamanho) for tamanho in resultado.fila_por_hora))
+    print(f"{'Urgência':>9} | {'atendidos':>9} | {'média':>8} | "
+          + " | ".join(f"{'p' + str(p):>8}" for p in PERCENTIS) + f" | {'máxima':>8} | {'aguardando':>10}")
+    for urgencia in (5, 4, 3, 2, 1):
+        resumo = resultado.espera_por_urgencia.get(urgencia)
+        aguardando = resultado.aguardando_por_urgencia.get(urgencia, 0)
+        if resumo is None:
+            print(f"{urgencia:>9} | {0:>9} | {'-':>8} | " + " | ".join(f"{'-':>8}" for _ in PERCENTIS)
+                  + f" | {'-':>8} | {aguardando:>10}")
+            continue
+        print(f"{urgencia:>9} | {resumo['quantidade']:>9} | {resumo['media'] / 60:8.1f} | "
+              + " | ".join(f"{resumo[f'p{p}'] / 60:8.1f}" for p in PERCENTIS)
+              + f" | {resumo['maxima'] / 60:8.1f} | {aguardando:>10}")
+    print("(esperas em minutos, só dos atendidos; 'aguardando' ainda estava na fila ao fim)")
+
+
+def main() -> None:
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Simulador de eventos discretos do pronto-socorro")
+    parser.add_argument('--cenario', choices=list(CENARIOS), default='normal')
+    parser.add_argument('--dias', type=float, default=1.0)
+    parser.add_argument('--chegadas-por-hora', type=float, help="Média de chegadas por hora (padrão do cenário)")
+    parser.add_argument('--enfermeiros', type=int, nargs='+', help="Uma simulação por tamanho de equipe")
+    parser.add_argument('--escala', type=float, default=1.0,
+                        help="Multiplica chegadas e equipe (ex.: 100 para 100x o volume real)")
+    parser.add_argument('--backend', choices=list(BACKENDS), default='heap')
+    parser.add_argument('--politica', choices=list(POLITICAS),
+                        help="Política de prioridade (FilaPolitica; substitui --backend)")
+    parser.add_argument('--nivel', choices=NIVEIS_INSTRUMENTACAO, default='contadores',
+                        help="nível de instrumentação do decorator durante a simulação")
+    parser.add_argument('--sem-logs', action='store_true',
+                        help="Descarta os logs do monitor durante a simulação (mede só a fila)")
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--json', metavar='ARQUIVO', help="Grava os resultados em JSON")
+    args = parser.parse_args()
+
+    cenario = replace(CENARIOS[args.cenario], duracao=args.dias * DIA)
+    if args.chegadas_por_hora is not None:
+        cenario = replace(cenario, chegadas_por_hora=args.chegadas_por_hora)
+    equipes = args.enfermeiros or [cenario.enfermeiros]
+
+    print("🚑 SIMULADOR DO PRONTO-SOCORRO")
+    print("=" * 80)
+    if args.politica:
+        print(f"Política de prioridade: {args.politica}")
+    nivel_original = monitor.nivel_instrumentacao
+    monitor.configurar_instrumentacao(args.nivel)
+    if args.sem_logs:
+        logging.disable(logging.CRITICAL)
+    resultados = []
+    try:
+        for equipe in equipes:
+            simulado = replace(cenario, enfermeiros=equipe).escalado(args.escala)
+            if args.politica:
+                gerenciador = GerenciadorTriagem(FilaPolitica(POLITICAS[args.politica]()))
+            else:
+                gerenciador = GerenciadorTriagem(BACKENDS[args.backend]())
+            resultado = simular(simulado, gerenciador, semente=args.semente)
+            imprimir_resultado(resultado)
+            print("-" * 80)
+            resultados.append(resultado)
+    finally:
+        logging.disable(logging.NOTSET)
+        monitor.configurar_instrumentacao(nivel_original)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as arquivo:
+            json.dump([resultado.como_dict() for resultado in resultados], arquivo, ensure_ascii=False, indent=2)
+        print(f"💾 Resultados gravados em {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,27 +4,40 @@ Sistema de Triagem de Pacientes - Clínica Médica
 Gerencia fila de espera com priorização por urgência e ordem de chegada.
 """
 
-from typing import List
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 import time
 
 # Importar sistema de monitoramento
-from monitor_sistema import monitor, monitorar_performance, validar_entrada_paciente, gerar_relatorio_sistema
+from monitor_sistema import (
+    monitor, monitorar_performance, validar_entrada_paciente, verificar_dados_paciente,
+    gerar_relatorio_sistema
+)
+from filas import FilaPrioridade, FilaHeap
+from relogio import DatetimeISO, Relogio, momento_chegada, obter_relogio
 
 
-@dataclass
+@dataclass(slots=True)
 class Paciente:
-    """Representa um paciente na fila de triagem."""
+    """
+    Representa um paciente na fila de triagem.
+    
+    Usa __slots__ (sem __dict__ por instância) para reduzir a memória de
+    filas e históricos grandes; ver também pacientes_colunares.PacienteArray.
+    """
     nome: str
     idade: int
     urgencia: int  # 1 (baixa) a 5 (crítica)
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: datetime = field(default_factory=momento_chegada)  # único e crescente (ver relogio.Relogio)
     
     def __post_init__(self) -> None:
         """Valida os dados do paciente após inicialização."""
+        # Uma leitura do relógio para o log de erro ou o de criação
+        instante_ns = obter_relogio().agora_ns()
+        
         # Validação com logging integrado
-        if not validar_entrada_paciente(self.nome, self.idade, self.urgencia):
+        if not validar_entrada_paciente(self.nome, self.idade, self.urgencia, instante_ns):
             # A função validar_entrada_paciente já fez o log do erro
             # Apenas lançar exceção genérica
             raise ValueError("Dados de paciente inválidos")
@@ -36,18 +49,110 @@ class Paciente:
                 'nome': self.nome,
                 'idade': self.idade,
                 'urgencia': self.urgencia,
-                'timestamp': self.timestamp.isoformat()
-            }
+                'timestamp': DatetimeISO(self.timestamp)
+            },
+            instante_ns=instante_ns
         )
+    
+    @classmethod
+    def _ja_validado(cls, nome: str, idade: int, urgencia: int, timestamp: datetime) -> 'Paciente':
+        """Cria paciente cujos dados já foram validados, sem validar nem registrar log."""
+        paciente = cls.__new__(cls)
+        paciente.nome = nome
+        paciente.idade = idade
+        paciente.urgencia = urgencia
+        paciente.timestamp = timestamp
+        return paciente
+
+
+@dataclass
+class ResultadoLote:
+    """Resultado de uma admissão em lote."""
+    adicionados: List[Paciente] = field(default_factory=list)
+    erros: List[Tuple[int, str]] = field(default_factory=list)  # (linha, mensagem)
+    
+    @property
+    def sucesso(self) -> bool:
+        """Indica se todas as linhas do lote foram aceitas."""
+        return not self.erros
+
+
+class _FilaSomenteLeitura(list):
+    """Cópia da fila que recusa alterações (elas não chegariam ao backend)."""
+    
+    __slots__ = ()
+    
+    def _recusar(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("GerenciadorTriagem.fila é somente leitura; "
+                        "use adicionar_paciente/adicionar_lote e atender_proximo")
+    
+    append = extend = insert = remove = pop = clear = sort = reverse = _recusar
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _recusar
 
 
 class GerenciadorTriagem:
     """Gerencia a fila de triagem de pacientes."""
     
-    def __init__(self) -> None:
-        """Inicializa o gerenciador com fila vazia."""
-        self.fila: List[Paciente] = []
-        monitor.log_operacao("inicializar_gerenciador", {'fila_inicial': 0})
+    def __init__(self, backend: Optional[FilaPrioridade] = None, historico: Optional[Any] = None,
+                 indice_nomes: Optional[Any] = None, fluxo: Optional[Any] = None,
+                 relogio: Optional[Relogio] = None) -> None:
+        """
+        Inicializa o gerenciador com fila vazia.
+        
+        Args:
+            backend: Estrutura de fila a utilizar (padrão: FilaHeap)
+            historico: Recebe cada atendimento (ver historico_pacientes.HistoricoAtendimentos)
+            indice_nomes: Recebe cada admissão (ver busca_pacientes.IndiceNomes)
+            fluxo: Recebe cada mudança da fila (ver fluxo_fila.FluxoFila)
+            relogio: Fonte de tempo de chegadas, esperas e registros (padrão: relogio.obter_relogio())
+        """
+        self._fila: FilaPrioridade = backend if backend is not None else FilaHeap()
+        self.historico = historico
+        self.indice_nomes = indice_nomes
+        self.fluxo = fluxo
+        self.relogio = relogio if relogio is not None else obter_relogio()
+        if fluxo is not None:
+            fluxo.usar_ordem(self._fila.chave_ordem)
+            fluxo.carregar(self._fila.ordenada())
+        self._reordenacoes_fluxo = self._fila.reordenacoes
+        self._versao = 0
+        monitor.log_operacao("inicializar_gerenciador", {
+            'fila_inicial': len(self._fila),
+            'backend': type(self._fila).__name__
+        })
+    
+    def __len__(self) -> int:
+        """Número de pacientes aguardando, sem copiar a fila."""
+        return len(self._fila)
+    
+    @property
+    def fila(self) -> List[Paciente]:
+        """
+        Pacientes aguardando atendimento (cópia somente leitura, na ordem interna do backend).
+        
+        Alterar a cópia (append, remove, atribuição...) lança TypeError em vez
+        de ser ignorado em silêncio; use adicionar_paciente e atender_proximo.
+        """
+        return _FilaSomenteLeitura(self._pacientes())
+    
+    @fila.setter
+    def fila(self, valor: Any) -> None:
+        raise AttributeError("GerenciadorTriagem.fila é somente leitura; escolha a estrutura com o parâmetro backend")
+    
+    @property
+    def relogio(self) -> Relogio:
+        """Fonte de tempo do gerenciador, repassada ao backend da fila."""
+        return self._relogio
+    
+    @relogio.setter
+    def relogio(self, relogio: Relogio) -> None:
+        self._relogio = relogio
+        self._fila.usar_relogio(relogio)
+    
+    @property
+    def versao(self) -> int:
+        """Contador de mudanças da fila: muda a cada inserção, atendimento ou reordenação."""
+        return self._versao + self._fila.reordenacoes
     
     @monitorar_performance("triagem")
     def adicionar_paciente(self, paciente: Paciente) -> None:
@@ -57,15 +162,21 @@ class GerenciadorTriagem:
         Args:
             paciente: Paciente a ser adicionado
         """
-        self.fila.append(paciente)
-        monitor.contadores['pacientes_adicionados'] += 1
+        tamanho_fila = self._inserir([paciente])
+        if self.indice_nomes is not None:
+            self.indice_nomes.adicionar(paciente)
+        monitor.incrementar('pacientes_adicionados')
+        
+        # Uma leitura do relógio para a métrica e o log
+        instante_ns = self.relogio.agora_ns()
         
         # Registrar métrica de tamanho da fila
         monitor.registrar_metrica(
             nome="tamanho_fila",
-            valor=len(self.fila),
+            valor=tamanho_fila,
             categoria="capacidade",
-            detalhes={'operacao': 'adicionar_paciente'}
+            detalhes={'operacao': 'adicionar_paciente'},
+            instante_ns=instante_ns
         )
         
         monitor.log_operacao(
@@ -73,9 +184,89 @@ class GerenciadorTriagem:
             detalhes={
                 'paciente': paciente.nome,
                 'urgencia': paciente.urgencia,
-                'tamanho_fila': len(self.fila)
-            }
+                'tamanho_fila': tamanho_fila
+            },
+            instante_ns=instante_ns
+        )
+    
+    @monitorar_performance("triagem")
+    def adicionar_lote(self, linhas: Iterable[Any]) -> ResultadoLote:
+        """
+        Valida e adiciona um lote de pacientes em uma única operação.
+        
+        Cada linha pode ser um Paciente, um mapeamento com as chaves
+        'nome', 'idade', 'urgencia' (e opcionalmente 'timestamp') ou uma
+        sequência (nome, idade, urgencia[, timestamp]). Linhas inválidas
+        são rejeitadas individualmente sem impedir as demais; linhas sem
+        timestamp recebem o mesmo horário de chegada e mantêm a ordem do lote.
+        
+        Args:
+            linhas: Linhas do lote
+            
+        Returns:
+            Pacientes adicionados e erros por linha (índice a partir de 0)
+        """
+        # Um instante para o lote: chegada das linhas sem timestamp, métrica e logs
+        instante_ns = self.relogio.carimbo_ns()
+        chegada = self.relogio.para_datetime(instante_ns)
+        resultado = ResultadoLote()
+        erros_log = []
+        total = 0
+        
+        for indice, linha in enumerate(linhas):
+            total += 1
+            if isinstance(linha, Paciente):
+                resultado.adicionados.append(linha)
+                continue
+            
+            dados = _extrair_dados_linha(linha)
+            if dados is None:
+                mensagem = "Formato de linha inválido"
+                dados_entrada = {'linha': str(linha)[:100]}
+            else:
+                nome, idade, urgencia, timestamp = dados
+                erros = verificar_dados_paciente(nome, idade, urgencia)
+                if timestamp is not None and not isinstance(timestamp, datetime):
+                    erros.append("Timestamp deve ser um datetime")
+                if not erros:
+                    resultado.adicionados.append(Paciente._ja_validado(
+                        nome, idade, urgencia, timestamp if timestamp is not None else chegada
+                    ))
+                    continue
+                mensagem = "; ".join(erros)
+                dados_entrada = {'nome': nome, 'idade': idade, 'urgencia': urgencia}
+            
+            resultado.erros.append((indice, mensagem))
+            erros_log.append({'linha': indice, 'erro': mensagem, 'dados_entrada': dados_entrada})
+        
+        tamanho_fila = self._inserir(resultado.adicionados)
+        if self.indice_nomes is not None:
+            self.indice_nomes.adicionar_varios(resultado.adicionados)
+        monitor.incrementar('pacientes_adicionados', len(resultado.adicionados))
+        
+        if erros_log:
+            monitor.log_erros_validacao_lote(erros_log, total, instante_ns)
+        
+        monitor.registrar_metrica(
+            nome="tamanho_fila",
+            valor=tamanho_fila,
+            categoria="capacidade",
+            detalhes={'operacao': 'adicionar_lote', 'tamanho_lote': total},
+            instante_ns=instante_ns
+        )
+        
+        monitor.log_operacao(
+            operacao="adicionar_lote",
+            detalhes={
+                'linhas_recebidas': total,
+                'pacientes_adicionados': len(resultado.adicionados),
+                'linhas_rejeitadas': len(resultado.erros),
+                'tamanho_fila': tamanho_fila
+            },
+            instante_ns=instante_ns
         )
+        
+        return resultado
     
     @monitorar_performance("triagem")
     def obter_fila_ordenada(self) -> List[Paciente]:
@@ -84,21 +275,24 @@ class GerenciadorTriagem:
         
         Returns:
             Lista de pacientes ordenada por urgência (maior primeiro),
-            depois por timestamp (quem chegou primeiro)
+            depois por timestamp (quem chegou primeiro). A lista é uma
+            cópia do snapshot do backend; alterá-la não afeta a fila.
         """
-        inicio = time.time()
-        resultado = ordenar_por_prioridade(self.fila)
-        tempo_ordenacao = time.time() - inicio
+        # Duração medida no relógio de desempenho: é custo de CPU, não tempo da clínica
+        inicio = time.perf_counter_ns()
+        resultado = list(self._ordenada())
+        tempo_ordenacao = (time.perf_counter_ns() - inicio) / 1e9
         
         # Registrar métricas de performance
-        monitor.contadores['operacoes_ordenacao'] += 1
-        monitor.contadores['tempo_total_ordenacao'] += tempo_ordenacao
+        monitor.incrementar('operacoes_ordenacao')
+        monitor.incrementar('tempo_total_ordenacao', tempo_ordenacao)
         
         monitor.registrar_metrica(
             nome="tempo_ordenacao",
             valor=tempo_ordenacao,
             categoria="performance",
-            detalhes={'tamanho_fila': len(self.fila)}
+            detalhes={'tamanho_fila': len(resultado)},
+            instante_ns=self.relogio.agora_ns()
         )
         
         return resultado
@@ -114,21 +308,29 @@ class GerenciadorTriagem:
         Raises:
             IndexError: Se a fila estiver vazia
         """
-        if not self.fila:
+        try:
+            proximo, restante = self._retirar()
+        except IndexError:
             monitor.log_erro_validacao(
                 erro="Tentativa de atender paciente com fila vazia",
-                dados_entrada={'tamanho_fila': 0}
+                dados_entrada={'tamanho_fila': 0},
+                instante_ns=self.relogio.agora_ns()
             )
-            raise IndexError("Fila vazia")
-        
-        fila_ordenada = self.obter_fila_ordenada()
-        proximo = fila_ordenada[0]
-        self.fila.remove(proximo)
+            raise
         
-        monitor.contadores['pacientes_atendidos'] += 1
+        self._registrar_atendimento(proximo, restante)
+        return proximo
+    
+    def _registrar_atendimento(self, proximo: Paciente, restante: int) -> None:
+        """Registra contadores, métrica de espera e log de um atendimento."""
+        monitor.incrementar('pacientes_atendidos')
         
-        # Calcular tempo de espera
-        tempo_espera = (datetime.now() - proximo.timestamp).total_seconds()
+        # Calcular tempo de espera (uma leitura do relógio para a métrica e o log)
+        instante_ns = self.relogio.agora_ns()
+        atendido_em = self.relogio.para_datetime(instante_ns)
+        tempo_espera = (atendido_em - proximo.timestamp).total_seconds()
+        if self.historico is not None:
+            self.historico.registrar(proximo, atendido_em, tempo_espera)
         
         monitor.registrar_metrica(
             nome="tempo_espera",
@@ -137,7 +339,8 @@ class GerenciadorTriagem:
             detalhes={
                 'paciente': proximo.nome,
                 'urgencia': proximo.urgencia
-            }
+            },
+            instante_ns=instante_ns
         )
         
         monitor.log_operacao(
@@ -146,15 +349,51 @@ class GerenciadorTriagem:
                 'paciente': proximo.nome,
                 'urgencia': proximo.urgencia,
                 'tempo_espera_segundos': tempo_espera,
-                'fila_restante': len(self.fila)
-            }
+                'fila_restante': restante
+            },
+            instante_ns=instante_ns
         )
-        
-        return proximo
+    
+    def _inserir(self, pacientes: List[Paciente]) -> int:
+        """Insere pacientes na estrutura da fila e retorna o novo tamanho."""
+        self._acompanhar_reordenacoes()
+        if len(pacientes) == 1:
+            self._fila.adicionar(pacientes[0])
+        else:
+            self._fila.adicionar_varios(pacientes)
+        self._versao += 1
+        if self.fluxo is not None:
+            self.fluxo.adicionados(pacientes)
+        return len(self._fila)
+    
+    def _retirar(self) -> Tuple[Paciente, int]:
+        """Remove o próximo paciente; retorna (paciente, tamanho restante)."""
+        self._acompanhar_reordenacoes()
+        proximo = self._fila.remover_proximo()
+        self._versao += 1
+        if self.fluxo is not None:
+            self.fluxo.chamado(proximo)
+        return proximo, len(self._fila)
+    
+    def _pacientes(self) -> List[Paciente]:
+        """Cópia dos pacientes da estrutura da fila, na ordem interna."""
+        return self._fila.pacientes()
+    
+    def _ordenada(self) -> List[Paciente]:
+        """Snapshot ordenado da estrutura da fila."""
+        self._acompanhar_reordenacoes()
+        return self._fila.ordenada()
+    
+    def _acompanhar_reordenacoes(self) -> None:
+        """Repassa ao fluxo as mudanças de ordem que o backend fez sozinho (ordem que depende do tempo)."""
+        if self.fluxo is None or self._fila.reordenacoes == self._reordenacoes_fluxo:
+            return
+        self.fluxo.reordenar(self._fila.ordenada())
+        self._reordenacoes_fluxo = self._fila.reordenacoes
     
     def listar_fila(self) -> None:
         """Exibe a fila atual ordenada por prioridade."""
-        if not self.fila:
+        if not self._fila:
             print("Fila vazia")
             return
         
@@ -166,6 +405,18 @@ class GerenciadorTriagem:
             print(f"{i}. {paciente.nome} ({paciente.idade} anos) - {urgencia_texto} - Chegada: {chegada}")
 
 
+def _extrair_dados_linha(linha: Any) -> Optional[Tuple[Any, Any, Any, Optional[datetime]]]:
+    """Extrai (nome, idade, urgencia, timestamp) de uma linha de lote, ou None."""
+    if isinstance(linha, Mapping):
+        if not {'nome', 'idade', 'urgencia'} <= linha.keys():
+            return None
+        return linha['nome'], linha['idade'], linha['urgencia'], linha.get('timestamp')
+    if isinstance(linha, (tuple, list)) and len(linha) in (3, 4):
+        timestamp = linha[3] if len(linha) == 4 else None
+        return linha[0], linha[1], linha[2], timestamp
+    return None
+
+
 @monitorar_performance("ordenacao")
 def ordenar_por_prioridade(pacientes: List[Paciente]) -> List[Paciente]:
     """
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Fila de triagem para aplicações asyncio.
+`await fila.proximo()` suspende a corrotina até um paciente chegar, sem polling.
+
+Os logs do monitor já são gravados por uma thread própria (EscritorLogAssincrono),
+então as operações não fazem I/O de arquivo no loop. Para que o loop também
+nunca espere por uma fila de log cheia, configure o monitor antes do primeiro uso:
+
+    from monitor_sistema import configurar
+    configurar(politica_descarte='descartar_antigos')
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Deque, Iterable, List, Optional
+
+from monitor_sistema import monitor
+from triagem import GerenciadorTriagem, Paciente, ResultadoLote
+
+
+class FilaTriagemAssincrona:
+    """
+    Adaptador asyncio de um GerenciadorTriagem.
+
+    A ordem de atendimento é a do gerenciador (urgência decrescente, chegada
+    crescente). Deve ser usada a partir de um único event loop; para várias
+    threads, use GerenciadorTriagemConcorrente.
+
+    Exemplo:
+        async for paciente in fila:
+            await atender(paciente)
+    """
+
+    def __init__(self, gerenciador: Optional[GerenciadorTriagem] = None) -> None:
+        """
+        Args:
+            gerenciador: Gerenciador a envolver (padrão: um novo GerenciadorTriagem)
+        """
+        self.gerenciador = gerenciador if gerenciador is not None else GerenciadorTriagem()
+        self._aguardando: Deque[asyncio.Future] = deque()
+        self._fechada = False
+
+    def __len__(self) -> int:
+        return len(self.gerenciador._fila)
+
+    @property
+    def fechada(self) -> bool:
+        """Indica se `fechar()` já foi chamado."""
+        return self._fechada
+
+    def adicionar_paciente(self, paciente: Paciente) -> None:
+        """
+        Adiciona paciente à fila e acorda um atendente em espera.
+
+        Raises:
+            ValueError: Se a fila já estiver fechada
+        """
+        self._verificar_aberta()
+        self.gerenciador.adicionar_paciente(paciente)
+        self._acordar(1)
+
+    def adicionar_lote(self, linhas: Iterable[Any]) -> ResultadoLote:
+        """
+        Adiciona vários pacientes (ver GerenciadorTriagem.adicionar_lote).
+
+        Raises:
+            ValueError: Se a fila já estiver fechada
+        """
+        self._verificar_aberta()
+        resultado = self.gerenciador.adicionar_lote(linhas)
+        self._acordar(len(resultado.adicionados))
+        return resultado
+
+    def obter_fila_ordenada(self) -> List[Paciente]:
+        """Retorna os pacientes aguardando, na ordem de atendimento."""
+        return self.gerenciador.obter_fila_ordenada()
+
+    async def proximo(self, timeout: Optional[float] = None) -> Paciente:
+        """
+        Aguarda e retorna o próximo paciente a ser atendido.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos (None = sem limite)
+
+        Returns:
+            Próximo paciente a ser atendido
+
+        Raises:
+            IndexError: Se a fila continuar vazia após o timeout ou se for fechada vazia
+        """
+        if timeout is None:
+            return await self._aguardar_proximo()
+        try:
+            return await asyncio.wait_for(self._aguardar_proximo(), timeout)
+        except asyncio.TimeoutError:
+            # Mesmo registro do atendimento síncrono com fila vazia, sem passar por ele
+            monitor.log_erro_validacao(
+                erro="Tentativa de atender paciente com fila vazia",
+                dados_entrada={'tamanho_fila': len(self), 'timeout': timeout},
+                instante_ns=self.gerenciador.relogio.agora_ns()
+            )
+            raise IndexError("Fila vazia") from None
+
+    def fechar(self) -> None:
+        """
+        Impede novas chegadas; os pacientes restantes ainda podem ser atendidos.
+
+        Atendentes em espera são acordados e, com a fila vazia, recebem IndexError
+        (ou encerram a iteração com `async for`).
+        """
+        self._fechada = True
+        self._acordar(len(self._aguardando))
+
+    async def descarregar_logs(self) -> None:
+        """Aguarda a gravação dos logs pendentes sem bloquear o loop."""
+        await asyncio.to_thread(monitor.descarregar)
+
+    def __aiter__(self) -> 'FilaTriagemAssincrona':
+        return self
+
+    async def __anext__(self) -> Paciente:
+        try:
+            return await self.proximo()
+        except IndexError:
+            if self._fechada:
+                raise StopAsyncIteration from None
+            raise
+
+    async def _aguardar_proximo(self) -> Paciente:
+        while not len(self) and not self._fechada:
+            futuro = asyncio.get_running_loop().create_future()
+            self._aguardando.append(futuro)
+            try:
+                await futuro
+            except asyncio.CancelledError:
+                # Se o aviso já tinha chegado, repassa-o ao próximo atendente
+                if futuro.done() and not futuro.cancelled():
+                    self._acordar(1)
+                raise
+        if not len(self):
+            # Fechada e vazia: fim normal do atendimento, não é erro de uso
+            raise IndexError("Fila vazia")
+        return self.gerenciador.atender_proximo()
+
+    def _acordar(self, quantidade: int) -> None:
+        while quantidade > 0 and self._aguardando:
+            futuro = self._aguardando.popleft()
+            if not futuro.done():
+                futuro.set_result(None)
+                quantidade -= 1
+
+    def _verificar_aberta(self) -> None:
+        if self._fechada:
+            raise ValueError("Fila fechada para novas chegadas")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Gerenciador de triagem seguro para uso por várias threads.
+Permite várias recepções adicionando e vários enfermeiros atendendo a mesma fila.
+"""
+
+import threading
+from typing import Any, List, Optional, Tuple
+
+from monitor_sistema import monitor, monitorar_performance
+from filas import FilaPrioridade
+from relogio import Relogio
+from triagem import GerenciadorTriagem, Paciente
+
+
+class GerenciadorTriagemConcorrente(GerenciadorTriagem):
+    """
+    GerenciadorTriagem com a estrutura da fila protegida por uma Condition.
+
+    O lock cobre apenas a operação na estrutura (inserir, remover, snapshot);
+    métricas e logs são registrados fora dele. Cada paciente é entregue a
+    exatamente um atendente, e `atender_proximo` pode aguardar chegadas.
+
+    Um lock único é intencional: inserção e remoção mexem no mesmo heap
+    (a raiz e o caminho até ela), então locks separados para recepções e
+    enfermeiros não protegeriam a estrutura. Em benchmark_concorrencia.py
+    (20000 pacientes, nível 'contadores') o lock fica retido ~5 µs de
+    ~120 µs por operação (~4%); a vazão vai de ~9200 ops/s (1+1 threads)
+    a ~10100 ops/s (4+4) e cai para ~8400 ops/s com 8+8, limitada pelo GIL
+    no trabalho fora do lock, não pela disputa por ele.
+    """
+
+    def __init__(self, backend: Optional[FilaPrioridade] = None, historico: Optional[Any] = None,
+                 indice_nomes: Optional[Any] = None, fluxo: Optional[Any] = None,
+                 relogio: Optional[Relogio] = None) -> None:
+        """
+        Inicializa o gerenciador com fila vazia.
+
+        Args:
+            backend: Estrutura de fila a utilizar (padrão: FilaHeap)
+            historico: Recebe cada atendimento (ver historico_pacientes.HistoricoAtendimentos)
+            indice_nomes: Recebe cada admissão (ver busca_pacientes.IndiceNomes)
+            fluxo: Recebe cada mudança da fila (ver fluxo_fila.FluxoFila)
+            relogio: Fonte de tempo de chegadas, esperas e registros (padrão: relogio.obter_relogio())
+        """
+        self._condicao = threading.Condition()
+        super().__init__(backend, historico, indice_nomes, fluxo, relogio)
+
+    @monitorar_performance("triagem")
+    def atender_proximo(self, bloquear: bool = False, timeout: Optional[float] = None) -> Paciente:
+        """
+        Remove e retorna o próximo paciente da fila ordenada.
+
+        Args:
+            bloquear: Aguarda a chegada de um paciente se a fila estiver vazia
+            timeout: Tempo máximo de espera em segundos (None = sem limite)
+
+        Returns:
+            Próximo paciente a ser atendido
+
+        Raises:
+            IndexError: Se a fila estiver (ou continuar, após o timeout) vazia
+        """
+        with self._condicao:
+            if bloquear:
+                self._condicao.wait_for(lambda: len(self._fila) > 0, timeout)
+            try:
+                proximo, restante = self._retirar()
+            except IndexError:
+                proximo = None
+
+        if proximo is None:
+            monitor.log_erro_validacao(
+                erro="Tentativa de atender paciente com fila vazia",
+                dados_entrada={'tamanho_fila': 0, 'bloquear': bloquear, 'timeout': timeout},
+                instante_ns=self.relogio.agora_ns()
+            )
+            raise IndexError("Fila vazia")
+
+        self._registrar_atendimento(proximo, restante)
+        return proximo
+
+    def _inserir(self, pacientes: List[Paciente]) -> int:
+        with self._condicao:
+            tamanho = super()._inserir(pacientes)
+            self._condicao.notify(len(pacientes))
+        return tamanho
+
+    def _retirar(self) -> Tuple[Paciente, int]:
+        with self._condicao:
+            return super()._retirar()
+
+    def _pacientes(self) -> List[Paciente]:
+        with self._condicao:
+            return super()._pacientes()
+
+    def _ordenada(self) -> List[Paciente]:
+        with self._condicao:
+            return super()._ordenada()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para a agenda de consultas.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import date, datetime, timedelta
+import random
+import threading
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from agenda import Agenda, ConflitoAgendamento, Medico, HORARIOS_EXPEDIENTE
+
+segunda = date(2024, 3, 4)
+
+
+def _agenda(dias=14):
+    agenda = Agenda(segunda, dias)
+    agenda.adicionar_medico(Medico("1", "Dr. Carlos Silva", "Clínico Geral"))
+    agenda.adicionar_medico(Medico("2", "Dra. Ana Santos", "Cardiologia"))
+    agenda.adicionar_medico(Medico("3", "Dr. Pedro Oliveira", "Pediatria"))
+    agenda.adicionar_medico(Medico("4", "Dra. Maria Costa", "Cardiologia"))
+    return agenda
+
+
+def _em(dia, horario):
+    return datetime.combine(dia, datetime.strptime(horario, "%H:%M").time())
+
+
+def test_horarios_livres():
+    """Testa os horários de expediente e a remoção dos reservados."""
+    agenda = _agenda()
+    assert len(HORARIOS_EXPEDIENTE) == 18
+    livres = agenda.horarios_livres("1", segunda)
+    assert [f"{h:%H:%M}" for h in livres] == list(HORARIOS_EXPEDIENTE)
+
+    agenda.reservar("1", _em(segunda, "07:00"), "Maria")
+    agenda.reservar("1", _em(segunda, "14:30"), "José")
+    livres = [f"{h:%H:%M}" for h in agenda.horarios_livres("1", segunda)]
+    assert "07:00" not in livres and "14:30" not in livres and len(livres) == 16
+    assert agenda.horarios_livres("1", segunda + timedelta(days=5)) == []  # sábado
+    print("✅ test_horarios_livres passou")
+
+
+def test_reserva_dupla_recusada():
+    """Testa que o mesmo horário não pode ser reservado duas vezes."""
+    agenda = _agenda()
+    horario = _em(segunda, "09:30")
+    agenda.reservar("2", horario, "Maria")
+    try:
+        agenda.reservar("2", horario, "José")
+        assert False, "Deveria ter detectado o conflito"
+    except ConflitoAgendamento:
+        pass
+    assert agenda.agendamento("2", horario).paciente == "Maria"
+    agenda.reservar("4", horario, "José")  # outro médico, mesmo horário
+
+    agenda.cancelar("2", horario)
+    assert agenda.esta_livre("2", horario)
+    agenda.reservar("2", horario, "José")
+    print("✅ test_reserva_dupla_recusada passou")
+
+
+def test_horarios_invalidos():
+    """Testa fins de semana, almoço, minutos quebrados e datas fora da agenda."""
+    agenda = _agenda()
+    invalidos = [_em(segunda + timedelta(days=6), "09:00"), _em(segunda, "12:30"),
+                 _em(segunda, "09:15"), _em(segunda - timedelta(days=7), "09:00"),
+                 _em(segunda + timedelta(days=14), "09:00")]
+    for horario in invalidos:
+        try:
+            agenda.reservar("1", horario, "Maria")
+            assert False, f"Deveria ter rejeitado {horario}"
+        except ValueError as erro:
+            assert not isinstance(erro, ConflitoAgendamento)
+    try:
+        agenda.horarios_livres("99", segunda)
+        assert False, "Deveria ter rejeitado médico desconhecido"
+    except ValueError:
+        pass
+    print("✅ test_horarios_invalidos passou")
+
+
+def test_primeiro_horario_livre_por_especialidade():
+    """Testa a busca pulando horários passados, dias lotados e fins de semana."""
+    agenda = _agenda()
+    medico, horario = agenda.primeiro_horario_livre("Cardiologia", _em(segunda, "10:10"))
+    assert horario == _em(segunda, "10:30") and medico.id == "2"
+
+    # Lota a cardiologia de segunda a sexta da primeira semana
+    for indice in range(5):
+        dia = segunda + timedelta(days=indice)
+        for medico_id in ("2", "4"):
+            for horario in agenda.horarios_livres(medico_id, dia):
+                agenda.reservar(medico_id, horario, "Paciente")
+    medico, horario = agenda.primeiro_horario_livre("Cardiologia", _em(segunda, "07:00"))
+    assert horario == _em(segunda + timedelta(days=7), "07:00")
+
+    agenda.cancelar("4", _em(segunda + timedelta(days=2), "16:00"))
+    medico, horario = agenda.primeiro_horario_livre("Cardiologia", _em(segunda, "07:00"))
+    assert (medico.id, horario) == ("4", _em(segunda + timedelta(days=2), "16:00"))
+
+    assert agenda.primeiro_horario_livre("Neurologia", _em(segunda, "07:00")) is None
+    assert agenda.primeiro_horario_livre("Pediatria", _em(segunda + timedelta(days=30), "07:00")) is None
+    print("✅ test_primeiro_horario_livre_por_especialidade passou")
+
+
+def test_primeiro_horario_livre_igual_a_busca_completa():
+    """Testa, com reservas e cancelamentos aleatórios, o índice por horário contra a varredura dos médicos."""
+    gerador = random.Random(11)
+    agenda = Agenda(segunda, 5)
+    medicos = [f"C{i}" for i in range(6)]
+    for medico_id in medicos[:4]:
+        agenda.adicionar_medico(Medico(medico_id, medico_id, "Clínica"))
+
+    def busca_completa(a_partir):
+        candidatos = [(horario, medicos.index(medico_id), medico_id)
+                      for medico_id in medicos if medico_id in agenda.medicos
+                      for indice in range(5)
+                      for horario in agenda.horarios_livres(medico_id, segunda + timedelta(days=indice))
+                      if horario >= a_partir]
+        if not candidatos:
+            return None
+        horario, _, medico_id = min(candidatos)
+        return medico_id, horario
+
+    reservados = []
+    for passo in range(3000):
+        if passo in (1000, 2000):  # médico novo fica livre em todos os horários
+            medico_id = medicos[4 + passo // 2000]
+            agenda.adicionar_medico(Medico(medico_id, medico_id, "Clínica"))
+        if reservados and gerador.random() < 0.3:
+            agenda.cancelar(*reservados.pop(gerador.randrange(len(reservados))))
+        else:
+            medico_id = gerador.choice([m for m in medicos if m in agenda.medicos])
+            dia = segunda + timedelta(days=gerador.randrange(5))
+            livres = agenda.horarios_livres(medico_id, dia)
+            if livres:
+                horario = gerador.choice(livres[:4])  # concentra nos primeiros horários
+                agenda.reservar(medico_id, horario, "Paciente")
+                reservados.append((medico_id, horario))
+        a_partir = _em(segunda + timedelta(days=gerador.randrange(5)), gerador.choice(["07:00", "09:10", "16:00"]))
+        resultado = agenda.primeiro_horario_livre("Clínica", a_partir)
+        assert (resultado and (resultado[0].id, resultado[1])) == busca_completa(a_partir)
+    print("✅ test_primeiro_horario_livre_igual_a_busca_completa passou")
+
+
+def test_reservas_concorrentes():
+    """Testa que, entre várias threads disputando o mesmo horário, só uma reserva."""
+    agenda = _agenda()
+    horario = _em(segunda, "08:00")
+    aceitas, conflitos = [], []
+    barreira = threading.Barrier(8)
+
+    def disputar(i):
+        barreira.wait()
+        try:
+            aceitas.append(agenda.reservar("3", horario, f"Paciente {i}"))
+        except ConflitoAgendamento:
+            conflitos.append(i)
+
+    threads = [threading.Thread(target=disputar, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(aceitas) == 1 and len(conflitos) == 7
+    print("✅ test_reservas_concorrentes passou")
+
+
+def executar_testes():
+    """Executa todos os testes da agenda."""
+    print("📅 Executando testes da agenda de consultas...")
+
+    test_horarios_livres()
+    test_reserva_dupla_recusada()
+    test_horarios_invalidos()
+    test_primeiro_horario_livre_por_especialidade()
+    test_primeiro_horario_livre_igual_a_busca_completa()
+    test_reservas_concorrentes()
+
+    print("\n✅ Todos os testes da agenda passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
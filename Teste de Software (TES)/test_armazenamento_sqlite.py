@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o backend de fila em SQLite.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import datetime, timedelta
+import tempfile
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from relogio import RelogioVirtual
+from triagem import Paciente, GerenciadorTriagem, ordenar_por_prioridade
+from fluxo_fila import FluxoFila, ReplicaFila
+from armazenamento_sqlite import FilaSQLite, _SELECIONAR_FILA, _ORDEM_ATENDIMENTO
+
+
+def _criar_pacientes(quantidade):
+    base_time = datetime(2024, 1, 1, 8, 0)
+    # Timestamps repetidos testam o desempate pela ordem de inserção
+    return [Paciente(f"Paciente {i}", 30, i % 5 + 1, base_time + timedelta(minutes=i // 3))
+            for i in range(quantidade)]
+
+
+def test_sqlite_mesma_ordem_que_ordenacao():
+    """Testa que o backend SQLite atende na ordem de ordenar_por_prioridade."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        fila = FilaSQLite(os.path.join(diretorio, 'triagem.db'))
+        gerenciador = GerenciadorTriagem(backend=fila)
+        pacientes = _criar_pacientes(25)
+        gerenciador.adicionar_lote(pacientes[:10])
+        for paciente in pacientes[10:]:
+            gerenciador.adicionar_paciente(paciente)
+
+        esperado = ordenar_por_prioridade(pacientes)
+        assert gerenciador.obter_fila_ordenada() == esperado
+        assert [gerenciador.atender_proximo() for _ in range(25)] == esperado
+        fila.fechar()
+    print("✅ test_sqlite_mesma_ordem_que_ordenacao passou")
+
+
+def test_sqlite_persiste_fila_e_historico():
+    """Testa que fila e atendimentos sobrevivem à reabertura do banco."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'triagem.db')
+        fila = FilaSQLite(caminho)
+        fila.adicionar_varios(_criar_pacientes(6))
+        atendido = fila.remover_proximo()
+        esperado = fila.ordenada()
+        fila.fechar()
+
+        reaberta = FilaSQLite(caminho)
+        assert len(reaberta) == 5
+        assert reaberta.ordenada() == esperado
+        historico = reaberta.historico_atendimentos()
+        assert [registro[0] for registro in historico] == [atendido]
+        assert historico[0][2] >= 0
+        reaberta.fechar()
+    print("✅ test_sqlite_persiste_fila_e_historico passou")
+
+
+def test_sqlite_proximo_usa_indice():
+    """Testa que a escolha do próximo paciente percorre o índice, não a tabela."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        fila = FilaSQLite(os.path.join(diretorio, 'triagem.db'))
+        plano = fila._conexao.execute(
+            "EXPLAIN QUERY PLAN " + _SELECIONAR_FILA + _ORDEM_ATENDIMENTO + " LIMIT 1"
+        ).fetchall()
+        detalhes = " ".join(linha[-1] for linha in plano)
+        assert "USING COVERING INDEX idx_fila_prioridade" in detalhes
+        assert "TEMP B-TREE" not in detalhes
+        fila.fechar()
+    print("✅ test_sqlite_proximo_usa_indice passou")
+
+
+def test_sqlite_lote_confirma_ao_sincronizar():
+    """Testa que gravações em lote só aparecem para leitores após a confirmação."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        fila = FilaSQLite(os.path.join(diretorio, 'triagem.db'), lote_gravacao=100)
+        fila.adicionar_varios(_criar_pacientes(3))
+        fila.remover_proximo()
+        assert len(fila) == 2
+        assert fila.historico_atendimentos() == []
+
+        fila.sincronizar()
+        assert len(fila.historico_atendimentos()) == 1
+        fila.fechar()
+    print("✅ test_sqlite_lote_confirma_ao_sincronizar passou")
+
+
+def test_sqlite_devolve_o_mesmo_paciente():
+    """Testa que o atendido é o objeto inserido, a réplica acompanha a fila e a espera usa o relógio injetado."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'triagem.db')
+        pacientes = _criar_pacientes(6)
+        relogio = RelogioVirtual(datetime(2024, 1, 1, 8, 0))
+        fluxo = FluxoFila(intervalo_coalescencia=10)
+        gerenciador = GerenciadorTriagem(backend=FilaSQLite(caminho), fluxo=fluxo, relogio=relogio)
+        assinatura = fluxo.assinar()
+        replica = ReplicaFila()
+        replica.aplicar(next(assinatura))
+        gerenciador.adicionar_lote(pacientes)
+
+        relogio.avancar(600)
+        proximo = gerenciador.atender_proximo()
+        assert proximo is ordenar_por_prioridade(pacientes)[0]
+        assert all(any(p is original for original in pacientes) for p in gerenciador.obter_fila_ordenada())
+        fluxo.publicar()
+        replica.aplicar(next(assinatura))
+        assert [p['nome'] for p in replica.pacientes] == [p.nome for p in gerenciador.obter_fila_ordenada()]
+        assinatura.close()
+        fluxo.fechar()
+
+        gerenciador._fila.sincronizar()
+        _, _, espera = gerenciador._fila.historico_atendimentos()[0]
+        assert espera == (relogio.agora() - proximo.timestamp).total_seconds()
+        gerenciador._fila.fechar()
+
+        # Após reabrir, cada linha vira um único objeto estável
+        reaberta = FilaSQLite(caminho)
+        assert reaberta.espiar() is reaberta.ordenada()[0] is reaberta.remover_proximo()
+        reaberta.fechar()
+    print("✅ test_sqlite_devolve_o_mesmo_paciente passou")
+
+
+def executar_testes():
+    """Executa todos os testes do backend SQLite."""
+    print("🗄️ Executando testes do backend SQLite...")
+
+    test_sqlite_mesma_ordem_que_ordenacao()
+    test_sqlite_persiste_fila_e_historico()
+    test_sqlite_proximo_usa_indice()
+    test_sqlite_lote_confirma_ao_sincronizar()
+    test_sqlite_devolve_o_mesmo_paciente()
+
+    print("\n✅ Todos os testes do backend SQLite passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para os benchmarks do núcleo da triagem (baselines e comparação).
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+import logging
+import tempfile
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from monitor_sistema import monitor
+from benchmark_triagem import CASOS, MODOS, carregar, chave_resultado, comparar, executar, salvar
+
+
+def _documento(valores):
+    return {'metadados': {}, 'resultados': {chave: {'ns_por_op': valor, 'operacoes': 1}
+                                             for chave, valor in valores.items()}}
+
+
+def test_comparar_classifica_variacoes():
+    """Testa regressão, melhora, estabilidade e casos novos em relação ao limite."""
+    baseline = _documento({'a': 1000, 'b': 1000, 'c': 1000})
+    atual = _documento({'a': 1150, 'b': 800, 'c': 1050, 'd': 10})
+    linhas = {linha['chave']: linha for linha in comparar(baseline, atual, limite=0.10)}
+
+    assert linhas['a']['situacao'] == 'regressão' and abs(linhas['a']['variacao'] - 0.15) < 1e-9
+    assert linhas['b']['situacao'] == 'melhora'
+    assert linhas['c']['situacao'] == 'estável'
+    assert linhas['d']['situacao'] == 'novo' and linhas['d']['baseline'] is None
+
+    # Com limite maior, os 15% deixam de ser regressão
+    linhas = {linha['chave']: linha for linha in comparar(baseline, atual, limite=0.20)}
+    assert linhas['a']['situacao'] == 'estável'
+    print("✅ test_comparar_classifica_variacoes passou")
+
+
+def test_executar_grava_e_compara_baseline():
+    """Testa uma execução curta de todos os casos, a baseline em JSON e o estado do monitor depois."""
+    nivel, amostragem = monitor.nivel_instrumentacao, monitor.amostragem
+    documento = executar(tamanhos=[20], operacoes=10, repeticoes=1)
+
+    esperadas = {chave_resultado(caso, modo, 20 if CASOS[caso][1] else None)
+                 for caso in CASOS for modo in MODOS}
+    assert set(documento['resultados']) == esperadas
+    assert all(resultado['ns_por_op'] > 0 for resultado in documento['resultados'].values())
+    assert documento['metadados']['tamanhos'] == [20]
+
+    # Os modos restauram a instrumentação e os logs
+    assert (monitor.nivel_instrumentacao, monitor.amostragem) == (nivel, amostragem)
+    assert logging.root.manager.disable == logging.NOTSET
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'baseline.json')
+        salvar(documento, caminho)
+        baseline = carregar(caminho)
+    assert baseline == documento
+    assert all(linha['situacao'] == 'estável' for linha in comparar(baseline, documento))
+
+    try:
+        executar(casos=['inexistente'])
+        assert False, "Deveria ter lançado ValueError"
+    except ValueError:
+        pass
+    print("✅ test_executar_grava_e_compara_baseline passou")
+
+
+def executar_testes():
+    """Executa todos os testes dos benchmarks."""
+    print("📈 Executando testes dos benchmarks da triagem...")
+
+    test_comparar_classifica_variacoes()
+    test_executar_grava_e_compara_baseline()
+
+    print("\n✅ Todos os testes dos benchmarks passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o índice de busca de pacientes por nome.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from contextlib import redirect_stdout
+import io
+import random
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from triagem import Paciente, GerenciadorTriagem
+from busca_pacientes import IndiceNomes, distancia_edicao, normalizar_nome
+
+
+def _nomes(pacientes):
+    return [p.nome for p in pacientes]
+
+
+def _indice_exemplo():
+    indice = IndiceNomes()
+    for nome in ["João Silva", "Joana Souza", "José Conceição", "Maria Simões", "Ana Joaquina Lima"]:
+        indice.adicionar(Paciente(nome, 30, 3))
+    return indice
+
+
+def test_normalizacao_e_distancia():
+    """Testa a remoção de acentos e a distância de edição com transposição."""
+    assert normalizar_nome("  JOÃO   da Conceição ") == "joao da conceicao"
+    assert distancia_edicao("maria", "mraia", 1) == 1
+    assert distancia_edicao("silva", "silav", 2) == 1
+    assert distancia_edicao("santos", "souza", 1) == 2  # limite + 1
+    print("✅ test_normalizacao_e_distancia passou")
+
+
+def test_prefixo_sem_acentos():
+    """Testa busca por prefixo ignorando acentos e maiúsculas, com vários termos."""
+    indice = _indice_exemplo()
+
+    assert _nomes(indice.buscar_prefixo("joa")) == ["Joana Souza", "João Silva", "Ana Joaquina Lima"]
+    assert _nomes(indice.buscar_prefixo("JOÃO")) == ["João Silva"]
+    assert _nomes(indice.buscar_prefixo("jo si")) == ["João Silva"]
+    assert _nomes(indice.buscar_prefixo("conceicao")) == ["José Conceição"]
+    assert _nomes(indice.buscar_prefixo("joa", k=1)) == ["Joana Souza"]
+    assert indice.buscar_prefixo("xyz") == []
+    assert indice.buscar_prefixo("   ") == []
+    print("✅ test_prefixo_sem_acentos passou")
+
+
+def test_busca_tolerante_a_erros():
+    """Testa que erros de digitação de uma letra ainda encontram o paciente."""
+    indice = _indice_exemplo()
+
+    assert _nomes(indice.buscar_aproximado("simoes")) == ["Maria Simões"]
+    assert _nomes(indice.buscar_aproximado("mraia smioes")) == ["Maria Simões"]
+    assert _nomes(indice.buscar_aproximado("jsoe")) == ["José Conceição"]
+    assert indice.buscar_aproximado("mariana") == []
+    print("✅ test_busca_tolerante_a_erros passou")
+
+
+def test_buscar_combina_prefixo_e_aproximada():
+    """Testa que buscar() completa os resultados de prefixo com os aproximados."""
+    indice = _indice_exemplo()
+
+    assert _nomes(indice.buscar("silv")) == ["João Silva"]
+    assert _nomes(indice.buscar("slva")) == ["João Silva"]
+    assert _nomes(indice.buscar("joaa", k=3)) == ["Joana Souza", "João Silva"]
+    print("✅ test_buscar_combina_prefixo_e_aproximada passou")
+
+
+def test_indice_atualizado_na_admissao():
+    """Testa que o gerenciador indexa pacientes adicionados um a um e em lote."""
+    indice = IndiceNomes()
+    gerenciador = GerenciadorTriagem(indice_nomes=indice)
+    gerenciador.adicionar_paciente(Paciente("Inês Brandão", 50, 4))
+    gerenciador.adicionar_lote([("Otávio Romão", 20, 2), ("Inácio Sá", 33, 1)])
+
+    assert len(indice) == 3
+    assert _nomes(indice.buscar_prefixo("in")) == ["Inácio Sá", "Inês Brandão"]
+    gerenciador.atender_proximo()
+    assert _nomes(indice.buscar_prefixo("ines")) == ["Inês Brandão"]
+    print("✅ test_indice_atualizado_na_admissao passou")
+
+
+def test_lote_e_termo_seletivo_iguais_a_varredura():
+    """Testa o lote (termos ordenados de uma vez) e a busca pelo termo secundário mais seletivo."""
+    gerador = random.Random(4)
+    primeiros = ["Ana", "Antônio", "André", "Bruno", "Beatriz", "Carla", "Caio"]
+    sobrenomes = ["Silva", "Souza", "Santos", "Sá", "Zanetti", "Zózimo"]
+    with redirect_stdout(io.StringIO()):
+        pacientes = [Paciente(f"{gerador.choice(primeiros)} {gerador.choice(sobrenomes)} {i % 97}", 30, 3)
+                     for i in range(3000)]
+    em_lote, um_a_um = IndiceNomes(), IndiceNomes()
+    em_lote.adicionar_varios(pacientes[:2000])
+    em_lote.adicionar_varios(pacientes[2000:])
+    for paciente in pacientes:
+        um_a_um.adicionar(paciente)
+    assert em_lote._termos_ordenados == um_a_um._termos_ordenados == sorted(um_a_um._termos_ordenados)
+
+    def varredura(consulta, k):
+        # Referência: ordem alfabética do termo mais longo, depois ordem de cadastro
+        termos = normalizar_nome(consulta).split()
+        principal = max(termos, key=len)
+        encontrados = []
+        for id_paciente, paciente in enumerate(pacientes):
+            termos_paciente = normalizar_nome(paciente.nome).split()
+            if all(any(t.startswith(termo) for t in termos_paciente) for termo in termos):
+                encontrados.append((min(t for t in termos_paciente if t.startswith(principal)), id_paciente))
+        return [pacientes[i].nome for _, i in sorted(encontrados)[:k]]
+
+    # Em "an 9", "9 an" e "silva ca 1" o número tem menos pacientes que o termo principal
+    for consulta in ["s an", "an 9", "santos an", "zozimo b", "9 an", "silva ca 1"]:
+        assert _nomes(em_lote.buscar_prefixo(consulta, 15)) == varredura(consulta, 15), consulta
+    assert em_lote._prefixo_mais_seletivo(["an", "9"], "an") == "9"
+    assert em_lote._prefixo_mais_seletivo(["s", "an"], "an") == "an"
+    print("✅ test_lote_e_termo_seletivo_iguais_a_varredura passou")
+
+
+def executar_testes():
+    """Executa todos os testes da busca por nome."""
+    print("🔎 Executando testes da busca de pacientes...")
+
+    test_normalizacao_e_distancia()
+    test_prefixo_sem_acentos()
+    test_busca_tolerante_a_erros()
+    test_buscar_combina_prefixo_e_aproximada()
+    test_indice_atualizado_na_admissao()
+    test_lote_e_termo_seletivo_iguais_a_varredura()
+
+    print("\n✅ Todos os testes da busca de pacientes passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o GerenciadorTriagemConcorrente.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import datetime, timedelta
+import threading
+import time
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from triagem import Paciente, ordenar_por_prioridade
+from triagem_concorrente import GerenciadorTriagemConcorrente
+from monitor_sistema import monitor
+
+
+def test_concorrente_sem_perdas_nem_duplicatas():
+    """Testa várias recepções e enfermeiros simultâneos sobre a mesma fila."""
+    gerenciador = GerenciadorTriagemConcorrente()
+    atendidos_antes = monitor.contadores['pacientes_atendidos']
+    threads, por_thread = 4, 50
+    atendidos = [[] for _ in range(threads)]
+
+    def recepcao(indice):
+        for i in range(por_thread):
+            gerenciador.adicionar_paciente(Paciente(f"R{indice}-P{i}", 30, i % 5 + 1))
+
+    def enfermeiro(destino):
+        for _ in range(por_thread):
+            destino.append(gerenciador.atender_proximo(bloquear=True, timeout=10))
+
+    trabalhadores = [threading.Thread(target=recepcao, args=(i,)) for i in range(threads)]
+    trabalhadores += [threading.Thread(target=enfermeiro, args=(d,)) for d in atendidos]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+
+    nomes = [p.nome for destino in atendidos for p in destino]
+    assert len(nomes) == threads * por_thread
+    assert len(set(nomes)) == len(nomes)
+    assert gerenciador.fila == []
+    assert monitor.contadores['pacientes_atendidos'] - atendidos_antes == threads * por_thread
+    print("✅ test_concorrente_sem_perdas_nem_duplicatas passou")
+
+
+def test_concorrente_mantem_ordem():
+    """Testa que a ordem de atendimento é a mesma do gerenciador sequencial."""
+    gerenciador = GerenciadorTriagemConcorrente()
+    base_time = datetime.now()
+    pacientes = [Paciente(f"P{i}", 30, i % 5 + 1, base_time + timedelta(seconds=i)) for i in range(20)]
+    gerenciador.adicionar_lote(pacientes)
+
+    esperado = ordenar_por_prioridade(pacientes)
+    assert gerenciador.obter_fila_ordenada() == esperado
+    assert [gerenciador.atender_proximo() for _ in range(20)] == esperado
+    print("✅ test_concorrente_mantem_ordem passou")
+
+
+def test_atender_bloqueante_acorda_com_chegada():
+    """Testa que o atendimento bloqueante aguarda até um paciente chegar."""
+    gerenciador = GerenciadorTriagemConcorrente()
+    resultado = []
+
+    enfermeiro = threading.Thread(
+        target=lambda: resultado.append(gerenciador.atender_proximo(bloquear=True, timeout=5))
+    )
+    enfermeiro.start()
+    time.sleep(0.05)
+    assert resultado == []
+
+    gerenciador.adicionar_paciente(Paciente("Maria Silva", 45, 3))
+    enfermeiro.join(timeout=5)
+    assert [p.nome for p in resultado] == ["Maria Silva"]
+    print("✅ test_atender_bloqueante_acorda_com_chegada passou")
+
+
+def test_atender_fila_vazia():
+    """Testa IndexError sem bloqueio e após o timeout."""
+    gerenciador = GerenciadorTriagemConcorrente()
+
+    try:
+        gerenciador.atender_proximo()
+        assert False, "Deveria ter levantado IndexError"
+    except IndexError as e:
+        assert "Fila vazia" in str(e)
+
+    inicio = time.monotonic()
+    try:
+        gerenciador.atender_proximo(bloquear=True, timeout=0.05)
+        assert False, "Deveria ter levantado IndexError"
+    except IndexError as e:
+        assert "Fila vazia" in str(e)
+    assert time.monotonic() - inicio >= 0.04
+    print("✅ test_atender_fila_vazia passou")
+
+
+def executar_testes():
+    """Executa todos os testes do gerenciador concorrente."""
+    print("🧵 Executando testes do gerenciador concorrente...")
+
+    test_concorrente_sem_perdas_nem_duplicatas()
+    test_concorrente_mantem_ordem()
+    test_atender_bloqueante_acorda_com_chegada()
+    test_atender_fila_vazia()
+
+    print("\n✅ Todos os testes do gerenciador concorrente passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
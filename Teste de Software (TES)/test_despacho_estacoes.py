@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o despacho de pacientes entre estações.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import datetime, timedelta
+import random
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from relogio import RelogioVirtual
+from triagem import Paciente
+from despacho_estacoes import DespachanteEstacoes, Estacao, simular_plantao
+from simulador_triagem import HORA, Cenario
+
+base_time = datetime(2024, 3, 1, 8, 0)
+
+
+def _paciente(nome, urgencia, minutos=0):
+    return Paciente(nome, 40, urgencia, base_time + timedelta(minutes=minutos))
+
+
+def _consultorios(relogio=None):
+    return DespachanteEstacoes([
+        Estacao('A', {'clinica'}),
+        Estacao('B', {'clinica', 'pediatria'}),
+        Estacao('C', {'pediatria'}),
+    ], relogio=relogio or RelogioVirtual(base_time))
+
+
+def test_primeira_estacao_livre_compativel():
+    """Testa o despacho para a primeira estação livre compatível e a fila quando todas estão ocupadas."""
+    despachante = _consultorios()
+    assert despachante.admitir(_paciente("Ana", 3), 'clinica') == 'A'
+    assert despachante.admitir(_paciente("Bia", 3), 'pediatria') == 'B'
+    assert despachante.admitir(_paciente("Caio", 2), 'clinica') is None
+    assert despachante.admitir(_paciente("Duda", 2), 'pediatria') == 'C'
+    assert despachante.aguardando() == 1 and despachante.aguardando('A') == 1  # menos carregada
+    assert despachante.em_atendimento('C').nome == "Duda"
+
+    for chamada in (lambda: despachante.admitir(_paciente("Eva", 3), 'ortopedia'),
+                    lambda: despachante.admitir(_paciente("Eva", 3), 'pediatria', estacao='A'),
+                    lambda: despachante.finalizar('Z'),
+                    lambda: despachante.adicionar_estacao(Estacao('A', {'clinica'}))):
+        try:
+            chamada()
+            assert False, "Deveria ter lançado ValueError"
+        except ValueError:
+            pass
+
+    # Estação nova chama quem já estava aguardando
+    despachante.adicionar_estacao(Estacao('D', {'clinica'}))
+    assert despachante.em_atendimento('D').nome == "Caio" and despachante.aguardando() == 0
+    print("✅ test_primeira_estacao_livre_compativel passou")
+
+
+def test_roubo_de_trabalho_e_urgencia_global():
+    """Testa o roubo da fila de outra estação e que um crítico não fica preso atrás de estação ocupada."""
+    despachante = _consultorios()
+    despachante.admitir(_paciente("Ana", 3), 'clinica')
+    despachante.admitir(_paciente("Bia", 3), 'clinica')
+    despachante.admitir(_paciente("Caio", 3, 1), 'clinica', estacao='A')
+    despachante.admitir(_paciente("Duda", 3, 2), 'clinica', estacao='B')
+    despachante.admitir(_paciente("Crítico", 5, 3), 'clinica', estacao='A')
+    despachante.admitir(_paciente("Muito Alta", 4, 4), 'clinica', estacao='A')
+
+    # B tem Duda na fila, mas o crítico (na fila de A) é global; depois rouba a urgência 4
+    assert despachante.finalizar('B').nome == "Crítico"
+    assert despachante.finalizar('B').nome == "Muito Alta"
+    # Mesma urgência: cada estação fica com a própria fila (afinidade), mesmo que a outra seja mais antiga
+    assert despachante.finalizar('B').nome == "Duda"
+    assert despachante.finalizar('B').nome == "Caio"  # fila própria vazia: roubo
+    assert despachante.finalizar('B') is None and despachante.aguardando('A') == 0
+
+    relatorio = despachante.relatorio()
+    assert relatorio['B']['atendidos'] == 5 and relatorio['B']['roubados'] == 3
+    assert relatorio['A']['atendidos'] == 1 and relatorio['A']['roubados'] == 0
+    print("✅ test_roubo_de_trabalho_e_urgencia_global passou")
+
+
+def test_invariante_sem_estacao_livre_com_fila_compativel():
+    """Testa, com operações aleatórias, que nenhuma estação fica livre com paciente compatível aguardando."""
+    gerador = random.Random(5)
+    especialidades = ['clinica', 'pediatria', 'ortopedia']
+    estacoes = [Estacao(f"E{i}", set(gerador.sample(especialidades, gerador.randint(1, 2)))) for i in range(6)]
+    estacoes.append(Estacao('geral', set(especialidades)))
+    relogio = RelogioVirtual(base_time)
+    despachante = DespachanteEstacoes(estacoes, relogio=relogio)
+    aguardando = {}  # nome -> especialidade
+    atendidos = 0
+
+    for i in range(600):
+        relogio.avancar(gerador.uniform(0, 60))
+        ocupadas = [e.id for e in estacoes if despachante.em_atendimento(e.id) is not None]
+        if ocupadas and gerador.random() < 0.45:
+            proximo = despachante.finalizar(gerador.choice(ocupadas))
+            if proximo is not None:
+                del aguardando[proximo.nome]
+        else:
+            paciente = Paciente._ja_validado(f"P{i}", 40, gerador.randint(1, 5), relogio.chegada())
+            especialidade = gerador.choice(especialidades)
+            if despachante.admitir(paciente, especialidade) is None:
+                aguardando[paciente.nome] = especialidade
+        atendidos = sum(linha['atendidos'] for linha in despachante.relatorio().values())
+
+        assert despachante.aguardando() == len(aguardando)
+        pendentes = set(aguardando.values())
+        for estacao in estacoes:
+            if despachante.em_atendimento(estacao.id) is None:
+                assert not estacao.especialidades & pendentes
+    assert atendidos > 0 and aguardando
+    print("✅ test_invariante_sem_estacao_livre_com_fila_compativel passou")
+
+
+def test_metricas_por_estacao():
+    """Testa espera, duração de atendimento, ocupação e vazão por estação no relógio virtual."""
+    relogio = RelogioVirtual(base_time)
+    despachante = DespachanteEstacoes([Estacao('sala1'), Estacao('sala2')], relogio=relogio)
+    relogio.avancar(600)
+    despachante.admitir(_paciente("Ana", 3))  # chegou no início: esperou 10 min
+    despachante.admitir(_paciente("Bia", 3, 10))
+    despachante.admitir(_paciente("Caio", 3))
+    relogio.avancar(600)
+    assert despachante.finalizar('sala1').nome == "Caio"  # esperou 20 min
+    relogio.avancar(1200)
+    despachante.finalizar('sala1')
+    despachante.finalizar('sala2')
+    relogio.avancar(1800)
+
+    relatorio = despachante.relatorio()
+    sala1, sala2 = relatorio['sala1'], relatorio['sala2']
+    assert sala1['atendidos'] == 2 and sala2['atendidos'] == 1
+    assert sala1['espera']['contagem'] == 2 and abs(sala1['espera']['p50'] - 600) < 600 * 0.02
+    assert abs(sala1['ocupacao'] - 1800 / 4200) < 1e-9 and abs(sala2['ocupacao'] - 1800 / 4200) < 1e-9
+    assert abs(sala1['vazao_por_hora'] - 2 * 3600 / 4200) < 1e-9
+    assert abs(sala2['atendimento']['p50'] - 1800) < 1800 * 0.02
+    print("✅ test_metricas_por_estacao passou")
+
+
+def test_plantao_simulado():
+    """Testa um plantão simulado: atendimentos em todas as estações e roubos de trabalho."""
+    cenario = Cenario('normal', duracao=12 * HORA, chegadas_por_hora=10)
+    despachante = simular_plantao(cenario, semente=3)
+    relatorio = despachante.relatorio()
+
+    assert sum(linha['atendidos'] for linha in relatorio.values()) > 80
+    assert sum(linha['roubados'] for linha in relatorio.values()) > 0
+    assert all(0 < linha['ocupacao'] < 1 for linha in relatorio.values())
+    print("✅ test_plantao_simulado passou")
+
+
+def executar_testes():
+    """Executa todos os testes do despacho entre estações."""
+    print("🏥 Executando testes do despacho entre estações...")
+
+    test_primeira_estacao_livre_compativel()
+    test_roubo_de_trabalho_e_urgencia_global()
+    test_invariante_sem_estacao_livre_com_fila_compativel()
+    test_metricas_por_estacao()
+    test_plantao_simulado()
+
+    print("\n✅ Todos os testes do despacho entre estações passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
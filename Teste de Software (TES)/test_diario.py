@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o diário (write-ahead log) da fila de triagem.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import datetime, timedelta
+import tempfile
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from triagem import Paciente
+from diario_triagem import GerenciadorTriagemDuravel
+
+
+def _criar_pacientes(quantidade):
+    base_time = datetime(2024, 1, 1, 8, 0)
+    return [Paciente(f"Paciente {i}", 30 + i, i % 5 + 1, base_time + timedelta(minutes=i))
+            for i in range(quantidade)]
+
+
+def _resumo(pacientes):
+    return [(p.nome, p.idade, p.urgencia, p.timestamp) for p in pacientes]
+
+
+def test_recupera_fila_apos_reinicio():
+    """Testa que adições e atendimentos são reproduzidos na reabertura."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        gerenciador = GerenciadorTriagemDuravel(diretorio, intervalo_snapshot=0)
+        gerenciador.adicionar_lote(_criar_pacientes(10))
+        atendidos = [gerenciador.atender_proximo() for _ in range(3)]
+        esperado = _resumo(gerenciador.obter_fila_ordenada())
+        gerenciador.fechar()
+
+        reaberto = GerenciadorTriagemDuravel(diretorio, intervalo_snapshot=0)
+        assert _resumo(reaberto.obter_fila_ordenada()) == esperado
+        assert reaberto.diario.estado.eventos_reproduzidos == 13
+        assert all(p.nome not in [q.nome for q in reaberto.fila] for p in atendidos)
+        reaberto.fechar()
+    print("✅ test_recupera_fila_apos_reinicio passou")
+
+
+def test_snapshot_limita_reproducao():
+    """Testa que após o snapshot só o final do diário é reproduzido."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        gerenciador = GerenciadorTriagemDuravel(diretorio, intervalo_snapshot=8)
+        for paciente in _criar_pacientes(10):
+            gerenciador.adicionar_paciente(paciente)
+        gerenciador.atender_proximo()
+        esperado = _resumo(gerenciador.obter_fila_ordenada())
+        gerenciador.fechar()
+
+        segmentos = [nome for nome in os.listdir(diretorio) if nome.startswith('diario.')]
+        assert len(segmentos) == 1
+        assert 'snapshot.bin' in os.listdir(diretorio)
+
+        reaberto = GerenciadorTriagemDuravel(diretorio, intervalo_snapshot=8)
+        assert _resumo(reaberto.obter_fila_ordenada()) == esperado
+        assert reaberto.diario.estado.eventos_reproduzidos == 3
+        reaberto.fechar()
+    print("✅ test_snapshot_limita_reproducao passou")
+
+
+def test_final_truncado_e_descartado():
+    """Testa que um registro gravado pela metade é descartado na recuperação."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        gerenciador = GerenciadorTriagemDuravel(diretorio)
+        gerenciador.adicionar_lote(_criar_pacientes(4))
+        gerenciador.fechar()
+
+        segmento = os.path.join(diretorio, sorted(os.listdir(diretorio))[0])
+        with open(segmento, 'ab') as arquivo:
+            arquivo.write(b'\x20\x00\x01\x02\x03')
+
+        reaberto = GerenciadorTriagemDuravel(diretorio)
+        assert len(reaberto.fila) == 4
+        assert reaberto.diario.estado.bytes_descartados == 5
+        reaberto.adicionar_paciente(Paciente("Maria Silva", 45, 5))
+        reaberto.fechar()
+
+        final = GerenciadorTriagemDuravel(diretorio)
+        assert final.obter_fila_ordenada()[0].nome == "Maria Silva"
+        assert len(final.fila) == 5
+        final.fechar()
+    print("✅ test_final_truncado_e_descartado passou")
+
+
+def test_mesmo_paciente_adicionado_duas_vezes():
+    """Testa que o mesmo objeto na fila duas vezes é registrado como dois eventos."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        gerenciador = GerenciadorTriagemDuravel(diretorio, intervalo_snapshot=0)
+        paciente = Paciente("João Santos", 30, 3)
+        gerenciador.adicionar_paciente(paciente)
+        gerenciador.adicionar_paciente(paciente)
+        gerenciador.gravar_snapshot()
+        gerenciador.atender_proximo()
+        gerenciador.fechar()
+
+        reaberto = GerenciadorTriagemDuravel(diretorio, intervalo_snapshot=0)
+        assert [p.nome for p in reaberto.fila] == ["João Santos"]
+        reaberto.fechar()
+    print("✅ test_mesmo_paciente_adicionado_duas_vezes passou")
+
+
+def executar_testes():
+    """Executa todos os testes do diário."""
+    print("💾 Executando testes do diário da fila...")
+
+    test_recupera_fila_apos_reinicio()
+    test_snapshot_limita_reproducao()
+    test_final_truncado_e_descartado()
+    test_mesmo_paciente_adicionado_duas_vezes()
+
+    print("\n✅ Todos os testes do diário passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
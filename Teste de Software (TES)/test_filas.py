@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para os backends de fila de prioridade.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import datetime, timedelta
+import random
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from triagem import Paciente, GerenciadorTriagem, ordenar_por_prioridade
+from filas import FilaFaixas, FilaHeap, FilaLista
+
+
+def _pacientes_embaralhados(quantidade: int) -> list:
+    """Cria pacientes com urgências e timestamps repetidos propositalmente."""
+    base_time = datetime.now()
+    gerador = random.Random(42)
+    pacientes = []
+    for i in range(quantidade):
+        paciente = Paciente(f"Paciente {i}", 30, gerador.randint(1, 5))
+        paciente.timestamp = base_time + timedelta(seconds=gerador.randint(0, 3))
+        pacientes.append(paciente)
+    return pacientes
+
+
+def test_heap_fila_vazia():
+    """Testa remoção e consulta em heap vazio."""
+    fila = FilaHeap()
+    assert len(fila) == 0
+    assert not fila
+    for operacao in (fila.remover_proximo, fila.espiar):
+        try:
+            operacao()
+            assert False, "Deveria ter dado erro"
+        except IndexError as e:
+            assert "Fila vazia" in str(e)
+    print("✅ test_heap_fila_vazia passou")
+
+
+def test_heap_espiar_nao_remove():
+    """Testa que espiar retorna o próximo sem removê-lo."""
+    fila = FilaHeap()
+    fila.adicionar(Paciente("Baixa", 30, 1))
+    fila.adicionar(Paciente("Crítica", 40, 5))
+
+    assert fila.espiar().nome == "Crítica"
+    assert len(fila) == 2
+    assert fila.remover_proximo().nome == "Crítica"
+    assert fila.espiar().nome == "Baixa"
+    print("✅ test_heap_espiar_nao_remove passou")
+
+
+def test_heap_desempate_timestamps_identicos():
+    """Testa que timestamps idênticos seguem a ordem de inserção."""
+    base_time = datetime.now()
+    fila = FilaHeap()
+    for nome in ("Primeiro", "Segundo", "Terceiro"):
+        paciente = Paciente(nome, 30, 3)
+        paciente.timestamp = base_time
+        fila.adicionar(paciente)
+
+    nomes = [fila.remover_proximo().nome for _ in range(3)]
+    assert nomes == ["Primeiro", "Segundo", "Terceiro"]
+    print("✅ test_heap_desempate_timestamps_identicos passou")
+
+
+def test_backends_equivalentes_a_ordenacao():
+    """Testa que todos os backends atendem na mesma ordem de ordenar_por_prioridade."""
+    pacientes = _pacientes_embaralhados(40)
+    esperado = [p.nome for p in ordenar_por_prioridade(pacientes)]
+
+    for backend in (FilaHeap(), FilaLista(), FilaFaixas()):
+        for paciente in pacientes:
+            backend.adicionar(paciente)
+        assert [p.nome for p in backend.ordenada()] == esperado
+        atendidos = [backend.remover_proximo().nome for _ in range(len(pacientes))]
+        assert atendidos == esperado, type(backend).__name__
+    print("✅ test_backends_equivalentes_a_ordenacao passou")
+
+
+def test_gerenciador_com_backend_lista():
+    """Testa o gerenciador configurado com o backend de lista original."""
+    gerenciador = GerenciadorTriagem(backend=FilaLista())
+    gerenciador.adicionar_paciente(Paciente("Normal", 30, 2))
+    gerenciador.adicionar_paciente(Paciente("Crítico", 40, 5))
+
+    assert gerenciador.atender_proximo().nome == "Crítico"
+    assert [p.nome for p in gerenciador.fila] == ["Normal"]
+    print("✅ test_gerenciador_com_backend_lista passou")
+
+
+def test_snapshot_reutilizado_sem_mudancas():
+    """Testa que leituras sem mudança retornam o mesmo snapshot do backend (e o gerenciador, uma cópia)."""
+    gerenciador = GerenciadorTriagem()
+    gerenciador.adicionar_paciente(Paciente("Baixa", 30, 1))
+    gerenciador.adicionar_paciente(Paciente("Alta", 40, 4))
+
+    primeira = gerenciador._fila.ordenada()
+    assert gerenciador._fila.ordenada() is primeira
+    assert [p.nome for p in primeira] == ["Alta", "Baixa"]
+    copia = gerenciador.obter_fila_ordenada()
+    assert copia == primeira and copia is not primeira
+    print("✅ test_snapshot_reutilizado_sem_mudancas passou")
+
+
+def test_snapshot_atualizado_apos_mudancas():
+    """Testa que a visão incremental acompanha inserções e atendimentos."""
+    pacientes = _pacientes_embaralhados(30)
+    fila = FilaHeap()
+    referencia = []
+
+    for paciente in pacientes:
+        anterior = fila.ordenada()
+        copia_anterior = list(anterior)
+        fila.adicionar(paciente)
+        referencia.append(paciente)
+        assert anterior == copia_anterior  # snapshots antigos não mudam
+        assert fila.ordenada() == ordenar_por_prioridade(referencia)
+
+    while fila:
+        proximo = fila.remover_proximo()
+        referencia.remove(proximo)
+        assert fila.ordenada() == ordenar_por_prioridade(referencia)
+    print("✅ test_snapshot_atualizado_apos_mudancas passou")
+
+
+def test_faixas_timestamp_fora_de_ordem():
+    """Testa faixa recebendo paciente com timestamp anterior ao último."""
+    base_time = datetime.now()
+    fila = FilaFaixas()
+    for nome, segundos in (("Segundo", 2), ("Terceiro", 3), ("Primeiro", 1), ("Empate", 2)):
+        paciente = Paciente(nome, 30, 3)
+        paciente.timestamp = base_time + timedelta(seconds=segundos)
+        fila.adicionar(paciente)
+
+    assert [p.nome for p in fila.ordenada()] == ["Primeiro", "Segundo", "Empate", "Terceiro"]
+    assert fila.remover_proximo().nome == "Primeiro"
+    assert len(fila) == 3
+    print("✅ test_faixas_timestamp_fora_de_ordem passou")
+
+
+def test_faixas_urgencia_fora_do_dominio():
+    """Testa que urgência fora de 1-5 é rejeitada pelo backend de faixas."""
+    paciente = Paciente("João", 30, 3)
+    paciente.urgencia = 7
+    try:
+        FilaFaixas().adicionar(paciente)
+        assert False, "Deveria ter dado erro"
+    except ValueError as e:
+        assert "Urgência deve estar entre 1 e 5" in str(e)
+    print("✅ test_faixas_urgencia_fora_do_dominio passou")
+
+
+def executar_testes():
+    """Executa todos os testes dos backends de fila."""
+    print("🗂️  Executando testes dos backends de fila...")
+
+    test_heap_fila_vazia()
+    test_heap_espiar_nao_remove()
+    test_heap_desempate_timestamps_identicos()
+    test_backends_equivalentes_a_ordenacao()
+    test_gerenciador_com_backend_lista()
+    test_snapshot_reutilizado_sem_mudancas()
+    test_snapshot_atualizado_apos_mudancas()
+    test_faixas_timestamp_fora_de_ordem()
+    test_faixas_urgencia_fora_do_dominio()
+
+    print("\n✅ Todos os testes dos backends de fila passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
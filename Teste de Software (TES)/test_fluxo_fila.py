@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o fluxo de mudanças da fila (painéis da sala de espera).
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import datetime, timedelta
+import http.client
+import json
+import threading
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from relogio import RelogioVirtual
+from triagem import Paciente, GerenciadorTriagem
+from politicas_prioridade import Envelhecimento, FilaPolitica
+from triagem_concorrente import GerenciadorTriagemConcorrente
+from fluxo_fila import FluxoFila, ReplicaFila
+from servidor_api import ServidorAPI
+
+base_time = datetime(2024, 3, 1, 8, 0)
+
+
+def _nomes_replica(replica):
+    return [p['nome'] for p in replica.pacientes]
+
+
+def _nomes_fila(gerenciador):
+    return [p.nome for p in gerenciador.obter_fila_ordenada()]
+
+
+def test_eventos_compactos():
+    """Testa que adições e chamadas viram eventos com a posição na fila."""
+    fluxo = FluxoFila(intervalo_coalescencia=10)
+    gerenciador = GerenciadorTriagem(fluxo=fluxo)
+    assinatura = fluxo.assinar()
+    replica = ReplicaFila()
+    replica.aplicar(next(assinatura))  # snapshot inicial, vazio
+    assert replica.pacientes == []
+
+    gerenciador.adicionar_paciente(Paciente("Maria Silva", 45, 3, base_time))
+    gerenciador.adicionar_paciente(Paciente("João Santos", 30, 5, base_time + timedelta(minutes=1)))
+    gerenciador.adicionar_paciente(Paciente("Ana Costa", 25, 3, base_time + timedelta(minutes=2)))
+    gerenciador.atender_proximo()
+    fluxo.publicar()
+
+    quadro = next(assinatura)
+    eventos = json.loads(quadro.decode().split('data: ', 1)[1])
+    assert [(e['tipo'], e['posicao']) for e in eventos] == [
+        ('adicionado', 0), ('adicionado', 0), ('adicionado', 2), ('chamado', 0)]
+    assert 'nome' not in eventos[-1]  # chamada só leva id e posição
+
+    replica.aplicar(quadro)
+    assert _nomes_replica(replica) == _nomes_fila(gerenciador) == ["Maria Silva", "Ana Costa"]
+    assinatura.close()
+    fluxo.fechar()
+    print("✅ test_eventos_compactos passou")
+
+
+def test_coalescencia_e_snapshot_em_rajada():
+    """Testa que uma janela vira um quadro e que rajadas grandes viram snapshot."""
+    fluxo = FluxoFila(intervalo_coalescencia=10, limite_diferencas=50)
+    gerenciador = GerenciadorTriagem(fluxo=fluxo)
+    assinatura = fluxo.assinar()
+    replica = ReplicaFila()
+    replica.aplicar(next(assinatura))
+
+    gerenciador.adicionar_lote([(f"Paciente {i}", 30, i % 5 + 1) for i in range(20)])
+    seq = fluxo.publicar()
+    quadro = next(assinatura)
+    assert quadro.count(b'event: mudancas') == 1 and fluxo.seq == seq
+    replica.aplicar(quadro)
+
+    gerenciador.adicionar_lote([(f"Rajada {i}", 30, i % 5 + 1) for i in range(200)])
+    for _ in range(30):
+        gerenciador.atender_proximo()
+    fluxo.publicar()
+    quadro = next(assinatura)
+    assert b'event: snapshot' in quadro
+    replica.aplicar(quadro)
+    assert _nomes_replica(replica) == _nomes_fila(gerenciador)
+    assinatura.close()
+    fluxo.fechar()
+    print("✅ test_coalescencia_e_snapshot_em_rajada passou")
+
+
+def test_reconexao_recebe_quadros_perdidos():
+    """Testa que uma tela que volta com Last-Event-ID recebe só o que perdeu."""
+    fluxo = FluxoFila(intervalo_coalescencia=10)
+    gerenciador = GerenciadorTriagem(fluxo=fluxo)
+    replica = ReplicaFila()
+    assinatura = fluxo.assinar()
+    replica.aplicar(next(assinatura))
+    assinatura.close()
+
+    gerenciador.adicionar_paciente(Paciente("Maria Silva", 45, 3, base_time))
+    fluxo.publicar()
+    gerenciador.adicionar_paciente(Paciente("João Santos", 30, 4, base_time))
+    fluxo.publicar()
+
+    assinatura = fluxo.assinar(desde=replica.ultimo_quadro)
+    quadro = next(assinatura)
+    assert b'event: snapshot' not in quadro and quadro.count(b'event: mudancas') == 2
+    replica.aplicar(quadro)
+    assert _nomes_replica(replica) == ["João Santos", "Maria Silva"]
+
+    # Quadro desconhecido (outra execução do servidor): recomeça com snapshot
+    desconhecida = fluxo.assinar(desde=999)
+    assert b'event: snapshot' in next(desconhecida)
+    assinatura.close()
+    desconhecida.close()
+    fluxo.fechar()
+    print("✅ test_reconexao_recebe_quadros_perdidos passou")
+
+
+def test_muitas_telas_convergem():
+    """Testa várias telas em threads acompanhando adições e atendimentos concorrentes."""
+    fluxo = FluxoFila(intervalo_coalescencia=0.01)
+    gerenciador = GerenciadorTriagemConcorrente(fluxo=fluxo)
+    replicas = [ReplicaFila() for _ in range(10)]
+    fim = threading.Event()
+
+    def tela(replica):
+        for quadro in fluxo.assinar(intervalo_ping=0.05):
+            replica.aplicar(quadro)
+            if fim.is_set() and replica.ultimo_quadro == fluxo.seq:
+                return
+
+    telas = [threading.Thread(target=tela, args=(replica,)) for replica in replicas]
+    for thread in telas:
+        thread.start()
+    for i in range(300):
+        gerenciador.adicionar_lote([(f"Paciente {i}", 30, i % 5 + 1)])
+        if i % 3 == 2:
+            gerenciador.atender_proximo()
+    fluxo.publicar()
+    fim.set()
+    for thread in telas:
+        thread.join(timeout=5)
+    assert all(not thread.is_alive() for thread in telas)
+
+    esperado = _nomes_fila(gerenciador)
+    assert len(esperado) == 200
+    for replica in replicas:
+        assert _nomes_replica(replica) == esperado
+    fluxo.fechar()
+    print("✅ test_muitas_telas_convergem passou")
+
+
+def test_eventos_via_sse():
+    """Testa o endpoint /triage/events do servidor HTTP."""
+    servidor = ServidorAPI(porta=0)
+    servidor.iniciar()
+    conexao = http.client.HTTPConnection(*servidor.endereco, timeout=5)
+    try:
+        servidor.gerenciador.adicionar_paciente(Paciente("Maria Silva", 45, 3))
+        conexao.request('GET', '/triage/events')
+        resposta = conexao.getresponse()
+        assert resposta.status == 200
+        assert resposta.getheader('Content-Type').startswith('text/event-stream')
+        replica = ReplicaFila()
+        replica.aplicar(resposta.fp.read1(65536))
+        assert _nomes_replica(replica) == ["Maria Silva"]
+
+        servidor.gerenciador.adicionar_paciente(Paciente("João Santos", 30, 5))
+        replica.aplicar(resposta.fp.read1(65536))
+        assert _nomes_replica(replica) == ["João Santos", "Maria Silva"]
+    finally:
+        conexao.close()
+        servidor.parar()
+    print("✅ test_eventos_via_sse passou")
+
+
+def test_reordenacao_da_politica_chega_as_telas():
+    """Testa que a réplica segue a ordem da política e recebe as promoções por envelhecimento."""
+    relogio = RelogioVirtual(base_time)
+    fluxo = FluxoFila(intervalo_coalescencia=10)
+    gerenciador = GerenciadorTriagem(FilaPolitica(Envelhecimento(intervalo=60)), fluxo=fluxo, relogio=relogio)
+    assinatura = fluxo.assinar()
+    replica = ReplicaFila()
+    replica.aplicar(next(assinatura))
+
+    gerenciador.adicionar_paciente(Paciente("Velho", 40, 1, base_time))
+    relogio.avancar(30)
+    gerenciador.adicionar_paciente(Paciente("Novo", 40, 2, base_time + timedelta(seconds=30)))
+    fluxo.publicar()
+    replica.aplicar(next(assinatura))
+    assert _nomes_replica(replica) == _nomes_fila(gerenciador) == ["Novo", "Velho"]
+
+    # Aos 60 s o Velho sobe ao nível 2 e, por ter chegado antes, passa à frente
+    relogio.avancar(30)
+    assert _nomes_fila(gerenciador) == ["Velho", "Novo"]
+    fluxo.publicar()
+    quadro = next(assinatura)
+    eventos = json.loads(quadro.decode().split('data: ', 1)[1])
+    assert [(e['tipo'], e['de'], e['para']) for e in eventos] == [('movido', 1, 0)]
+    replica.aplicar(quadro)
+    assert _nomes_replica(replica) == ["Velho", "Novo"]
+
+    # A chamada acha o paciente pela chave nova
+    assert gerenciador.atender_proximo().nome == "Velho"
+    fluxo.publicar()
+    replica.aplicar(next(assinatura))
+    assert _nomes_replica(replica) == _nomes_fila(gerenciador) == ["Novo"]
+    assinatura.close()
+    fluxo.fechar()
+    print("✅ test_reordenacao_da_politica_chega_as_telas passou")
+
+
+def test_chaves_renovadas_sem_movimento():
+    """Testa que o espelho renova as chaves da política mesmo quando a reordenação não move ninguém."""
+    relogio = RelogioVirtual(base_time)
+    fluxo = FluxoFila(intervalo_coalescencia=10)
+    gerenciador = GerenciadorTriagem(FilaPolitica(Envelhecimento(intervalo=600)), fluxo=fluxo, relogio=relogio)
+    assinatura = fluxo.assinar()
+    replica = ReplicaFila()
+    replica.aplicar(next(assinatura))
+
+    gerenciador.adicionar_paciente(Paciente("Ana", 40, 1, base_time))
+    relogio.avancar(700)  # Ana sobe ao nível 2, sozinha na fila
+    gerenciador.adicionar_paciente(Paciente("Bruno", 40, 2, base_time + timedelta(seconds=700)))
+    fluxo.publicar()
+    replica.aplicar(next(assinatura))
+    assert _nomes_replica(replica) == _nomes_fila(gerenciador) == ["Ana", "Bruno"]
+
+    assinatura.close()
+    fluxo.fechar()
+    print("✅ test_chaves_renovadas_sem_movimento passou")
+
+
+def executar_testes():
+    """Executa todos os testes do fluxo de mudanças."""
+    print("📺 Executando testes do fluxo de mudanças da fila...")
+
+    test_eventos_compactos()
+    test_coalescencia_e_snapshot_em_rajada()
+    test_reconexao_recebe_quadros_perdidos()
+    test_muitas_telas_convergem()
+    test_eventos_via_sse()
+    test_reordenacao_da_politica_chega_as_telas()
+    test_chaves_renovadas_sem_movimento()
+
+    print("\n✅ Todos os testes do fluxo de mudanças passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
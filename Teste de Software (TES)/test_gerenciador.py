@@ -138,6 +138,42 @@ def test_fluxo_completo():
     print("✅ test_fluxo_completo passou")
 
 
+def test_fila_somente_leitura():
+    """Testa que alterar a cópia da fila falha em vez de ser ignorado."""
+    gerenciador = GerenciadorTriagem()
+    gerenciador.adicionar_paciente(Paciente("Maria", 30, 2))
+    
+    for alterar in (lambda fila: fila.append(Paciente("João", 40, 4)),
+                    lambda fila: fila.pop(),
+                    lambda fila: fila.__setitem__(0, None)):
+        try:
+            alterar(gerenciador.fila)
+            assert False, "Deveria ter lançado TypeError"
+        except TypeError:
+            pass
+    try:
+        gerenciador.fila = []
+        assert False, "Deveria ter lançado AttributeError"
+    except AttributeError:
+        pass
+    
+    assert len(gerenciador) == 1 and [p.nome for p in gerenciador.fila] == ["Maria"]
+    print("✅ test_fila_somente_leitura passou")
+
+
+def test_fila_ordenada_e_copia():
+    """Testa que alterar a lista devolvida não corrompe a fila nem as próximas consultas."""
+    gerenciador = GerenciadorTriagem()
+    gerenciador.adicionar_paciente(Paciente("Maria", 30, 2))
+    gerenciador.adicionar_paciente(Paciente("João", 40, 4))
+    
+    ordenada = gerenciador.obter_fila_ordenada()
+    ordenada.clear()
+    assert [p.nome for p in gerenciador.obter_fila_ordenada()] == ["João", "Maria"]
+    assert gerenciador.atender_proximo().nome == "João"
+    print("✅ test_fila_ordenada_e_copia passou")
+
+
 def executar_testes():
     """Executa todos os testes do gerenciador."""
     print("🏥 Executando testes do GerenciadorTriagem...")
@@ -149,6 +185,8 @@ def executar_testes():
     test_atender_proximo_fila_vazia()
     test_listar_fila_vazia()
     test_fluxo_completo()
+    test_fila_somente_leitura()
+    test_fila_ordenada_e_copia()
     
     print("\n✅ Todos os testes do GerenciadorTriagem passaram!")
 
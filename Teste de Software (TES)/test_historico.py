@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o histórico de atendimentos.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import datetime, timedelta
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from triagem import Paciente, GerenciadorTriagem
+from historico_pacientes import HistoricoAtendimentos
+
+base_time = datetime(2024, 3, 1, 8, 0)
+
+
+def _preencher(historico, quantidade):
+    """Um atendimento por hora, urgência cíclica, espera de 10 min por nível."""
+    for i in range(quantidade):
+        urgencia = i % 5 + 1
+        atendido_em = base_time + timedelta(hours=i)
+        paciente = Paciente(f"Paciente {i % 7}", 30, urgencia, atendido_em - timedelta(minutes=10 * urgencia))
+        historico.registrar(paciente, atendido_em, 600.0 * urgencia)
+
+
+def test_atender_registra_no_historico():
+    """Testa que atender_proximo grava o paciente e a espera no histórico."""
+    historico = HistoricoAtendimentos()
+    gerenciador = GerenciadorTriagem(historico=historico)
+    gerenciador.adicionar_paciente(Paciente("Maria Silva", 45, 3, datetime.now() - timedelta(minutes=5)))
+
+    atendido = gerenciador.atender_proximo()
+    assert len(historico) == 1
+    registro = historico[0]
+    assert registro.paciente == atendido
+    assert 299 < registro.espera_segundos < 360
+    print("✅ test_atender_registra_no_historico passou")
+
+
+def test_consulta_por_intervalo_e_urgencia():
+    """Testa consultas por intervalo de tempo com e sem filtro de urgência."""
+    historico = HistoricoAtendimentos()
+    _preencher(historico, 100)
+
+    inicio, fim = base_time + timedelta(hours=20), base_time + timedelta(hours=40)
+    pagina = historico.consultar(inicio=inicio, fim=fim, limite=100)
+    assert [r.id for r in pagina.registros] == list(range(20, 40))
+    assert pagina.cursor is None
+
+    urgentes = historico.consultar(inicio=inicio, fim=fim, urgencia=5, limite=100)
+    assert [r.id for r in urgentes.registros] == [24, 29, 34, 39]
+    assert all(r.paciente.urgencia == 5 for r in urgentes.registros)
+    print("✅ test_consulta_por_intervalo_e_urgencia passou")
+
+
+def test_paginacao_por_cursor():
+    """Testa que páginas encadeadas pelo cursor cobrem tudo sem repetir."""
+    historico = HistoricoAtendimentos()
+    _preencher(historico, 53)
+
+    vistos, cursor = [], None
+    while True:
+        pagina = historico.consultar(urgencia=2, apos=cursor, limite=4)
+        vistos.extend(r.id for r in pagina.registros)
+        cursor = pagina.cursor
+        if cursor is None:
+            break
+    assert vistos == list(range(1, 53, 5))
+
+    # Novos registros não deslocam páginas já percorridas
+    pagina = historico.consultar(apos=50)
+    assert [r.id for r in pagina.registros] == [51, 52]
+    print("✅ test_paginacao_por_cursor passou")
+
+
+def test_busca_por_paciente():
+    """Testa a busca por nome sem diferenciar maiúsculas e espaços extras."""
+    historico = HistoricoAtendimentos()
+    _preencher(historico, 30)
+
+    pagina = historico.por_paciente("  paciente   3 ", limite=2)
+    assert [r.id for r in pagina.registros] == [3, 10]
+    assert pagina.cursor == 10
+    seguinte = historico.por_paciente("PACIENTE 3", apos=pagina.cursor, limite=10)
+    assert [r.id for r in seguinte.registros] == [17, 24]
+    assert historico.por_paciente("Desconhecido").registros == []
+    print("✅ test_busca_por_paciente passou")
+
+
+def test_agregados_incrementais():
+    """Testa contagem, média, máximo e percentis mantidos a cada registro."""
+    historico = HistoricoAtendimentos()
+    _preencher(historico, 50)
+
+    urgentes = historico.agregados(5)
+    assert urgentes['contagem'] == 10
+    assert urgentes['espera_media'] == 3000.0
+    assert abs(urgentes['p50'] - 3000.0) / 3000.0 <= 0.01
+
+    geral = historico.agregados()
+    assert geral['contagem'] == 50
+    assert geral['espera_media'] == 1800.0
+    assert geral['espera_maxima'] == 3000.0
+
+    por_dia = historico.atendimentos_por_dia(base_time.date())
+    assert sum(por_dia.values()) == 16  # 08h às 23h
+    print("✅ test_agregados_incrementais passou")
+
+
+def executar_testes():
+    """Executa todos os testes do histórico."""
+    print("📚 Executando testes do histórico de atendimentos...")
+
+    test_atender_registra_no_historico()
+    test_consulta_por_intervalo_e_urgencia()
+    test_paginacao_por_cursor()
+    test_busca_por_paciente()
+    test_agregados_incrementais()
+
+    print("\n✅ Todos os testes do histórico passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
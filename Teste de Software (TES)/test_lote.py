@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para a admissão de pacientes em lote.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import datetime, timedelta
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from triagem import Paciente, GerenciadorTriagem, ordenar_por_prioridade
+from filas import FilaFaixas, FilaLista
+from monitor_sistema import monitor
+
+
+def test_lote_formatos_aceitos():
+    """Testa lote com dicionários, tuplas e objetos Paciente."""
+    gerenciador = GerenciadorTriagem()
+    existente = Paciente("Ana Costa", 25, 2)
+
+    resultado = gerenciador.adicionar_lote([
+        {'nome': "Maria Silva", 'idade': 45, 'urgencia': 3},
+        ("João Santos", 30, 5),
+        existente,
+    ])
+
+    assert resultado.sucesso
+    assert [p.nome for p in resultado.adicionados] == ["Maria Silva", "João Santos", "Ana Costa"]
+    assert [p.nome for p in gerenciador.obter_fila_ordenada()] == ["João Santos", "Maria Silva", "Ana Costa"]
+    print("✅ test_lote_formatos_aceitos passou")
+
+
+def test_lote_erros_por_linha():
+    """Testa que linhas inválidas são rejeitadas sem impedir as demais."""
+    gerenciador = GerenciadorTriagem()
+    erros_antes = monitor.contadores['erros_validacao']
+
+    resultado = gerenciador.adicionar_lote([
+        ("Válido Um", 30, 3),
+        ("", -5, 10),
+        {'nome': "Sem urgência", 'idade': 20},
+        ("Válido Dois", 40, 1),
+        ("Data errada", 40, 1, "ontem"),
+    ])
+
+    assert [p.nome for p in resultado.adicionados] == ["Válido Um", "Válido Dois"]
+    assert [linha for linha, _ in resultado.erros] == [1, 2, 4]
+    assert "Nome não pode ser vazio" in resultado.erros[0][1]
+    assert "Urgência deve estar entre 1 e 5" in resultado.erros[0][1]
+    assert resultado.erros[1][1] == "Formato de linha inválido"
+    assert "Timestamp" in resultado.erros[2][1]
+    assert len(gerenciador.fila) == 2
+    assert monitor.contadores['erros_validacao'] == erros_antes + 3
+    print("✅ test_lote_erros_por_linha passou")
+
+
+def test_lote_mantem_ordem_de_chegada():
+    """Testa que o lote preserva a ordem entre pacientes de mesma urgência."""
+    for backend in (None, FilaLista(), FilaFaixas()):
+        gerenciador = GerenciadorTriagem(backend=backend)
+        gerenciador.adicionar_paciente(Paciente("Antes", 30, 3))
+        gerenciador.adicionar_lote([(f"Lote {i}", 30, 3) for i in range(5)])
+
+        nomes = [gerenciador.atender_proximo().nome for _ in range(6)]
+        assert nomes == ["Antes"] + [f"Lote {i}" for i in range(5)], nomes
+    print("✅ test_lote_mantem_ordem_de_chegada passou")
+
+
+def test_lote_grande_equivale_a_ordenacao():
+    """Testa lote maior que a fila (heapify) com timestamps explícitos."""
+    gerenciador = GerenciadorTriagem()
+    base_time = datetime.now()
+    gerenciador.adicionar_paciente(Paciente("Inicial", 30, 2))
+    gerenciador.obter_fila_ordenada()  # ativa a visão ordenada incremental
+
+    linhas = [(f"P{i}", 30, i % 5 + 1, base_time + timedelta(seconds=-i)) for i in range(50)]
+    resultado = gerenciador.adicionar_lote(linhas)
+
+    esperado = ordenar_por_prioridade(gerenciador.fila)
+    assert gerenciador.obter_fila_ordenada() == esperado
+    assert len(resultado.adicionados) == 50
+    assert [gerenciador.atender_proximo() for _ in range(51)] == esperado
+    print("✅ test_lote_grande_equivale_a_ordenacao passou")
+
+
+def executar_testes():
+    """Executa todos os testes de admissão em lote."""
+    print("📦 Executando testes de admissão em lote...")
+
+    test_lote_formatos_aceitos()
+    test_lote_erros_por_linha()
+    test_lote_mantem_ordem_de_chegada()
+    test_lote_grande_equivale_a_ordenacao()
+
+    print("\n✅ Todos os testes de admissão em lote passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
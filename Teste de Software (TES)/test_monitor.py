@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o sistema de monitoramento.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from contextlib import redirect_stdout
+import io
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+import monitor_sistema
+from monitor_sistema import (
+    EscritorLogAssincrono, HistogramaLatencia, SerieMetrica, monitor,
+    monitorar_performance, _ArquivoEmLote, _MensagemJSON, _estatisticas_funcoes
+)
+
+
+def _criar_destino(escritor: EscritorLogAssincrono, nome: str):
+    """Cria logger isolado gravando em arquivo temporário via escritor."""
+    diretorio = tempfile.mkdtemp()
+    caminho = os.path.join(diretorio, f"{nome}.log")
+    logger = logging.getLogger(f"teste_monitor.{nome}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    handler = _ArquivoEmLote(caminho)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    escritor.registrar_destino(logger, handler)
+    return logger, caminho
+
+
+def _ler_linhas(caminho: str) -> list:
+    with open(caminho) as arquivo:
+        return arquivo.read().splitlines()
+
+
+def test_escritor_grava_em_lotes():
+    """Testa que registros são gravados em lotes e descarregados no encerramento."""
+    escritor = EscritorLogAssincrono(capacidade=1000, tamanho_lote=50)
+    logger, caminho = _criar_destino(escritor, "lotes")
+
+    # Enfileirar antes de iniciar força lotes cheios
+    for i in range(120):
+        logger.info(_MensagemJSON({'indice': i}))
+    escritor.iniciar()
+    escritor.encerrar()
+
+    linhas = _ler_linhas(caminho)
+    assert len(linhas) == 120
+    assert linhas[0] == '{"indice": 0}'
+    assert escritor.lotes_gravados == 3
+    print("✅ test_escritor_grava_em_lotes passou")
+
+
+def test_politica_descartar_novos():
+    """Testa descarte dos registros que chegam com a fila cheia."""
+    escritor = EscritorLogAssincrono(capacidade=3, politica='descartar_novos')
+    logger, caminho = _criar_destino(escritor, "descartar_novos")
+
+    for i in range(5):
+        logger.info(_MensagemJSON({'indice': i}))
+    escritor.iniciar()
+    escritor.encerrar()
+
+    assert escritor.descartados == 2
+    assert _ler_linhas(caminho) == ['{"indice": 0}', '{"indice": 1}', '{"indice": 2}']
+    print("✅ test_politica_descartar_novos passou")
+
+
+def test_politica_descartar_antigos():
+    """Testa descarte dos registros mais antigos com a fila cheia."""
+    escritor = EscritorLogAssincrono(capacidade=3, politica='descartar_antigos')
+    logger, caminho = _criar_destino(escritor, "descartar_antigos")
+
+    for i in range(5):
+        logger.info(_MensagemJSON({'indice': i}))
+    escritor.iniciar()
+    escritor.encerrar()
+
+    assert escritor.descartados == 2
+    assert _ler_linhas(caminho) == ['{"indice": 2}', '{"indice": 3}', '{"indice": 4}']
+    print("✅ test_politica_descartar_antigos passou")
+
+
+def test_politica_invalida():
+    """Testa rejeição de política de descarte desconhecida."""
+    try:
+        EscritorLogAssincrono(politica='ignorar')
+        assert False, "Deveria ter dado erro"
+    except ValueError as e:
+        assert "Política de descarte inválida" in str(e)
+    print("✅ test_politica_invalida passou")
+
+
+def test_gravacao_apos_encerramento():
+    """Testa que registros após o encerramento são gravados de forma síncrona."""
+    escritor = EscritorLogAssincrono()
+    logger, caminho = _criar_destino(escritor, "apos_encerrar")
+    escritor.iniciar()
+    escritor.encerrar()
+
+    logger.info(_MensagemJSON({'tardio': True}))
+
+    assert _ler_linhas(caminho) == ['{"tardio": true}']
+    print("✅ test_gravacao_apos_encerramento passou")
+
+
+def test_serie_capacidade_fixa():
+    """Testa que a série sobrescreve as amostras mais antigas."""
+    serie = SerieMetrica("tempo", "performance", capacidade=4)
+    for i in range(10):
+        serie.adicionar(float(i), 1_700_000_000.0 + i)
+
+    assert len(serie) == 4
+    assert [m.valor for m in serie.recentes(10)] == [6.0, 7.0, 8.0, 9.0]
+    assert [m.valor for m in serie.recentes(2)] == [8.0, 9.0]
+    print("✅ test_serie_capacidade_fixa passou")
+
+
+def test_serie_agregados_vida_toda():
+    """Testa agregados calculados sobre todas as amostras, inclusive sobrescritas."""
+    serie = SerieMetrica("tempo", "performance", capacidade=2)
+    for valor in (5.0, -1.0, 3.0, 1.0):
+        serie.adicionar(valor, 1_700_000_000.0)
+
+    agregados = serie.agregados()
+    assert agregados['contagem'] == 4
+    assert agregados['soma'] == 8.0
+    assert agregados['media'] == 2.0
+    assert agregados['minimo'] == -1.0
+    assert agregados['maximo'] == 5.0
+    print("✅ test_serie_agregados_vida_toda passou")
+
+
+def test_serie_detalhes_esparsos():
+    """Testa que detalhes sobrescritos não permanecem na série."""
+    serie = SerieMetrica("tamanho_fila", "capacidade", capacidade=2)
+    serie.adicionar(1.0, 1_700_000_000.0, {'operacao': 'adicionar'})
+    serie.adicionar(2.0, 1_700_000_001.0)
+    serie.adicionar(3.0, 1_700_000_002.0)
+
+    assert serie.detalhes == {}
+    assert [m.detalhes for m in serie.recentes(2)] == [None, None]
+    print("✅ test_serie_detalhes_esparsos passou")
+
+
+def test_relatorio_inclui_agregados():
+    """Testa que o relatório traz amostras recentes e agregados por métrica."""
+    for valor in range(15):
+        monitor.registrar_metrica("teste_relatorio", float(valor), "teste")
+
+    relatorio = monitor.obter_relatorio_metricas()
+    recentes = relatorio['metricas_recentes']['teste_relatorio']
+    assert [m['valor'] for m in recentes] == [float(v) for v in range(5, 15)]
+    assert recentes[-1]['categoria'] == "teste"
+    assert relatorio['agregados']['teste_relatorio']['contagem'] == 15
+    assert relatorio['agregados']['teste_relatorio']['maximo'] == 14.0
+    print("✅ test_relatorio_inclui_agregados passou")
+
+
+def test_histograma_erro_relativo():
+    """Testa que os percentis ficam dentro da precisão configurada."""
+    gerador = random.Random(7)
+    amostras = sorted(gerador.expovariate(2.0) for _ in range(20000))
+    histograma = HistogramaLatencia(precisao=0.01)
+    for valor in amostras:
+        histograma.registrar(valor)
+
+    for q in (0.5, 0.9, 0.99):
+        exato = amostras[int(q * (len(amostras) - 1))]
+        assert abs(histograma.quantil(q) - exato) / exato <= 0.011, q
+    assert histograma.contagem == 20000
+    print("✅ test_histograma_erro_relativo passou")
+
+
+def test_histograma_mesclar():
+    """Testa que mesclar dois histogramas equivale a registrar tudo em um."""
+    a, b, total = HistogramaLatencia(), HistogramaLatencia(), HistogramaLatencia()
+    for i in range(1, 501):
+        (a if i % 2 else b).registrar(i / 1000)
+        total.registrar(i / 1000)
+    a.mesclar(b)
+
+    assert a.baldes == total.baldes
+    assert a.percentis() == total.percentis()
+
+    try:
+        a.mesclar(HistogramaLatencia(precisao=0.05))
+        assert False, "Deveria ter dado erro"
+    except ValueError:
+        pass
+    print("✅ test_histograma_mesclar passou")
+
+
+def test_histograma_zeros_e_vazio():
+    """Testa histograma vazio e valores abaixo do mínimo."""
+    histograma = HistogramaLatencia()
+    assert histograma.quantil(0.5) == 0.0
+
+    histograma.registrar(0.0)
+    histograma.registrar(0.0)
+    histograma.registrar(1.0)
+    assert histograma.quantil(0.5) == 0.0
+    assert abs(histograma.quantil(1.0) - 1.0) <= 0.01
+    assert histograma.faixas()[0] == (histograma.valor_minimo, 2)
+    print("✅ test_histograma_zeros_e_vazio passou")
+
+
+def test_relatorio_percentis_espera_por_urgencia():
+    """Testa percentis de tempo_espera por urgência e histogramas tempo_*."""
+    anterior = monitor.obter_relatorio_metricas()['tempo_espera_por_urgencia'].get(5, {})
+    for segundos in range(1, 101):
+        monitor.registrar_metrica("tempo_espera", float(segundos), "atendimento",
+                                  {'paciente': 'Teste', 'urgencia': 5})
+
+    relatorio = monitor.obter_relatorio_metricas()
+    espera = relatorio['tempo_espera_por_urgencia'][5]
+    assert espera['contagem'] == anterior.get('contagem', 0) + 100
+    assert set(espera) == {'contagem', 'p50', 'p90', 'p99'}
+    assert 'tempo_espera' in relatorio['percentis']
+    assert relatorio['histogramas']['tempo_espera']
+    print("✅ test_relatorio_percentis_espera_por_urgencia passou")
+
+
+def test_alertas_threshold_sem_inundar_stdout():
+    """Testa que tempo_espera alerta só no log e que tamanho_fila imprime apenas ao cruzar o threshold."""
+    monitor._acima_threshold.clear()
+    alertas = monitor.contadores['alertas_threshold']
+    saida = io.StringIO()
+    with redirect_stdout(saida):
+        for segundos in (400.0, 500.0):
+            monitor.registrar_metrica("tempo_espera", segundos, "atendimento")
+        for tamanho in (51, 52, 10, 53):
+            monitor.registrar_metrica("tamanho_fila", tamanho, "capacidade")
+        monitor.registrar_metrica("tamanho_fila", 0, "capacidade")
+
+    impressos = saida.getvalue().splitlines()
+    assert monitor.contadores['alertas_threshold'] == alertas + 5
+    assert not any("tempo_espera" in linha for linha in impressos)
+    assert [linha for linha in impressos if "tamanho_fila" in linha] == [
+        "⚠️  ALERTA: tamanho_fila = 51 (threshold: 50)",
+        "⚠️  ALERTA: tamanho_fila = 53 (threshold: 50)",
+    ]
+    print("✅ test_alertas_threshold_sem_inundar_stdout passou")
+
+
+@monitorar_performance("teste")
+def _operacao_instrumentada(valor):
+    """Função decorada usada nos testes de nível de instrumentação."""
+    if valor < 0:
+        raise ValueError("valor negativo")
+    return valor * 2
+
+
+def _chamadas_registradas() -> int:
+    """Quantidade de métricas tempo_ registradas para a função de teste."""
+    serie = monitor.metricas.get("tempo__operacao_instrumentada")
+    return serie.contagem if serie else 0
+
+
+def _com_nivel(nivel: str, amostragem: int, acao):
+    """Executa `acao` com o nível de instrumentação temporariamente alterado."""
+    nivel_original, amostragem_original = monitor.nivel_instrumentacao, monitor.amostragem
+    monitor.configurar_instrumentacao(nivel, amostragem)
+    try:
+        acao()
+    finally:
+        monitor.configurar_instrumentacao(nivel_original, amostragem_original)
+
+
+def test_nivel_instrumentacao_invalido():
+    """Testa rejeição de nível e amostragem inválidos."""
+    for argumentos in (('verboso', None), ('amostrado', 0)):
+        try:
+            monitor.configurar_instrumentacao(*argumentos)
+            assert False, "Deveria ter dado erro"
+        except ValueError:
+            pass
+    print("✅ test_nivel_instrumentacao_invalido passou")
+
+
+def test_nivel_contadores():
+    """Testa que o nível contadores não registra métricas, apenas contadores."""
+    estatisticas = _estatisticas_funcoes[_operacao_instrumentada.__qualname__]
+    chamadas, erros, metricas = estatisticas.chamadas, estatisticas.erros, _chamadas_registradas()
+
+    def acao():
+        for i in range(10):
+            assert _operacao_instrumentada(i) == i * 2
+        try:
+            _operacao_instrumentada(-1)
+        except ValueError:
+            pass
+    _com_nivel('contadores', 100, acao)
+
+    assert estatisticas.chamadas == chamadas + 10
+    assert estatisticas.erros == erros + 1
+    assert _chamadas_registradas() == metricas
+    resumo = monitor.obter_relatorio_metricas()['funcoes'][_operacao_instrumentada.__qualname__]
+    assert resumo['chamadas'] == estatisticas.chamadas
+    print("✅ test_nivel_contadores passou")
+
+
+def test_nivel_desligado():
+    """Testa que o nível desligado não toca nenhum contador."""
+    estatisticas = _estatisticas_funcoes[_operacao_instrumentada.__qualname__]
+    chamadas = estatisticas.chamadas
+
+    _com_nivel('desligado', 100, lambda: [_operacao_instrumentada(i) for i in range(10)])
+
+    assert estatisticas.chamadas == chamadas
+    print("✅ test_nivel_desligado passou")
+
+
+def test_nivel_amostrado():
+    """Testa instrumentação completa em 1 de cada N chamadas."""
+    metricas = _chamadas_registradas()
+
+    _com_nivel('amostrado', 5, lambda: [_operacao_instrumentada(i) for i in range(20)])
+
+    assert _chamadas_registradas() == metricas + 4
+    print("✅ test_nivel_amostrado passou")
+
+
+def test_contadores_entre_threads_e_configurar():
+    """Testa que chamadas concorrentes não perdem contagens e que configurar() zera os contadores."""
+    estatisticas = _estatisticas_funcoes[_operacao_instrumentada.__qualname__]
+    chamadas = estatisticas.chamadas
+    intervalo_original = sys.getswitchinterval()
+
+    def acao():
+        threads = [threading.Thread(target=lambda: [_operacao_instrumentada(i) for i in range(5000)])
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    sys.setswitchinterval(1e-6)  # trocas de thread frequentes expõem incrementos perdidos
+    try:
+        _com_nivel('contadores', 100, acao)
+    finally:
+        sys.setswitchinterval(intervalo_original)
+    assert estatisticas.chamadas == chamadas + 8 * 5000
+
+    monitor_sistema.configurar()
+    assert estatisticas.chamadas == 0 and estatisticas.erros == 0
+    assert _operacao_instrumentada(1) == 2 and estatisticas.chamadas == 1
+    print("✅ test_contadores_entre_threads_e_configurar passou")
+
+
+def _handlers_do_monitor(nome_logger: str) -> list:
+    """Handlers anexados por algum MonitorTriagem ao logger."""
+    return [h for h in logging.getLogger(nome_logger).handlers
+            if getattr(h, '_monitor_triagem', None) is not None]
+
+
+def test_configurar_e_encerrar_monitor_global():
+    """Testa o ciclo de vida configurar/encerrar do monitor global."""
+    diretorio = tempfile.mkdtemp()
+    try:
+        monitor_sistema.configurar(diretorio_logs=diretorio, assincrono=False)
+        assert monitor_sistema._instancia is None  # criado só no primeiro uso
+        assert os.listdir(diretorio) == []
+
+        monitor.log_operacao("teste_ciclo_vida", {'ok': True})
+        assert monitor_sistema._instancia is not None
+        assert monitor.escritor is None
+        assert os.listdir(diretorio) == ['triagem_sistema.log']
+
+        monitor_sistema.encerrar()
+        assert monitor_sistema._instancia is None
+        assert _handlers_do_monitor('triagem_sistema') == []
+        with open(os.path.join(diretorio, 'triagem_sistema.log')) as arquivo:
+            assert 'teste_ciclo_vida' in arquivo.read()
+    finally:
+        monitor_sistema.configurar()
+    print("✅ test_configurar_e_encerrar_monitor_global passou")
+
+
+def test_configuracao_idempotente_de_handlers():
+    """Testa que novos monitores não acumulam handlers nos loggers."""
+    diretorio = tempfile.mkdtemp()
+    primeiro = monitor_sistema.MonitorTriagem(diretorio_logs=diretorio)
+    segundo = monitor_sistema.MonitorTriagem(diretorio_logs=diretorio)
+    try:
+        for nome in ('triagem_sistema', 'triagem_metricas', 'triagem_erros'):
+            handlers = _handlers_do_monitor(nome)
+            assert len(handlers) == 1
+            assert handlers[0]._monitor_triagem is segundo
+        assert primeiro._encerrado
+    finally:
+        segundo.encerrar()
+        monitor_sistema.configurar()
+    print("✅ test_configuracao_idempotente_de_handlers passou")
+
+
+def executar_testes():
+    """Executa todos os testes do monitoramento."""
+    print("📊 Executando testes do monitoramento...")
+
+    test_escritor_grava_em_lotes()
+    test_politica_descartar_novos()
+    test_politica_descartar_antigos()
+    test_politica_invalida()
+    test_gravacao_apos_encerramento()
+    test_serie_capacidade_fixa()
+    test_serie_agregados_vida_toda()
+    test_serie_detalhes_esparsos()
+    test_relatorio_inclui_agregados()
+    test_histograma_erro_relativo()
+    test_histograma_mesclar()
+    test_histograma_zeros_e_vazio()
+    test_relatorio_percentis_espera_por_urgencia()
+    test_alertas_threshold_sem_inundar_stdout()
+    test_nivel_instrumentacao_invalido()
+    test_nivel_contadores()
+    test_nivel_desligado()
+    test_nivel_amostrado()
+    test_contadores_entre_threads_e_configurar()
+    test_configurar_e_encerrar_monitor_global()
+    test_configuracao_idempotente_de_handlers()
+
+    print("\n✅ Todos os testes do monitoramento passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para a representação compacta de pacientes.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import datetime
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from triagem import Paciente
+from pacientes_colunares import PacienteArray, datetime_para_ns, ns_para_datetime
+
+
+def test_paciente_sem_dict():
+    """Testa que Paciente usa __slots__ e não aceita atributos extras."""
+    paciente = Paciente("João Silva", 45, 3)
+    assert not hasattr(paciente, '__dict__')
+    try:
+        paciente.apelido = "Jão"
+        assert False, "Deveria ter dado erro"
+    except AttributeError:
+        pass
+    print("✅ test_paciente_sem_dict passou")
+
+
+def test_conversao_nanossegundos():
+    """Testa ida e volta datetime ↔ nanossegundos com precisão de microssegundos."""
+    momento = datetime(2025, 3, 14, 9, 26, 53, 589793)
+    assert ns_para_datetime(datetime_para_ns(momento)) == momento
+    assert datetime_para_ns(momento) % 1000 == 0
+    print("✅ test_conversao_nanossegundos passou")
+
+
+def test_array_ida_e_volta():
+    """Testa que pacientes materializados são iguais aos originais."""
+    pacientes = [Paciente("João Santos", 30, 5), Paciente("Conceição Araújo", 82, 2)]
+    armazenamento = PacienteArray(pacientes)
+
+    assert len(armazenamento) == 2
+    assert list(armazenamento) == pacientes
+    assert armazenamento[-1].nome == "Conceição Araújo"
+    assert armazenamento.nome(0) == "João Santos"
+    assert armazenamento.indices_por_urgencia(2) == [1]
+    print("✅ test_array_ida_e_volta passou")
+
+
+def test_array_indice_invalido():
+    """Testa acesso fora do intervalo."""
+    armazenamento = PacienteArray()
+    armazenamento.anexar("Ana Costa", 25, 1, 0)
+    for indice in (1, -2):
+        try:
+            armazenamento[indice]
+            assert False, "Deveria ter dado erro"
+        except IndexError:
+            pass
+    print("✅ test_array_indice_invalido passou")
+
+
+def test_array_bytes_por_paciente():
+    """Testa que o armazenamento colunar usa poucos bytes por paciente."""
+    armazenamento = PacienteArray()
+    for i in range(1000):
+        armazenamento.anexar(f"Paciente {i:04d}", 40, 3, i)
+
+    # 13 bytes de nome + 8 de deslocamento + 1 + 1 + 8 de chegada
+    assert armazenamento.bytes_usados() == 1000 * 31
+    print("✅ test_array_bytes_por_paciente passou")
+
+
+def executar_testes():
+    """Executa todos os testes da representação compacta."""
+    print("🗜️  Executando testes da representação compacta de pacientes...")
+
+    test_paciente_sem_dict()
+    test_conversao_nanossegundos()
+    test_array_ida_e_volta()
+    test_array_indice_invalido()
+    test_array_bytes_por_paciente()
+
+    print("\n✅ Todos os testes da representação compacta passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
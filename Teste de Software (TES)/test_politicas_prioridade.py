@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para as políticas de prioridade (envelhecimento, espera máxima, fila justa).
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+import io
+import random
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from filas import FilaHeap
+from monitor_sistema import monitor
+from relogio import RelogioVirtual
+from triagem import Paciente, GerenciadorTriagem
+from politicas_prioridade import Envelhecimento, EsperaMaxima, FilaPolitica, JustaPonderada
+from simulador_triagem import HORA, Cenario, simular
+
+base_time = datetime(2024, 3, 1, 8, 0)
+
+
+def _paciente(nome, urgencia, minutos):
+    return Paciente(nome, 40, urgencia, base_time + timedelta(minutes=minutos))
+
+
+def _atender_todos(fila):
+    return [fila.remover_proximo().nome for _ in range(len(fila))]
+
+
+def test_politica_padrao_igual_ao_heap():
+    """Testa que a FilaPolitica sem política atende na mesma ordem do FilaHeap."""
+    gerador = random.Random(3)
+    pacientes = [_paciente(f"P{i}", gerador.randint(1, 5), gerador.randint(0, 30)) for i in range(200)]
+    politica, heap = FilaPolitica(relogio=RelogioVirtual(base_time)), FilaHeap()
+    politica.adicionar_varios(pacientes[:150])
+    heap.adicionar_varios(pacientes[:150])
+    for paciente in pacientes[150:]:
+        politica.adicionar(paciente)
+        heap.adicionar(paciente)
+
+    assert politica.ordenada() == heap.ordenada()
+    assert _atender_todos(politica) == _atender_todos(heap)
+    print("✅ test_politica_padrao_igual_ao_heap passou")
+
+
+def test_envelhecimento_promove_sem_passar_do_teto():
+    """Testa a promoção por tempo de espera e que o teto preserva os críticos."""
+    relogio = RelogioVirtual(base_time)
+    gerenciador = GerenciadorTriagem(FilaPolitica(Envelhecimento(intervalo=600, teto=4)), relogio=relogio)
+    gerenciador.adicionar_paciente(_paciente("Baixa", 1, 0))
+    relogio.avancar(15 * 60)
+    gerenciador.adicionar_paciente(_paciente("Alta", 3, 15))
+    versao = gerenciador.versao
+    assert [p.nome for p in gerenciador.obter_fila_ordenada()] == ["Alta", "Baixa"]
+
+    # Aos 20 min a urgência 1 chega ao nível 3 (a 3 ainda não subiu) e, por ter chegado antes, passa à frente
+    relogio.definir(20 * 60)
+    assert gerenciador.versao != versao  # a ordem mudou sem inserção nem atendimento
+    assert [p.nome for p in gerenciador.obter_fila_ordenada()] == ["Baixa", "Alta"]
+
+    # Depois do teto (nível 4) ninguém passa à frente de um crítico que acabou de chegar
+    relogio.definir(5 * HORA)
+    gerenciador.adicionar_paciente(_paciente("Crítico", 5, 300))
+    assert [gerenciador.atender_proximo().nome for _ in range(3)] == ["Crítico", "Baixa", "Alta"]
+    print("✅ test_envelhecimento_promove_sem_passar_do_teto passou")
+
+
+def test_espera_maxima_atende_vencidos_primeiro():
+    """Testa que quem estoura o prazo da urgência passa à frente, por prazo, abaixo dos críticos."""
+    relogio = RelogioVirtual(base_time)
+    fila = FilaPolitica(EsperaMaxima({1: 3600, 2: 1800, 4: 600}), relogio=relogio)
+    fila.adicionar(_paciente("Baixa", 1, 0))      # prazo 09:00
+    fila.adicionar(_paciente("Moderada", 2, 10))  # prazo 08:40
+    relogio.definir(50 * 60)
+    fila.adicionar(_paciente("Muito Alta", 4, 50))
+    assert [p.nome for p in fila.ordenada()] == ["Moderada", "Muito Alta", "Baixa"]
+
+    relogio.definir(70 * 60)
+    fila.adicionar(_paciente("Crítico", 5, 70))
+    assert _atender_todos(fila) == ["Crítico", "Moderada", "Baixa", "Muito Alta"]
+    print("✅ test_espera_maxima_atende_vencidos_primeiro passou")
+
+
+def test_justa_ponderada_divide_por_peso():
+    """Testa a divisão dos atendimentos entre faixas pelo peso, com os críticos sempre antes."""
+    fila = FilaPolitica(JustaPonderada({4: 3, 1: 1}), relogio=RelogioVirtual(base_time))
+    fila.adicionar_varios([_paciente(f"U4-{i}", 4, 0) for i in range(30)])
+    fila.adicionar_varios([_paciente(f"U1-{i}", 1, 0) for i in range(30)])
+    fila.adicionar(_paciente("Crítico", 5, 1))
+
+    ordem = _atender_todos(fila)
+    assert ordem[0] == "Crítico"
+    primeiros = ordem[1:21]
+    assert sum(nome.startswith("U1") for nome in primeiros) == 5  # 1 a cada 4
+    assert [nome for nome in ordem if nome.startswith("U1")] == [f"U1-{i}" for i in range(30)]
+
+    try:
+        fila.adicionar(_paciente("Sem faixa", 2, 0))
+        assert False, "Deveria ter lançado ValueError"
+    except ValueError:
+        pass
+    print("✅ test_justa_ponderada_divide_por_peso passou")
+
+
+def test_simulacao_alivia_espera_da_urgencia_baixa():
+    """Testa no simulador que o envelhecimento reduz quem fica esperando sem atendimento."""
+    cenario = Cenario('normal', duracao=24 * HORA, chegadas_por_hora=12, enfermeiros=2)
+    alertas = monitor.contadores['alertas_threshold']
+    saida = io.StringIO()
+    with redirect_stdout(saida):
+        padrao = simular(cenario, semente=42, inicio=base_time)
+        envelhecimento = simular(cenario, GerenciadorTriagem(FilaPolitica(Envelhecimento())),
+                                 semente=42, inicio=base_time)
+
+    assert padrao.chegadas == envelhecimento.chegadas
+    assert envelhecimento.aguardando_por_urgencia.get(1, 0) < padrao.aguardando_por_urgencia[1] / 2
+    assert envelhecimento.atendidos >= padrao.atendidos
+    # Esperas acima de 5 minutos geram alertas de tempo_espera, só no log de erros
+    assert monitor.contadores['alertas_threshold'] > alertas
+    assert "ALERTA: tempo_espera" not in saida.getvalue()
+    print("✅ test_simulacao_alivia_espera_da_urgencia_baixa passou")
+
+
+def executar_testes():
+    """Executa todos os testes das políticas de prioridade."""
+    print("⚖️ Executando testes das políticas de prioridade...")
+
+    test_politica_padrao_igual_ao_heap()
+    test_envelhecimento_promove_sem_passar_do_teto()
+    test_espera_maxima_atende_vencidos_primeiro()
+    test_justa_ponderada_divide_por_peso()
+    test_simulacao_alivia_espera_da_urgencia_baixa()
+
+    print("\n✅ Todos os testes das políticas de prioridade passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o relógio injetável (sistema e virtual).
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import datetime, timedelta
+import threading
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from relogio import RelogioSistema, RelogioVirtual, obter_relogio, usando_relogio
+from monitor_sistema import monitor
+from triagem import Paciente, GerenciadorTriagem
+
+base_time = datetime(2024, 3, 1, 8, 0)
+
+
+def test_relogio_virtual():
+    """Testa avanço, conversões e que o relógio virtual não volta no tempo."""
+    relogio = RelogioVirtual(base_time)
+    assert relogio.agora() == base_time
+    relogio.avancar(90.5)
+    assert relogio.agora() == base_time + timedelta(seconds=90.5)
+    assert relogio.decorrido == 90.5
+    assert relogio.para_ns(relogio.agora()) == relogio.agora_ns()
+
+    relogio.definir(120)
+    assert relogio.agora() == base_time + timedelta(minutes=2)
+    for voltar in (lambda: relogio.definir(60), lambda: relogio.avancar(-1)):
+        try:
+            voltar()
+            assert False, "Deveria ter lançado ValueError"
+        except ValueError:
+            pass
+    print("✅ test_relogio_virtual passou")
+
+
+def test_carimbos_unicos_e_crescentes():
+    """Testa que chegadas no mesmo instante (ou no mesmo tick) recebem timestamps distintos."""
+    relogio = RelogioVirtual(base_time)
+    carimbos = [relogio.carimbo_ns() for _ in range(3)]
+    assert carimbos == [relogio.agora_ns(), relogio.agora_ns() + 1000, relogio.agora_ns() + 2000]
+
+    sistema = RelogioSistema()
+    resultados = [[] for _ in range(4)]
+
+    def carimbar(lista):
+        for _ in range(5000):
+            lista.append(sistema.carimbo_ns())
+
+    threads = [threading.Thread(target=carimbar, args=(lista,)) for lista in resultados]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    todos = [carimbo for lista in resultados for carimbo in lista]
+    assert len(set(todos)) == len(todos)
+    assert all(a < b for lista in resultados for a, b in zip(lista, lista[1:]))
+    assert abs((sistema.agora() - datetime.now()).total_seconds()) < 1
+
+    pacientes = [Paciente(f"Paciente {i}", 30, 3) for i in range(1000)]
+    assert len({p.timestamp for p in pacientes}) == 1000
+    assert all(a.timestamp < b.timestamp for a, b in zip(pacientes, pacientes[1:]))
+    print("✅ test_carimbos_unicos_e_crescentes passou")
+
+
+def test_gerenciador_com_relogio_virtual():
+    """Testa chegadas, espera e registros do monitor no tempo do relógio injetado."""
+    relogio = RelogioVirtual(base_time)
+    gerenciador = GerenciadorTriagem(relogio=relogio)
+    with usando_relogio(relogio):
+        maria = Paciente("Maria Silva", 45, 3)
+        relogio.avancar(30)
+        joao = Paciente("João Santos", 30, 3)
+    assert obter_relogio() is not relogio
+    assert maria.timestamp == base_time and joao.timestamp == base_time + timedelta(seconds=30)
+
+    gerenciador.adicionar_paciente(joao)
+    gerenciador.adicionar_paciente(maria)
+    # Métrica da operação e a do decorator no relógio do gerenciador, não no do monitor
+    assert monitor.metricas['tamanho_fila'].recentes(1)[0].timestamp == base_time + timedelta(seconds=30)
+    assert monitor.metricas['tempo_adicionar_paciente'].recentes(1)[0].timestamp == base_time + timedelta(seconds=30)
+    relogio.avancar(90)
+    assert gerenciador.atender_proximo() is maria
+
+    ultima = monitor.metricas['tempo_espera'].recentes(1)[0]
+    assert ultima.valor == 120
+    assert ultima.timestamp == base_time + timedelta(seconds=120)
+
+    # Instante formatado só quando o registro é gravado
+    instante = relogio.instante()
+    assert str(instante) == "2024-03-01T08:02:00"
+    print("✅ test_gerenciador_com_relogio_virtual passou")
+
+
+def executar_testes():
+    """Executa todos os testes do relógio."""
+    print("🕐 Executando testes do relógio injetável...")
+
+    test_relogio_virtual()
+    test_carimbos_unicos_e_crescentes()
+    test_gerenciador_com_relogio_virtual()
+
+    print("\n✅ Todos os testes do relógio passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o serviço de reservas de consultas.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import date, datetime, timedelta
+import random
+import tempfile
+import threading
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from agenda import Agenda, ConflitoAgendamento, Medico
+from reservas import BloqueioExpirado, GeradorProtocolos, ServicoReservas
+
+segunda = date(2024, 3, 4)
+
+
+class RelogioFalso:
+    """Relógio controlado pelo teste."""
+
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+def _servico(relogio=None, medicos=2):
+    agenda = Agenda(segunda, 7)
+    for i in range(1, medicos + 1):
+        agenda.adicionar_medico(Medico(str(i), f"Médico {i}", "Cardiologia"))
+    if relogio is None:
+        return ServicoReservas(agenda)
+    return ServicoReservas(agenda, duracao_bloqueio=60, relogio=relogio)
+
+
+def _em(horario, dias=0):
+    return datetime.combine(segunda + timedelta(days=dias), datetime.strptime(horario, "%H:%M").time())
+
+
+def test_bloquear_e_confirmar():
+    """Testa o fluxo seleção -> confirmação e o formato do protocolo."""
+    servico = _servico()
+    bloqueio = servico.bloquear("1", _em("09:00"), "Maria Silva")
+    assert _em("09:00") not in servico.horarios_livres("1", segunda)
+    try:
+        servico.bloquear("1", _em("09:00"), "José")
+        assert False, "Horário bloqueado não pode ser bloqueado por outro"
+    except ConflitoAgendamento:
+        pass
+
+    agendamento = servico.confirmar(bloqueio)
+    assert agendamento.protocolo.startswith(f"#AG{date.today().year}")
+    assert agendamento.expira_em is None
+    assert servico.agenda.agendamento("1", _em("09:00")) is agendamento
+    try:
+        servico.confirmar(bloqueio)
+        assert False, "Bloqueio não pode ser confirmado duas vezes"
+    except ConflitoAgendamento:
+        pass
+    print("✅ test_bloquear_e_confirmar passou")
+
+
+def test_bloqueio_expira():
+    """Testa que bloqueios vencidos liberam o horário e não podem ser confirmados."""
+    relogio = RelogioFalso()
+    servico = _servico(relogio)
+    antigo = servico.bloquear("1", _em("10:00"), "Maria")
+    servico.bloquear("1", _em("10:30"), "José")
+
+    relogio.agora = 61
+    # Um novo pedido toma o lugar do bloqueio vencido
+    novo = servico.bloquear("1", _em("10:00"), "Ana")
+    try:
+        servico.confirmar(antigo)
+        assert False, "Bloqueio vencido não pode ser confirmado"
+    except BloqueioExpirado:
+        pass
+    assert servico.confirmar(novo).paciente == "Ana"
+
+    # O bloqueio que ninguém pediu volta para os horários livres
+    assert _em("10:30") in servico.horarios_livres("1", segunda)
+    assert servico.expirar_bloqueios() == 0
+    print("✅ test_bloqueio_expira passou")
+
+
+def test_liberar_e_cancelar():
+    """Testa a desistência do bloqueio e o cancelamento da reserva."""
+    servico = _servico()
+    bloqueio = servico.bloquear("2", _em("14:00"), "Maria")
+    assert servico.liberar(bloqueio)
+    assert not servico.liberar(bloqueio)
+    agendamento = servico.reservar("2", _em("14:00"), "José")
+    assert servico.cancelar(agendamento)
+    assert _em("14:00") in servico.horarios_livres("2", segunda)
+    print("✅ test_liberar_e_cancelar passou")
+
+
+def test_protocolos_em_blocos():
+    """Testa números crescentes, compartilhados entre threads e retomados após reinício."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivo = os.path.join(diretorio, 'protocolos.seq')
+        gerador = GeradorProtocolos(tamanho_bloco=10, arquivo=arquivo)
+        numeros = [gerador.proximo_numero() for _ in range(25)]
+        assert numeros == list(range(1, 26))
+
+        outra_thread = []
+        thread = threading.Thread(target=lambda: outra_thread.extend(gerador.proximo_numero() for _ in range(3)))
+        thread.start()
+        thread.join()
+        assert outra_thread == [26, 27, 28]
+
+        reiniciado = GeradorProtocolos(tamanho_bloco=10, arquivo=arquivo)
+        assert reiniciado.proximo_numero() == 31
+    print("✅ test_protocolos_em_blocos passou")
+
+
+def test_protocolos_threads_curtas():
+    """Testa que threads de um só protocolo (uma por conexão) recebem números consecutivos."""
+    gerador = GeradorProtocolos(tamanho_bloco=1000)
+    numeros = []
+    for _ in range(50):
+        thread = threading.Thread(target=lambda: numeros.append(gerador.proximo_numero()))
+        thread.start()
+        thread.join()
+    assert numeros == list(range(1, 51))
+
+    # Concorrentes: sem repetição nem buracos, mesmo atravessando vários blocos
+    gerador = GeradorProtocolos(tamanho_bloco=7)
+    por_thread = [[] for _ in range(8)]
+    threads = [threading.Thread(target=lambda lista=lista: lista.extend(gerador.proximo_numero() for _ in range(500)))
+               for lista in por_thread]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(n for lista in por_thread for n in lista) == list(range(1, 4001))
+    assert all(lista == sorted(lista) for lista in por_thread)
+    print("✅ test_protocolos_threads_curtas passou")
+
+
+def test_reservas_concorrentes_sem_duplicidade():
+    """Teste de estresse: muitas threads disputando poucos horários."""
+    servico = _servico(medicos=3)
+    horarios = [(medico_id, horario) for medico_id in ("1", "2", "3")
+                for horario in servico.horarios_livres(medico_id, segunda)]
+    confirmados, conflitos = [], []
+    lock = threading.Lock()
+    barreira = threading.Barrier(16)
+
+    def cliente(semente):
+        gerador = random.Random(semente)
+        barreira.wait()
+        for tentativa in range(200):
+            medico_id, horario = gerador.choice(horarios)
+            try:
+                if tentativa % 2:
+                    agendamento = servico.reservar(medico_id, horario, f"Paciente {semente}")
+                else:
+                    bloqueio = servico.bloquear(medico_id, horario, f"Paciente {semente}")
+                    if gerador.random() < 0.3:
+                        servico.liberar(bloqueio)
+                        continue
+                    agendamento = servico.confirmar(bloqueio)
+            except ConflitoAgendamento:
+                with lock:
+                    conflitos.append(semente)
+                continue
+            with lock:
+                confirmados.append(agendamento)
+            if gerador.random() < 0.2:
+                if servico.cancelar(agendamento):
+                    with lock:
+                        confirmados.remove(agendamento)
+
+    threads = [threading.Thread(target=cliente, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ocupados = [(a.medico_id, a.inicio) for a in confirmados]
+    assert len(ocupados) == len(set(ocupados))
+    assert len(conflitos) > 0
+    for agendamento in confirmados:
+        assert servico.agenda.agendamento(agendamento.medico_id, agendamento.inicio) is agendamento
+    livres = sum(len(servico.horarios_livres(m, segunda)) for m in ("1", "2", "3"))
+    assert livres + len(confirmados) == len(horarios)
+    print("✅ test_reservas_concorrentes_sem_duplicidade passou")
+
+
+def executar_testes():
+    """Executa todos os testes do serviço de reservas."""
+    print("🗓️ Executando testes do serviço de reservas...")
+
+    test_bloquear_e_confirmar()
+    test_bloqueio_expira()
+    test_liberar_e_cancelar()
+    test_protocolos_em_blocos()
+    test_protocolos_threads_curtas()
+    test_reservas_concorrentes_sem_duplicidade()
+
+    print("\n✅ Todos os testes do serviço de reservas passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
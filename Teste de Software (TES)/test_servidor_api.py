@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o servidor HTTP da triagem e do agendamento.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import date, datetime, timedelta
+import http.client
+import json
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from agenda import Agenda, Medico
+from reservas import ServicoReservas
+from servidor_api import ServidorAPI
+from triagem_concorrente import GerenciadorTriagemConcorrente
+
+segunda = date(2024, 3, 4)
+
+
+def _servidor(limite_streaming=1000):
+    agenda = Agenda(segunda, 14)
+    agenda.adicionar_medico(Medico("3", "Dr. Pedro Costa", "pediatria"))
+    servidor = ServidorAPI(GerenciadorTriagemConcorrente(), ServicoReservas(agenda), porta=0,
+                           limite_streaming=limite_streaming)
+    servidor.iniciar()
+    return servidor, http.client.HTTPConnection(*servidor.endereco, timeout=5)
+
+
+def _requisitar(conexao, metodo, url, corpo=None, cabecalhos=None):
+    conexao.request(metodo, url, body=None if corpo is None else json.dumps(corpo), headers=cabecalhos or {})
+    resposta = conexao.getresponse()
+    dados = resposta.read()
+    return resposta.status, resposta, json.loads(dados) if dados else None
+
+
+def test_adicionar_e_atender_pela_api():
+    """Testa POST individual, em lote e o atendimento na mesma conexão persistente."""
+    servidor, conexao = _servidor()
+    try:
+        status, _, corpo = _requisitar(conexao, 'POST', '/triage/patients',
+                                       {'nome': 'Maria Silva', 'idade': 45, 'urgencia': 3})
+        assert status == 201 and corpo['data']['nome'] == 'Maria Silva'
+
+        lote = [{'nome': 'João Santos', 'idade': 30, 'urgencia': 5},
+                {'nome': '', 'idade': 30, 'urgencia': 2},
+                ['Ana Costa', 25, 1]]
+        status, _, corpo = _requisitar(conexao, 'POST', '/triage/patients', lote)
+        assert status == 200 and corpo['data']['adicionados'] == 2
+        assert [erro['linha'] for erro in corpo['data']['erros']] == [1]
+
+        status, _, corpo = _requisitar(conexao, 'POST', '/triage/next')
+        assert status == 200 and corpo['data']['nome'] == 'João Santos'
+        status, _, corpo = _requisitar(conexao, 'POST', '/triage/next', {'quantidade': 5})
+        assert [p['nome'] for p in corpo['data']] == ['Maria Silva', 'Ana Costa']
+        status, _, corpo = _requisitar(conexao, 'POST', '/triage/next')
+        assert status == 404 and corpo['error']['code'] == 'EMPTY_QUEUE'
+
+        status, _, corpo = _requisitar(conexao, 'POST', '/triage/patients', {'nome': 'X', 'idade': 200, 'urgencia': 3})
+        assert status == 400 and corpo['error']['code'] == 'VALIDATION_ERROR'
+    finally:
+        conexao.close()
+        servidor.parar()
+    print("✅ test_adicionar_e_atender_pela_api passou")
+
+
+def test_listagem_com_etag():
+    """Testa 304 enquanto a fila não muda e novo ETag após uma mudança."""
+    servidor, conexao = _servidor()
+    try:
+        _requisitar(conexao, 'POST', '/triage/patients', [['Maria Silva', 45, 3], ['João Santos', 30, 5]])
+        status, resposta, corpo = _requisitar(conexao, 'GET', '/triage/queue')
+        etag = resposta.getheader('ETag')
+        assert status == 200 and etag
+        assert [p['nome'] for p in corpo['data']['pacientes']] == ['João Santos', 'Maria Silva']
+
+        status, _, corpo = _requisitar(conexao, 'GET', '/triage/queue', cabecalhos={'If-None-Match': etag})
+        assert status == 304 and corpo is None
+
+        _requisitar(conexao, 'POST', '/triage/next')
+        status, resposta, corpo = _requisitar(conexao, 'GET', '/triage/queue', cabecalhos={'If-None-Match': etag})
+        assert status == 200 and resposta.getheader('ETag') != etag
+        assert corpo['data']['total'] == 1
+    finally:
+        conexao.close()
+        servidor.parar()
+    print("✅ test_listagem_com_etag passou")
+
+
+def test_listagem_grande_em_streaming():
+    """Testa que filas acima do limite vão em chunks e chegam completas e ordenadas."""
+    servidor, conexao = _servidor(limite_streaming=100)
+    try:
+        lote = [[f"Paciente {i}", 30, i % 5 + 1] for i in range(1200)]
+        _requisitar(conexao, 'POST', '/triage/patients', lote)
+        status, resposta, corpo = _requisitar(conexao, 'GET', '/triage/queue')
+        assert status == 200 and resposta.getheader('Transfer-Encoding') == 'chunked'
+        pacientes = corpo['data']['pacientes']
+        assert len(pacientes) == 1200 and corpo['data']['total'] == 1200
+        assert [p['posicao'] for p in pacientes] == list(range(1, 1201))
+        assert pacientes[0]['urgencia'] == 5 and pacientes[-1]['urgencia'] == 1
+
+        # A segunda leitura da mesma versão sai do cache, com Content-Length
+        status, resposta, _ = _requisitar(conexao, 'GET', '/triage/queue')
+        assert resposta.getheader('Content-Length') is not None
+    finally:
+        conexao.close()
+        servidor.parar()
+    print("✅ test_listagem_grande_em_streaming passou")
+
+
+def test_agendamento_pela_api():
+    """Testa disponibilidade, reserva, conflito com sugestões, lote e cancelamento."""
+    servidor, conexao = _servidor()
+    try:
+        status, _, corpo = _requisitar(conexao, 'GET', f'/appointments/availability?doctorId=3&date={segunda}')
+        assert status == 200 and len(corpo['data']['availableSlots']) == 18
+
+        inicio = datetime.combine(segunda, datetime.min.time()) + timedelta(hours=9)
+        pedido = {'doctorId': '3', 'dateTime': inicio.isoformat(), 'patientName': 'Maria Silva'}
+        status, _, corpo = _requisitar(conexao, 'POST', '/appointments', pedido)
+        assert status == 201 and corpo['data']['protocol'].startswith('#AG')
+        protocolo = corpo['data']['protocol']
+
+        status, _, corpo = _requisitar(conexao, 'POST', '/appointments', pedido)
+        assert status == 409 and corpo['error']['code'] == 'TIME_CONFLICT'
+        assert corpo['error']['details']['suggestedTimes'][0] == f"{segunda}T07:00:00"
+
+        lote = [dict(pedido, dateTime=(inicio + timedelta(minutes=30)).isoformat()), pedido]
+        status, _, corpo = _requisitar(conexao, 'POST', '/appointments', lote)
+        assert status == 200 and [r['success'] for r in corpo['data']] == [True, False]
+
+        status, _, corpo = _requisitar(conexao, 'GET', f'/appointments/first-available?specialty=pediatria&from={inicio.isoformat()}')
+        assert corpo['data']['dateTime'] == (inicio + timedelta(hours=1)).isoformat()
+
+        status, _, _ = _requisitar(conexao, 'DELETE', '/appointments/' + protocolo.replace('#', '%23'))
+        assert status == 200
+        status, _, _ = _requisitar(conexao, 'DELETE', '/appointments/' + protocolo.replace('#', '%23'))
+        assert status == 404
+    finally:
+        conexao.close()
+        servidor.parar()
+    print("✅ test_agendamento_pela_api passou")
+
+
+def test_erros_de_requisicao_viram_json():
+    """Testa Content-Length inválido (400) e falha inesperada (500) sem derrubar o servidor."""
+    servidor, conexao = _servidor()
+    try:
+        conexao.putrequest('POST', '/triage/patients')
+        conexao.putheader('Content-Length', 'abc')
+        conexao.endheaders()
+        resposta = conexao.getresponse()
+        corpo = json.loads(resposta.read())
+        assert resposta.status == 400 and corpo['error']['code'] == 'INVALID_CONTENT_LENGTH'
+        conexao.close()
+
+        def falhar(corpo):
+            raise RuntimeError("falha simulada")
+        servidor.atender = falhar
+        status, _, corpo = _requisitar(conexao, 'POST', '/triage/next')
+        assert status == 500 and corpo == {'success': False,
+                                           'error': {'code': 'INTERNAL_ERROR', 'message': "Erro interno do servidor"}}
+        conexao.close()
+
+        status, _, corpo = _requisitar(conexao, 'GET', '/health')
+        assert status == 200 and corpo['data'] == {'status': 'healthy', 'fila': 0}
+    finally:
+        conexao.close()
+        servidor.parar()
+    print("✅ test_erros_de_requisicao_viram_json passou")
+
+
+def executar_testes():
+    """Executa todos os testes do servidor HTTP."""
+    print("🌐 Executando testes do servidor HTTP...")
+
+    test_adicionar_e_atender_pela_api()
+    test_listagem_com_etag()
+    test_listagem_grande_em_streaming()
+    test_agendamento_pela_api()
+    test_erros_de_requisicao_viram_json()
+
+    print("\n✅ Todos os testes do servidor HTTP passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
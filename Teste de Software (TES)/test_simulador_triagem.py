@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para o simulador de eventos discretos do pronto-socorro.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import datetime
+import random
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from filas import FilaFaixas
+from monitor_sistema import monitor
+from triagem import GerenciadorTriagem
+from simulador_triagem import HORA, Cenario, Chegada, Surto, fixo, gerar_chegadas, simular
+
+base_time = datetime(2024, 3, 1, 0, 0)
+
+
+def _atendimento_fixo(segundos):
+    return {urgencia: fixo(segundos) for urgencia in (1, 2, 3, 4, 5)}
+
+
+def test_esperas_verificaveis_a_mao():
+    """Testa as esperas de um cenário determinístico com um enfermeiro."""
+    cenario = Cenario('manual', duracao=HORA, enfermeiros=1, atendimento=_atendimento_fixo(100))
+    chegadas = [Chegada(0, 1, 30), Chegada(10, 3, 40), Chegada(20, 5, 50)]
+    resultado = simular(cenario, chegadas=chegadas, inicio=base_time)
+
+    # t=0 atende a urgência 1; em t=100 a urgência 5 passa à frente da 3
+    assert resultado.chegadas == resultado.atendidos == 3
+    assert resultado.espera_por_urgencia[1]['maxima'] == 0
+    assert resultado.espera_por_urgencia[5]['maxima'] == 80
+    assert resultado.espera_por_urgencia[3]['maxima'] == 190
+    assert resultado.fila_maxima == 2
+    assert abs(resultado.fila_media - (10 * 1 + 80 * 2 + 100 * 1) / HORA) < 1e-9
+    assert abs(resultado.ocupacao_equipe - 300 / HORA) < 1e-9
+
+    # O gerenciador usa o relógio virtual: a métrica do monitor bate com o simulador
+    esperas = [metrica.valor for metrica in monitor.metricas['tempo_espera'].recentes(3)]
+    assert esperas == [0, 80, 190]
+    print("✅ test_esperas_verificaveis_a_mao passou")
+
+
+def test_fim_da_simulacao_deixa_pacientes_na_fila():
+    """Testa que quem não foi atendido até o fim aparece como aguardando, por urgência."""
+    cenario = Cenario('curto', duracao=150, enfermeiros=1, atendimento=_atendimento_fixo(100))
+    chegadas = [Chegada(0, 2, 30), Chegada(1, 2, 30), Chegada(2, 4, 30), Chegada(200, 5, 30)]
+    resultado = simular(cenario, chegadas=chegadas, inicio=base_time)
+
+    assert resultado.chegadas == 3  # a chegada em t=200 fica fora da janela
+    assert resultado.atendidos == 2
+    assert resultado.aguardando_no_fim == 1 and resultado.aguardando_por_urgencia == {2: 1}
+    print("✅ test_fim_da_simulacao_deixa_pacientes_na_fila passou")
+
+
+def test_chegadas_poisson_e_surto():
+    """Testa a taxa média das chegadas e o aumento durante um surto."""
+    constante = Cenario('constante', duracao=100 * HORA, chegadas_por_hora=30, perfil_horario=None)
+    chegadas = list(gerar_chegadas(constante, random.Random(1)))
+    assert 2700 < len(chegadas) < 3300  # 3000 esperadas, desvio ~55
+    assert all(a.tempo < b.tempo for a, b in zip(chegadas, chegadas[1:]))
+
+    com_surto = Cenario('surto', duracao=10 * HORA, chegadas_por_hora=30, perfil_horario=None,
+                        surtos=[Surto(5 * HORA, HORA, 10.0, (0, 0, 0, 0, 1))])
+    chegadas = list(gerar_chegadas(com_surto, random.Random(2)))
+    no_surto = [c for c in chegadas if 5 * HORA <= c.tempo < 6 * HORA]
+    por_hora_fora = len([c for c in chegadas if c.tempo < 5 * HORA]) / 5
+    assert len(no_surto) > 5 * por_hora_fora  # ~300 contra ~30 por hora
+    assert len(no_surto) > 200 and all(c.urgencia == 5 for c in no_surto)
+    print("✅ test_chegadas_poisson_e_surto passou")
+
+
+def test_reprodutivel_e_independente_do_backend():
+    """Testa que a mesma semente dá o mesmo resultado com backends diferentes."""
+    cenario = Cenario('normal', duracao=12 * HORA, chegadas_por_hora=20)
+    heap = simular(cenario, semente=7, inicio=base_time)
+    faixas = simular(cenario, GerenciadorTriagem(FilaFaixas()), semente=7, inicio=base_time)
+
+    assert heap.chegadas > 0
+    assert heap.espera_por_urgencia == faixas.espera_por_urgencia
+    assert heap.fila_por_hora == faixas.fila_por_hora and len(heap.fila_por_hora) == 12
+    print("✅ test_reprodutivel_e_independente_do_backend passou")
+
+
+def test_escala_mantem_carga_por_enfermeiro():
+    """Testa que o cenário escalado multiplica chegadas e equipe."""
+    cenario = Cenario('normal', chegadas_por_hora=12, enfermeiros=3).escalado(100)
+    assert cenario.chegadas_por_hora == 1200 and cenario.enfermeiros == 300
+
+    try:
+        simular(Cenario('vazio', enfermeiros=0))
+        assert False, "Deveria ter lançado ValueError"
+    except ValueError:
+        pass
+    print("✅ test_escala_mantem_carga_por_enfermeiro passou")
+
+
+def executar_testes():
+    """Executa todos os testes do simulador."""
+    print("🚑 Executando testes do simulador do pronto-socorro...")
+
+    test_esperas_verificaveis_a_mao()
+    test_fim_da_simulacao_deixa_pacientes_na_fila()
+    test_chegadas_poisson_e_surto()
+    test_reprodutivel_e_independente_do_backend()
+    test_escala_mantem_carga_por_enfermeiro()
+
+    print("\n✅ Todos os testes do simulador passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Testes unitários para a fila de triagem asyncio.
+Testes usando apenas bibliotecas padrão do Python.
+"""
+
+from datetime import datetime, timedelta
+import asyncio
+import sys
+import os
+
+# Adicionar o diretório correto ao path
+caminho_triagem = os.path.join(os.path.dirname(__file__), '..', 'Construção de Software (PRO)')
+sys.path.insert(0, os.path.abspath(caminho_triagem))
+
+from monitor_sistema import monitor
+from triagem import Paciente, ordenar_por_prioridade
+from triagem_async import FilaTriagemAssincrona
+
+
+def test_proximo_aguarda_chegada():
+    """Testa que proximo() suspende até um paciente ser adicionado."""
+    async def cenario():
+        fila = FilaTriagemAssincrona()
+        atendente = asyncio.create_task(fila.proximo())
+        await asyncio.sleep(0.01)
+        assert not atendente.done()
+
+        fila.adicionar_paciente(Paciente("Maria Silva", 45, 3))
+        paciente = await asyncio.wait_for(atendente, 1)
+        assert paciente.nome == "Maria Silva"
+        assert len(fila) == 0
+
+    asyncio.run(cenario())
+    print("✅ test_proximo_aguarda_chegada passou")
+
+
+def test_proximo_timeout():
+    """Testa IndexError quando nenhum paciente chega dentro do timeout."""
+    async def cenario():
+        fila = FilaTriagemAssincrona()
+        erros = monitor.contadores['erros_validacao']
+        atender_sincrono = fila.gerenciador.atender_proximo
+
+        def sem_chamada_sincrona():
+            raise AssertionError("O timeout não deve passar pelo atendimento síncrono")
+        fila.gerenciador.atender_proximo = sem_chamada_sincrona
+        try:
+            await fila.proximo(timeout=0.01)
+            assert False, "Deveria ter levantado IndexError"
+        except IndexError as e:
+            assert "Fila vazia" in str(e)
+        assert monitor.contadores['erros_validacao'] == erros + 1  # registrado direto no monitor
+        fila.gerenciador.atender_proximo = atender_sincrono
+
+        # Um atendente que desistiu não consome o aviso de chegada
+        fila.adicionar_paciente(Paciente("João Santos", 30, 5))
+        assert (await fila.proximo(timeout=1)).nome == "João Santos"
+
+    asyncio.run(cenario())
+    print("✅ test_proximo_timeout passou")
+
+
+def test_iteracao_mantem_ordem():
+    """Testa que async for atende na mesma ordem de ordenar_por_prioridade."""
+    async def cenario():
+        fila = FilaTriagemAssincrona()
+        base_time = datetime.now()
+        pacientes = [Paciente(f"P{i}", 30, i % 5 + 1, base_time + timedelta(seconds=i)) for i in range(15)]
+        fila.adicionar_lote(pacientes)
+        fila.fechar()
+
+        atendidos = [paciente async for paciente in fila]
+        assert atendidos == ordenar_por_prioridade(pacientes)
+
+    asyncio.run(cenario())
+    print("✅ test_iteracao_mantem_ordem passou")
+
+
+def test_varios_atendentes_e_fechamento():
+    """Testa atendentes concorrentes recebendo cada paciente uma única vez."""
+    async def cenario():
+        fila = FilaTriagemAssincrona()
+
+        async def atendente():
+            return [paciente.nome async for paciente in fila]
+
+        tarefas = [asyncio.create_task(atendente()) for _ in range(3)]
+        for i in range(30):
+            fila.adicionar_paciente(Paciente(f"P{i}", 30, i % 5 + 1))
+            if i % 7 == 0:
+                await asyncio.sleep(0)
+        fila.fechar()
+
+        resultados = await asyncio.wait_for(asyncio.gather(*tarefas), 1)
+        nomes = [nome for resultado in resultados for nome in resultado]
+        assert sorted(nomes) == sorted(f"P{i}" for i in range(30))
+
+        try:
+            fila.adicionar_paciente(Paciente("Atrasado", 30, 1))
+            assert False, "Deveria ter levantado ValueError"
+        except ValueError as e:
+            assert "fechada" in str(e)
+
+        await fila.descarregar_logs()
+
+    asyncio.run(cenario())
+    print("✅ test_varios_atendentes_e_fechamento passou")
+
+
+def executar_testes():
+    """Executa todos os testes da fila asyncio."""
+    print("⏳ Executando testes da fila asyncio...")
+
+    test_proximo_aguarda_chegada()
+    test_proximo_timeout()
+    test_iteracao_mantem_ordem()
+    test_varios_atendentes_e_fechamento()
+
+    print("\n✅ Todos os testes da fila asyncio passaram!")
+
+
+if __name__ == "__main__":
+    executar_testes()